@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+VibeCollab Vector Codec Benchmark
+
+Compares VectorStore storage codecs (float32 / float16 / int8, with and without
+float32 re-rank) on synthetic clustered embeddings: index.db size, resident
+matrix size, search latency and recall@k against the float32 exact scan.
+
+Usage:
+    python scripts/bench_vector_codecs.py
+    python scripts/bench_vector_codecs.py --rows 20000 --dims 1536 --queries 50
+
+Requires numpy.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from vibecollab.search.vector_store import VectorDocument, VectorStore  # noqa: E402
+
+CONFIGS = [
+    ("float32", False),
+    ("float16", False),
+    ("int8", False),
+    ("float16", True),
+    ("int8", True),
+]
+
+
+def make_data(rows: int, dims: int, queries: int, seed: int = 0):
+    """Clustered unit vectors (closer to real embeddings than uniform noise)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, rows // 50), dims))
+    data = centers[rng.integers(len(centers), size=rows)] + 0.6 * rng.normal(size=(rows, dims))
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    picks = data[rng.integers(rows, size=queries)]
+    qs = picks + 0.3 * rng.normal(size=picks.shape)
+    return data.astype(np.float32), qs.astype(np.float32)
+
+
+def run(codec: str, keep_exact: bool, data, queries, top_k: int, workdir: Path):
+    db_path = workdir / f"{codec}{'_exact' if keep_exact else ''}.db"
+    store = VectorStore(db_path=db_path, dimensions=data.shape[1], codec=codec, keep_exact=keep_exact)
+    store.upsert_batch([
+        VectorDocument(f"doc:{i}", f"text {i}", row.tolist()) for i, row in enumerate(data)
+    ])
+    store.close()
+    db_bytes = db_path.stat().st_size
+
+    store = VectorStore(db_path=db_path, dimensions=data.shape[1])
+    start = time.perf_counter()
+    store.search(queries[0].tolist(), top_k=top_k)
+    load_s = time.perf_counter() - start
+    resident = store._cache.nbytes if store._cache is not None else 0
+
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append([r.doc_id for r in store.search(q.tolist(), top_k=top_k, min_score=-1.0)])
+    per_query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    store.close()
+    return db_bytes, resident, load_s, per_query_ms, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    data, queries = make_data(args.rows, args.dims, args.queries)
+    print(f"rows={args.rows} dims={args.dims} queries={args.queries} top_k={args.top_k}\n")
+    header = f"{'codec':<16}{'index.db MB':>12}{'resident MB':>12}{'load s':>8}{'ms/query':>10}{'recall':>8}"
+    print(header)
+    print("-" * len(header))
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec, keep_exact in CONFIGS:
+            db_bytes, resident, load_s, ms, results = run(
+                codec, keep_exact, data, queries, args.top_k, Path(tmp)
+            )
+            if baseline is None:
+                baseline = results
+            recall = np.mean([
+                len(set(got) & set(want)) / len(want) for got, want in zip(results, baseline)
+            ])
+            label = codec + (" +rerank" if keep_exact else "")
+            print(
+                f"{label:<16}{db_bytes / 2**20:>12.1f}{resident / 2**20:>12.1f}"
+                f"{load_s:>8.2f}{ms:>10.2f}{recall:>8.3f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,7 +22,7 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -63,6 +63,19 @@ def _get_insight_files(project_root: Path) -> List[Path]:
     return sorted(insights_dir.glob("INS-*.yaml"), reverse=True)
 
 
+def _get_insight_records(project_root: Path) -> List[Tuple[str, Dict]]:
+    """Get all parsed Insight files as (file stem, data), sorted by ID descending
+
+    Read through the shared insight catalog (compiled, re-parsing only changed files).
+    """
+    from ..insight.catalog import get_insight_catalog
+
+    insights_dir = project_root / ".vibecollab" / "insights"
+    if not insights_dir.exists():
+        return []
+    return list(reversed(get_insight_catalog(insights_dir).records()))
+
+
 def _get_managers(root: Path):
     """Lazy-initialize and return (InsightManager, TaskManager, EventLog)."""
     from ..domain.event_log import EventLog
@@ -87,19 +100,30 @@ def _get_managers(root: Path):
     return im, tm, event_log
 
 
-def create_mcp_server(project_root: Optional[Path] = None):
+def create_mcp_server(project_root: Optional[Path] = None, preload_embedder: bool = False):
     """Create and configure an MCP Server instance
 
+    Semantic search tools share a warm, process-wide Indexer/Embedder pool
+    (see search/pool.py), so the embedding model is loaded once per server.
+
     Args:
         project_root: Project root directory; auto-detected when None
+        preload_embedder: Load the embedding model in a background thread now
+            instead of on the first semantic search
 
     Returns:
         FastMCP instance
     """
     from mcp.server.fastmcp import FastMCP
 
+    from ..search.manifest import ReindexNeeded
+    from ..search.pool import get_indexer_pool
+
     root = project_root or _find_project_root()
     config_path = root / "project.yaml"
+    indexer_pool = get_indexer_pool()
+    if preload_embedder:
+        indexer_pool.preload(root)
 
     mcp = FastMCP(
         "vibecollab",
@@ -154,16 +178,15 @@ def create_mcp_server(project_root: Optional[Path] = None):
     @mcp.resource("vibecollab://insights/list")
     def get_insights_list() -> str:
         """All Insight entries list (ID + title + tags)"""
-        files = _get_insight_files(root)
-        if not files:
+        records = _get_insight_records(root)
+        if not records:
             return json.dumps({"insights": [], "count": 0}, ensure_ascii=False)
 
         insights = []
-        for f in files:
-            data = _safe_load_yaml(f)
+        for stem, data in records:
             if data:
                 insights.append({
-                    "id": data.get("id", f.stem),
+                    "id": data.get("id", stem),
                     "title": data.get("title", ""),
                     "tags": data.get("tags", []),
                     "category": data.get("category", ""),
@@ -187,13 +210,23 @@ def create_mcp_server(project_root: Optional[Path] = None):
             im, _, _ = _get_managers(root)
 
             if semantic:
-                from ..search.indexer import Indexer
+                from ..search.vector_store import SearchFilter
                 try:
-                    indexer = Indexer(project_root=root)
-                    results = indexer.search(query, top_k=10, source_type="insight")
-                    items = [{"doc_id": r.doc_id, "title": r.title, "score": round(r.score, 3),
-                              "source_type": r.source_type} for r in results]
-                    return json.dumps({"results": items, "count": len(items)}, ensure_ascii=False, indent=2)
+                    indexer = indexer_pool.get(root)
+                    tag_filter = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
+                    results = indexer.search(
+                        query, top_k=10, source_type="insight",
+                        filters=SearchFilter(tags_any=tag_filter),
+                    )
+                    items = [{"doc_id": r.doc_id, "title": r.metadata.get("title", ""),
+                              "score": round(r.score, 3), "source_type": r.source_type,
+                              "tags": r.metadata.get("tags", [])} for r in results]
+                    return json.dumps({"results": items, "count": len(items),
+                                       "embed_ms": indexer.last_embed_ms},
+                                      ensure_ascii=False, indent=2)
+                except ReindexNeeded as e:
+                    return json.dumps({"error": str(e), "status": "reindex_needed"},
+                                      ensure_ascii=False)
                 except Exception as e:
                     return json.dumps({"error": f"Semantic search failed: {e}",
                                        "hint": "Run 'vibecollab index' first"}, ensure_ascii=False)
@@ -676,31 +709,70 @@ def create_mcp_server(project_root: Optional[Path] = None):
         )
 
     @mcp.tool()
-    def search_docs(query: str, doc_type: str = "", min_score: float = 0.0) -> str:
+    def search_docs(
+        query: str,
+        doc_type: str = "",
+        min_score: float = 0.0,
+        tags: str = "",
+        match_all_tags: bool = False,
+        category: str = "",
+        source: str = "",
+        heading: str = "",
+    ) -> str:
         """Semantic search across project documents and Insights
 
         Args:
             query: Search content (natural language)
             doc_type: Filter by source type (insight/document, empty for all)
             min_score: Minimum relevance threshold (0.0-1.0)
+            tags: Tag filter, comma-separated (e.g. "architecture,MCP")
+            match_all_tags: Require every tag instead of any of them
+            category: Insight category filter
+            source: Source path glob (e.g. "docs/*.md")
+            heading: Heading prefix filter (e.g. "## Architecture")
         """
         try:
-            from ..search.indexer import Indexer
+            from ..search.vector_store import SearchFilter
 
-            indexer = Indexer(project_root=root)
+            tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
+            filters = SearchFilter(
+                tags_any=[] if match_all_tags else tag_list,
+                tags_all=tag_list if match_all_tags else [],
+                category=category or None,
+                source_glob=source or None,
+                heading_prefix=heading or None,
+            )
+            indexer = indexer_pool.get(root)
             results = indexer.search(
                 query, top_k=10,
                 source_type=doc_type or None,
                 min_score=min_score,
+                filters=filters,
             )
-            items = [{"doc_id": r.doc_id, "title": r.title, "score": round(r.score, 3),
-                       "source_type": r.source_type, "snippet": r.snippet[:200] if hasattr(r, "snippet") else ""}
+            items = [{"doc_id": r.doc_id,
+                      "title": r.metadata.get("title") or r.metadata.get("heading", ""),
+                      "score": round(r.score, 3), "source_type": r.source_type,
+                      "source": r.source, "snippet": r.text[:200]}
                      for r in results]
-            return json.dumps({"results": items, "count": len(items)}, ensure_ascii=False, indent=2)
+            return json.dumps({"results": items, "count": len(items),
+                               "embed_ms": indexer.last_embed_ms},
+                              ensure_ascii=False, indent=2)
+        except ReindexNeeded as e:
+            return json.dumps({"error": str(e), "status": "reindex_needed"}, ensure_ascii=False)
         except Exception as e:
             return json.dumps({"error": str(e),
                                "hint": "Run 'vibecollab index' first to build vector index"}, ensure_ascii=False)
 
+    @mcp.tool()
+    def search_status() -> str:
+        """Semantic search engine status: index manifest, warm embedders, model load time, embedding latency"""
+        from ..search.indexer import vectors_dir
+        from ..search.manifest import read_manifest
+
+        manifest = read_manifest(vectors_dir(root) / "index.db")
+        return json.dumps({"manifest": manifest.to_dict() if manifest else None,
+                           "indexers": indexer_pool.stats()}, ensure_ascii=False, indent=2)
+
     @mcp.tool()
     def insight_suggest(output_json: bool = True) -> str:
         """Recommend candidate Insights based on structured signals -- from git incremental/doc changes/Task changes
@@ -911,6 +983,7 @@ def create_mcp_server(project_root: Optional[Path] = None):
             "- `onboard`: Get full project context",
             "- `next_step`: Get next step suggestions",
             "- `search_docs`: Semantic search project documents",
+            "- `search_status`: Embedding model load time and search latency",
             "- `task_list`: List current tasks",
             "- `task_create`: Create new task",
             "- `task_transition`: Advance task status",
@@ -967,12 +1040,14 @@ def create_mcp_server(project_root: Optional[Path] = None):
 def run_server(
     project_root: Optional[Path] = None,
     transport: str = "stdio",
+    preload_embedder: bool = False,
 ):
     """Start MCP Server
 
     Args:
         project_root: Project root directory
         transport: Transport mode ("stdio" or "sse")
+        preload_embedder: Load the embedding model in the background at startup
     """
-    server = create_mcp_server(project_root)
+    server = create_mcp_server(project_root, preload_embedder=preload_embedder)
     server.run(transport=transport)
@@ -34,32 +34,27 @@ def _search_related_insights(
 ) -> List[Dict]:
     """Search for Insights related to query text from vector index
 
-    Returns [{id, title, tags, score}] list, or empty list if index does not exist.
+    Queries with the embedder recorded in the index manifest. Returns
+    [{id, title, tags, score}] list, or empty list if the index does not
+    exist or needs a reindex (no manifest / embedder unavailable).
     """
     db_path = project_root / ".vibecollab" / "vectors" / "index.db"
     if not db_path.exists():
         return []
 
     try:
-        # Infer dimensions from existing DB
-        import sqlite3
-
-        from ..insight.embedder import Embedder, EmbedderConfig
+        from ..search.manifest import ReindexNeeded, load_index_embedder
         from ..search.vector_store import VectorStore
 
-        conn = sqlite3.connect(str(db_path))
-        row = conn.execute(
-            "SELECT dimensions FROM vectors LIMIT 1"
-        ).fetchone()
-        conn.close()
-
-        if not row:
+        try:
+            embedder, manifest = load_index_embedder(project_root)
+        except ReindexNeeded as e:
+            logger.info("Skipping related Insights: %s", e)
+            return []
+        if manifest.chunk_count == 0:
             return []
-        dimensions = row[0]
-
-        embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=dimensions))
-        store = VectorStore(db_path=db_path, dimensions=dimensions)
 
+        store = VectorStore(db_path=db_path, dimensions=manifest.dimensions)
         query_vector = embedder.embed_text(query_text)
         results = store.search(
             query_vector, top_k=top_k, source_type="insight"
@@ -6,10 +6,20 @@ Commands:
     vibecollab search    Global semantic search
 """
 
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 import click
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TaskID,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
 from rich.table import Table
 
 from .._compat import BULLET, EMOJI, safe_console
@@ -17,6 +27,130 @@ from ..i18n import _
 
 console = safe_console()
 
+_PHASE_LABELS = {
+    "document": _("Documents"),
+    "insight": _("Insights"),
+    "index": _("Chunks"),
+}
+
+
+def _progress_bar() -> Progress:
+    """Progress bar with ETA and chunk throughput"""
+    return Progress(
+        TextColumn("[cyan]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("{task.fields[rate]:.0f} chunks/s"),
+        TimeElapsedColumn(),
+        TextColumn(_("ETA")),
+        TimeRemainingColumn(),
+        console=console,
+    )
+
+
+def _progress_callback(progress: Progress) -> Callable[[str, int, Optional[int]], None]:
+    """Indexer progress callback driving one bar per phase"""
+    tasks: Dict[str, TaskID] = {}
+    started: Dict[str, float] = {}
+
+    def report(phase: str, done: int, total: Optional[int]) -> None:
+        if phase not in tasks:
+            started[phase] = time.perf_counter()
+            tasks[phase] = progress.add_task(
+                _PHASE_LABELS.get(phase, phase), total=total, rate=0.0
+            )
+        elapsed = time.perf_counter() - started[phase]
+        progress.update(
+            tasks[phase], completed=done, total=total,
+            rate=done / elapsed if elapsed > 0 else 0.0,
+        )
+
+    return report
+
+
+def _storage_table(title: str, columns: Dict[str, Dict]) -> Table:
+    """Storage stats (see VectorStore.storage_stats), one column per snapshot"""
+    table = Table(title=title, show_header=True)
+    table.add_column(_("Metric"), style="cyan")
+    for label in columns:
+        table.add_column(label, justify="right")
+    rows = [
+        (_("Rows"), lambda st: str(st["rows"])),
+        (_("Page size"), lambda st: str(st["page_size"])),
+        (_("Pages"), lambda st: str(st["page_count"])),
+        (_("Free pages"), lambda st: str(st["freelist_count"])),
+        (_("Fragmentation"), lambda st: f"{st['fragmentation']:.1%}"),
+        (_("DB size (KiB)"), lambda st: f"{st['db_bytes'] / 1024:.1f}"),
+        (_("WAL size (KiB)"), lambda st: f"{st['wal_bytes'] / 1024:.1f}"),
+    ]
+    for name, fmt in rows:
+        table.add_row(name, *(fmt(st) for st in columns.values()))
+    return table
+
+
+def _print_projection_report(report: dict) -> None:
+    """Print the outcome of `Indexer.reduce_dimensions`"""
+    console.print()
+    if not report["method"]:
+        msg = _("Projection removed; vectors stored at {dims} dims").format(dims=report["source_dims"])
+        console.print(f"[dim]{msg}[/dim]")
+        return
+    msg = _("Projected {rows} vectors: {method} {source} -> {target} dims").format(
+        rows=report["rows"], method=report["method"],
+        source=report["source_dims"], target=report["target_dims"],
+    )
+    console.print(f"[cyan]{msg}[/cyan]")
+    if report["recall"] is None:
+        console.print(f"[dim]{_('Recall estimate unavailable (requires numpy)')}[/dim]")
+        return
+    line = _("Estimated recall@{k} vs exact search: {recall:.3f}").format(
+        k=report["top_k"], recall=report["recall"]
+    )
+    if report["rerank_recall"] is not None:
+        line += " " + _("({recall:.3f} with float32 re-rank)").format(recall=report["rerank_recall"])
+    console.print(f"[dim]{line}[/dim]")
+
+
+def _maintain_index(db_path: Path, vacuum: bool) -> None:
+    """`index --stats / --vacuum`: report storage and optionally compact it"""
+    from ..search.manifest import read_manifest
+    from ..search.vector_store import VectorStore
+
+    if not db_path.exists():
+        console.print(f"[red]{_('Index does not exist')}[/red] -- {_('please run `vibecollab index` first')}")
+        raise SystemExit(1)
+    manifest = read_manifest(db_path)
+    if manifest is not None:
+        store = VectorStore(db_path=db_path, dimensions=manifest.dimensions)
+    else:
+        store = VectorStore(db_path=db_path)
+    try:
+        before = store.storage_stats()
+        phases = {"stats": before["seconds"]}
+        columns = {_("Current"): before}
+        if vacuum:
+            phases.update(store.vacuum())
+            after = store.storage_stats()
+            phases["stats_after"] = after["seconds"]
+            columns = {_("Before"): before, _("After"): after}
+    finally:
+        store.close()
+
+    console.print(_storage_table(_("Index Storage"), columns))
+    phase_table = Table(title=_("Maintenance Phases"), show_header=True)
+    phase_table.add_column(_("Phase"), style="cyan")
+    phase_table.add_column(_("Seconds"), justify="right")
+    for name, seconds in phases.items():
+        phase_table.add_row(name, f"{seconds:.3f}")
+    console.print(phase_table)
+    if vacuum:
+        saved = (before["db_bytes"] + before["wal_bytes"]) - (after["db_bytes"] + after["wal_bytes"])
+        console.print(
+            f"[green]{EMOJI.get('success', 'OK')} {_('Vacuum complete')}[/green] -- "
+            f"{_('reclaimed {kib:.1f} KiB').format(kib=max(saved, 0) / 1024)}"
+        )
+    console.print(f"[dim]{_('Storage:')} {db_path}[/dim]")
+
 
 @click.command()
 @click.option("--config", "-c", default="project.yaml", help=_("Project config file path"))
@@ -25,20 +159,77 @@ console = safe_console()
     type=click.Choice(["auto", "openai", "local", "pure_python"]),
     help=_("Embedding backend")
 )
-@click.option("--rebuild", is_flag=True, help=_("Rebuild after clearing old index"))
-def index_cmd(config: str, backend: str, rebuild: bool):
+@click.option(
+    "--rebuild", is_flag=True,
+    help=_("Rebuild from scratch in a shadow index, swapped in when complete (resumable)")
+)
+@click.option("--ann", is_flag=True, help=_("Build approximate nearest-neighbour (IVF) index"))
+@click.option("--nlist", default=None, type=int, help=_("ANN cluster count (default: sqrt of chunks)"))
+@click.option(
+    "--codec", default=None,
+    type=click.Choice(["float32", "float16", "int8"]),
+    help=_("Vector storage codec (default: keep the index's current codec)")
+)
+@click.option(
+    "--keep-exact/--no-keep-exact", default=None,
+    help=_("Also store float32 originals to exactly re-rank quantized or projected results")
+)
+@click.option(
+    "--reduce-dims", default=None, type=click.IntRange(min=0),
+    help=_("Store vectors projected to this many dims and report recall (0 = full dims)")
+)
+@click.option(
+    "--projection", "projection_method", default=None,
+    type=click.Choice(["pca", "random"]),
+    help=_("Projection for --reduce-dims: PCA fitted on the index, or seeded random (default: pca)")
+)
+@click.option(
+    "--workers", "-j", default=1, type=click.IntRange(min=1),
+    help=_("Parse worker processes; >1 runs the pipelined indexer")
+)
+@click.option(
+    "--batch-size", default=None, type=click.IntRange(min=1),
+    help=_("Chunks per embedding call in the pipelined indexer (default: 256)")
+)
+@click.option(
+    "--stats", "show_stats", is_flag=True,
+    help=_("Report index storage (pages, fragmentation) without indexing")
+)
+@click.option(
+    "--vacuum", is_flag=True,
+    help=_("Compact the index database and report time spent per phase, without indexing")
+)
+def index_cmd(
+    config: str, backend: str, rebuild: bool, ann: bool, nlist: Optional[int],
+    codec: Optional[str], keep_exact: Optional[bool], reduce_dims: Optional[int],
+    projection_method: Optional[str], workers: int, batch_size: Optional[int],
+    show_stats: bool, vacuum: bool,
+):
     """Index project documents and Insights
 
     Split documents by heading into chunks, generate embedding vectors,
     and store in local vector database (.vibecollab/vectors/index.db).
+    Unchanged chunks are not re-embedded; chunks of removed content are deleted.
 
     Examples:
 
         vibecollab index                     # Incremental index
 
-        vibecollab index --rebuild           # Clear and rebuild
+        vibecollab index --rebuild           # Rebuild; searches use the old index meanwhile
 
         vibecollab index -b pure_python      # Force zero-dependency backend
+
+        vibecollab index --ann               # Also build ANN index (requires numpy)
+
+        vibecollab index --codec int8        # 4x smaller vectors (quantized)
+
+        vibecollab index --reduce-dims 128 --keep-exact   # PCA-reduced scan + exact re-rank
+
+        vibecollab index -j 8                # Parallel parsing for large corpora
+
+        vibecollab index --stats             # Page counts and fragmentation
+
+        vibecollab index --vacuum            # Compact index.db
     """
     from ..insight.embedder import Embedder, EmbedderConfig
     from ..search.indexer import Indexer
@@ -47,8 +238,12 @@ def index_cmd(config: str, backend: str, rebuild: bool):
     config_path = Path(config)
     project_root = config_path.parent if config_path.parent != Path(".") else Path.cwd()
 
-    # Configure Embedder
-    embedder_config = EmbedderConfig(backend=backend)
+    # Configure Embedder (persistent embedding cache lives next to the index)
+    vectors_dir = project_root / ".vibecollab" / "vectors"
+    if show_stats or vacuum:
+        _maintain_index(vectors_dir / "index.db", vacuum)
+        return
+    embedder_config = EmbedderConfig(backend=backend, cache_dir=str(vectors_dir))
 
     # If openai backend, try loading API key from config
     if backend == "openai" or (backend == "auto" and not embedder_config.api_key):
@@ -67,21 +262,39 @@ def index_cmd(config: str, backend: str, rebuild: bool):
         console.print(f"[red]{_('Embedding initialization failed:')}[/red] {e}")
         raise SystemExit(1)
 
-    db_path = project_root / ".vibecollab" / "vectors" / "index.db"
-    store = VectorStore(db_path=db_path, dimensions=embedder.dimensions)
-
-    # Rebuild mode: clear old data
+    db_path = vectors_dir / "index.db"
     if rebuild:
-        old_count = store.count()
-        store.delete_by_source_type("document")
-        store.delete_by_source_type("insight")
-        console.print(f"[dim]{_('Cleared {n} old index entries').format(n=old_count)}[/dim]")
-
-    indexer = Indexer(project_root=project_root, embedder=embedder, store=store)
+        # The rebuilt index gets the codec; the live one is replaced as-is
+        store = VectorStore(db_path=db_path, dimensions=embedder.dimensions)
+    else:
+        store = VectorStore(
+            db_path=db_path, dimensions=embedder.dimensions, codec=codec, keep_exact=keep_exact
+        )
+
+    progress = _progress_bar()
+    indexer = Indexer(
+        project_root=project_root, embedder=embedder, store=store,
+        progress=_progress_callback(progress),
+    )
 
     console.print(f"[cyan]{_('Indexing... (backend: {name})').format(name=embedder.model_name)}[/cyan]")
 
-    stats = indexer.index_all()
+    if rebuild:
+        old_count = store.count()
+        console.print(f"[dim]{_('Rebuilding in a shadow index; searches keep using the current one')}[/dim]")
+        with progress:
+            stats = indexer.rebuild(
+                workers=workers, batch_size=batch_size, codec=codec, keep_exact=keep_exact,
+                reduce_dims=reduce_dims, projection_method=projection_method,
+            )
+        if stats.resumed:
+            console.print(
+                f"[dim]{_('Resumed interrupted rebuild ({n} chunks already built)').format(n=stats.resumed)}[/dim]"
+            )
+        console.print(f"[dim]{_('Swapped in rebuilt index, replaced {n} old entries').format(n=old_count)}[/dim]")
+    else:
+        with progress:
+            stats = indexer.index_all(workers=workers, batch_size=batch_size)
 
     # Display results
     console.print()
@@ -92,24 +305,84 @@ def index_cmd(config: str, backend: str, rebuild: bool):
     table.add_row(_("Insights"), str(stats.insights_indexed))
     table.add_row(_("Chunks Total"), str(stats.chunks_total))
     table.add_row(_("Skipped"), str(stats.skipped))
+    table.add_row(_("Added"), str(stats.added))
+    table.add_row(_("Updated"), str(stats.updated))
+    table.add_row(_("Unchanged"), str(stats.unchanged))
+    table.add_row(_("Removed"), str(stats.removed))
     console.print(table)
 
+    if stats.throughput:
+        console.print()
+        stage_table = Table(title=_("Pipeline Throughput"), show_header=True)
+        stage_table.add_column(_("Stage"), style="cyan")
+        stage_table.add_column(_("Chunks"), justify="right")
+        stage_table.add_column(_("Seconds"), justify="right")
+        stage_table.add_column(_("Chunks/sec"), justify="right")
+        for stage, values in stats.throughput.items():
+            stage_table.add_row(
+                stage, str(values["chunks"]), f"{values['seconds']:.2f}",
+                f"{values['chunks_per_sec']:.0f}",
+            )
+        console.print(stage_table)
+
     if stats.errors:
         console.print()
         console.print(f"[yellow]{EMOJI.get('warning', '!')} {_('Index errors:')}[/yellow]")
         for err in stats.errors:
             console.print(f"  {BULLET} {err}")
 
+    projection_report = stats.projection
+    if reduce_dims is not None and not rebuild:
+        current = store.projection
+        method = projection_method or (current.method if current else "pca")
+        have = (current.target_dims, current.method) if current else None
+        if have != ((reduce_dims, method) if reduce_dims else None):
+            try:
+                projection_report = indexer.reduce_dimensions(
+                    reduce_dims, method, keep_exact=keep_exact
+                )
+            except (ImportError, ValueError) as e:
+                console.print(f"[yellow]{EMOJI.get('warning', '!')} {_('Projection skipped:')} {e}[/yellow]")
+    if projection_report:
+        _print_projection_report(projection_report)
+
+    if ann:
+        try:
+            ann_index = indexer.build_ann_index(nlist=nlist)
+            console.print(
+                f"[dim]{_('ANN index built:')} {ann_index.nlist} {_('clusters')}, "
+                f"nprobe={ann_index.nprobe}[/dim]"
+            )
+        except (ImportError, ValueError) as e:
+            console.print(f"[yellow]{EMOJI.get('warning', '!')} {_('ANN index skipped:')} {e}[/yellow]")
+
     console.print()
     total = store.count()
     console.print(f"[green]{EMOJI.get('success', 'OK')} {_('Index complete')}[/green] -- {total} {_('vectors total')}")
     console.print(f"[dim]{_('Storage:')} {db_path}[/dim]")
+    codec_label = store.codec + (" + float32 re-rank" if store.keep_exact else "")
+    console.print(f"[dim]{_('Vector codec:')} {codec_label}[/dim]")
+    if store.projection is not None:
+        console.print(f"[dim]{_('Projection:')} {store.projection.describe()}[/dim]")
+    manifest = indexer.manifest()
+    if manifest is not None:
+        console.print(f"[dim]{_('Embedder:')} {manifest.describe()}[/dim]")
+    if embedder.disk_cache is not None:
+        cache_stats = embedder.disk_cache.stats()
+        console.print(
+            f"[dim]{_('Embedding cache:')} {cache_stats['hits']} {_('hits')}, "
+            f"{cache_stats['misses']} {_('misses')}, {cache_stats['entries']} {_('entries')}[/dim]"
+        )
 
     store.close()
 
 
 @click.command()
-@click.argument("query")
+@click.argument("query", required=False)
+@click.option(
+    "--queries-file", "-f", default=None, type=click.File("r", encoding="utf-8"),
+    help=_("Run one query per line of this file ('-' = stdin) in a single batched pass")
+)
 @click.option("--top", "-k", default=5, help=_("Number of results"))
 @click.option(
     "--type", "-t", "source_type", default=None,
@@ -117,11 +390,46 @@ def index_cmd(config: str, backend: str, rebuild: bool):
     help=_("Filter source type")
 )
 @click.option("--min-score", default=0.0, type=float, help=_("Minimum similarity threshold (0~1)"))
+@click.option(
+    "--nprobe", default=None, type=click.IntRange(min=0),
+    help=_("ANN clusters to probe: higher = better recall, slower (0 = exact)")
+)
+@click.option(
+    "--rerank", default=None, type=click.IntRange(min=0),
+    help=_("Candidates re-ranked with float32 originals (quantized indexes with --keep-exact; 0 = off)")
+)
+@click.option("--tag", "tags", multiple=True, help=_("Only chunks with any of these tags (repeatable)"))
+@click.option(
+    "--all-tags", "all_tags", multiple=True,
+    help=_("Only chunks with all of these tags (repeatable)")
+)
+@click.option("--category", default=None, help=_("Only Insights of this category"))
+@click.option("--source", "source_glob", default=None, help=_("Source path glob, e.g. 'docs/*.md'"))
+@click.option("--heading", "heading_prefix", default=None, help=_("Only chunks whose heading starts with this"))
+@click.option(
+    "--mode", default="vector",
+    type=click.Choice(["vector", "lexical", "hybrid"]),
+    help=_("Retrieval mode: vector similarity, BM25 keywords, or both fused")
+)
+@click.option(
+    "--lexical-candidates", is_flag=True,
+    help=_("Hybrid mode: only score vectors of keyword (BM25) matches")
+)
+@click.option(
+    "--no-cache", is_flag=True,
+    help=_("Bypass the query result cache shared by search invocations")
+)
 @click.option("--config", "-c", default="project.yaml", help=_("Project config file path"))
-def search_cmd(query: str, top: int, source_type: Optional[str], min_score: float, config: str):
+def search_cmd(
+    query: Optional[str], queries_file, top: int, source_type: Optional[str], min_score: float,
+    nprobe: Optional[int], rerank: Optional[int], tags: tuple, all_tags: tuple,
+    category: Optional[str], source_glob: Optional[str], heading_prefix: Optional[str],
+    mode: str, lexical_candidates: bool, no_cache: bool, config: str,
+):
     """Global semantic search
 
     Unified search across Insights / documents. Run `vibecollab index` first.
+    Vector and hybrid results are cached until the index changes.
 
     Examples:
 
@@ -132,9 +440,22 @@ def search_cmd(query: str, top: int, source_type: Optional[str], min_score: floa
         vibecollab search "template engine" -t insight
 
         vibecollab search "Git conventions" --min-score 0.3
+
+        vibecollab search "cache" --nprobe 32
+
+        vibecollab search "retry" --tag mcp --source "docs/*"
+
+        vibecollab search "INS-042" --mode lexical
+
+        vibecollab search "embedding cache eviction" --mode hybrid
+
+        vibecollab search --queries-file tasks.txt -k 3
     """
-    from ..insight.embedder import Embedder, EmbedderConfig
-    from ..search.vector_store import VectorStore
+    from ..search.manifest import ReindexNeeded, load_index_embedder, read_manifest
+    from ..search.vector_store import SearchFilter, VectorStore
+
+    if (query is None) == (queries_file is None):
+        raise click.UsageError(_("Pass either QUERY or --queries-file"))
 
     config_path = Path(config)
     project_root = config_path.parent if config_path.parent != Path(".") else Path.cwd()
@@ -144,28 +465,83 @@ def search_cmd(query: str, top: int, source_type: Optional[str], min_score: floa
         console.print(f"[red]{_('Index does not exist')}[/red] -- {_('please run `vibecollab index` first')}")
         raise SystemExit(1)
 
-    # Infer dimensions from existing index
-    import sqlite3
-    conn = sqlite3.connect(str(db_path))
-    row = conn.execute("SELECT dimensions FROM vectors LIMIT 1").fetchone()
-    conn.close()
-    if not row:
+    # Query with the embedder recorded in the index manifest (lexical needs none)
+    embedder = None
+    if mode == "lexical":
+        manifest = read_manifest(db_path)
+    else:
+        try:
+            embedder, manifest = load_index_embedder(project_root)
+        except ReindexNeeded as e:
+            console.print(f"[red]{e}[/red]")
+            raise SystemExit(1)
+    if manifest is not None and manifest.chunk_count == 0:
         console.print(f"[red]{_('Index is empty')}[/red] -- {_('please run `vibecollab index` first')}")
         raise SystemExit(1)
-    dims = row[0]
 
-    embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=dims))
-    store = VectorStore(db_path=db_path, dimensions=dims)
+    if manifest is not None:
+        store = VectorStore(db_path=db_path, dimensions=manifest.dimensions)
+    else:
+        # Lexical search over an index without manifest: dimensions are unused
+        store = VectorStore(db_path=db_path)
+
+    filters = SearchFilter(
+        tags_any=list(tags),
+        tags_all=list(all_tags),
+        category=category,
+        source_glob=source_glob,
+        heading_prefix=heading_prefix,
+    )
+    if mode != "vector" and not store.fts_available:
+        console.print(f"[red]{_('SQLite FTS5 is not available')}[/red] -- {_('use --mode vector')}")
+        store.close()
+        raise SystemExit(1)
+
+    if queries_file is not None:
+        queries = [line.strip() for line in queries_file if line.strip()]
+        if not queries:
+            console.print(f"[yellow]{_('No queries in file')}[/yellow]")
+            store.close()
+            return
+    else:
+        queries = [query]
+
+    if mode == "lexical":
+        batches = [
+            store.search_lexical(q, top_k=top, source_type=source_type, filters=filters)
+            for q in queries
+        ]
+    else:
+        from ..search.indexer import Indexer, query_cache_path
+        from ..search.query_cache import QueryResultCache
+
+        query_cache = (
+            QueryResultCache(max_entries=0) if no_cache
+            else QueryResultCache(path=query_cache_path(project_root))
+        )
+        indexer = Indexer(
+            project_root=project_root, embedder=embedder, store=store, query_cache=query_cache
+        )
+        # Uncached queries: one batched embedder call and one pass over the stored vectors
+        batches = indexer.search_many(
+            queries, top_k=top, source_type=source_type, min_score=min_score,
+            nprobe=nprobe, rerank=rerank, filters=filters, mode=mode,
+            lexical_candidates_only=lexical_candidates,
+        )
+        query_cache.close()
+
+    for q, results in zip(queries, batches):
+        _print_results(q, results, mode, min_score)
+    store.close()
 
-    query_vector = embedder.embed_text(query)
-    results = store.search(query_vector, top_k=top, source_type=source_type, min_score=min_score)
 
+def _print_results(query: str, results: list, mode: str, min_score: float) -> None:
+    """Print the results of one search query"""
     if not results:
         msg = _('No results found for "{query}"').format(query=query)
         console.print(f"[yellow]{msg}[/yellow]")
         if min_score > 0:
             console.print(f"[dim]{_('Hint: Try lowering --min-score (current: {score})').format(score=min_score)}[/dim]")
-        store.close()
         return
 
     console.print()
@@ -174,9 +550,13 @@ def search_cmd(query: str, top: int, source_type: Optional[str], min_score: floa
 
     for i, r in enumerate(results, 1):
         score_color = "green" if r.score > 0.5 else "yellow" if r.score > 0.2 else "dim"
+        if mode != "vector":
+            # BM25 / RRF scores are not on the 0~1 cosine scale
+            score_color = "cyan"
         type_label = {"document": "DOC", "insight": "INS"}.get(r.source_type, r.source_type)
         console.print(f"  [{score_color}]{i}. [{type_label}] {r.doc_id}[/{score_color}]")
-        console.print(f"     [{score_color}]{_('Similarity:')} {r.score:.3f}[/{score_color}]")
+        score_label = _('Similarity:') if mode == "vector" else _('Score:')
+        console.print(f"     [{score_color}]{score_label} {r.score:.3f}[/{score_color}]")
 
         # Show text preview (first 100 chars)
         preview = r.text[:150].replace("\n", " ")
@@ -194,5 +574,3 @@ def search_cmd(query: str, top: int, source_type: Optional[str], min_score: floa
                 console.print(f"     [dim]Tags: {', '.join(tags[:5])}[/dim]")
 
         console.print()
-
-    store
@@ -375,7 +375,7 @@ def list_tags(include_inactive, as_json):
 
 
 def _semantic_search_insights(query: str, top_k: int):
-    """Semantic search for Insights (uses vector index)"""
+    """Semantic search for Insights (uses vector index and its manifest embedder)"""
     from pathlib import Path
 
     project_root = Path.cwd()
@@ -384,21 +384,19 @@ def _semantic_search_insights(query: str, top_k: int):
         click.echo("Semantic index does not exist -- please run `vibecollab index` first", err=True)
         raise SystemExit(1)
 
-    import sqlite3
+    from ..search.manifest import ReindexNeeded, load_index_embedder
+    from ..search.vector_store import VectorStore
 
-    conn = sqlite3.connect(str(db_path))
-    row = conn.execute("SELECT dimensions FROM vectors LIMIT 1").fetchone()
-    conn.close()
-    if not row:
+    try:
+        embedder, manifest = load_index_embedder(project_root)
+    except ReindexNeeded as e:
+        click.echo(str(e), err=True)
+        raise SystemExit(1)
+    if manifest.chunk_count == 0:
         click.echo("Index is empty -- please run `vibecollab index` first", err=True)
         raise SystemExit(1)
 
-    from ..insight.embedder import Embedder, EmbedderConfig
-    from ..search.vector_store import VectorStore
-
-    dims = row[0]
-    embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=dims))
-    store = VectorStore(db_path=db_path, dimensions=dims)
+    store = VectorStore(db_path=db_path, dimensions=manifest.dimensions)
 
     query_vector = embedder.embed_text(query)
     results = store.search(query_vector, top_k=top_k, source_type="insight")
@@ -434,6 +432,8 @@ def use_insight(insight_id):
     if not entry:
         click.echo(f"Registry entry not found: {insight_id}", err=True)
         raise SystemExit(1)
+    # Keep the tracked registry.yaml current (the journal is local state)
+    mgr.compact_registry()
 
     click.echo(f"Usage recorded: {insight_id}")
     click.echo(f"  weight: {entry.weight:.4f}  used_count: {entry.used_count}  by: {used_by}")
@@ -460,6 +460,7 @@ def decay_insights(dry_run):
         return
 
     deactivated = mgr.apply_decay()
+    mgr.compact_registry()
     click.echo("Weight decay executed.")
     if deactivated:
         click.echo(f"Deactivated {len(deactivated)} insights: {', '.join(deactivated)}")
@@ -467,6 +468,22 @@ def decay_insights(dry_run):
         click.echo("No insights deactivated.")
 
 
+@insight.command("compact")
+def compact_insight_registry():
+    """Fold the local usage journal into registry.yaml
+
+    Registry updates made through the API are journaled locally and only
+    compacted every `journal_compact_every` ops; this writes them to the
+    tracked registry.yaml now.
+    """
+    mgr = _load_insight_manager()
+    folded = mgr.compact_registry()
+    if folded:
+        click.echo(f"{EMOJI['ok']} Folded {folded} journaled update(s) into registry.yaml")
+    else:
+        click.echo("Registry is up to date.")
+
+
 @insight.command("check")
 @click.option("--json", "as_json", is_flag=True, default=False, help=_("JSON output"))
 def check_insights(as_json):
@@ -1042,10 +1059,25 @@ def export_insights(ids, output, include_registry):
     default="skip",
     help=_("ID conflict strategy: skip/rename/overwrite"),
 )
+@click.option(
+    "--dedupe/--no-dedupe",
+    default=True,
+    help=_("Skip Insights whose content already exists under another ID"),
+)
+@click.option("--workers", type=int, default=None, help=_("Threads writing Insight files"))
+@click.option(
+    "--sequential",
+    is_flag=True,
+    default=False,
+    help=_("Import one Insight at a time (pre-bulk path, no deduplication)"),
+)
 @click.option("--json", "json_output", is_flag=True, default=False, help=_("JSON output"))
-def import_insights(filepath, strategy, json_output):
+def import_insights(filepath, strategy, dedupe, workers, sequential, json_output):
     """Import Insights from YAML file
 
+    The bundle is streamed and imported in one pass: IDs are reserved once,
+    files are written in parallel and the registry is written once.
+
     Examples:
 
         vibecollab insight import insights_bundle.yaml
@@ -1053,41 +1085,62 @@ def import_insights(filepath, strategy, json_output):
         vibecollab insight import bundle.yaml --strategy rename
 
         vibecollab insight import bundle.yaml --strategy overwrite
+
+        vibecollab insight import bundle.yaml --no-dedupe --workers 4
     """
     import json as json_mod
 
+    from ..insight.bulk_import import InvalidBundleError, stream_bundle
+
     path = Path(filepath)
     if not path.exists():
         click.echo(f"{EMOJI['fail']} File not found: {filepath}")
         raise SystemExit(1)
 
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            bundle = yaml.safe_load(f)
-    except Exception as e:
-        click.echo(f"{EMOJI['fail']} Failed to parse YAML: {e}")
-        raise SystemExit(1)
+    invalid = f"{EMOJI['fail']} Invalid bundle format. Expected 'vibecollab-insight-export'."
+    if sequential:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                bundle = yaml.safe_load(f)
+        except Exception as e:
+            click.echo(f"{EMOJI['fail']} Failed to parse YAML: {e}")
+            raise SystemExit(1)
 
-    if not isinstance(bundle, dict) or bundle.get("format") != "vibecollab-insight-export":
-        click.echo(f"{EMOJI['fail']} Invalid bundle format. Expected 'vibecollab-insight-export'.")
-        raise SystemExit(1)
+        if not isinstance(bundle, dict) or bundle.get("format") != "vibecollab-insight-export":
+            click.echo(invalid)
+            raise SystemExit(1)
 
     mgr = _load_insight_manager()
     dm = _load_role_manager()
     imported_by = dm.get_current_role()
 
-    results = mgr.import_insights(bundle, imported_by=imported_by, strategy=strategy)
+    if sequential:
+        results = mgr.import_insights(bundle, imported_by=imported_by, strategy=strategy)
+    else:
+        try:
+            results = mgr.bulk_import(
+                stream_bundle(path),
+                imported_by=imported_by,
+                strategy=strategy,
+                dedupe=dedupe,
+                workers=workers,
+            )
+        except yaml.YAMLError as e:
+            click.echo(f"{EMOJI['fail']} Failed to parse YAML: {e}")
+            raise SystemExit(1)
+        except InvalidBundleError:
+            click.echo(invalid)
+            raise SystemExit(1)
 
     if json_output:
         click.echo(json_mod.dumps(results, ensure_ascii=False, indent=2))
         return
 
     # Update role contributed
-    for ins_id in results["imported"]:
-        try:
-            dm.add_contributed(ins_id, imported_by)
-        except Exception:
-            pass
+    try:
+        dm.add_contributed_many(results["imported"], imported_by)
+    except Exception:
+        pass
 
     click.echo(f"\nImport results (strategy={strategy}):")
     click.echo(f"  {EMOJI['ok']} Imported:  {len(results['imported'])}")
@@ -1099,10 +1152,17 @@ def import_insights(filepath, strategy, json_output):
         click.echo(f"  {EMOJI['info']} Renamed:   {len(results['renamed'])}")
         for old_id, new_id in results["renamed"].items():
             click.echo(f"    {old_id} -> {new_id}")
+    if results.get("duplicates"):
+        click.echo(f"  {EMOJI['info']} Duplicates: {len(results['duplicates'])}")
+        for old_id, existing_id in results["duplicates"].items():
+            click.echo(f"    {old_id} = {existing_id}")
     if results["errors"]:
         click.echo(f"  {EMOJI['fail']} Errors:    {len(results['errors'])}")
         for err in results["errors"]:
             click.echo(f"    {err}")
+    if results.get("timings"):
+        phases = ", ".join(f"{k} {v:.3f}s" for k, v in results["timings"].items())
+        click.echo(f"  Timings: {phases}")
 
 
 @insight.command("triggers")
@@ -14,7 +14,7 @@ from rich.table import Table
 from .. import __version__
 from .._compat import BULLET, EMOJI, is_windows_gbk, safe_console
 from ..core.generator import LLMContextGenerator
-from ..core.project import Project
+from ..core.project import Project, ensure_vibecollab_gitignore
 from ..core.protocol_checker import ProtocolChecker
 from ..core.templates import TemplateManager
 from ..i18n import _, setup_locale
@@ -503,6 +503,13 @@ def upgrade(config: str, dry_run: bool, force: bool):
         config_path.parent, project_name, project_desc, contributing_ai_path
     )
 
+    # Ignore runtime files added by newer versions (catalog, journal, locks)
+    vibecollab_dir = config_path.parent / ".vibecollab"
+    if vibecollab_dir.is_dir():
+        added = ensure_vibecollab_gitignore(vibecollab_dir)
+        if added:
+            console.print(f"[dim].vibecollab/.gitignore: + {', '.join(added)}[/dim]")
+
     # Check and initialize role-based directory structure
     role_based_config = merged.get("role_context", {})
     if role_based_config.get("enabled", False):
@@ -41,7 +41,12 @@ def mcp_group():
     default=None,
     help=_("Project root directory (default: auto-find project.yaml)"),
 )
-def serve(transport: str, project_root: Path):
+@click.option(
+    "--preload",
+    is_flag=True,
+    help=_("Load the embedding model in the background at startup (faster first search)"),
+)
+def serve(transport: str, project_root: Path, preload: bool):
     """Start MCP Server
 
     stdio mode (default): Communicates via stdin/stdout, suitable for IDE direct invocation.
@@ -64,7 +69,7 @@ def serve(transport: str, project_root: Path):
     if project_root:
         click.echo(f"Project root: {project_root}", err=True)
 
-    run_server(project_root=project_root, transport=transport)
+    run_server(project_root=project_root, transport=transport, preload_embedder=preload)
 
 
 @mcp_group.command("config")
@@ -4,7 +4,7 @@ LLMContext Project - Project management
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import yaml
 
@@ -16,6 +16,41 @@ from .generator import LLMContextGenerator
 from .templates import TemplateManager
 
 
+# .vibecollab/ runtime data kept out of Git (catalog, journal and lock files included)
+VIBECOLLAB_GITIGNORE_PATTERNS = [
+    "events.jsonl",
+    "vectors/",
+    "*.local.yaml",
+    "*.local.json",
+    "*.local.jsonl",
+    "*.lock",
+]
+
+
+def ensure_vibecollab_gitignore(vibecollab_dir: Path) -> List[str]:
+    """Create .vibecollab/.gitignore or append the patterns it lacks
+
+    Returns:
+        Patterns added (all of them when the file was created)
+    """
+    gitignore = vibecollab_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text(
+            "# VibeCollab runtime data (auto-generated by vibecollab init)\n"
+            + "".join(f"{p}\n" for p in VIBECOLLAB_GITIGNORE_PATTERNS),
+            encoding="utf-8",
+        )
+        return list(VIBECOLLAB_GITIGNORE_PATTERNS)
+    text = gitignore.read_text(encoding="utf-8")
+    present = {line.strip() for line in text.splitlines()}
+    missing = [p for p in VIBECOLLAB_GITIGNORE_PATTERNS if p not in present]
+    if missing:
+        if text and not text.endswith("\n"):
+            text += "\n"
+        gitignore.write_text(text + "".join(f"{p}\n" for p in missing), encoding="utf-8")
+    return missing
+
+
 class Project:
     """Project management class"""
 
@@ -117,15 +152,7 @@ class Project:
         (vibecollab_dir / "insights").mkdir(exist_ok=True)
 
         # .vibecollab/.gitignore -- exclude runtime data but keep directory structure
-        vc_gitignore = vibecollab_dir / ".gitignore"
-        if not vc_gitignore.exists():
-            vc_gitignore.write_text(
-                "# VibeCollab runtime data (auto-generated by vibecollab init)\n"
-                "events.jsonl\n"
-                "vectors/\n"
-                "*.local.yaml\n",
-                encoding="utf-8",
-            )
+        ensure_vibecollab_gitignore(vibecollab_dir)
 
         # Check and initialize Git repo
         self._ensure_git_repo(auto_init_git)
@@ -504,6 +504,17 @@ class RoleManager:
         self._write_metadata(meta, developer)
         return True
 
+    def add_contributed_many(self, insight_ids: List[str], developer: Optional[str] = None) -> int:
+        """Record several contributed insights with one metadata write, returns number added"""
+        meta = self._read_metadata(developer)
+        contributed = meta.get("contributed", [])
+        known = set(contributed)
+        added = [i for i in dict.fromkeys(insight_ids) if i not in known]
+        if added:
+            meta["contributed"] = contributed + added
+            self._write_metadata(meta, developer)
+        return len(added)
+
     def remove_contributed(self, insight_id: str, developer: Optional[str] = None) -> bool:
         """Remove a contributed record"""
         meta = self._read_metadata(developer)
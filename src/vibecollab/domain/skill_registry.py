@@ -2,6 +2,8 @@
 Skill Registry Module
 
 Dynamic skill registration and management from Insights.
+Insight files are read through the shared insight catalog (compiled, re-parsing
+only changed files).
 """
 
 from dataclasses import dataclass
@@ -63,18 +65,15 @@ class SkillRegistry:
         if self._cache_valid and role_code in self._skills_cache:
             return self._skills_cache[role_code]
 
+        from ..insight.catalog import get_insight_catalog
+
         skills = []
 
         # Scan all insight files
         if self.insights_dir.exists():
-            for insight_file in self.insights_dir.glob("INS-*.yaml"):
+            for stem, insight_data in get_insight_catalog(self.insights_dir).records():
                 try:
-                    import yaml
-
-                    with open(insight_file, "r", encoding="utf-8") as f:
-                        insight_data = yaml.safe_load(f)
-
-                    insight_id = insight_data.get("id", insight_file.stem)
+                    insight_id = insight_data.get("id", stem)
 
                     # Check for role_skills section
                     role_skills = insight_data.get("role_skills", {})
@@ -2,14 +2,14 @@
 Insight Trigger Registry
 
 Discover triggers from insight tags for easy invocation.
+Insight files are read through the shared insight catalog (compiled, re-parsing
+only changed files), so recreating the registry does not rescan all YAML.
 """
 
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import yaml
-
 
 @dataclass
 class Trigger:
@@ -45,20 +45,16 @@ class TriggerRegistry:
         if self._cache_valid:
             return
 
+        from ..insight.catalog import get_insight_catalog
+
         self._triggers.clear()
 
         if not self.insights_dir.exists():
             return
 
-        for insight_file in self.insights_dir.glob("INS-*.yaml"):
+        for stem, data in get_insight_catalog(self.insights_dir).records():
             try:
-                with open(insight_file, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-
-                if not data:
-                    continue
-
-                insight_id = data.get("id", insight_file.stem)
+                insight_id = data.get("id", stem)
                 insight_title = data.get("title", "Untitled")
                 tags = data.get("tags", [])
 
@@ -1,6 +1,9 @@
 """Insight knowledge system subpackage."""
 
+from .bulk_import import BulkImporter, InvalidBundleError, stream_bundle
+from .catalog import InsightCatalog, get_insight_catalog
 from .derivation_detector import DerivationDetector, DerivationSuggestion
+from .journal import RegistryJournal, get_registry_journal
 from .manager import (
     Artifact,
     ConsistencyReport,
@@ -12,11 +15,18 @@ from .manager import (
 
 __all__ = [
     "Artifact",
+    "BulkImporter",
     "ConsistencyReport",
     "DerivationDetector",
     "DerivationSuggestion",
     "Insight",
+    "InsightCatalog",
     "InsightManager",
+    "InvalidBundleError",
     "Origin",
     "RegistryEntry",
+    "RegistryJournal",
+    "get_insight_catalog",
+    "get_registry_journal",
+    "stream_bundle",
 ]
@@ -0,0 +1,400 @@
+"""
+BulkImporter - Single-pass ingestion of large Insight export bundles
+
+InsightManager.import_insights handles one Insight at a time: a directory glob
+per renamed ID, a full registry.yaml rewrite and an event per Insight, so
+importing N Insights costs O(N^2) filesystem work. The bulk path instead:
+
+    index     scans the catalog once: present IDs, the highest ID number and
+              a content hash index (title + tags + body, as find_duplicates)
+    read      pulls Insights one at a time from the bundle (stream_bundle
+              parses a YAML file incrementally, so memory does not grow with
+              the bundle)
+    plan      resolves ID conflicts (skip/rename/overwrite), drops content
+              that already exists under another ID, validates, and assigns
+              renamed IDs from a counter reserved by the index scan
+    write     dumps the YAML files on a thread pool, one batch in flight
+              while the next is planned
+    registry  adds all new entries and merges bundle usage counts in one
+              atomic registry write
+
+and logs one batch event. Results use import_insights' keys plus
+`duplicates` ({bundle ID: existing ID}) and `timings` (seconds per phase).
+
+Header keys may come in any order: Insights read before `format` and
+`source_project` are held back until both are seen (export_insights writes
+them first, so normally nothing is buffered).
+
+ID conflicts (the ID is taken, also by an earlier Insight of the same
+bundle) are governed by the strategy as in import_insights; deduplication
+only drops Insights whose content is already stored under a different ID.
+New files are created exclusively, so an Insight created concurrently under
+a planned ID is reported as an error instead of being overwritten.
+
+Usage:
+    results = mgr.bulk_import(stream_bundle(Path("bundle.yaml")), imported_by="dev")
+    results["timings"]["write"]
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+from ..domain.event_log import EventType
+from .manager import Insight, RegistryEntry
+
+if TYPE_CHECKING:
+    from .manager import InsightManager
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "vibecollab-insight-export"
+INVALID_BUNDLE = "Invalid bundle format"
+
+# Record key of one item of the bundle's `insights` list
+ITEM_KEY = "insights[]"
+
+# Header keys the Insights are planned with; items read before them are held back
+HEADER_KEYS = ("format", "source_project")
+
+# Insight files written per thread pool batch
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_WRITE_WORKERS = 8
+
+PHASES = ("index", "read", "plan", "write", "registry")
+
+_ID_NUMBER = re.compile(r"^INS-(\d+)$")
+
+BundleRecord = Tuple[str, Any]
+
+
+class InvalidBundleError(ValueError):
+    """The records are not an Insight export bundle; nothing was imported"""
+
+
+def bundle_records(bundle: Dict[str, Any]) -> Iterator[BundleRecord]:
+    """Records of an in-memory bundle: header keys, then one per Insight, then the rest"""
+    trailer = ("insights", "registry")
+    for key, value in bundle.items():
+        if key not in trailer:
+            yield key, value
+    insights = bundle.get("insights")
+    if isinstance(insights, list):
+        for item in insights:
+            yield ITEM_KEY, item
+    elif "insights" in bundle:
+        yield "insights", insights
+    if "registry" in bundle:
+        yield "registry", bundle["registry"]
+
+
+def stream_bundle(path: Path) -> Iterator[BundleRecord]:
+    """Records of a bundle YAML file, parsed incrementally
+
+    Top-level keys are yielded as (key, value) in file order, except the
+    `insights` list, whose items are yielded one by one as (ITEM_KEY, item)
+    without building the list.
+
+    Raises:
+        yaml.YAMLError: the file is not valid YAML (at the point reached)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        loader = yaml.SafeLoader(f)
+        try:
+            loader.anchors = {}
+            loader.get_event()  # StreamStart
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()  # DocumentStart
+            if not loader.check_event(yaml.MappingStartEvent):
+                yield "", loader.construct_document(loader.compose_node(None, None))
+                return
+            loader.get_event()
+            while not loader.check_event(yaml.MappingEndEvent):
+                key = loader.construct_document(loader.compose_node(None, None))
+                if key == "insights" and loader.check_event(yaml.SequenceStartEvent):
+                    loader.get_event()
+                    while not loader.check_event(yaml.SequenceEndEvent):
+                        node = loader.compose_node(None, None)
+                        yield ITEM_KEY, loader.construct_document(node)
+                    loader.get_event()
+                else:
+                    yield key, loader.construct_document(loader.compose_node(None, None))
+        finally:
+            loader.dispose()
+
+
+def _write_insight_file(path: Path, data: Dict[str, Any], exclusive: bool) -> None:
+    """Write one Insight file (same layout as InsightManager._save_insight)"""
+    text = yaml.dump(data, allow_unicode=True, sort_keys=False, default_flow_style=False)
+    with open(path, "x" if exclusive else "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+class BulkImporter:
+    """One bulk import of Insights into a manager's project
+
+    Args:
+        manager: InsightManager of the target project
+        imported_by: Operator recorded in the batch event
+        strategy: ID conflict strategy (skip/rename/overwrite, as import_insights)
+        dedupe: Drop Insights whose content already exists under another ID
+        workers: Threads writing Insight files
+        batch_size: Insight files per write batch
+    """
+
+    def __init__(
+        self,
+        manager: "InsightManager",
+        imported_by: str,
+        strategy: str = "skip",
+        dedupe: bool = True,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        if strategy not in ("skip", "rename", "overwrite"):
+            raise ValueError(f"Unknown import strategy: {strategy!r}")
+        self._mgr = manager
+        self._imported_by = imported_by
+        self._strategy = strategy
+        self._dedupe = dedupe
+        self._workers = max(1, workers or DEFAULT_WRITE_WORKERS)
+        self._batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+        self._present: set = set()  # Taken IDs (existing files and planned writes)
+        self._content: Dict[str, str] = {}  # content key -> ID
+        self._written: set = set()
+        self._next_number = 1
+        self.timings: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.results: Dict[str, Any] = {
+            "imported": [],
+            "skipped": [],
+            "renamed": {},
+            "duplicates": {},
+            "errors": [],
+        }
+
+    # ------------------------------------------------------------------
+    # Phases
+    # ------------------------------------------------------------------
+
+    def _index(self) -> None:
+        start = time.perf_counter()
+        catalog = self._mgr._catalog
+        highest = 0
+        for stem, _ in catalog.records():
+            self._present.add(stem)
+            match = _ID_NUMBER.match(stem)
+            if match:
+                highest = max(highest, int(match.group(1)))
+        self._next_number = highest + 1
+        if self._dedupe:
+            for ins in catalog.all():
+                self._content.setdefault(
+                    self._mgr._content_key(ins.title, ins.tags, ins.body), ins.id
+                )
+        self.timings["index"] += time.perf_counter() - start
+
+    def _reserve_id(self) -> str:
+        while True:
+            insight_id = f"INS-{self._next_number:03d}"
+            self._next_number += 1
+            if insight_id not in self._present:
+                return insight_id
+
+    def _plan(self, item: Any, source_project: str) -> Optional[Tuple[Insight, bool]]:
+        """Insight to write and whether its file must be new, or None when not imported"""
+        if not isinstance(item, dict):
+            self.results["errors"].append(f"<item>: not a mapping: {item!r}"[:200])
+            return None
+        old_id = item.get("id", "")
+        if not old_id or not isinstance(old_id, str):
+            self.results["errors"].append(f"<item>: missing id: {item.get('title', '')!r}"[:200])
+            return None
+        content_key = None
+        if self._dedupe:
+            try:
+                content_key = self._mgr._content_key(
+                    item.get("title", ""), item.get("tags", []), item.get("body", {})
+                )
+            except (TypeError, AttributeError, ValueError) as e:
+                self.results["errors"].append(f"{old_id}: {e}")
+                return None
+            existing = self._content.get(content_key)
+            if existing is not None and existing != old_id:
+                self.results["duplicates"][old_id] = existing
+                return None
+
+        new_id = old_id
+        conflict = old_id in self._present
+        if conflict and self._strategy == "skip":
+            self.results["skipped"].append(old_id)
+            return None
+        if conflict and self._strategy == "rename":
+            new_id = self._reserve_id()
+
+        # Mark source project (if original doesn't have one), without mutating the input
+        data = dict(item)
+        data["id"] = new_id
+        origin = dict(data.get("origin") or {})
+        source = dict(origin.get("source") or {})
+        if not source.get("project"):
+            source["project"] = source_project
+        origin["source"] = source
+        data["origin"] = origin
+        try:
+            insight = Insight.from_dict(data)
+        except Exception as e:
+            self.results["errors"].append(f"{old_id}: {e}")
+            return None
+        if not insight.fingerprint:
+            insight.fingerprint = insight.compute_fingerprint()
+
+        if new_id != old_id:
+            self.results["renamed"][old_id] = new_id
+        self._present.add(new_id)
+        if content_key is not None:
+            self._content.setdefault(content_key, new_id)
+        return insight, not conflict
+
+    def _flush(self, pool: ThreadPoolExecutor, batch: Dict[str, Tuple[Insight, bool]],
+               inflight: List[Tuple[str, Path, Future]]) -> List[Tuple[str, Path, Future]]:
+        """Wait for the batch in flight, submit `batch`; returns the new in-flight batch"""
+        start = time.perf_counter()
+        self._collect(inflight)
+        submitted = []
+        for insight_id, (insight, exclusive) in batch.items():
+            path = self._mgr._insight_path(insight_id)
+            future = pool.submit(_write_insight_file, path, insight.to_dict(), exclusive)
+            submitted.append((insight_id, path, future))
+        batch.clear()
+        self.timings["write"] += time.perf_counter() - start
+        return submitted
+
+    def _collect(self, inflight: List[Tuple[str, Path, Future]]) -> None:
+        catalog = self._mgr._catalog
+        imported = self.results["imported"]
+        for insight_id, path, future in inflight:
+            try:
+                future.result()
+            except FileExistsError:
+                self.results["errors"].append(f"{insight_id}: created concurrently, not imported")
+                continue
+            except Exception as e:
+                self.results["errors"].append(f"{insight_id}: {e}")
+                continue
+            catalog.invalidate(path)
+            if insight_id not in self._written:
+                self._written.add(insight_id)
+                imported.append(insight_id)
+
+    def _write_registry(self, bundle_registry: Any) -> None:
+        start = time.perf_counter()
+        imported = self.results["imported"]
+        merge = bundle_registry if isinstance(bundle_registry, dict) else None
+        if imported or merge is not None:
+            journal = self._mgr._journal
+            with journal.locked():
+                entries, settings = self._mgr.get_registry()
+                for insight_id in imported:
+                    entries.setdefault(insight_id, RegistryEntry())
+                for ins_id, reg_data in (merge or {}).items():
+                    # If ID was renamed, map to new ID; keep local weight, merge usage count
+                    mapped_id = self.results["renamed"].get(ins_id, ins_id)
+                    if mapped_id in entries and isinstance(reg_data, dict):
+                        entries[mapped_id].used_count += reg_data.get("used_count", 0)
+                self._mgr._save_registry(entries, settings)
+        self.timings["registry"] += time.perf_counter() - start
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+
+    def run(self, records: Iterable[BundleRecord]) -> Dict[str, Any]:
+        """Import the bundle records; returns the results (see module docstring)
+
+        Raises:
+            InvalidBundleError: not an Insight export bundle (nothing is imported)
+            yaml.YAMLError: a streamed bundle is unreadable before its first Insight
+        """
+        wall_start = time.perf_counter()
+        self._mgr.insights_dir.mkdir(parents=True, exist_ok=True)
+        header: Dict[str, Any] = {}
+        indexed = False
+        pending: List[Any] = []  # Items read before the header was complete
+        batch: Dict[str, Tuple[Insight, bool]] = {}
+        inflight: List[Tuple[str, Path, Future]] = []
+        iterator = iter(records)
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            while True:
+                start = time.perf_counter()
+                try:
+                    record = next(iterator, None)
+                except yaml.YAMLError as e:
+                    if not indexed and not pending:
+                        raise
+                    # Keep what was read before the damaged part of the stream
+                    self.results["errors"].append(f"bundle: {e}")
+                    record = None
+                finally:
+                    self.timings["read"] += time.perf_counter() - start
+                if record is not None and record[0] != ITEM_KEY:
+                    header[record[0]] = record[1]
+                    continue
+                if not indexed:
+                    if record is not None and not all(k in header for k in HEADER_KEYS):
+                        pending.append(record[1])
+                        continue
+                    if header.get("format") != BUNDLE_FORMAT:
+                        raise InvalidBundleError(INVALID_BUNDLE)
+                    self._index()
+                    indexed = True
+                items = pending + ([record[1]] if record is not None else [])
+                pending = []
+                for item in items:
+                    start = time.perf_counter()
+                    planned = self._plan(item, header.get("source_project", "unknown"))
+                    if planned is not None:
+                        insight, exclusive = planned
+                        previous = batch.get(insight.id)
+                        # A later overwrite of an ID planned in this batch still creates it
+                        batch[insight.id] = (insight, exclusive or bool(previous and previous[1]))
+                    self.timings["plan"] += time.perf_counter() - start
+                    if len(batch) >= self._batch_size:
+                        inflight = self._flush(pool, batch, inflight)
+                if record is None:
+                    break
+            inflight = self._flush(pool, batch, inflight)
+            start = time.perf_counter()
+            self._collect(inflight)
+            self.timings["write"] += time.perf_counter() - start
+
+        self._write_registry(header.get("registry"))
+        self._log_batch_event(header.get("source_project", "unknown"))
+        self.timings["total"] = time.perf_counter() - wall_start
+        self.results["timings"] = {k: round(v, 4) for k, v in self.timings.items()}
+        return self.results
+
+    def _log_batch_event(self, source_project: str) -> None:
+        imported = self.results["imported"]
+        if not imported:
+            return
+        self._mgr._log_event(
+            EventType.CUSTOM,
+            self._imported_by,
+            f"Imported {len(imported)} insights from {source_project}",
+            {
+                "action": "insights_imported",
+                "source_project": source_project,
+                "insight_ids": imported,
+                "renamed": self.results["renamed"],
+                "skipped": len(self.results["skipped"]),
+                "duplicates": len(self.results["duplicates"]),
+            },
+        )
@@ -0,0 +1,563 @@
+"""
+InsightCatalog - Parsed, indexed view of the insights directory
+
+InsightManager queries (list_all, search_by_tags, build_graph, ...) used to
+YAML-parse every INS-*.yaml on each call, often several times per command.
+The catalog parses each file once and remembers its (mtime_ns, size) and
+SHA-256; every lookup re-stats the directory, re-parses only files whose
+content changed (a touched but unchanged file costs one read and hash) and
+drops removed ones. registry.yaml is cached the same way.
+
+Secondary indexes are kept in step with the parsed files:
+
+    tag         lower-cased tag -> files
+    category    category -> files
+    role        origin.created_by -> files
+    derived_by  parent ID (origin.derived_from) -> files deriving from it
+
+so tag, category, role and derivation lookups touch only matching Insights.
+
+A file modified within _RACY_WINDOW_NS of being checked is re-checked on the
+next lookup even if its stat is unchanged, so a same-size rewrite within the
+filesystem's timestamp granularity is not missed (the "racy git" problem).
+
+Compiled catalog: short-lived processes (CLI calls, git hooks, MCP resource
+reads) would still parse every file once per process, so the parsed records
+are persisted with their stat and hash to insights/catalog.local.json and
+seed the catalog on first use; records are then verified like cached ones.
+The file also carries the registry and a tag -> IDs index for other readers.
+It is rewritten atomically after lookups that changed the catalog; a missing,
+corrupt or unwritable compiled catalog only means parsing the YAML.
+
+Catalogs are shared per insights directory within the process
+(get_insight_catalog), so short-lived InsightManagers (one per MCP tool call)
+reuse the parsed files. Cached Insight objects and records are shared: treat
+them as read-only (InsightManager hands out copies).
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+if TYPE_CHECKING:
+    from .manager import Insight
+
+logger = logging.getLogger(__name__)
+
+INSIGHT_FILE_PATTERN = "INS-*.yaml"
+
+COMPILED_CATALOG_FILE = "catalog.local.json"
+COMPILED_FORMAT = "vibecollab-insight-catalog"
+COMPILED_VERSION = 1
+
+# Files modified this recently are re-checked on every lookup (covers 2 s FAT mtimes)
+_RACY_WINDOW_NS = 2_000_000_000
+
+_FileStat = Tuple[int, int]  # (mtime_ns, size)
+
+
+@dataclass
+class _CatalogFile:
+    """One parsed YAML file; `insight` is None when it is not a valid Insight"""
+
+    stat: _FileStat
+    checked_at: int  # time.time_ns() when the content was last verified
+    digest: str
+    data: Any
+    insight: Optional["Insight"] = None
+    portable: bool = True  # data survives a JSON round trip (can be compiled)
+
+    def fresh(self, stat: _FileStat) -> bool:
+        return stat == self.stat and stat[0] < self.checked_at - _RACY_WINDOW_NS
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "mtime_ns": self.stat[0],
+            "size": self.stat[1],
+            "checked_at": self.checked_at,
+            "sha256": self.digest,
+            "data": self.data,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "_CatalogFile":
+        return cls(
+            (int(record["mtime_ns"]), int(record["size"])),
+            int(record["checked_at"]),
+            str(record["sha256"]),
+            record["data"],
+        )
+
+
+def _parse_yaml(raw: bytes) -> Any:
+    try:
+        return yaml.safe_load(raw.decode("utf-8"))
+    except Exception:
+        return None
+
+
+def _portable(data: Any) -> bool:
+    try:
+        return json.loads(json.dumps(data)) == data
+    except (TypeError, ValueError):
+        return False
+
+
+def _to_insight(data: Any) -> Optional["Insight"]:
+    from .manager import Insight
+
+    if not isinstance(data, dict) or not data:
+        return None
+    try:
+        return Insight.from_dict(data)
+    except Exception:
+        return None
+
+
+class InsightCatalog:
+    """Parsed Insights of one directory plus tag/category/role/derivation indexes
+
+    Thread-safe. Every query first brings the catalog up to date with the
+    directory (one stat per file, reads only for changed files).
+    `compiled_file` names the persisted catalog (None = memory only).
+
+    Usage:
+        catalog = get_insight_catalog(insights_dir)
+        catalog.with_tags(["cache"])
+        catalog.stats()["parses"]
+    """
+
+    def __init__(
+        self,
+        insights_dir: Path,
+        registry_file: str = "registry.yaml",
+        compiled_file: Optional[str] = COMPILED_CATALOG_FILE,
+    ):
+        self.insights_dir = Path(insights_dir)
+        self.registry_path = self.insights_dir / registry_file
+        self.compiled_path = self.insights_dir / compiled_file if compiled_file else None
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self._files: Dict[str, _CatalogFile] = {}  # file stem -> parsed file
+        self._sorted: Optional[List[str]] = None
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._by_role: Dict[str, Set[str]] = {}
+        self._derived_by: Dict[str, Set[str]] = {}
+        self._registry: Optional[_CatalogFile] = None
+        self.refreshes = 0
+        self.hits = 0
+        self.verified = 0
+        self.parses = 0
+        self.errors = 0
+        self.removals = 0
+        self.registry_hits = 0
+        self.registry_parses = 0
+        self.compiled_records = 0
+        self.compiled_saves = 0
+
+    # ------------------------------------------------------------------
+    # Synchronization with the directory
+    # ------------------------------------------------------------------
+
+    def _sync(self) -> None:
+        """Bring every file up to date and persist the result"""
+        self._ensure_loaded()
+        self._refresh()
+        self._persist()
+
+    def _refresh(self) -> None:
+        """Re-stat the directory, re-parse changed files, drop removed ones"""
+        self.refreshes += 1
+        seen: Set[str] = set()
+        try:
+            entries = list(os.scandir(self.insights_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if not fnmatch.fnmatch(entry.name, INSIGHT_FILE_PATTERN):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            stem = entry.name[: -len(".yaml")]
+            seen.add(stem)
+            self._sync_file(stem, Path(entry.path), (st.st_mtime_ns, st.st_size))
+        for stem in [s for s in self._files if s not in seen]:
+            self._drop(stem)
+
+    def _verify(
+        self, path: Path, stat: _FileStat, cached: Optional[_CatalogFile]
+    ) -> Tuple[Optional[_CatalogFile], bool]:
+        """Re-check a file whose stat is not trusted: (entry, content changed)
+
+        The entry is None when the file cannot be read.
+        """
+        checked_at = time.time_ns()
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None, False
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached is not None and cached.digest == digest:
+            self.verified += 1
+            moved = cached.stat != stat
+            cached.stat = stat
+            cached.checked_at = checked_at
+            # Persist once the record becomes trustworthy on its own
+            self._dirty = self._dirty or moved or cached.fresh(stat)
+            return cached, False
+        data = _parse_yaml(raw)
+        self._dirty = True
+        return _CatalogFile(stat, checked_at, digest, data, portable=_portable(data)), True
+
+    def _sync_file(self, stem: str, path: Path, stat: _FileStat) -> Optional["Insight"]:
+        cached = self._files.get(stem)
+        if cached is not None and cached.fresh(stat):
+            self.hits += 1
+            return cached.insight
+        entry, changed = self._verify(path, stat, cached)
+        if entry is None:
+            self._drop(stem)
+            return None
+        if not changed:
+            return entry.insight
+        self.parses += 1
+        entry.insight = _to_insight(entry.data)
+        if entry.insight is None:
+            self.errors += 1
+        if cached is not None:
+            self._unindex(stem, cached.insight)
+        else:
+            self._sorted = None
+        self._files[stem] = entry
+        self._index(stem, entry.insight)
+        return entry.insight
+
+    def _drop(self, stem: str) -> None:
+        cached = self._files.pop(stem, None)
+        if cached is not None:
+            self._unindex(stem, cached.insight)
+            self._sorted = None
+            self._dirty = True
+            self.removals += 1
+
+    def _postings(self, insight: "Insight") -> Iterable[Tuple[Dict[str, Set[str]], str]]:
+        for tag in insight.tags:
+            yield self._by_tag, tag.lower()
+        yield self._by_category, insight.category
+        if insight.origin.created_by:
+            yield self._by_role, insight.origin.created_by
+        for parent_id in insight.origin.derived_from:
+            yield self._derived_by, parent_id
+
+    def _index(self, stem: str, insight: Optional["Insight"]) -> None:
+        if insight is None:
+            return
+        for index, key in self._postings(insight):
+            index.setdefault(key, set()).add(stem)
+
+    def _unindex(self, stem: str, insight: Optional["Insight"]) -> None:
+        if insight is None:
+            return
+        for index, key in self._postings(insight):
+            stems = index.get(key)
+            if stems is not None:
+                stems.discard(stem)
+                if not stems:
+                    del index[key]
+
+    def invalidate(self, path: Path) -> None:
+        """Forget a file just written or deleted (re-read on next lookup)"""
+        name = Path(path).name
+        with self._lock:
+            if name == self.registry_path.name:
+                self._registry = None
+                self._dirty = True
+            elif fnmatch.fnmatch(name, INSIGHT_FILE_PATTERN):
+                self._drop(name[: -len(".yaml")])
+
+    def _reset(self) -> None:
+        self._files.clear()
+        self._sorted = None
+        for index in (self._by_tag, self._by_category, self._by_role, self._derived_by):
+            index.clear()
+        self._registry = None
+
+    def clear(self) -> None:
+        """Forget every parsed file (the compiled catalog is re-read on next lookup)"""
+        with self._lock:
+            self._reset()
+            self._loaded = False
+            self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Compiled catalog
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        """Seed the catalog from the compiled file once per process"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.compiled_path is None:
+            return
+        try:
+            with open(self.compiled_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable compiled insight catalog: %s", e)
+            return
+        if (
+            not isinstance(payload, dict)
+            or payload.get("format") != COMPILED_FORMAT
+            or payload.get("version") != COMPILED_VERSION
+        ):
+            return
+        try:
+            for stem, record in payload.get("files", {}).items():
+                entry = _CatalogFile.from_record(record)
+                entry.insight = _to_insight(entry.data)
+                self._files[stem] = entry
+                self._index(stem, entry.insight)
+            if payload.get("registry"):
+                self._registry = _CatalogFile.from_record(payload["registry"])
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.debug("Ignoring malformed compiled insight catalog: %s", e)
+            self._reset()
+            return
+        self.compiled_records = len(self._files)
+
+    def _persist(self) -> None:
+        """Rewrite the compiled catalog if the catalog changed (best effort)"""
+        if not self._dirty or self.compiled_path is None:
+            return
+        self._dirty = False
+        files = {stem: f.to_record() for stem, f in self._files.items() if f.portable}
+        registry = self._registry
+        if not files and registry is None and not self.compiled_path.exists():
+            return
+        payload = {
+            "format": COMPILED_FORMAT,
+            "version": COMPILED_VERSION,
+            "files": files,
+            "registry": registry.to_record() if registry and registry.portable else None,
+            "tags": {
+                tag: sorted(self._files[stem].insight.id for stem in stems)
+                for tag, stems in sorted(self._by_tag.items())
+            },
+        }
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.insights_dir, prefix=".catalog-", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.compiled_path)
+            self.compiled_saves += 1
+        except OSError as e:
+            logger.debug("Compiled insight catalog not written: %s", e)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Queries (results in file order; Insight objects are shared)
+    # ------------------------------------------------------------------
+
+    def _ordered(self) -> List[str]:
+        if self._sorted is None:
+            self._sorted = sorted(self._files)
+        return self._sorted
+
+    def _insights(self, stems: Iterable[str]) -> List["Insight"]:
+        result = []
+        for stem in sorted(stems):
+            insight = self._files[stem].insight
+            if insight is not None:
+                result.append(insight)
+        return result
+
+    def all(self) -> List["Insight"]:
+        """Every valid Insight"""
+        with self._lock:
+            self._sync()
+            return [
+                self._files[stem].insight
+                for stem in self._ordered()
+                if self._files[stem].insight is not None
+            ]
+
+    def records(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """(file stem, parsed mapping) of every INS-*.yaml, valid Insight or not"""
+        with self._lock:
+            self._sync()
+            return [
+                (stem, self._files[stem].data)
+                for stem in self._ordered()
+                if isinstance(self._files[stem].data, dict) and self._files[stem].data
+            ]
+
+    def get(self, insight_id: str) -> Optional["Insight"]:
+        """Insight stored as `<insight_id>.yaml` (checks that file only)"""
+        path = self.insights_dir / f"{insight_id}.yaml"
+        if not fnmatch.fnmatch(path.name, INSIGHT_FILE_PATTERN):
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            try:
+                st = path.stat()
+            except OSError:
+                self._drop(insight_id)
+                insight = None
+            else:
+                insight = self._sync_file(insight_id, path, (st.st_mtime_ns, st.st_size))
+            self._persist()
+            return insight
+
+    def with_tags(self, tags: Iterable[str]) -> List["Insight"]:
+        """Insights carrying any of `tags` (case-insensitive)"""
+        with self._lock:
+            self._sync()
+            stems: Set[str] = set()
+            for tag in tags:
+                stems |= self._by_tag.get(tag.lower(), set())
+            return self._insights(stems)
+
+    def in_category(self, category: str) -> List["Insight"]:
+        with self._lock:
+            self._sync()
+            return self._insights(self._by_category.get(category, ()))
+
+    def created_by(self, role: str) -> List["Insight"]:
+        with self._lock:
+            self._sync()
+            return self._insights(self._by_role.get(role, ()))
+
+    def derived_by(self, insight_id: str) -> List["Insight"]:
+        """Insights listing `insight_id` in origin.derived_from"""
+        with self._lock:
+            self._sync()
+            return self._insights(self._derived_by.get(insight_id, ()))
+
+    def tag_counts(self, exclude_ids: Iterable[str] = ()) -> Dict[str, int]:
+        """Insights per lower-cased tag, not counting the Insights in `exclude_ids`"""
+        with self._lock:
+            self._sync()
+            counts = {tag: len(stems) for tag, stems in self._by_tag.items()}
+            for insight_id in set(exclude_ids):
+                cached = self._files.get(insight_id)
+                if cached is None or cached.insight is None or cached.insight.id != insight_id:
+                    continue
+                for tag in {t.lower() for t in cached.insight.tags}:
+                    counts[tag] -= 1
+            return {tag: n for tag, n in counts.items() if n > 0}
+
+    # ------------------------------------------------------------------
+    # Registry
+    # ------------------------------------------------------------------
+
+    def registry_data(self) -> Dict[str, Any]:
+        """Parsed registry.yaml ({} when missing or unreadable); shared, read-only"""
+        with self._lock:
+            self._ensure_loaded()
+            try:
+                st = self.registry_path.stat()
+            except OSError:
+                if self._registry is not None:
+                    self._registry = None
+                    self._dirty = True
+                self._persist()
+                return {}
+            stat = (st.st_mtime_ns, st.st_size)
+            cached = self._registry
+            if cached is not None and cached.fresh(stat):
+                self.registry_hits += 1
+            else:
+                entry, changed = self._verify(self.registry_path, stat, cached)
+                if entry is None:
+                    return {}
+                if changed:
+                    self.registry_parses += 1
+                self._registry = entry
+                self._persist()
+            data = self._registry.data
+            return data if isinstance(data, dict) else {}
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Catalog size, index sizes and hit/parse counters"""
+        with self._lock:
+            lookups = self.hits + self.verified + self.parses
+            return {
+                "files": len(self._files),
+                "insights": sum(1 for f in self._files.values() if f.insight is not None),
+                "tags": len(self._by_tag),
+                "categories": len(self._by_category),
+                "roles": len(self._by_role),
+                "derivation_edges": sum(len(s) for s in self._derived_by.values()),
+                "refreshes": self.refreshes,
+                "hits": self.hits,
+                "verified": self.verified,
+                "parses": self.parses,
+                "errors": self.errors,
+                "removals": self.removals,
+                "hit_rate": round((self.hits + self.verified) / lookups, 4) if lookups else 0.0,
+                "registry_hits": self.registry_hits,
+                "registry_parses": self.registry_parses,
+                "compiled_records": self.compiled_records,
+                "compiled_saves": self.compiled_saves,
+            }
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+_catalogs: Dict[Tuple[str, str], InsightCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def _is_project_insights_dir(insights_dir: Path) -> bool:
+    """Whether a directory is a project's .vibecollab/insights (git-ignores *.local.json)"""
+    return insights_dir.name == "insights" and insights_dir.parent.name == ".vibecollab"
+
+
+def get_insight_catalog(insights_dir: Path, registry_file: str = "registry.yaml") -> InsightCatalog:
+    """The process-wide catalog of an insights directory
+
+    Only a project's .vibecollab/insights gets a compiled catalog file; other
+    directories (e.g. read by the trigger/skill registries) stay untouched.
+    """
+    resolved = Path(insights_dir).resolve()
+    key = (str(resolved), registry_file)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            compiled_file = COMPILED_CATALOG_FILE if _is_project_insights_dir(resolved) else None
+            catalog = InsightCatalog(resolved, registry_file, compiled_file)
+            _catalogs[key] = catalog
+        return catalog
@@ -0,0 +1,87 @@
+"""
+DecaySchedule - Lazy, read-time weight decay for the insight registry
+
+apply_decay used to multiply every active entry's weight by the decay rate
+and rewrite the registry, so each decay period cost O(registry). Now a decay
+period only advances the schedule's epoch counter (recording the rate and
+deactivation threshold in force), and each registry entry remembers the epoch
+its weight was last materialized at (`last_decay_epoch`). An entry's
+effective weight is computed when it is read, by replaying the periods that
+elapsed since then:
+
+    for each elapsed period:
+        weight = round(weight * rate, 4)   # RegistryEntry.to_dict rounding
+        deactivate (and stop decaying) once the unrounded weight < threshold
+
+which is exactly what the eager rewrite after every apply_decay produced. A
+weight that no longer changes under rounding (e.g. 0.0) skips the rest of a
+period run, so reads stay cheap however many periods elapsed.
+
+Recording a use materializes that one entry first. Compaction of the usage
+journal (journal.py) materializes every entry and starts a new schedule at
+epoch 0, so registry.yaml at rest holds plain weights and no epochs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .manager import RegistryEntry
+
+
+@dataclass
+class DecaySchedule:
+    """Decay periods elapsed since the registry was last materialized
+
+    `segments` holds [start_epoch, rate, threshold] for each run of periods
+    with the same settings (usually one).
+    """
+
+    epoch: int = 0
+    segments: List[List[float]] = field(default_factory=list)
+
+    def advance(self, rate: float, threshold: float) -> None:
+        """One decay period (what a single eager apply_decay did)"""
+        if not self.segments or self.segments[-1][1:] != [rate, threshold]:
+            self.segments.append([self.epoch, rate, threshold])
+        self.epoch += 1
+
+    def decay(self, weight: float, active: bool, since: Optional[int]) -> Tuple[float, bool]:
+        """Weight and active flag at the current epoch of an entry materialized at `since`
+
+        `since` None means the entry is already current.
+        """
+        if since is None or since >= self.epoch:
+            return weight, active
+        for index, (start, rate, threshold) in enumerate(self.segments):
+            end = self.segments[index + 1][0] if index + 1 < len(self.segments) else self.epoch
+            for _ in range(max(int(start), since), int(end)):
+                if not active:
+                    return weight, active
+                decayed = weight * rate
+                rounded = round(decayed, 4)
+                if decayed < threshold:
+                    return rounded, False
+                if rounded == weight:
+                    break  # Fixed point: the rest of this run changes nothing
+                weight = rounded
+        return weight, active
+
+    def materialize(self, entry: "RegistryEntry") -> None:
+        """Bring an entry's weight/active to the current epoch (in place)"""
+        entry.weight, entry.active = self.decay(entry.weight, entry.active, entry.last_decay_epoch)
+        entry.last_decay_epoch = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"epoch": self.epoch, "segments": [list(s) for s in self.segments]}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "DecaySchedule":
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            epoch=int(data.get("epoch", 0)),
+            segments=[list(s) for s in data.get("segments", [])],
+        )
@@ -6,15 +6,32 @@ Supports two backends:
     - "local": sentence-transformers local model (requires pip install vibe-collab[embedding])
 
 Default backend auto-selects by availability: local > openai > fail
+
+Vectors are cached in a bounded in-memory LRU (compact float32 storage) and, when
+`EmbedderConfig.cache_dir` is set, in a persistent SQLite cache shared across processes (embedding_cache.py).
 """
 
 from __future__ import annotations
 
 import hashlib
 import logging
+import math
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .embedding_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    EMBEDDING_CACHE_FILENAME,
+    EmbeddingCache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +49,9 @@ class EmbeddingResult:
 class EmbedderBackend(ABC):
     """Embedding backend abstract base class"""
 
+    # EmbedderConfig.backend value that selects this backend
+    name = ""
+
     @abstractmethod
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Batch compute text embedding vectors"""
@@ -51,8 +71,26 @@ class EmbedderBackend(ABC):
         """Model name"""
 
 
+# HTTP statuses worth retrying (rate limit / transient server errors)
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token) used for request budgeting"""
+    return len(text) // 4 + 1
+
+
 class OpenAIEmbedder(EmbedderBackend):
-    """OpenAI text-embedding API backend"""
+    """OpenAI text-embedding API backend
+
+    Inputs are split into batches bounded by `max_batch_size` texts and
+    `max_batch_tokens` estimated tokens. Up to `max_concurrency` batches are in
+    flight at once over a shared keep-alive `httpx.Client`. 429/5xx responses
+    and transport errors are retried with exponential backoff (honouring
+    Retry-After, capped at `max_backoff` seconds). Results are returned in input order.
+    """
+
+    name = "openai"
 
     def __init__(
         self,
@@ -60,6 +98,13 @@ class OpenAIEmbedder(EmbedderBackend):
         model: str = "text-embedding-3-small",
         base_url: str = "https://api.openai.com/v1",
         dimensions: Optional[int] = None,
+        max_batch_size: int = 256,
+        max_batch_tokens: int = 100_000,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 60.0,
     ):
         try:
             import httpx  # noqa: F401
@@ -71,33 +116,127 @@ class OpenAIEmbedder(EmbedderBackend):
         self._model = model
         self._base_url = base_url.rstrip("/")
         self._dimensions = dimensions or 1536
-
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_batch_tokens = max(1, max_batch_tokens)
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_retries = max(0, max_retries)
+        self._backoff_base = backoff_base
+        self._max_backoff = max(0.0, max_backoff)
+        self._timeout = timeout
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        """Shared keep-alive client (created lazily, thread-safe)"""
+        with self._client_lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(
+                    base_url=self._base_url,
+                    headers={
+                        "Authorization": f"Bearer {self._api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    timeout=self._timeout,
+                    limits=httpx.Limits(
+                        max_connections=self._max_concurrency,
+                        max_keepalive_connections=self._max_concurrency,
+                    ),
+                )
+            return self._client
+
+    def _make_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split inputs by batch size and estimated token budget, keeping order"""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = _estimate_tokens(text)
+            if current and (
+                len(current) >= self._max_batch_size
+                or current_tokens + tokens > self._max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        """Seconds to wait before retry `attempt`, capped at `max_backoff`
+
+        A numeric Retry-After header wins over the exponential schedule;
+        negative, non-finite or HTTP-date values fall back to it.
+        """
+        delay = self._backoff_base * (2 ** attempt)
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    requested = float(retry_after)
+                except ValueError:
+                    requested = -1.0
+                if 0 <= requested < math.inf:
+                    delay = requested
+        return min(delay, self._max_backoff)
+
+    def _post_batch(self, texts: List[str]) -> List[List[float]]:
         import httpx
 
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
         payload: Dict = {"input": texts, "model": self._model}
         if self._dimensions:
             payload["dimensions"] = self._dimensions
 
-        resp = httpx.post(
-            f"{self._base_url}/embeddings",
-            headers=headers,
-            json=payload,
-            timeout=60.0,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        # Sort by index to ensure consistent order
-        embeddings = sorted(data["data"], key=lambda x: x["index"])
-        return [e["embedding"] for e in embeddings]
+        client = self._get_client()
+        attempt = 0
+        while True:
+            try:
+                resp = client.post("/embeddings", json=payload)
+            except httpx.TransportError as e:
+                if attempt >= self._max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.debug("Embedding request failed (%s), retrying in %.2fs", e, delay)
+            else:
+                if resp.status_code not in _RETRY_STATUSES or attempt >= self._max_retries:
+                    resp.raise_for_status()
+                    data = resp.json()
+                    # Sort by index to ensure consistent order
+                    embeddings = sorted(data["data"], key=lambda x: x["index"])
+                    return [e["embedding"] for e in embeddings]
+                delay = self._retry_delay(attempt, resp)
+                logger.debug(
+                    "Embedding request got HTTP %d, retrying in %.2fs", resp.status_code, delay
+                )
+            time.sleep(delay)
+            attempt += 1
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        batches = self._make_batches(texts)
+        if len(batches) == 1 or self._max_concurrency == 1:
+            results = [self._post_batch(batch) for batch in batches]
+        else:
+            workers = min(self._max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # map() yields in submission order, so output order matches input
+                results = list(pool.map(self._post_batch, batches))
+        return [vector for batch in results for vector in batch]
 
     def embed_text(self, text: str) -> List[float]:
         return self.embed_texts([text])[0]
 
+    def close(self) -> None:
+        """Close the pooled HTTP client"""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
     @property
     def dimensions(self) -> int:
         return self._dimensions
@@ -110,6 +249,8 @@ class OpenAIEmbedder(EmbedderBackend):
 class LocalEmbedder(EmbedderBackend):
     """sentence-transformers local model backend"""
 
+    name = "local"
+
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         try:
             from sentence_transformers import SentenceTransformer
@@ -139,17 +280,72 @@ class LocalEmbedder(EmbedderBackend):
         return self._model_name
 
 
+_numpy: Any = None
+_numpy_checked = False
+
+
+def _get_numpy() -> Any:
+    """Return the numpy module if installed, otherwise None (optional acceleration)"""
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+# Bump when the vector definition changes so existing indexes are detected as stale
+PURE_PYTHON_EMBEDDER_VERSION = 2
+
+# Trigram -> bucket memo size before it is reset
+_TRIGRAM_MEMO_MAX = 200_000
+
+# 32-bit multiplicative hash constants for code-point trigrams
+_MASK32 = 0xFFFFFFFF
+_H1, _H2, _H3, _H4 = 0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F
+
+
+def _trigram_hash(a: int, b: int, c: int) -> int:
+    """Stable 32-bit hash of three code points (identical to the NumPy batch path)"""
+    h = (a * _H1 + b * _H2 + c * _H3) & _MASK32
+    h ^= h >> 15
+    h = (h * _H4) & _MASK32
+    h ^= h >> 13
+    return h
+
+
 class PurePythonEmbedder(EmbedderBackend):
     """Pure Python lightweight embedding (based on character n-gram hashing)
 
     Zero external dependency solution. Accuracy is far lower than real embedding models,
     but sufficient to provide better text similarity search than pure tag matching.
 
-    Algorithm: character trigram -> hash -> normalize to fixed-dimension vector
+    Algorithm (v2): lowercase text -> character trigrams (texts shorter than 3
+    chars are zero-padded) -> 32-bit code-point hash -> bucket counts -> L2
+    normalize. The pure Python path counts distinct trigrams and memoizes their
+    buckets; with NumPy, `embed_texts` hashes every window vectorized and counts
+    the whole batch with one `bincount`. Both paths produce the same vectors.
     """
 
+    name = "pure_python"
+
     def __init__(self, dimensions: int = 256):
         self._dims = dimensions
+        self._buckets: Dict[str, int] = {}
+
+    def _bucket(self, trigram: str) -> int:
+        idx = self._buckets.get(trigram)
+        if idx is None:
+            if len(self._buckets) >= _TRIGRAM_MEMO_MAX:
+                self._buckets.clear()
+            codes = [ord(ch) for ch in trigram] + [0, 0]
+            idx = _trigram_hash(codes[0], codes[1], codes[2]) % self._dims
+            self._buckets[trigram] = idx
+        return idx
 
     def _text_to_vector(self, text: str) -> List[float]:
         text = text.lower().strip()
@@ -158,21 +354,43 @@ class PurePythonEmbedder(EmbedderBackend):
         if not text:
             return vector
 
-        # Character trigram hashing
-        for i in range(max(1, len(text) - 2)):
-            trigram = text[i : i + 3]
-            h = int(hashlib.md5(trigram.encode("utf-8")).hexdigest(), 16)
-            idx = h % self._dims
-            vector[idx] += 1.0
-
-        # L2 normalization
-        norm = sum(v * v for v in vector) ** 0.5
-        if norm > 0:
-            vector = [v / norm for v in vector]
-
-        return vector
+        counts = Counter(text[i : i + 3] for i in range(max(1, len(text) - 2)))
+        for trigram, count in counts.items():
+            vector[self._bucket(trigram)] += count
+
+        # L2 normalization (only non-zero buckets contribute)
+        norm = math.sqrt(sum(v * v for v in vector if v))
+        return [v / norm for v in vector]
+
+    def _embed_numpy(self, np: Any, texts: List[str]) -> List[List[float]]:
+        """Batch mode: vectorized window hashing + one bincount over (row, bucket)"""
+        dims = self._dims
+        shift15, shift13 = np.uint64(15), np.uint64(13)
+        parts = []
+        for row, text in enumerate(texts):
+            text = text.lower().strip()
+            if not text:
+                continue
+            codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+            if len(codes) < 3:
+                codes = np.concatenate([codes, np.zeros(3 - len(codes), dtype=np.uint64)])
+            h = (codes[:-2] * _H1 + codes[1:-1] * _H2 + codes[2:] * _H3) & _MASK32
+            h ^= h >> shift15
+            h = (h * _H4) & _MASK32
+            h ^= h >> shift13
+            parts.append((h % dims).astype(np.int64) + row * dims)
+
+        flat = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        counts = np.bincount(flat, minlength=len(texts) * dims).astype(np.float64)
+        counts = counts.reshape(len(texts), dims)
+        norms = np.linalg.norm(counts, axis=1)
+        norms[norms == 0] = 1.0
+        return (counts / norms[:, None]).tolist()
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        np = _get_numpy()
+        if np is not None and len(texts) > 1:
+            return self._embed_numpy(np, texts)
         return [self._text_to_vector(t) for t in texts]
 
     def embed_text(self, text: str) -> List[float]:
@@ -184,7 +402,90 @@ class PurePythonEmbedder(EmbedderBackend):
 
     @property
     def model_name(self) -> str:
-        return "pure-python-trigram"
+        return f"pure-python-trigram-v{PURE_PYTHON_EMBEDDER_VERSION}"
+
+
+# Approximate per-entry overhead of the in-memory cache (key, array header, dict slot)
+_LRU_ENTRY_OVERHEAD = 160
+
+
+class VectorLRUCache:
+    """Bounded LRU of embedding vectors, stored compactly as array('f')
+
+    Bounded by entry count and by approximate bytes; 0 disables a bound.
+    Thread-safe. Returns fresh lists so callers cannot mutate cached data.
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0):
+        self._data: "OrderedDict[bytes, array]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.md5(text.encode("utf-8")).digest()
+
+    @staticmethod
+    def _entry_bytes(vector: array) -> int:
+        return len(vector) * vector.itemsize + _LRU_ENTRY_OVERHEAD
+
+    def get(self, key: bytes) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._data.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return vector.tolist()
+
+    def put(self, key: bytes, vector: List[float]) -> List[float]:
+        """Store a vector; returns it as cached (float32-rounded)"""
+        compact = array("f", vector)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= self._entry_bytes(old)
+            self._data[key] = compact
+            self._bytes += self._entry_bytes(compact)
+            self._evict()
+        return compact.tolist()
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self._max_entries and len(self._data) > self._max_entries)
+            or (self._max_bytes and self._bytes > self._max_bytes)
+        ):
+            _, vector = self._data.popitem(last=False)
+            self._bytes -= self._entry_bytes(vector)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._data
 
 
 @dataclass
@@ -196,7 +497,15 @@ class EmbedderConfig:
     api_key: str = ""
     base_url: str = "https://api.openai.com/v1"
     dimensions: int = 0  # 0 = backend default
-    cache_dir: Optional[str] = None
+    max_batch_size: int = 256  # OpenAI: texts per request
+    max_batch_tokens: int = 100_000  # OpenAI: estimated tokens per request
+    max_concurrency: int = 4  # OpenAI: concurrent in-flight requests
+    max_retries: int = 5  # OpenAI: retries on 429/5xx/transport errors
+    cache_max_entries: int = 10_000  # In-memory LRU bound (0 = unbounded)
+    cache_max_bytes: int = 64 * 1024 * 1024  # In-memory LRU byte budget (0 = unbounded)
+    cache_dir: Optional[str] = None  # Persistent embedding cache directory (None = disabled)
+    disk_cache_max_entries: int = DEFAULT_MAX_ENTRIES
+    disk_cache_max_bytes: int = DEFAULT_MAX_BYTES
 
 
 class Embedder:
@@ -210,8 +519,37 @@ class Embedder:
 
     def __init__(self, config: Optional[EmbedderConfig] = None):
         self._config = config or EmbedderConfig()
+        start = time.perf_counter()
         self._backend = self._create_backend()
-        self._cache: Dict[str, List[float]] = {}
+        # Backend construction includes model loading for the local backend
+        self._load_seconds = time.perf_counter() - start
+        self._calls = 0
+        self._call_seconds = 0.0
+        self._last_call_seconds = 0.0
+        self._backend_seconds = 0.0
+        self._cache = VectorLRUCache(
+            max_entries=self._config.cache_max_entries,
+            max_bytes=self._config.cache_max_bytes,
+        )
+        self._disk_cache = self._create_disk_cache()
+
+    def _create_disk_cache(self) -> Optional[EmbeddingCache]:
+        if not self._config.cache_dir:
+            return None
+        namespace = (
+            f"{type(self._backend).__name__}:{self._backend.model_name}:"
+            f"{self._backend.dimensions}"
+        )
+        try:
+            return EmbeddingCache(
+                Path(self._config.cache_dir) / EMBEDDING_CACHE_FILENAME,
+                namespace=namespace,
+                max_entries=self._config.disk_cache_max_entries,
+                max_bytes=self._config.disk_cache_max_bytes,
+            )
+        except Exception as e:
+            logger.warning("Persistent embedding cache unavailable: %s", e)
+            return None
 
     def _create_backend(self) -> EmbedderBackend:
         backend = self._config.backend
@@ -255,6 +593,10 @@ class Embedder:
             model=self._config.model or "text-embedding-3-small",
             base_url=self._config.base_url,
             dimensions=self._config.dimensions or 1536,
+            max_batch_size=self._config.max_batch_size,
+            max_batch_tokens=self._config.max_batch_tokens,
+            max_concurrency=self._config.max_concurrency,
+            max_retries=self._config.max_retries,
         )
 
     def _create_local(self) -> LocalEmbedder:
@@ -273,36 +615,82 @@ class Embedder:
     def model_name(self) -> str:
         return self._backend.model_name
 
+    @property
+    def backend_name(self) -> str:
+        """Backend actually in use ("openai" | "local" | "pure_python"), after auto-selection"""
+        return self._backend.name
+
     def embed_text(self, text: str) -> List[float]:
-        cache_key = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        vector = self._backend.embed_text(text)
-        self._cache[cache_key] = vector
-        return vector
+        return self.embed_texts([text])[0]
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        results = []
+        start = time.perf_counter()
+        results: List[List[float]] = []
         uncached_indices = []
         uncached_texts = []
 
         for i, text in enumerate(texts):
-            cache_key = hashlib.md5(text.encode("utf-8")).hexdigest()
-            if cache_key in self._cache:
-                results.append(self._cache[cache_key])
+            cached = self._cache.get(VectorLRUCache.key(text))
+            if cached is not None:
+                results.append(cached)
             else:
                 results.append([])  # Placeholder
                 uncached_indices.append(i)
                 uncached_texts.append(text)
 
+        if uncached_texts and self._disk_cache is not None:
+            found = self._disk_cache.get_many(uncached_texts)
+            if found:
+                remaining_indices = []
+                remaining_texts = []
+                for pos, (idx, text) in enumerate(zip(uncached_indices, uncached_texts)):
+                    if pos in found:
+                        results[idx] = self._cache.put(VectorLRUCache.key(text), found[pos])
+                    else:
+                        remaining_indices.append(idx)
+                        remaining_texts.append(text)
+                uncached_indices, uncached_texts = remaining_indices, remaining_texts
+
         if uncached_texts:
+            backend_start = time.perf_counter()
             new_vectors = self._backend.embed_texts(uncached_texts)
+            self._backend_seconds += time.perf_counter() - backend_start
             for idx, text, vec in zip(uncached_indices, uncached_texts, new_vectors):
-                cache_key = hashlib.md5(text.encode("utf-8")).hexdigest()
-                self._cache[cache_key] = vec
-                results[idx] = vec
-
+                results[idx] = self._cache.put(VectorLRUCache.key(text), vec)
+            if self._disk_cache is not None:
+                self._disk_cache.put_many(uncached_texts, new_vectors)
+
+        elapsed = time.perf_counter() - start
+        self._calls += 1
+        self._call_seconds += elapsed
+        self._last_call_seconds = elapsed
         return results
 
+    @property
+    def config(self) -> EmbedderConfig:
+        return self._config
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Backend load time and per-call embedding latency (milliseconds)"""
+        return {
+            "load_ms": round(self._load_seconds * 1000, 2),
+            "calls": self._calls,
+            "avg_ms": round(self._call_seconds * 1000 / self._calls, 3) if self._calls else 0.0,
+            "last_ms": round(self._last_call_seconds * 1000, 3),
+            "backend_ms_total": round(self._backend_seconds * 1000, 2),
+        }
+
+    @property
+    def disk_cache(self) -> Optional[EmbeddingCache]:
+        """Persistent embedding cache, or None when `cache_dir` is not configured"""
+        return self._disk_cache
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Cache statistics: in-memory LRU counters plus persistent cache counters"""
+        stats: Dict[str, Any] = {"memory": self._cache.stats()}
+        if self._disk_cache is not None:
+            stats["disk"] = self._disk_cache.stats()
+        return stats
+
     def clear_cache(self):
         self._cache.clear()
@@ -0,0 +1,241 @@
+"""
+EmbeddingCache -- Persistent embedding cache shared across processes
+
+SQLite file keyed by (backend, model, dimensions, text hash), so CLI invocations,
+MCP restarts and plan steps reuse vectors computed by earlier processes.
+
+Storage path: .vibecollab/vectors/embeddings.db
+
+Concurrency: WAL mode lets readers proceed while another process writes; a
+locked database is treated as a cache miss / skipped write, never an error.
+Lookups never write: access times are buffered in memory and flushed with the
+next write (or on close).
+Eviction: least recently used entries are dropped once the entry or byte
+budget is exceeded (down to 90% of the budget to amortize deletes). The table
+is only counted when the size known from the last count plus the rows written
+since may exceed the budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_FILENAME = "embeddings.db"
+
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Fraction of the budget kept after an eviction pass
+_EVICT_TARGET = 0.9
+
+# Buffered access times that force a flush even without a write
+_MAX_PENDING_TOUCHES = 10_000
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """LRU embedding cache persisted in SQLite
+
+    Usage:
+        cache = EmbeddingCache(path, namespace="local:all-MiniLM-L6-v2:384")
+        found = cache.get_many(texts)        # {index: vector}
+        cache.put_many(missing_texts, vectors)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        namespace: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        timeout: float = 5.0,
+    ):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # One connection shared by the threads of this process, guarded by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                nbytes INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)"
+        )
+        self._conn.commit()
+
+        # key -> last access time not yet written
+        self._touched: Dict[str, float] = {}
+        # Size at the last count plus rows/bytes written since (None = count first)
+        self._size_estimate: Optional[Tuple[int, int]] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, text: str) -> str:
+        return f"{self._namespace}:{_text_hash(text)}"
+
+    def get_many(self, texts: Sequence[str]) -> Dict[int, List[float]]:
+        """Look up texts; returns {position: vector} for the cached ones"""
+        if not texts:
+            return {}
+        keys = [self._key(t) for t in texts]
+        found_by_key: Dict[str, List[float]] = {}
+        with self._lock:
+            self._read(keys, found_by_key)
+            found = {i: found_by_key[k] for i, k in enumerate(keys) if k in found_by_key}
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def _read(self, keys: List[str], found_by_key: Dict[str, List[float]]) -> None:
+        try:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found_by_key[key] = array("f", blob).tolist()
+        except sqlite3.OperationalError as e:
+            logger.debug("Embedding cache read skipped: %s", e)
+            self._rollback()
+            return
+        if found_by_key:
+            now = time.time()
+            self._touched.update((k, now) for k in found_by_key)
+            if len(self._touched) >= _MAX_PENDING_TOUCHES:
+                self._write([])
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store vectors for texts, then evict if over budget"""
+        if not texts:
+            return
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            blob = array("f", vector).tobytes()
+            rows.append((self._key(text), blob, len(blob), now))
+        with self._lock:
+            self._write(rows)
+
+    def _write(self, rows: List[tuple]) -> None:
+        """Insert rows and flush buffered access times in one transaction"""
+        touched = self._touched
+        try:
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, nbytes, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            if touched:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = MAX(last_access, ?) WHERE key = ?",
+                    [(at, key) for key, at in touched.items()],
+                )
+            self._conn.commit()
+            self._touched = {}
+            if rows:
+                self._evict_if_needed(len(rows), sum(row[2] for row in rows))
+        except sqlite3.OperationalError as e:
+            logger.debug("Embedding cache write skipped: %s", e)
+            self._rollback()
+
+    def _evict_if_needed(self, added: int, added_bytes: int) -> None:
+        if self._size_estimate is not None:
+            count, total = self._size_estimate
+            count, total = count + added, total + added_bytes
+            if count <= self._max_entries and total <= self._max_bytes:
+                self._size_estimate = (count, total)
+                return
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM embeddings"
+        ).fetchone()
+        self._size_estimate = (count, total)
+        if count <= self._max_entries and total <= self._max_bytes:
+            return
+
+        drop = 0
+        if count > self._max_entries:
+            drop = count - int(self._max_entries * _EVICT_TARGET)
+        if total > self._max_bytes:
+            avg = total / count
+            drop = max(drop, int((total - self._max_bytes * _EVICT_TARGET) / avg) + 1)
+        drop = min(drop, count)
+
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+            (drop,),
+        )
+        self._conn.commit()
+        self.evictions += cursor.rowcount
+        self._size_estimate = None  # Recount after the next write
+
+    def _rollback(self) -> None:
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters plus current size"""
+        try:
+            with self._lock:
+                count, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM embeddings"
+                ).fetchone()
+        except sqlite3.OperationalError:
+            count, total = -1, -1
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        """Delete every cached embedding (all namespaces)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._touched = {}
+            self._size_estimate = (0, 0)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        """Flush buffered access times (best effort) and close the connection"""
+        with self._lock:
+            if self._touched:
+                self._write([])
+            self._conn.close()
@@ -0,0 +1,455 @@
+"""
+RegistryJournal - Append-only usage journal in front of registry.yaml
+
+record_use, apply_decay and registry entry creation/removal used to rewrite
+the whole registry.yaml each time (one YAML dump per `insight_use`). They now
+append one JSON line to insights/registry.journal.local.jsonl instead:
+
+    {"op": "use", "id": "INS-001", "by": "qa", "at": "<iso>", "reward": 0.1}
+    {"op": "decay", "rate": 0.95, "threshold": 0.1}
+    {"op": "add", "id": "INS-002"}
+    {"op": "remove", "id": "INS-002"}
+
+Ops carry the settings they were recorded with, so replay does not depend on
+later settings changes. The registry view is registry.yaml (the snapshot,
+cached by the catalog) with the journal folded over it, producing exactly the
+entries an eager rewrite would have written; a decay op only advances the
+view's DecaySchedule (decay.py), weights decay when read. The fold is
+incremental: a read only parses lines appended since the previous read.
+
+Compaction writes the folded view (weights materialized) back to
+registry.yaml and removes the journal. InsightManager compacts every
+`journal_compact_every` ops (registry setting, or the journal's
+`compact_every`), on full rewrites, at the end of the `insight use` /
+`insight decay` commands and on `vibecollab insight compact`, so the tracked
+registry.yaml keeps recording usage. The snapshot records which journal it
+absorbed and how many of its ops:
+
+    journal: {id: <journal id>, applied: <ops>}
+
+Crash recovery:
+- An append is a single write() of a complete line. A torn last line (crash
+  mid-write) is ignored on replay, and the next append starts a fresh line.
+- registry.yaml is replaced atomically (temp file + rename).
+- A crash between replacing registry.yaml and removing the journal leaves a
+  journal whose id matches the snapshot marker: its first `applied` ops are
+  skipped on replay, so no use is counted twice.
+- Appends are flushed to the OS (they survive a process crash). Pass
+  fsync=True to also survive power loss, at the cost of a disk flush per op.
+
+Concurrent writers: appends and compactions of all processes serialize on an
+advisory lock on insights/registry.lock (flock, or msvcrt on Windows), so no
+journaled op is lost or applied twice. Readers take no lock: they read the
+journal before the snapshot and only complete lines, which always yields a
+consistent (possibly slightly older) view. Full rewrites of the registry
+(InsightManager._save_registry: settings edits, imports) remain
+read-modify-write as before: an op journaled between their read and their
+write is absorbed by them, i.e. last writer wins.
+
+The journal is local state (git-ignored via *.local.jsonl): pending ops
+replay on top of whichever registry.yaml is checked out.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+from .catalog import _RACY_WINDOW_NS, InsightCatalog
+from .decay import DecaySchedule
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "registry.journal.local.jsonl"
+LOCK_FILE = "registry.lock"
+JOURNAL_FORMAT = "vibecollab-registry-journal"
+JOURNAL_VERSION = 1
+
+# Journaled ops folded into registry.yaml by automatic compaction
+# (registry setting `journal_compact_every` overrides it)
+DEFAULT_COMPACT_EVERY = 20
+
+# Snapshot key recording the journal it absorbed
+MARKER_KEY = "journal"
+
+# Stands in for a missing registry.yaml (catalog returns a new {} each time)
+_NO_SNAPSHOT: Dict[str, Any] = {}
+
+
+def _lock_file(handle: Any) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        return
+    import msvcrt
+
+    handle.seek(0)
+    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(handle: Any) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        return
+    import msvcrt
+
+    handle.seek(0)
+    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _copy_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    copied = dict(entry)
+    if isinstance(copied.get("used_by"), list):
+        copied["used_by"] = list(copied["used_by"])
+    return copied
+
+
+def apply_op(data: Dict[str, Any], op: Dict[str, Any]) -> None:
+    """Fold one journaled op into a registry view
+
+    `data` holds "entries" (entry dicts as in registry.yaml) and "decay" (the
+    DecaySchedule). Weights are rounded as RegistryEntry.to_dict rounds them
+    on every eager save, so the fold matches rewriting the registry after
+    each op. A decay op only advances the schedule (see decay.py).
+    """
+    entries: Dict[str, Dict[str, Any]] = data["entries"]
+    schedule: DecaySchedule = data["decay"]
+    kind = op.get("op")
+    insight_id = op.get("id")
+    if kind == "add":
+        if insight_id not in entries:
+            entries[insight_id] = _stamp({"weight": 1.0, "used_count": 0, "active": True},
+                                         schedule)
+    elif kind == "remove":
+        entries.pop(insight_id, None)
+    elif kind == "use":
+        entry = entries.get(insight_id)
+        if entry is None:
+            return  # Removed before the use was replayed
+        weight, _ = schedule.decay(
+            entry.get("weight", 1.0), entry.get("active", True), entry.get("last_decay_epoch", 0)
+        )
+        entry["weight"] = round(weight + op.get("reward", 0.0), 4)
+        entry["used_count"] = entry.get("used_count", 0) + 1
+        entry["active"] = True
+        entry["last_used_at"] = op.get("at")
+        entry["last_used_by"] = op.get("by")
+        used_by = entry.setdefault("used_by", [])
+        if op.get("by") not in used_by:
+            used_by.append(op.get("by"))
+        _stamp(entry, schedule)
+    elif kind == "decay":
+        schedule.advance(op.get("rate", 1.0), op.get("threshold", 0.0))
+    else:
+        logger.debug("Ignoring unknown registry journal op: %r", kind)
+
+
+def _stamp(entry: Dict[str, Any], schedule: DecaySchedule) -> Dict[str, Any]:
+    """Mark an entry's weight as materialized at the current epoch"""
+    if schedule.epoch:
+        entry["last_decay_epoch"] = schedule.epoch
+    else:
+        entry.pop("last_decay_epoch", None)
+    return entry
+
+
+class RegistryJournal:
+    """Write-behind journal of registry ops plus the folded registry view
+
+    Thread-safe; one instance per insights directory is shared in-process
+    (get_registry_journal). `view()` returns shared, read-only data.
+
+    Usage:
+        journal = get_registry_journal(catalog)
+        journal.append({"op": "use", "id": "INS-001", "by": "qa", "reward": 0.1})
+        journal.view()["entries"]["INS-001"]["used_count"]
+    """
+
+    def __init__(
+        self,
+        catalog: InsightCatalog,
+        journal_file: str = JOURNAL_FILE,
+        lock_file: str = LOCK_FILE,
+        compact_every: Optional[int] = None,
+        fsync: bool = False,
+    ):
+        self.catalog = catalog
+        self.insights_dir = catalog.insights_dir
+        self.registry_path = catalog.registry_path
+        self.path = self.insights_dir / journal_file
+        self.lock_path = self.insights_dir / lock_file
+        self.compact_every = compact_every  # None: registry setting / DEFAULT_COMPACT_EVERY
+        self.fsync = fsync
+        self._mutex = threading.RLock()
+        self._lock_depth = 0
+        self._lock_handle: Any = None
+        # Journal as read so far
+        self._stat: Optional[tuple] = None  # (st_dev, st_ino, st_size, st_mtime_ns)
+        self._checked_at = 0  # time.time_ns() of the last read
+        self._header: Optional[bytes] = None  # first line, with the journal id
+        self._offset = 0
+        self._journal_id: Optional[str] = None
+        self._ops: List[Dict[str, Any]] = []
+        # Folded view
+        self._base: Optional[Dict[str, Any]] = None  # snapshot the view was folded from
+        self._skip = 0  # leading ops already in the snapshot
+        self._folded = 0  # ops folded into the view
+        self._view: Dict[str, Any] = {}
+        # Counters
+        self.appends = 0
+        self.replays = 0
+        self.torn_lines = 0
+        self.compactions = 0
+
+    # ------------------------------------------------------------------
+    # Locking
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the cross-process registry lock (re-entrant within the process)"""
+        with self._mutex:
+            if self._lock_depth == 0:
+                self.insights_dir.mkdir(parents=True, exist_ok=True)
+                handle = open(self.lock_path, "a+b")
+                try:
+                    _lock_file(handle)
+                except BaseException:
+                    handle.close()
+                    raise
+                self._lock_handle = handle
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    handle, self._lock_handle = self._lock_handle, None
+                    try:
+                        _unlock_file(handle)
+                    finally:
+                        handle.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _forget_journal(self) -> None:
+        self._stat = None
+        self._header = None
+        self._offset = 0
+        self._journal_id = None
+        self._ops = []
+        self._base = None  # Refold
+
+    def _read_journal(self) -> None:
+        """Parse the complete lines appended since the last read
+
+        A compaction removes the journal and the next append creates a new one,
+        which may reuse the inode and even the size of the old file, so the
+        journal is identified by its header line (which carries a random id).
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._header is not None or self._ops:
+                self._forget_journal()
+            return
+        stat = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        if stat == self._stat and st.st_mtime_ns < self._checked_at - _RACY_WINDOW_NS:
+            return
+        checked_at = time.time_ns()
+        try:
+            with open(self.path, "rb") as f:
+                header = f.readline()
+                if header != self._header or st.st_size < self._offset:
+                    self._forget_journal()
+                if not header.endswith(b"\n"):
+                    return  # First append still in flight
+                f.seek(self._offset)
+                chunk = f.read()
+        except OSError as e:
+            logger.debug("Registry journal not readable: %s", e)
+            return
+        self._header = header
+        self._stat = stat
+        self._checked_at = checked_at
+        # An unterminated tail is an append in flight (or torn): read it next time
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except ValueError:
+                self.torn_lines += 1
+                continue
+            if not isinstance(record, dict):
+                self.torn_lines += 1
+            elif record.get("format") == JOURNAL_FORMAT:
+                self._journal_id = record.get("journal")
+            elif "op" in record:
+                self._ops.append(record)
+        self._offset += end
+        if end < len(chunk):
+            self._stat = None  # Re-read the unterminated tail next time
+
+    def view(self) -> Dict[str, Any]:
+        """Snapshot with the journal folded in ({} when neither exists); shared, read-only"""
+        with self._mutex:
+            # Journal first: a compaction in between then shows up as a newer
+            # snapshot whose marker covers the ops read, never as lost ops
+            self._read_journal()
+            snapshot = self.catalog.registry_data() or _NO_SNAPSHOT
+            if snapshot is not self._base:
+                marker = snapshot.get(MARKER_KEY)
+                skip = 0
+                if (
+                    isinstance(marker, dict)
+                    and self._journal_id is not None
+                    and marker.get("id") == self._journal_id
+                ):
+                    skip = int(marker.get("applied", 0))
+                raw_entries = snapshot.get("entries")
+                entries = {
+                    k: _copy_entry(v)
+                    for k, v in (raw_entries if isinstance(raw_entries, dict) else {}).items()
+                    if isinstance(v, dict)
+                }
+                self._view = {k: v for k, v in snapshot.items() if k != MARKER_KEY}
+                self._view["entries"] = entries
+                self._view["decay"] = DecaySchedule.from_dict(snapshot.get("decay"))
+                self._base = snapshot
+                self._skip = skip
+                self._folded = 0
+                self.replays += 1
+            if self._folded < len(self._ops):
+                for index in range(max(self._folded, self._skip), len(self._ops)):
+                    apply_op(self._view, self._ops[index])
+                self._folded = len(self._ops)
+            if not snapshot and not self._view.get("entries"):
+                return {}
+            return self._view
+
+    @property
+    def pending(self) -> int:
+        """Journaled ops not yet compacted into registry.yaml (as last read)"""
+        with self._mutex:
+            return max(len(self._ops) - self._skip, 0)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, op: Dict[str, Any]) -> int:
+        """Journal one op; returns the number of pending (uncompacted) ops"""
+        line = json.dumps(op, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self.locked():
+            fd = os.open(
+                self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0),
+                0o644,
+            )
+            try:
+                if os.fstat(fd).st_size == 0:
+                    header = {
+                        "format": JOURNAL_FORMAT,
+                        "version": JOURNAL_VERSION,
+                        "journal": uuid.uuid4().hex,
+                    }
+                    line = json.dumps(header).encode("utf-8") + b"\n" + line
+                elif not self._ends_with_newline():
+                    line = b"\n" + line  # Isolate a torn line left by a crash
+                while line:
+                    line = line[os.write(fd, line):]
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.appends += 1
+            self.view()
+            return self.pending
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Write `data` as the new registry.yaml, absorbing the current journal
+
+        `data` must already include the journal's effect (read through view()).
+        """
+        with self.locked():
+            self._read_journal()
+            data = {k: v for k, v in data.items() if k != MARKER_KEY}
+            if self._ops:
+                data[MARKER_KEY] = {"id": self._journal_id, "applied": len(self._ops)}
+            self._write_snapshot(data)
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self._forget_journal()
+            self.compactions += 1
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        self.insights_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.insights_dir, prefix=".registry-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                yaml.dump(data, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.registry_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            self.catalog.invalidate(self.registry_path)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Journal size and append/replay/compaction counters"""
+        with self._mutex:
+            return {
+                "pending": self.pending,
+                "appends": self.appends,
+                "replays": self.replays,
+                "torn_lines": self.torn_lines,
+                "compactions": self.compactions,
+                "compact_every": self.compact_every,
+            }
+
+
+_journals: Dict[int, RegistryJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_registry_journal(catalog: InsightCatalog) -> RegistryJournal:
+    """The process-wide journal of a (shared) catalog's registry"""
+    with _journals_lock:
+        journal = _journals.get(id(catalog))
+        if journal is None or journal.catalog is not catalog:
+            journal = RegistryJournal(catalog)
+            _journals[id(catalog)] = journal
+        return journal
@@ -8,11 +8,19 @@ Manages reusable knowledge units (Insights) distilled from development practices
 - Traceability: Track insight origin and derivation relationships
 - Consistency check: Insight entity <-> registry <-> Role metadata sync verification
 - Fingerprint: SHA-256 content integrity
+- Catalog: parsed files and tag/category/role/derivation indexes cached in-process
+  and in a compiled catalog file (catalog.py), re-parsing only files that changed
+- Journal: registry updates (use, decay, add, remove) are appended to a usage
+  journal and folded into registry.yaml by periodic compaction (journal.py)
+- Lazy decay: a decay period advances an epoch counter; weights are decayed
+  when read and materialized on compaction (decay.py)
 
 Storage structure:
     .vibecollab/
     ├── insights/
     │   ├── registry.yaml       # Project registry (weight, usage state)
+    │   ├── registry.journal.local.jsonl  # Registry ops not yet compacted (not committed)
+    │   ├── catalog.local.json  # Compiled catalog of parsed files (derived, not committed)
     │   ├── INS-001.yaml        # Insight entity
     │   ├── INS-002.yaml
     │   └── tools/              # Associated tools/scripts (future)
@@ -28,17 +36,21 @@ Design principles:
 - Consistency check covers all associated data synchronization
 """
 
+import copy
 import hashlib
 import json
 import re
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import yaml
 
 from ..domain.event_log import Event, EventLog, EventType
+from .catalog import InsightCatalog, get_insight_catalog
+from .decay import DecaySchedule
+from .journal import DEFAULT_COMPACT_EVERY, RegistryJournal, get_registry_journal
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -64,6 +76,7 @@ DEFAULT_SETTINGS = {
     "decay_interval_days": 30,
     "use_reward": 0.1,
     "deactivate_threshold": 0.1,
+    "journal_compact_every": DEFAULT_COMPACT_EVERY,
 }
 
 
@@ -252,6 +265,8 @@ class RegistryEntry:
     last_used_by: Optional[str] = None
     active: bool = True
     used_by: List[str] = field(default_factory=list)
+    # Decay epoch `weight` was materialized at (None = current; see decay.py)
+    last_decay_epoch: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         d: Dict[str, Any] = {
@@ -265,6 +280,8 @@ class RegistryEntry:
             d["last_used_by"] = self.last_used_by
         if self.used_by:
             d["used_by"] = self.used_by
+        if self.last_decay_epoch:
+            d["last_decay_epoch"] = self.last_decay_epoch
         return d
 
     @classmethod
@@ -275,7 +292,8 @@ class RegistryEntry:
             last_used_at=data.get("last_used_at"),
             last_used_by=data.get("last_used_by"),
             active=data.get("active", True),
-            used_by=data.get("used_by", []),
+            used_by=list(data.get("used_by", [])),
+            last_decay_epoch=data.get("last_decay_epoch", 0),
         )
 
 
@@ -319,12 +337,23 @@ class InsightManager:
     REGISTRY_FILE = "registry.yaml"
 
     def __init__(self, project_root: Path, data_dir: Optional[str] = None,
-                 event_log: Optional[EventLog] = None):
+                 event_log: Optional[EventLog] = None,
+                 catalog: Optional[InsightCatalog] = None,
+                 journal: Optional[RegistryJournal] = None):
         self.project_root = Path(project_root)
         self.data_dir = self.project_root / (data_dir or ".vibecollab")
         self.insights_dir = self.data_dir / self.INSIGHTS_DIR
         self.registry_path = self.insights_dir / self.REGISTRY_FILE
         self.event_log = event_log
+        # Shared by every manager of this directory unless one is given
+        if journal is not None:
+            self._catalog = journal.catalog
+            self._journal = journal
+        else:
+            self._catalog = catalog or get_insight_catalog(self.insights_dir, self.REGISTRY_FILE)
+            self._journal = (
+                RegistryJournal(self._catalog) if catalog else get_registry_journal(self._catalog)
+            )
 
     # ------------------------------------------------------------------
     # CRUD -- Insight entity
@@ -377,24 +406,12 @@ class InsightManager:
 
     def get(self, insight_id: str) -> Optional[Insight]:
         """Get insight by ID"""
-        path = self._insight_path(insight_id)
-        if not path.exists():
-            return None
-        return self._load_insight(path)
+        insight = self._catalog.get(insight_id)
+        return copy.deepcopy(insight) if insight else None
 
     def list_all(self) -> List[Insight]:
         """List all insights"""
-        if not self.insights_dir.exists():
-            return []
-        insights = []
-        for path in sorted(self.insights_dir.glob("INS-*.yaml")):
-            try:
-                ins = self._load_insight(path)
-                if ins:
-                    insights.append(ins)
-            except Exception:
-                continue
-        return insights
+        return [copy.deepcopy(ins) for ins in self._catalog.all()]
 
     def get_all_tags(self, active_only: bool = True) -> Dict[str, int]:
         """Get all unique tags with usage count across all insights.
@@ -405,20 +422,11 @@ class InsightManager:
         Returns:
             Dict mapping tag name to count (number of insights using this tag)
         """
-        all_insights = self.list_all()
-        entries, _ = self.get_registry()
-
-        tag_counts: Dict[str, int] = {}
-
-        for ins in all_insights:
-            if active_only:
-                entry = entries.get(ins.id)
-                if entry and not entry.active:
-                    continue
-
-            for tag in ins.tags:
-                tag_lower = tag.lower()
-                tag_counts[tag_lower] = tag_counts.get(tag_lower, 0) + 1
+        inactive: List[str] = []
+        if active_only:
+            entries, _ = self.get_registry()
+            inactive = [k for k, e in entries.items() if not e.active]
+        tag_counts = self._catalog.tag_counts(exclude_ids=inactive)
 
         # Sort by count descending, then alphabetically
         return dict(sorted(tag_counts.items(), key=lambda x: (-x[1], x[0])))
@@ -456,6 +464,7 @@ class InsightManager:
         if not path.exists():
             return False
         path.unlink()
+        self._catalog.invalidate(path)
         self._remove_registry_entry(insight_id)
         self._log_event(
             EventType.CUSTOM,
@@ -470,32 +479,41 @@ class InsightManager:
     # ------------------------------------------------------------------
 
     def get_registry(self) -> Tuple[Dict[str, RegistryEntry], Dict[str, Any]]:
-        """Read registry, returns (entries, settings)"""
-        if not self.registry_path.exists():
+        """Read registry (registry.yaml plus journaled updates), returns (entries, settings)
+
+        Weights and active flags are the decayed values as of now.
+        """
+        data = self._journal.view()
+        if not data:
             return {}, dict(DEFAULT_SETTINGS)
-        data = self._load_yaml(self.registry_path)
+        schedule = self._decay_schedule(data)
         entries = {}
         for k, v in data.get("entries", {}).items():
-            entries[k] = RegistryEntry.from_dict(v)
-        settings = {**DEFAULT_SETTINGS, **data.get("settings", {})}
+            entry = RegistryEntry.from_dict(v)
+            schedule.materialize(entry)
+            entries[k] = entry
+        settings = {**DEFAULT_SETTINGS, **(data.get("settings") or {})}
         return entries, settings
 
     def record_use(self, insight_id: str, used_by: str) -> Optional[RegistryEntry]:
         """Record one insight usage, reward weight"""
-        entries, settings = self.get_registry()
-        entry = entries.get(insight_id)
-        if entry is None:
+        data = self._journal.view()
+        if insight_id not in data.get("entries", {}):
             return None
-        entry.used_count += 1
-        entry.weight += settings["use_reward"]
-        entry.last_used_at = datetime.now(timezone.utc).isoformat()
-        entry.last_used_by = used_by
-        if used_by not in entry.used_by:
-            entry.used_by.append(used_by)
-        if not entry.active:
-            entry.active = True  # Reactivate on use
-        entries[insight_id] = entry
-        self._save_registry(entries, settings)
+        settings = {**DEFAULT_SETTINGS, **(data.get("settings") or {})}
+        self._journal_op({
+            "op": "use",
+            "id": insight_id,
+            "by": used_by,
+            "at": datetime.now(timezone.utc).isoformat(),
+            "reward": settings["use_reward"],
+        })
+        data = self._journal.view()
+        raw = data.get("entries", {}).get(insight_id)
+        if raw is None:
+            return None  # Removed concurrently
+        entry = RegistryEntry.from_dict(raw)
+        self._decay_schedule(data).materialize(entry)
         self._log_event(
             EventType.CUSTOM,
             used_by,
@@ -508,24 +526,43 @@ class InsightManager:
     def apply_decay(self) -> List[str]:
         """Apply weight decay to all active insights
 
+        Journals one decay period; weights are decayed lazily when read.
+
         Returns:
             List of deactivated insight IDs
         """
-        entries, settings = self.get_registry()
-        deactivated = []
-        rate = settings["decay_rate"]
-        threshold = settings["deactivate_threshold"]
+        with self._journal.locked():
+            data = self._journal.view()
+            settings = {**DEFAULT_SETTINGS, **(data.get("settings") or {})}
+            rate, threshold = settings["decay_rate"], settings["deactivate_threshold"]
+            # Entries still active now that the new period deactivates
+            schedule = self._decay_schedule(data)
+            period = DecaySchedule()
+            period.advance(rate, threshold)
+            deactivated = []
+            for k, v in data.get("entries", {}).items():
+                weight, active = schedule.decay(
+                    v.get("weight", 1.0), v.get("active", True), v.get("last_decay_epoch", 0)
+                )
+                if active and not period.decay(weight, active, 0)[1]:
+                    deactivated.append(k)
+            self._journal_op({"op": "decay", "rate": rate, "threshold": threshold})
+        return deactivated
 
-        for ins_id, entry in entries.items():
-            if not entry.active:
-                continue
-            entry.weight *= rate
-            if entry.weight < threshold:
-                entry.active = False
-                deactivated.append(ins_id)
+    def compact_registry(self) -> int:
+        """Fold the usage journal into registry.yaml; returns the number of ops folded"""
+        with self._journal.locked():
+            entries, settings = self.get_registry()
+            pending = self._journal.pending
+            if pending:
+                self._save_registry(entries, settings)
+            return pending
 
-        self._save_registry(entries, settings)
-        return deactivated
+    def registry_journal_stats(self) -> Dict[str, Any]:
+        """Usage journal statistics (pending ops, appends, compactions)"""
+        stats = self._journal.stats()
+        stats["compact_every"] = self._compact_every(self._journal.view())
+        return stats
 
     def get_active_insights(self) -> List[Tuple[str, float]]:
         """Get all active insights and their weights, sorted by weight descending"""
@@ -541,13 +578,13 @@ class InsightManager:
 
     def search_by_tags(self, tags: List[str], active_only: bool = True) -> List[Insight]:
         """Search insights by tags, results sorted by match_score * weight"""
-        all_insights = self.list_all()
         entries, _ = self.get_registry()
 
         scored: List[Tuple[float, Insight]] = []
         query_tags = set(t.lower() for t in tags)
 
-        for ins in all_insights:
+        # Only Insights sharing a tag can score
+        for ins in self._catalog.with_tags(query_tags):
             if active_only:
                 entry = entries.get(ins.id)
                 if entry and not entry.active:
@@ -570,11 +607,15 @@ class InsightManager:
             scored.append((match_score * weight, ins))
 
         scored.sort(key=lambda x: x[0], reverse=True)
-        return [ins for _, ins in scored]
+        return [copy.deepcopy(ins) for _, ins in scored]
 
     def search_by_category(self, category: str) -> List[Insight]:
         """Search insights by category"""
-        return [ins for ins in self.list_all() if ins.category == category]
+        return [copy.deepcopy(ins) for ins in self._catalog.in_category(category)]
+
+    def search_by_role(self, role: str) -> List[Insight]:
+        """Search insights created by a role"""
+        return [copy.deepcopy(ins) for ins in self._catalog.created_by(role)]
 
     # ------------------------------------------------------------------
     # Traceability
@@ -582,19 +623,15 @@ class InsightManager:
 
     def get_derived_tree(self, insight_id: str) -> Dict[str, List[str]]:
         """Get insight derivation tree: who references it, and what it references"""
-        all_insights = self.list_all()
         result: Dict[str, List[str]] = {
             "derived_from": [],   # Upstream references of this insight
             "derived_by": [],     # Downstream references to this insight
         }
-        target = self.get(insight_id)
+        target = self._catalog.get(insight_id)
         if target:
             result["derived_from"] = list(target.origin.derived_from)
 
-        for ins in all_insights:
-            if insight_id in ins.origin.derived_from:
-                result["derived_by"].append(ins.id)
-
+        result["derived_by"] = [ins.id for ins in self._catalog.derived_by(insight_id)]
         return result
 
     def get_full_trace(self, insight_id: str) -> Dict[str, Any]:
@@ -614,7 +651,7 @@ class InsightManager:
             if iid in visited:
                 return []
             visited.add(iid)
-            ins = self.get(iid)
+            ins = self._catalog.get(iid)
             if not ins:
                 return [{"id": iid, "title": "(missing)", "upstream": []}]
             result = []
@@ -624,7 +661,7 @@ class InsightManager:
                     "title": "",
                     "upstream": [],
                 }
-                parent = self.get(parent_id)
+                parent = self._catalog.get(parent_id)
                 if parent:
                     node["title"] = parent.title
                     node["upstream"] = _trace_upstream(parent_id)
@@ -634,24 +671,22 @@ class InsightManager:
             return result
 
         visited_down: set = set()
-        all_insights = self.list_all()
 
         def _trace_downstream(iid: str) -> List[Dict[str, Any]]:
             if iid in visited_down:
                 return []
             visited_down.add(iid)
             result = []
-            for ins in all_insights:
-                if iid in ins.origin.derived_from:
-                    node: Dict[str, Any] = {
-                        "id": ins.id,
-                        "title": ins.title,
-                        "downstream": _trace_downstream(ins.id),
-                    }
-                    result.append(node)
+            for ins in self._catalog.derived_by(iid):
+                node: Dict[str, Any] = {
+                    "id": ins.id,
+                    "title": ins.title,
+                    "downstream": _trace_downstream(ins.id),
+                }
+                result.append(node)
             return result
 
-        target = self.get(insight_id)
+        target = self._catalog.get(insight_id)
         return {
             "id": insight_id,
             "title": target.title if target else "(missing)",
@@ -682,7 +717,7 @@ class InsightManager:
         }
 
         # Get creator from insight entity
-        ins = self.get(insight_id)
+        ins = self._catalog.get(insight_id)
         if ins:
             result["created_by"] = ins.origin.created_by
 
@@ -733,7 +768,7 @@ class InsightManager:
                 },
             }
         """
-        all_insights = self.list_all()
+        all_insights = self._catalog.all()
         entries, _ = self.get_registry()
 
         # Collect role metadata
@@ -825,7 +860,7 @@ class InsightManager:
         warnings: List[str] = []
 
         # Collect all insight files
-        all_insights = self.list_all()
+        all_insights = self._catalog.all()
         file_ids = {ins.id for ins in all_insights}
 
         # Collect registry entries
@@ -904,6 +939,10 @@ class InsightManager:
 
         return errors
 
+    def catalog_stats(self) -> Dict[str, Any]:
+        """In-process catalog statistics (size, parses, cache hits)"""
+        return self._catalog.stats()
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -934,40 +973,51 @@ class InsightManager:
         with open(path, "w", encoding="utf-8") as f:
             yaml.dump(insight.to_dict(), f, allow_unicode=True, sort_keys=False,
                       default_flow_style=False)
-
-    def _load_insight(self, path: Path) -> Optional[Insight]:
-        """Load insight from YAML file"""
-        data = self._load_yaml(path)
-        if not data:
-            return None
-        return Insight.from_dict(data)
+        self._catalog.invalidate(path)
 
     def _ensure_registry_entry(self, insight_id: str) -> None:
         """Ensure the registry has an entry for this ID"""
-        entries, settings = self.get_registry()
-        if insight_id not in entries:
-            entries[insight_id] = RegistryEntry()
-            self._save_registry(entries, settings)
+        if insight_id not in self._journal.view().get("entries", {}):
+            self._journal_op({"op": "add", "id": insight_id})
 
     def _remove_registry_entry(self, insight_id: str) -> None:
         """Remove entry from registry"""
-        entries, settings = self.get_registry()
-        if insight_id in entries:
-            del entries[insight_id]
-            self._save_registry(entries, settings)
+        if insight_id in self._journal.view().get("entries", {}):
+            self._journal_op({"op": "remove", "id": insight_id})
+
+    def _journal_op(self, op: Dict[str, Any]) -> None:
+        """Journal a registry update, compacting once enough ops are pending"""
+        if self._journal.append(op) >= self._compact_every(self._journal.view()):
+            self.compact_registry()
+
+    def _compact_every(self, data: Dict[str, Any]) -> int:
+        """Automatic compaction threshold: the journal's own, else the registry setting"""
+        if self._journal.compact_every is not None:
+            return max(1, self._journal.compact_every)
+        value = (data.get("settings") or {}).get("journal_compact_every", DEFAULT_COMPACT_EVERY)
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return DEFAULT_COMPACT_EVERY
+
+    def _decay_schedule(self, data: Dict[str, Any]) -> DecaySchedule:
+        return data.get("decay") or DecaySchedule()
 
     def _save_registry(self, entries: Dict[str, RegistryEntry],
                        settings: Dict[str, Any]) -> None:
-        """Save registry"""
-        self.insights_dir.mkdir(parents=True, exist_ok=True)
+        """Save registry (full atomic rewrite, absorbing the usage journal)
+
+        Decayed weights are materialized; the new snapshot starts at decay epoch 0.
+        """
+        schedule = self._decay_schedule(self._journal.view())
+        for entry in entries.values():
+            schedule.materialize(entry)
         data = {
             "schema_version": "1",
             "entries": {k: v.to_dict() for k, v in entries.items()},
             "settings": settings,
         }
-        with open(self.registry_path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False,
-                      default_flow_style=False)
+        self._journal.replace(data)
 
     def _load_yaml(self, path: Path) -> dict:
         """Safely load YAML"""
@@ -1006,7 +1056,7 @@ class InsightManager:
             List of duplicate candidates sorted by similarity descending:
             [{"id": "INS-001", "title": "...", "score": 0.85, "reason": "..."}, ...]
         """
-        all_insights = self.list_all()
+        all_insights = self._catalog.all()
         if not all_insights:
             return []
 
@@ -1082,7 +1132,7 @@ class InsightManager:
                            "isolated_count": K, "components": C}
             }
         """
-        all_insights = self.list_all()
+        all_insights = self._catalog.all()
         entries, _ = self.get_registry()
 
         nodes = []
@@ -1095,7 +1145,7 @@ class InsightManager:
                 "id": ins.id,
                 "title": ins.title,
                 "category": ins.category,
-                "tags": ins.tags,
+                "tags": list(ins.tags),
                 "weight": entry.weight if entry else 1.0,
                 "active": entry.active if entry else True,
             })
@@ -1184,13 +1234,13 @@ class InsightManager:
                 "registry": {...}  # Only when include_registry=True
             }
         """
-        all_insights = self.list_all()
+        all_insights = self._catalog.all()
 
         if insight_ids is not None:
             ids_set = set(insight_ids)
-            selected = [ins for ins in all_insights if ins.id in ids_set]
+            selected = [copy.deepcopy(ins) for ins in all_insights if ins.id in ids_set]
         else:
-            selected = all_insights
+            selected = [copy.deepcopy(ins) for ins in all_insights]
 
         # Read project name
         project_name = ""
@@ -1308,6 +1358,39 @@ class InsightManager:
 
         return results
 
+    def bulk_import(self, bundle: Union[Dict[str, Any], Iterable[Tuple[str, Any]]],
+                    imported_by: str,
+                    strategy: str = "skip",
+                    dedupe: bool = True,
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+        """Import a large bundle in one pass (see bulk_import.py).
+
+        Reserves IDs from a single directory scan, writes the files on a
+        thread pool, updates the registry with one atomic write and logs one
+        batch event.
+
+        Args:
+            bundle: Dictionary produced by export_insights(), or records from
+                bulk_import.stream_bundle() to stream a bundle file
+            imported_by: Operator performing the import
+            strategy: ID conflict strategy, as in import_insights()
+            dedupe: Skip Insights whose content already exists under another ID
+            workers: Threads writing Insight files
+
+        Returns:
+            import_insights() results plus "duplicates" ({bundle ID: existing ID})
+            and "timings" (seconds per phase)
+
+        Raises:
+            InvalidBundleError: not an Insight export bundle (nothing is imported)
+        """
+        from .bulk_import import BulkImporter, bundle_records
+
+        records = bundle_records(bundle) if isinstance(bundle, dict) else bundle
+        importer = BulkImporter(self, imported_by, strategy=strategy, dedupe=dedupe,
+                                workers=workers)
+        return importer.run(records)
+
     def _log_event(self, event_type: str, actor: str, summary: str,
                    payload: Dict[str, Any]) -> None:
         """Record audit event"""
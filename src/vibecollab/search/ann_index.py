@@ -0,0 +1,244 @@
+"""
+IVFIndex - Approximate nearest-neighbour index (IVF-flat)
+
+Partitions normalized vectors into `nlist` clusters with spherical k-means.
+A query only scores the vectors in its `nprobe` closest clusters, trading
+recall for latency. Written in NumPy, no native dependencies beyond it.
+
+Storage path: .vibecollab/vectors/ann_ivf.npz (next to index.db)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+ANN_INDEX_FILENAME = "ann_ivf.npz"
+
+# Clusters probed per query when the caller does not specify nprobe
+DEFAULT_NPROBE = 8
+
+# k-means settings
+_KMEANS_ITERATIONS = 10
+_KMEANS_MAX_TRAIN = 50_000
+_MAX_NLIST = 4096
+
+
+def _require_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "ANN index requires numpy. Install: pip install vibe-collab[embedding]"
+        )
+    return numpy
+
+
+def _normalize_rows(np: Any, matrix: Any) -> Any:
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0] = 1.0
+    return (matrix / norms[:, None]).astype(np.float32)
+
+
+def check_nprobe(nprobe: int) -> int:
+    """Validate a clusters-to-probe count (0 = none / exact scan at the store level)"""
+    if nprobe < 0:
+        raise ValueError(f"nprobe must be >= 0, got {nprobe}")
+    return nprobe
+
+
+def default_nlist(count: int) -> int:
+    """Cluster count heuristic: ~sqrt(N), at least 1"""
+    return max(1, min(_MAX_NLIST, int(math.sqrt(count))))
+
+
+class IVFIndex:
+    """Inverted-file index over doc_ids
+
+    Only cluster assignments are stored; vectors stay in VectorStore. Doc_ids
+    not known to the index (e.g. written by another process) are treated as
+    candidates for every query, so results never silently miss new rows.
+    """
+
+    def __init__(self, centroids: Any, nprobe: int = DEFAULT_NPROBE):
+        self._np = _require_numpy()
+        self._centroids = centroids
+        self._assignments: Dict[str, int] = {}
+        self._nprobe = nprobe
+        self._version = 0
+
+    # ------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        doc_ids: Sequence[str],
+        matrix: Any,
+        nlist: Optional[int] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Train centroids with spherical k-means and assign every row
+
+        Args:
+            doc_ids: Row identifiers, aligned with `matrix`
+            matrix: (N, dims) float matrix; rows are normalized internally
+            nlist: Number of clusters (default ~sqrt(N))
+            nprobe: Default clusters probed per query
+            seed: RNG seed, builds are deterministic
+        """
+        np = _require_numpy()
+        data = _normalize_rows(np, np.asarray(matrix, dtype=np.float32))
+        count = data.shape[0]
+        if count == 0:
+            raise ValueError("Cannot build ANN index over an empty store")
+
+        nlist = min(nlist or default_nlist(count), count)
+        rng = np.random.default_rng(seed)
+
+        train = data
+        if count > _KMEANS_MAX_TRAIN:
+            train = data[rng.choice(count, _KMEANS_MAX_TRAIN, replace=False)]
+
+        centroids = train[rng.choice(train.shape[0], nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(train @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = train[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+                else:
+                    # Re-seed empty clusters to keep all lists useful
+                    centroids[c] = train[rng.integers(train.shape[0])]
+            centroids = _normalize_rows(np, centroids)
+
+        index = cls(centroids, nprobe=nprobe)
+        index._assign(doc_ids, data)
+        return index
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        """Load a persisted index"""
+        np = _require_numpy()
+        with np.load(str(path), allow_pickle=False) as data:
+            index = cls(data["centroids"].astype(np.float32), nprobe=int(data["nprobe"]))
+            index._assignments = dict(
+                zip(data["doc_ids"].tolist(), data["lists"].astype(int).tolist())
+            )
+        return index
+
+    def save(self, path: Path) -> None:
+        """Persist atomically (write temp file, then replace)"""
+        np = self._np
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc_ids = list(self._assignments)
+        # Unique temp name: concurrent savers never write into each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    centroids=self._centroids,
+                    doc_ids=np.asarray(doc_ids, dtype=str),
+                    lists=np.asarray([self._assignments[d] for d in doc_ids], dtype=np.int32),
+                    nprobe=np.asarray(self._nprobe),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def copy(self) -> "IVFIndex":
+        """Copy sharing the (immutable) centroids, e.g. to save outside a lock"""
+        index = type(self)(self._centroids, nprobe=self._nprobe)
+        index._assignments = dict(self._assignments)
+        index._version = self._version
+        return index
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def _assign(self, doc_ids: Sequence[str], normalized: Any) -> None:
+        if not len(doc_ids):
+            return
+        labels = self._np.argmax(normalized @ self._centroids.T, axis=1)
+        for doc_id, label in zip(doc_ids, labels.tolist()):
+            self._assignments[doc_id] = label
+        self._version += 1
+
+    def add(self, doc_ids: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Assign new/updated vectors to their nearest cluster"""
+        if not doc_ids:
+            return
+        np = self._np
+        data = _normalize_rows(np, np.asarray(vectors, dtype=np.float32))
+        self._assign(doc_ids, data)
+
+    def remove(self, doc_ids: Sequence[str]) -> int:
+        """Forget doc_ids, return how many were known"""
+        removed = 0
+        for doc_id in doc_ids:
+            if self._assignments.pop(doc_id, None) is not None:
+                removed += 1
+        if removed:
+            self._version += 1
+        return removed
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def probe(self, query: Any, nprobe: Optional[int] = None) -> List[int]:
+        """Return the cluster ids closest to a normalized query
+
+        Raises:
+            ValueError: nprobe is negative
+        """
+        nprobe = self._nprobe if nprobe is None else check_nprobe(nprobe)
+        if nprobe == 0:
+            return []
+        scores = self._centroids @ query
+        if nprobe >= len(scores):
+            return list(range(len(scores)))
+        return self._np.argpartition(-scores, nprobe - 1)[:nprobe].tolist()
+
+    def rank_clusters(self, query: Any) -> List[int]:
+        """All cluster ids, closest to a normalized query first"""
+        return self._np.argsort(-(self._centroids @ query), kind="stable").tolist()
+
+    def list_rows(self, doc_ids: Sequence[str]) -> Any:
+        """Cluster id per row of a snapshot (-1 = unknown to the index)"""
+        assignments = self._assignments
+        return self._np.fromiter(
+            (assignments.get(d, -1) for d in doc_ids), dtype=self._np.int32, count=len(doc_ids)
+        )
+
+    @property
+    def nlist(self) -> int:
+        return int(self._centroids.shape[0])
+
+    @property
+    def nprobe(self) -> int:
+        return self._nprobe
+
+    @property
+    def dimensions(self) -> int:
+        return int(self._centroids.shape[1])
+
+    @property
+    def version(self) -> int:
+        """Bumped on every assignment change (used to refresh row mappings)"""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._assignments)
@@ -8,19 +8,55 @@ Index sources:
     - Project docs: CONTRIBUTING_AI.md, CONTEXT.md, DECISIONS.md, ROADMAP.md, PRD.md
     - Insight YAML: title + body + tags
     - Code files (optional): docstring / function signatures
+
+Indexing is incremental: each chunk records a content hash (which includes the
+embedder identity) and its source mtime. Sources whose mtime is unchanged are
+skipped without reading, unchanged chunks skip the embedder, and chunks whose
+source disappeared are deleted. Changed chunks are embedded and committed in
+batches of CHECKPOINT_BATCH_SIZE, so an interrupted pass loses at most one
+batch of embedding work.
+
+`Indexer.rebuild()` builds a fresh index in a shadow database and swaps it in
+only when complete: queries keep reading the old index meanwhile, and a rerun
+after an interruption resumes from the shadow's committed batches.
+
+Every pass records an index manifest (embedder backend/model/dimensions,
+codec, chunk count, corpus hash, see manifest.py); vector searches refuse to
+run with an embedder other than the one recorded there.
+
+`Indexer.reduce_dimensions()` fits a projection (PCA or random, see
+projection.py) over the indexed vectors and reports its estimated recall;
+rebuilds re-fit the projection of the index they replace.
+
+Search results are cached per index generation (see query_cache.py), so a
+repeated query skips both the embedder and the scan until the index changes.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import shutil
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 
 from ..insight.embedder import Embedder, EmbedderConfig
-from .vector_store import VectorDocument, VectorStore
+from .manifest import MISSING_MANIFEST_MESSAGE, IndexManifest, ReindexNeeded
+from .projection import PROJECTION_PCA, Projection, check_method, estimate_recall
+from .query_cache import QUERY_CACHE_FILENAME, QueryResultCache
+from .vector_store import (
+    RERANK_FACTOR,
+    SEARCH_MODES,
+    SearchFilter,
+    VectorDocument,
+    VectorStore,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,31 +84,105 @@ class IndexStats:
     insights_indexed: int = 0
     chunks_total: int = 0
     skipped: int = 0
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    # Rebuild only: chunks already built by an interrupted earlier rebuild
+    resumed: int = 0
     errors: List[str] = field(default_factory=list)
+    # Pipelined indexing only: stage -> {chunks, seconds, chunks_per_sec}
+    throughput: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # Rebuild of a projected index only: see Indexer.reduce_dimensions
+    projection: Dict[str, Any] = field(default_factory=dict)
+
+    def merge(self, other: "IndexStats") -> None:
+        """Accumulate another stats object into this one"""
+        self.documents_indexed += other.documents_indexed
+        self.insights_indexed += other.insights_indexed
+        self.chunks_total += other.chunks_total
+        self.skipped += other.skipped
+        self.added += other.added
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.removed += other.removed
+        self.resumed += other.resumed
+        self.errors.extend(other.errors)
+        self.throughput.update(other.throughput)
+        self.projection.update(other.projection)
+
+
+# index_meta key prefix: "embedder:<source_type>" -> identity of the embedder used
+EMBEDDER_META_KEY = "embedder"
+
+# Changed chunks embedded and committed together (the resume granularity)
+CHECKPOINT_BATCH_SIZE = 256
+
+# Called as progress(phase, chunks_done, chunks_total); total is None when unknown
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+
+
+def vectors_dir(project_root: Path) -> Path:
+    """Directory holding index.db, the ANN index and the embedding cache"""
+    return project_root / ".vibecollab" / "vectors"
+
+
+def rebuild_dir(project_root: Path) -> Path:
+    """Directory of the shadow index built by `Indexer.rebuild()`
+
+    A subdirectory, so the shadow never shares the live ANN index file.
+    """
+    return vectors_dir(project_root) / "rebuild"
+
+
+def query_cache_path(project_root: Path) -> Path:
+    """Persistent query result cache shared by CLI invocations"""
+    return vectors_dir(project_root) / QUERY_CACHE_FILENAME
+
+
+def default_embedder_config(project_root: Path) -> EmbedderConfig:
+    """Embedder config used when no embedder is passed (auto backend + disk cache)"""
+    return EmbedderConfig(backend="auto", cache_dir=str(vectors_dir(project_root)))
+
+
+def _chunk_hash(embedder_id: str, text: str, metadata: dict) -> str:
+    """Content hash of a chunk; changes when text, metadata or embedder change"""
+    payload = json.dumps([embedder_id, text, metadata], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 def _split_markdown_by_heading(text: str, source: str) -> List[Dict[str, str]]:
     """Split Markdown document into chunks by heading
 
     Each chunk contains a heading and its content until the next same-level or higher-level heading.
+    `path` is the chain of enclosing headings ("# A > ## B"), used for stable chunk ids.
     """
     lines = text.splitlines()
     chunks: List[Dict[str, str]] = []
     current_heading = ""
     current_lines: List[str] = []
+    stack: List[Tuple[int, str]] = []  # (level, heading) of the enclosing headings
+
+    def _flush() -> None:
+        content = "\n".join(current_lines).strip()
+        if content:
+            chunks.append({
+                "heading": current_heading,
+                "content": content,
+                "source": source,
+                "path": " > ".join(h for _, h in stack),
+            })
 
     for line in lines:
         stripped = line.strip()
         if stripped.startswith("#"):
             # Save current chunk
             if current_lines:
-                content = "\n".join(current_lines).strip()
-                if content:
-                    chunks.append({
-                        "heading": current_heading,
-                        "content": content,
-                        "source": source,
-                    })
+                _flush()
+            level = len(stripped) - len(stripped.lstrip("#"))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, stripped))
             current_heading = stripped
             current_lines = [line]
         else:
@@ -80,13 +190,7 @@ def _split_markdown_by_heading(text: str, source: str) -> List[Dict[str, str]]:
 
     # Last chunk
     if current_lines:
-        content = "\n".join(current_lines).strip()
-        if content:
-            chunks.append({
-                "heading": current_heading,
-                "content": content,
-                "source": source,
-            })
+        _flush()
 
     return chunks
 
@@ -161,9 +265,109 @@ def _split_yaml_by_keys(text: str, source: str) -> List[Dict[str, str]]:
     return chunks
 
 
+def _chunk_doc_id(source: str, heading_path: str, occurrence: int) -> str:
+    """Id of a document chunk, derived from its heading path rather than its position
+
+    `occurrence` numbers chunks sharing a heading path, so inserting or
+    deleting a section leaves the ids of the other sections unchanged.
+    """
+    digest = hashlib.sha256(f"{heading_path}\0{occurrence}".encode("utf-8")).hexdigest()
+    return f"doc:{source}:{digest[:16]}"
+
+
+@dataclass
+class SourceJob:
+    """A source file whose chunks must be (re)built"""
+
+    source_type: str  # "document" | "insight"
+    path: str  # Relative to the project root
+    mtime: float
+    previous_ids: List[str] = field(default_factory=list)
+
+
+def _chunk_document(project_root: Path, job: SourceJob) -> List[VectorDocument]:
+    """Split a document file into chunks (empty list = nothing to index)"""
+    text = (project_root / job.path).read_text(encoding="utf-8")
+    if not text.strip():
+        return []
+
+    # Choose splitter based on file extension
+    if job.path.endswith((".yaml", ".yml")):
+        chunks = _split_yaml_by_keys(text, job.path)
+    else:
+        chunks = _split_markdown_by_heading(text, job.path)
+    docs = []
+    occurrences: Dict[str, int] = {}
+    for chunk in chunks:
+        path = chunk.get("path", chunk["heading"])
+        occurrence = occurrences.get(path, 0)
+        occurrences[path] = occurrence + 1
+        docs.append(VectorDocument(
+            doc_id=_chunk_doc_id(job.path, path, occurrence),
+            text=chunk["content"],
+            vector=[],
+            source=job.path,
+            source_type="document",
+            metadata={"heading": chunk["heading"]},
+            source_mtime=job.mtime,
+        ))
+    return docs
+
+
+def _load_insight(project_root: Path, job: SourceJob) -> List[VectorDocument]:
+    """Parse an Insight YAML file into its single chunk (empty list = nothing to index)"""
+    with open(project_root / job.path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if not data:
+        return []
+
+    ins_id = data.get("id", Path(job.path).stem)
+    text = _insight_to_text(data)
+    if not text.strip():
+        return []
+
+    return [
+        VectorDocument(
+            doc_id=f"insight:{ins_id}",
+            text=text,
+            vector=[],
+            source=job.path,
+            source_type="insight",
+            metadata={
+                "title": data.get("title", ""),
+                "tags": data.get("tags", []),
+                "category": data.get("category", ""),
+            },
+            source_mtime=job.mtime,
+        )
+    ]
+
+
+def parse_sources(
+    project_root: str, jobs: List[SourceJob]
+) -> List[Tuple[List[VectorDocument], Optional[str]]]:
+    """Parse source files into chunks: [(chunks, error message or None)] per job
+
+    Module-level and picklable so it can run in a worker process.
+    """
+    root = Path(project_root)
+    results: List[Tuple[List[VectorDocument], Optional[str]]] = []
+    for job in jobs:
+        parse = _chunk_document if job.source_type == "document" else _load_insight
+        try:
+            results.append((parse(root, job), None))
+        except Exception as e:
+            results.append(([], str(e)))
+    return results
+
+
 class Indexer:
     """Project indexer
 
+    `query_cache` holds search results (default: a private in-memory LRU);
+    pass a shared or persistent QueryResultCache to reuse results across
+    Indexers or processes.
+
     Usage:
         indexer = Indexer(project_root)
         stats = indexer.index_all()
@@ -175,23 +379,33 @@ class Indexer:
         embedder: Optional[Embedder] = None,
         store: Optional[VectorStore] = None,
         doc_files: Optional[List[str]] = None,
+        progress: Optional[ProgressCallback] = None,
+        query_cache: Optional[QueryResultCache] = None,
     ):
         self._project_root = project_root
         self._doc_files = doc_files or list(DEFAULT_DOC_FILES)
+        self._progress = progress
+        self._query_cache = query_cache if query_cache is not None else QueryResultCache()
+        # Per-thread embedding time of the last search (see last_embed_ms)
+        self._local = threading.local()
 
         # Embedder
         if embedder:
             self._embedder = embedder
         else:
-            self._embedder = Embedder(EmbedderConfig(backend="auto"))
+            self._embedder = Embedder(default_embedder_config(project_root))
 
         # VectorStore
         if store:
             self._store = store
         else:
-            db_path = project_root / ".vibecollab" / "vectors" / "index.db"
+            db_path = vectors_dir(project_root) / "index.db"
             self._store = VectorStore(db_path=db_path, dimensions=self._embedder.dimensions)
 
+    @property
+    def project_root(self) -> Path:
+        return self._project_root
+
     @property
     def store(self) -> VectorStore:
         return self._store
@@ -200,32 +414,279 @@ class Indexer:
     def embedder(self) -> Embedder:
         return self._embedder
 
-    def index_all(self) -> IndexStats:
-        """Index all documents and Insights"""
-        stats = IndexStats()
+    @property
+    def query_cache(self) -> QueryResultCache:
+        return self._query_cache
 
-        # Index documents
-        doc_stats = self.index_documents()
-        stats.documents_indexed += doc_stats.documents_indexed
-        stats.chunks_total += doc_stats.chunks_total
-        stats.skipped += doc_stats.skipped
-        stats.errors.extend(doc_stats.errors)
+    def query_cache_stats(self) -> Dict[str, Any]:
+        """Query result cache hit rate and size"""
+        return self._query_cache.stats()
 
-        # Index Insights
-        ins_stats = self.index_insights()
-        stats.insights_indexed += ins_stats.insights_indexed
-        stats.chunks_total += ins_stats.chunks_total
-        stats.errors.extend(ins_stats.errors)
+    @property
+    def last_embed_ms(self) -> float:
+        """Query embedding time of this thread's last search/search_many call
 
-        return stats
+        0.0 when nothing was embedded (query cache hits, lexical mode). Unlike
+        the embedder's latency_stats(), calls on other threads do not change it.
+        """
+        return round(getattr(self._local, "embed_seconds", 0.0) * 1000, 3)
 
-    def index_documents(self) -> IndexStats:
-        """Index project document files (YAML-first, skip MD if YAML exists)"""
+    @property
+    def embedder_id(self) -> str:
+        """Identity of the embedder; vectors from a different one are stale"""
+        return f"{self._embedder.model_name}:{self._embedder.dimensions}"
+
+    def _embedder_unchanged(self, source_type: str) -> bool:
+        key = f"{EMBEDDER_META_KEY}:{source_type}"
+        return self._store.get_meta(key) == self.embedder_id
+
+    def _begin_pass(self, source_type: str, jobs: List[SourceJob]) -> None:
+        """Disable the mtime fast path until the pass completes
+
+        A source can be half-written when a pass is interrupted between
+        checkpoint batches; the next pass then re-hashes every source instead
+        of trusting mtimes (committed chunks still skip the embedder).
+        """
+        if jobs and self._embedder_unchanged(source_type):
+            self._store.set_meta(f"{EMBEDDER_META_KEY}:{source_type}", "")
+
+    def _record_embedder(self, source_type: str) -> None:
+        self._store.set_meta(f"{EMBEDDER_META_KEY}:{source_type}", self.embedder_id)
+        self._store.set_manifest(
+            IndexManifest.for_embedder(
+                self._embedder,
+                codec=self._store.codec,
+                chunk_count=self._store.count(),
+                corpus_hash=self._store.corpus_hash(),
+            )
+        )
+
+    def manifest(self) -> Optional[IndexManifest]:
+        """Manifest recorded by the last indexing pass (None if never indexed)"""
+        return self._store.get_manifest()
+
+    def _check_manifest(self) -> None:
+        """Refuse vector queries the stored vectors cannot answer meaningfully"""
+        manifest = self._store.get_manifest()
+        if manifest is not None:
+            manifest.check(self._embedder)
+        elif self._store.count():
+            raise ReindexNeeded(MISSING_MANIFEST_MESSAGE)
+
+    def index_all(
+        self,
+        workers: int = 1,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ) -> IndexStats:
+        """Index all documents and Insights
+
+        With `workers` > 1 the pipelined indexer is used (see pipeline.py):
+        parsing in a process pool, batched embedding and a single writer run
+        concurrently. The resulting index is identical to the serial path.
+        """
+        if workers > 1:
+            from .pipeline import IndexPipeline
+
+            return IndexPipeline(
+                self, workers=workers, batch_size=batch_size, queue_size=queue_size
+            ).run()
         stats = IndexStats()
+        stats.merge(self.index_documents())
+        stats.merge(self.index_insights())
+        return stats
+
+    def rebuild(
+        self,
+        workers: int = 1,
+        batch_size: Optional[int] = None,
+        codec: Optional[str] = None,
+        keep_exact: Optional[bool] = None,
+        reduce_dims: Optional[int] = None,
+        projection_method: Optional[str] = None,
+    ) -> IndexStats:
+        """Rebuild the index from scratch without taking the current one offline
+
+        Builds into a shadow database (see `rebuild_dir`) and atomically copies
+        it over the live one when complete (`VectorStore.replace_from`).
+        Until then searches keep using the old index. If a previous rebuild
+        was interrupted, its committed chunks are reused (`stats.resumed`);
+        chunks from another embedder fail their content hash and are redone.
+        `codec`/`keep_exact` default to the live store's settings, and so do
+        `reduce_dims`/`projection_method` (0 = no projection): the projection
+        is re-fitted on the shadow before the swap (report in `stats.projection`).
+        """
+        live = self._store
+        if live.db_path is None:
+            # In-memory store: no concurrent readers to protect
+            live.delete_by_source_type("document")
+            live.delete_by_source_type("insight")
+            return self.index_all(workers=workers, batch_size=batch_size)
+
+        live_projection = live.projection
+        if reduce_dims is None:
+            reduce_dims = live_projection.target_dims if live_projection else 0
+        if projection_method is None:
+            projection_method = live_projection.method if live_projection else PROJECTION_PCA
+
+        shadow_dir = rebuild_dir(self._project_root)
+        shadow = VectorStore(
+            db_path=shadow_dir / "index.db",
+            dimensions=self._embedder.dimensions,
+            codec=codec if codec is not None else live.codec,
+            keep_exact=keep_exact if keep_exact is not None else live.keep_exact,
+        )
+        builder = Indexer(
+            self._project_root,
+            embedder=self._embedder,
+            store=shadow,
+            doc_files=self._doc_files,
+            progress=self._progress,
+        )
+        try:
+            resumed = shadow.count()
+            stats = builder.index_all(workers=workers, batch_size=batch_size)
+            stats.resumed = resumed
+            # A resumed shadow may already carry the projection
+            current = shadow.projection
+            have = (current.target_dims, current.method) if current else None
+            if have != ((reduce_dims, projection_method) if reduce_dims else None):
+                stats.projection = builder.reduce_dimensions(reduce_dims, projection_method)
+        finally:
+            shadow.close()
+        live.replace_from(shadow_dir / "index.db", dimensions=self._embedder.dimensions)
+        shutil.rmtree(shadow_dir, ignore_errors=True)
+        return stats
+
+    def report_progress(self, phase: str, done: int, total: Optional[int]) -> None:
+        """Forward progress to the callback passed to the constructor, if any"""
+        if self._progress is not None:
+            self._progress(phase, done, total)
+
+    def split_changed(
+        self, existing: Dict[str, Tuple[str, float, str]], chunks: List[VectorDocument]
+    ) -> Tuple[List[VectorDocument], List[VectorDocument]]:
+        """Hash chunks and split them into (changed, unchanged) against the stored states"""
+        changed: List[VectorDocument] = []
+        unchanged: List[VectorDocument] = []
+        for doc in chunks:
+            doc.content_hash = _chunk_hash(self.embedder_id, doc.text, doc.metadata)
+            previous = existing.get(doc.doc_id)
+            if previous and previous[0] == doc.content_hash:
+                unchanged.append(doc)
+            else:
+                changed.append(doc)
+        return changed, unchanged
+
+    def embed_chunks(self, chunks: List[VectorDocument]) -> None:
+        """Fill in chunk vectors (one embedder call)"""
+        vectors = self._embedder.embed_texts([doc.text for doc in chunks])
+        for doc, vector in zip(chunks, vectors):
+            doc.vector = vector
+            # Stored text is truncated after embedding the full chunk
+            doc.text = doc.text[:2000]
+
+    def write_changed(
+        self,
+        stats: IndexStats,
+        existing: Dict[str, Tuple[str, float, str]],
+        changed: List[VectorDocument],
+    ) -> None:
+        """Upsert embedded chunks in one transaction"""
+        self._store.upsert_batch(changed)
+        for doc in changed:
+            if doc.doc_id in existing:
+                stats.updated += 1
+            else:
+                stats.added += 1
+
+    def refresh_unchanged(
+        self,
+        stats: IndexStats,
+        existing: Dict[str, Tuple[str, float, str]],
+        unchanged: List[VectorDocument],
+    ) -> None:
+        """Refresh the recorded mtime of unchanged chunks (no embedding)"""
+        stale_mtimes = {
+            doc.doc_id: doc.source_mtime
+            for doc in unchanged
+            if existing[doc.doc_id][1] != doc.source_mtime
+        }
+        if stale_mtimes:
+            self._store.set_source_mtimes(stale_mtimes)
+        stats.unchanged += len(unchanged)
+
+    def _sync_chunks(
+        self,
+        stats: IndexStats,
+        existing: Dict[str, Tuple[str, float, str]],
+        chunks: List[VectorDocument],
+        advance: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Embed and upsert only new/changed chunks; refresh mtime of unchanged ones
+
+        Changed chunks are embedded and committed CHECKPOINT_BATCH_SIZE at a
+        time; `advance(n)` is called as chunks are done. Each chunk must carry
+        its `source_mtime`; `vector` is filled in here.
+        """
+        changed, unchanged = self.split_changed(existing, chunks)
+        self.refresh_unchanged(stats, existing, unchanged)
+        if advance is not None and unchanged:
+            advance(len(unchanged))
+        for start in range(0, len(changed), CHECKPOINT_BATCH_SIZE):
+            batch = changed[start : start + CHECKPOINT_BATCH_SIZE]
+            self.embed_chunks(batch)
+            self.write_changed(stats, existing, batch)
+            if advance is not None:
+                advance(len(batch))
+
+    def finish_pass(
+        self,
+        stats: IndexStats,
+        source_type: str,
+        existing: Dict[str, Tuple[str, float, str]],
+        kept: set,
+    ) -> None:
+        """Delete stored chunks not kept by this pass, record the embedder, save the ANN index"""
+        stale_ids = [d for d in existing if d not in kept]
+        if stale_ids:
+            stats.removed += self._store.delete_many(stale_ids)
+        self._record_embedder(source_type)
+        self._store.flush_ann_index()
+
+    @staticmethod
+    def ids_of_source(existing: Dict[str, Tuple[str, float, str]], source: str) -> List[str]:
+        """Stored chunk ids of one source file"""
+        return [doc_id for doc_id, (_, _, src) in existing.items() if src == source]
+
+    @staticmethod
+    def _ids_by_source(existing: Dict[str, Tuple[str, float, str]]) -> Dict[str, List[str]]:
+        by_source: Dict[str, List[str]] = {}
+        for doc_id, (_, _, source) in existing.items():
+            by_source.setdefault(source, []).append(doc_id)
+        return by_source
+
+    @staticmethod
+    def _source_unchanged(
+        existing: Dict[str, Tuple[str, float, str]], doc_ids: List[str], mtime: float
+    ) -> bool:
+        return bool(doc_ids) and all(existing[d][1] == mtime for d in doc_ids)
+
+    def plan_documents(
+        self, stats: IndexStats
+    ) -> Tuple[Dict[str, Tuple[str, float, str]], set, List[SourceJob]]:
+        """Stored document states, chunk ids kept as-is, and files to (re)parse
+
+        Files whose mtime is unchanged are kept without reading (fast path).
+        """
+        existing = self._store.chunk_states("document")
+        by_source = self._ids_by_source(existing)
+        fast_path = self._embedder_unchanged("document")
+        kept: set = set()
+        jobs: List[SourceJob] = []
 
         # Deduplicate: if both .yaml and .md exist, only index .yaml
         seen_stems: set = set()
-        effective_files: List[str] = []
         for doc_file in self._doc_files:
             stem = doc_file.rsplit(".", 1)[0].lower().replace("/", "_")
             full_path = self._project_root / doc_file
@@ -236,114 +697,151 @@ class Indexer:
                 stats.skipped += 1
                 continue
             seen_stems.add(stem)
-            effective_files.append(doc_file)
-
-        for doc_file in effective_files:
-            full_path = self._project_root / doc_file
 
+            previous_ids = by_source.get(doc_file, [])
             try:
-                text = full_path.read_text(encoding="utf-8")
-                if not text.strip():
-                    stats.skipped += 1
-                    continue
-
-                # Choose splitter based on file extension
-                if doc_file.endswith((".yaml", ".yml")):
-                    chunks = _split_yaml_by_keys(text, doc_file)
-                else:
-                    chunks = _split_markdown_by_heading(text, doc_file)
-                if not chunks:
-                    stats.skipped += 1
-                    continue
-
-                # Batch embed
-                texts = [c["content"] for c in chunks]
-                vectors = self._embedder.embed_texts(texts)
-
-                docs = []
-                for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
-                    doc_id = f"doc:{doc_file}:{i}"
-                    docs.append(VectorDocument(
-                        doc_id=doc_id,
-                        text=chunk["content"][:2000],  # Truncate long text
-                        vector=vector,
-                        source=doc_file,
-                        source_type="document",
-                        metadata={"heading": chunk["heading"]},
-                    ))
-
-                self._store.upsert_batch(docs)
+                mtime = full_path.stat().st_mtime
+            except OSError as e:
+                job = SourceJob("document", doc_file, 0.0, previous_ids)
+                self.accept_document(stats, kept, job, [], str(e))
+                continue
+            if fast_path and self._source_unchanged(existing, previous_ids, mtime):
+                kept.update(previous_ids)
+                stats.unchanged += len(previous_ids)
                 stats.documents_indexed += 1
-                stats.chunks_total += len(docs)
+                stats.chunks_total += len(previous_ids)
+                continue
+            jobs.append(SourceJob("document", doc_file, mtime, previous_ids))
+        self._begin_pass("document", jobs)
+        return existing, kept, jobs
 
-            except Exception as e:
-                stats.errors.append(f"{doc_file}: {e}")
-                logger.warning("Failed to index document: %s -- %s", doc_file, e)
+    def accept_document(
+        self,
+        stats: IndexStats,
+        kept: set,
+        job: SourceJob,
+        docs: List[VectorDocument],
+        error: Optional[str],
+    ) -> List[VectorDocument]:
+        """Account for a parsed document file; returns the chunks to sync"""
+        if error is not None:
+            # Keep the previous chunks of a source that failed to index
+            kept.update(job.previous_ids)
+            stats.errors.append(f"{job.path}: {error}")
+            logger.warning("Failed to index document: %s -- %s", job.path, error)
+            return []
+        if not docs:
+            stats.skipped += 1
+            return []
+        kept.update(doc.doc_id for doc in docs)
+        stats.documents_indexed += 1
+        stats.chunks_total += len(docs)
+        return docs
 
+    def index_documents(self) -> IndexStats:
+        """Index project document files (YAML-first, skip MD if YAML exists)"""
+        stats = IndexStats()
+        existing, kept, jobs = self.plan_documents(stats)
+
+        # Parse first, so progress knows how many chunks there are to sync
+        parsed = parse_sources(str(self._project_root), jobs)
+        total = sum(len(docs) for docs, _ in parsed)
+        done = 0
+
+        def advance(n: int) -> None:
+            nonlocal done
+            done += n
+            self.report_progress("document", done, total)
+
+        self.report_progress("document", 0, total)
+        for job, (docs, error) in zip(jobs, parsed):
+            if error is None and docs:
+                try:
+                    self._sync_chunks(stats, existing, docs, advance)
+                except Exception as e:
+                    docs, error = [], str(e)
+            self.accept_document(stats, kept, job, docs, error)
+
+        self.finish_pass(stats, "document", existing, kept)
         return stats
 
-    def index_insights(self) -> IndexStats:
-        """Index Insight YAML files"""
-        stats = IndexStats()
+    def plan_insights(
+        self, stats: IndexStats
+    ) -> Optional[Tuple[Dict[str, Tuple[str, float, str]], set, List[SourceJob]]]:
+        """Like `plan_documents` for Insight YAML files (None = nothing to do)"""
+        existing = self._store.chunk_states("insight")
         insights_dir = self._project_root / ".vibecollab" / "insights"
 
-        if not insights_dir.exists():
-            return stats
+        insight_files = sorted(insights_dir.glob("INS-*.yaml")) if insights_dir.exists() else []
+        if not insight_files and not existing:
+            return None
 
-        insight_files = sorted(insights_dir.glob("INS-*.yaml"))
-        if not insight_files:
-            return stats
+        by_source = self._ids_by_source(existing)
+        fast_path = self._embedder_unchanged("insight")
+        kept: set = set()
+        jobs: List[SourceJob] = []
 
-        docs = []
-        texts = []
         for ins_file in insight_files:
+            rel_path = str(ins_file.relative_to(self._project_root))
+            previous_ids = by_source.get(rel_path, [])
             try:
-                with open(ins_file, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                if not data:
-                    continue
-
-                ins_id = data.get("id", ins_file.stem)
-                text = _insight_to_text(data)
-                if not text.strip():
-                    continue
-
-                texts.append(text)
-                docs.append({
-                    "ins_id": ins_id,
-                    "text": text,
-                    "file": str(ins_file.relative_to(self._project_root)),
-                    "data": data,
-                })
-
-            except Exception as e:
-                stats.errors.append(f"{ins_file.name}: {e}")
-
-        if not texts:
+                mtime = ins_file.stat().st_mtime
+            except OSError as e:
+                job = SourceJob("insight", rel_path, 0.0, previous_ids)
+                self.accept_insight(stats, kept, job, [], str(e))
+                continue
+            if fast_path and self._source_unchanged(existing, previous_ids, mtime):
+                kept.update(previous_ids)
+                stats.unchanged += len(previous_ids)
+                stats.insights_indexed += len(previous_ids)
+                continue
+            jobs.append(SourceJob("insight", rel_path, mtime, previous_ids))
+        self._begin_pass("insight", jobs)
+        return existing, kept, jobs
+
+    def accept_insight(
+        self,
+        stats: IndexStats,
+        kept: set,
+        job: SourceJob,
+        docs: List[VectorDocument],
+        error: Optional[str],
+    ) -> List[VectorDocument]:
+        """Account for a parsed Insight file; returns the chunks to sync"""
+        if error is not None:
+            kept.update(job.previous_ids)
+            stats.errors.append(f"{Path(job.path).name}: {error}")
+            return []
+        kept.update(doc.doc_id for doc in docs)
+        return docs
+
+    def index_insights(self) -> IndexStats:
+        """Index Insight YAML files"""
+        stats = IndexStats()
+        plan = self.plan_insights(stats)
+        if plan is None:
             return stats
+        existing, kept, jobs = plan
 
-        # Batch embed
-        vectors = self._embedder.embed_texts(texts)
-
-        vec_docs = []
-        for doc_info, vector in zip(docs, vectors):
-            vec_docs.append(VectorDocument(
-                doc_id=f"insight:{doc_info['ins_id']}",
-                text=doc_info["text"][:2000],
-                vector=vector,
-                source=doc_info["file"],
-                source_type="insight",
-                metadata={
-                    "title": doc_info["data"].get("title", ""),
-                    "tags": doc_info["data"].get("tags", []),
-                    "category": doc_info["data"].get("category", ""),
-                },
-            ))
-
-        count = self._store.upsert_batch(vec_docs)
-        stats.insights_indexed = count
-        stats.chunks_total += count
+        docs: List[VectorDocument] = []
+        for job, (parsed, error) in zip(jobs, parse_sources(str(self._project_root), jobs)):
+            docs.extend(self.accept_insight(stats, kept, job, parsed, error))
 
+        # Batch embed changed Insights across all files
+        if docs:
+            done = 0
+
+            def advance(n: int) -> None:
+                nonlocal done
+                done += n
+                self.report_progress("insight", done, len(docs))
+
+            self.report_progress("insight", 0, len(docs))
+            self._sync_chunks(stats, existing, docs, advance)
+            stats.insights_indexed += len(docs)
+
+        self.finish_pass(stats, "insight", existing, kept)
+        stats.chunks_total = stats.insights_indexed
         return stats
 
     def search(
@@ -352,12 +850,247 @@ class Indexer:
         top_k: int = 10,
         source_type: Optional[str] = None,
         min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        filters: Optional[SearchFilter] = None,
+        mode: str = "vector",
+        lexical_candidates_only: bool = False,
     ) -> List:
-        """Semantic search"""
+        """Semantic / lexical / hybrid search
+
+        `nprobe` is the ANN recall/latency knob (None = index default,
+        0 = exact scan); it only applies once `build_ann_index` has run.
+        `rerank` is the exact re-rank depth of quantized stores (see VectorStore.search).
+        `filters` (tags / category / source glob / heading prefix) are applied in
+        SQL before scoring, so top_k counts only matching chunks.
+
+        `mode` is "vector" (default), "lexical" (FTS5 BM25, no embedding call)
+        or "hybrid" (BM25 and vector rankings fused with RRF);
+        `lexical_candidates_only` limits hybrid vector scoring to BM25 hits.
+
+        Results come from the query cache while the index generation is unchanged.
+
+        Raises:
+            ReindexNeeded: vector/hybrid search with an embedder other than the
+                one recorded in the index manifest
+        """
+        params = dict(
+            top_k=top_k,
+            source_type=source_type,
+            min_score=min_score,
+            nprobe=nprobe,
+            rerank=rerank,
+            filters=filters,
+            mode=mode,
+            lexical_candidates_only=lexical_candidates_only,
+        )
+        generation = self._prepare_search(mode)
+        self._local.embed_seconds = 0.0
+        key = self._cache_key(query, params)
+        results = self._query_cache.get(key, generation)
+        if results is None:
+            results = self._search(query, **params)
+            self._query_cache.put(key, generation, results)
+        return results
+
+    def _prepare_search(self, mode: str) -> str:
+        """Validate a search; return the index generation its results belong to"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode!r} (expected one of {', '.join(SEARCH_MODES)})")
+        if mode != "lexical":
+            self._check_manifest()
+        return self._store.index_generation()
+
+    def _cache_key(self, query: str, params: Dict[str, Any]) -> str:
+        return self._query_cache.key(
+            query,
+            embedder=self.embedder_id if params["mode"] != "lexical" else "",
+            # Another process's ANN index is only picked up by reopening the store
+            ann=self._store.ann_index is not None,
+            **params,
+        )
+
+    def _search(
+        self,
+        query: str,
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        nprobe: Optional[int],
+        rerank: Optional[int],
+        filters: Optional[SearchFilter],
+        mode: str,
+        lexical_candidates_only: bool,
+    ) -> List:
+        if mode == "lexical":
+            return self._store.search_lexical(
+                query, top_k=top_k, source_type=source_type, filters=filters
+            )
+
+        start = time.perf_counter()
         query_vector = self._embedder.embed_text(query)
+        self._local.embed_seconds = time.perf_counter() - start
+        if mode == "hybrid":
+            return self._store.search_hybrid(
+                query,
+                query_vector,
+                top_k=top_k,
+                source_type=source_type,
+                min_score=min_score,
+                filters=filters,
+                lexical_candidates_only=lexical_candidates_only,
+                nprobe=nprobe,
+                rerank=rerank,
+            )
         return self._store.search(
             query_vector,
             top_k=top_k,
             source_type=source_type,
             min_score=min_score,
+            nprobe=nprobe,
+            rerank=rerank,
+            filters=filters,
         )
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        source_type: Optional[str] = None,
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        filters: Optional[SearchFilter] = None,
+        mode: str = "vector",
+        lexical_candidates_only: bool = False,
+    ) -> List[List]:
+        """`search` for several queries; one result list per query, in order
+
+        Cached queries are answered from the query cache; the others are
+        embedded in one batched embedder call. Vector mode scores them all in
+        one pass over the stored vectors (VectorStore.search_many); lexical and
+        hybrid modes run their BM25 lookups per query.
+
+        Raises:
+            ReindexNeeded: as for `search`
+        """
+        params = dict(
+            top_k=top_k,
+            source_type=source_type,
+            min_score=min_score,
+            nprobe=nprobe,
+            rerank=rerank,
+            filters=filters,
+            mode=mode,
+            lexical_candidates_only=lexical_candidates_only,
+        )
+        generation = self._prepare_search(mode)
+        self._local.embed_seconds = 0.0
+        keys = [self._cache_key(query, params) for query in queries]
+        batches = [self._query_cache.get(key, generation) for key in keys]
+        missing = [i for i, results in enumerate(batches) if results is None]
+        if missing:
+            found = self._search_many([queries[i] for i in missing], **params)
+            for i, results in zip(missing, found):
+                self._query_cache.put(keys[i], generation, results)
+                batches[i] = results
+        return batches
+
+    def _search_many(
+        self,
+        queries: List[str],
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        nprobe: Optional[int],
+        rerank: Optional[int],
+        filters: Optional[SearchFilter],
+        mode: str,
+        lexical_candidates_only: bool,
+    ) -> List[List]:
+        if mode == "lexical":
+            return [
+                self._store.search_lexical(q, top_k=top_k, source_type=source_type, filters=filters)
+                for q in queries
+            ]
+
+        start = time.perf_counter()
+        query_vectors = self._embedder.embed_texts(list(queries))
+        self._local.embed_seconds = time.perf_counter() - start
+        if mode == "hybrid":
+            return [
+                self._store.search_hybrid(
+                    query,
+                    query_vector,
+                    top_k=top_k,
+                    source_type=source_type,
+                    min_score=min_score,
+                    filters=filters,
+                    lexical_candidates_only=lexical_candidates_only,
+                    nprobe=nprobe,
+                    rerank=rerank,
+                )
+                for query, query_vector in zip(queries, query_vectors)
+            ]
+        return self._store.search_many(
+            query_vectors,
+            top_k=top_k,
+            source_type=source_type,
+            min_score=min_score,
+            nprobe=nprobe,
+            rerank=rerank,
+            filters=filters,
+        )
+
+    def build_ann_index(self, nlist: Optional[int] = None, nprobe: Optional[int] = None):
+        """Build the opt-in IVF ANN index over the current store contents"""
+        return self._store.build_ann_index(nlist=nlist, nprobe=nprobe)
+
+    def reduce_dimensions(
+        self,
+        target_dims: int,
+        method: str = PROJECTION_PCA,
+        keep_exact: Optional[bool] = None,
+        seed: int = 0,
+        top_k: int = 10,
+    ) -> Dict[str, Any]:
+        """Project the stored vectors to `target_dims` (0 = back to full dims)
+
+        PCA is fitted over the indexed vectors; the random projection is
+        seeded. `keep_exact` (default: the store's setting) keeps the full
+        vectors for re-ranking. Returns the projection and its recall@top_k
+        against exact search, measured on a sample of indexed vectors before
+        the full vectors may be dropped (None without numpy):
+        {method, source_dims, target_dims, rows, top_k, recall, rerank_recall}.
+
+        Raises:
+            ImportError: PCA without numpy
+            ValueError: bad target dims, too few vectors for PCA, or the
+                full vectors of a projected index were not kept
+        """
+        check_method(method)
+        _, vectors = self._store.full_vectors()
+        projection: Optional[Projection] = None
+        if target_dims:
+            if method == PROJECTION_PCA:
+                projection = Projection.fit_pca(vectors, target_dims, seed=seed)
+            else:
+                projection = Projection.random(self._embedder.dimensions, target_dims, seed=seed)
+        rows = self._store.set_projection(projection, keep_exact=keep_exact)
+
+        report: Dict[str, Any] = {
+            "method": method if projection else "",
+            "source_dims": self._embedder.dimensions,
+            "target_dims": target_dims or self._embedder.dimensions,
+            "rows": rows,
+            "top_k": top_k,
+            "recall": None,
+            "rerank_recall": None,
+        }
+        if projection is not None:
+            report["recall"] = estimate_recall(vectors, projection, top_k=top_k, seed=seed)
+            if self._store.keep_exact:
+                report["rerank_recall"] = estimate_recall(
+                    vectors, projection, top_k=top_k, rerank=top_k * RERANK_FACTOR, seed=seed
+                )
+        return report
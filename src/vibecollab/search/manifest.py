@@ -0,0 +1,252 @@
+"""
+IndexManifest - Record of how index.db was built
+
+The Indexer writes one manifest row (embedder backend, model, dimensions,
+storage codec, build time, chunk count, corpus hash) after every indexing
+pass. Query paths read it to build the embedder that produced the vectors,
+instead of guessing dimensions from a raw BLOB and querying with whatever
+backend is at hand. When that embedder cannot be rebuilt, or a caller's
+embedder differs from it, they refuse with `ReindexNeeded` rather than
+computing meaningless similarities.
+
+Storage: `index_manifest` table in .vibecollab/vectors/index.db
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from .quantization import DEFAULT_CODEC
+
+if TYPE_CHECKING:
+    from ..insight.embedder import Embedder, EmbedderConfig
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_TABLE = "index_manifest"
+
+# Single-row table (id is always 1); created by VectorStore
+MANIFEST_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        backend TEXT NOT NULL,
+        model TEXT NOT NULL,
+        dimensions INTEGER NOT NULL,
+        codec TEXT NOT NULL,
+        built_at TEXT NOT NULL,
+        chunk_count INTEGER NOT NULL,
+        corpus_hash TEXT NOT NULL
+    )
+"""
+
+# Backends whose model is chosen by EmbedderConfig.model
+_CONFIGURABLE_MODEL_BACKENDS = ("openai", "local")
+
+REINDEX_HINT = "run `vibecollab index --rebuild`"
+MISSING_MANIFEST_MESSAGE = (
+    "Reindex needed: index has no manifest (built by an older version); run `vibecollab index`"
+)
+
+
+class ReindexNeeded(RuntimeError):
+    """The index cannot be queried with a matching embedder; it must be rebuilt"""
+
+
+@dataclass
+class IndexManifest:
+    """How an index was built"""
+
+    backend: str  # "openai" | "local" | "pure_python"
+    model: str
+    dimensions: int
+    codec: str = DEFAULT_CODEC
+    built_at: str = ""  # ISO 8601, UTC
+    chunk_count: int = 0
+    corpus_hash: str = ""  # sha256 over (doc_id, content_hash) of every chunk
+
+    @classmethod
+    def for_embedder(cls, embedder: "Embedder", **kwargs: Any) -> "IndexManifest":
+        """Manifest describing vectors produced by `embedder`"""
+        kwargs.setdefault("built_at", datetime.now(timezone.utc).isoformat(timespec="seconds"))
+        return cls(
+            backend=embedder.backend_name,
+            model=embedder.model_name,
+            dimensions=embedder.dimensions,
+            **kwargs,
+        )
+
+    def describe(self) -> str:
+        return f"{self.backend}/{self.model} ({self.dimensions} dims)"
+
+    def mismatch(self, embedder: "Embedder") -> Optional[str]:
+        """Why `embedder` cannot query this index, or None when it matches"""
+        actual = (embedder.backend_name, embedder.model_name, embedder.dimensions)
+        if actual == (self.backend, self.model, self.dimensions):
+            return None
+        return (
+            f"index was built with {self.describe()}, query embedder is "
+            f"{actual[0]}/{actual[1]} ({actual[2]} dims)"
+        )
+
+    def check(self, embedder: "Embedder") -> None:
+        """Raise ReindexNeeded unless `embedder` produced this index's vectors"""
+        reason = self.mismatch(embedder)
+        if reason:
+            raise ReindexNeeded(f"Reindex needed: {reason}; {REINDEX_HINT}")
+
+    def embedder_config(self, base: "EmbedderConfig") -> "EmbedderConfig":
+        """`base` (cache dir, API credentials...) pinned to this index's embedder"""
+        return replace(
+            base,
+            backend=self.backend,
+            model=self.model if self.backend in _CONFIGURABLE_MODEL_BACKENDS else "",
+            dimensions=self.dimensions,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_COLUMNS = tuple(f.name for f in fields(IndexManifest))
+
+
+def corpus_hash(chunks: Iterable[Tuple[str, str]]) -> str:
+    """Hash of (doc_id, content_hash) pairs, expected in doc_id order"""
+    digest = hashlib.sha256()
+    for doc_id, content_hash in chunks:
+        digest.update(f"{doc_id}\0{content_hash or ''}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_manifest_row(conn: sqlite3.Connection) -> Optional[IndexManifest]:
+    """Manifest stored in an open index connection (None if absent)"""
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM {MANIFEST_TABLE} WHERE id = 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Index created before the manifest table existed
+        return None
+    return IndexManifest(*row) if row else None
+
+
+def write_manifest_row(conn: sqlite3.Connection, manifest: IndexManifest) -> None:
+    """Replace the manifest row (caller commits)"""
+    values = [getattr(manifest, name) for name in _COLUMNS]
+    conn.execute(
+        f"INSERT OR REPLACE INTO {MANIFEST_TABLE} (id, {', '.join(_COLUMNS)}) "
+        f"VALUES (1, {', '.join('?' * len(_COLUMNS))})",
+        values,
+    )
+
+
+def _connect_readonly(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def read_manifest(db_path: Path) -> Optional[IndexManifest]:
+    """Read the manifest of index.db without creating or migrating it"""
+    if not Path(db_path).exists():
+        return None
+    try:
+        conn = _connect_readonly(db_path)
+    except sqlite3.Error as e:
+        logger.debug("Cannot open index manifest %s: %s", db_path, e)
+        return None
+    try:
+        return read_manifest_row(conn)
+    except sqlite3.Error as e:
+        logger.debug("Cannot read index manifest %s: %s", db_path, e)
+        return None
+    finally:
+        conn.close()
+
+
+def _has_vectors(db_path: Path) -> bool:
+    try:
+        conn = _connect_readonly(db_path)
+        try:
+            return conn.execute("SELECT 1 FROM vectors LIMIT 1").fetchone() is not None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def index_embedder_config(
+    project_root: Path, manifest: Optional[IndexManifest] = None
+) -> "EmbedderConfig":
+    """Embedder config matching the project's index (default config if unindexed)
+
+    `manifest` defaults to the one recorded in index.db. OpenAI credentials
+    come from the LLM config, as for `vibecollab index`.
+    """
+    from .indexer import default_embedder_config, vectors_dir
+
+    config = default_embedder_config(project_root)
+    if manifest is None:
+        manifest = read_manifest(vectors_dir(project_root) / "index.db")
+    if manifest is None:
+        return config
+    config = manifest.embedder_config(config)
+    if config.backend == "openai" and not config.api_key:
+        try:
+            from ..core.config_manager import resolve_llm_config
+
+            llm_cfg = resolve_llm_config()
+            if llm_cfg.api_key:
+                config.api_key = llm_cfg.api_key
+                config.base_url = llm_cfg.base_url or config.base_url
+        except Exception:
+            pass
+    return config
+
+
+def create_index_embedder(
+    config: "EmbedderConfig", manifest: Optional[IndexManifest]
+) -> "Embedder":
+    """Build the embedder for `config`, verified against the index manifest
+
+    Raises:
+        ReindexNeeded: the manifest's embedder is unavailable here or differs
+    """
+    from ..insight.embedder import Embedder
+
+    try:
+        embedder = Embedder(config)
+    except (ImportError, ValueError) as e:
+        if manifest is None:
+            raise
+        raise ReindexNeeded(
+            f"Reindex needed: cannot load {manifest.describe()} ({e}); {REINDEX_HINT}"
+        ) from e
+    if manifest is not None:
+        manifest.check(embedder)
+    return embedder
+
+
+def load_index_embedder(project_root: Path) -> Tuple["Embedder", IndexManifest]:
+    """Embedder that produced the project's index, plus its manifest
+
+    Raises:
+        ReindexNeeded: no or empty index, an index without manifest, or an
+            embedder that cannot be rebuilt here
+    """
+    from .indexer import vectors_dir
+
+    db_path = vectors_dir(project_root) / "index.db"
+    if not db_path.exists():
+        raise ReindexNeeded("Index does not exist; run `vibecollab index` first")
+    manifest = read_manifest(db_path)
+    if manifest is None and not _has_vectors(db_path):
+        raise ReindexNeeded("Index is empty; run `vibecollab index` first")
+    if manifest is None:
+        raise ReindexNeeded(MISSING_MANIFEST_MESSAGE)
+    config = index_embedder_config(project_root, manifest)
+    return create_index_embedder(config, manifest), manifest
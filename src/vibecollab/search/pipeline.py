@@ -0,0 +1,397 @@
+"""
+IndexPipeline - Pipelined indexing for large corpora
+
+Three stages run concurrently, connected by bounded queues:
+
+    parse   process pool: read + YAML-parse + chunk source files
+    embed   one thread: hash chunks, batch changed ones into embedder calls
+    write   calling thread: transactional upsert_batch / mtime refresh
+
+Planning (mtime fast path), parsing, hashing and accounting reuse the serial
+Indexer steps, and results flow through every stage in source order, so the
+index contents and stats are the same as `Indexer.index_all()` in one thread.
+A failed embedding batch is reported per source in `stats.errors` and those
+sources keep their previous chunks: a source's changed chunks are only written
+once all of its batches have embedded. As in the serial document pass, such a
+source is not counted as indexed (its parse-time accounting is undone).
+The writer runs on the calling thread, so write errors surface there (searches
+on other threads keep reading the last committed state). Parse workers are started before the
+pipeline threads; where processes are spawned rather than forked (macOS,
+Windows) the calling script needs the usual `if __name__ == "__main__":` guard.
+
+Usage:
+    stats = IndexPipeline(indexer, workers=4).run()
+    stats.throughput["embed"]["chunks_per_sec"]
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .indexer import IndexStats, SourceJob, parse_sources
+from .vector_store import VectorDocument
+
+if TYPE_CHECKING:
+    from .indexer import Indexer
+
+logger = logging.getLogger(__name__)
+
+# Changed chunks per embedder call
+DEFAULT_BATCH_SIZE = 256
+# Items buffered between two stages
+DEFAULT_QUEUE_SIZE = 8
+# Source files per task submitted to the parse pool (amortizes IPC)
+_PARSE_TASK_SIZE = 16
+# Tasks in flight per parse worker
+_PARSE_WINDOW_PER_WORKER = 2
+# Queue poll interval while watching for a failed stage
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+SourceKey = Tuple[str, str]
+
+
+def _source_key(doc: VectorDocument) -> SourceKey:
+    return doc.source_type, doc.source
+
+
+@dataclass
+class StageStats:
+    """Work done by one pipeline stage"""
+
+    chunks: int = 0
+    seconds: float = 0.0  # Busy time (parse: wall time of the pool)
+
+    def to_dict(self) -> Dict[str, float]:
+        rate = self.chunks / self.seconds if self.seconds > 0 else 0.0
+        return {
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 4),
+            "chunks_per_sec": round(rate, 1),
+        }
+
+
+class _StageFailed(Exception):
+    """Another stage failed; unwind this one"""
+
+
+class IndexPipeline:
+    """Pipelined equivalent of `Indexer.index_all()`
+
+    Args:
+        indexer: Indexer providing the embedder, store and indexing steps
+        workers: Parse worker processes (default: CPU count)
+        batch_size: Changed chunks per embedder call
+        queue_size: Bounded queue length between stages
+        use_processes: Parse in worker processes (False = threads, e.g. where
+            process pools are unavailable)
+    """
+
+    def __init__(
+        self,
+        indexer: "Indexer",
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        use_processes: bool = True,
+    ):
+        self._indexer = indexer
+        self._workers = max(1, workers or os.cpu_count() or 1)
+        self._batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+        self._queue_size = max(1, queue_size or DEFAULT_QUEUE_SIZE)
+        self._use_processes = use_processes
+        self._failed = threading.Event()
+        self._errors: List[BaseException] = []
+        # Embed stage: changed chunks not yet embedded, embedded chunks held
+        # back until their whole source is, and sources whose embedding failed
+        self._unembedded: Counter = Counter()
+        self._held: Dict[SourceKey, List[VectorDocument]] = {}
+        self._failed_sources: set = set()
+        self.parse = StageStats()
+        self.embed = StageStats()
+        self.write = StageStats()
+
+    # ------------------------------------------------------------------
+    # Queue helpers (abort promptly when another stage failed)
+    # ------------------------------------------------------------------
+
+    def _put(self, q: "queue.Queue[Any]", item: Any) -> None:
+        while True:
+            if self._failed.is_set():
+                raise _StageFailed()
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: "queue.Queue[Any]") -> Any:
+        while True:
+            if self._failed.is_set():
+                raise _StageFailed()
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _fail(self, error: BaseException) -> None:
+        self._errors.append(error)
+        self._failed.set()
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _executor(self) -> Executor:
+        if self._use_processes and self._workers > 1:
+            try:
+                return ProcessPoolExecutor(max_workers=self._workers)
+            except (OSError, NotImplementedError) as e:
+                logger.info("Process pool unavailable, parsing in threads: %s", e)
+        return ThreadPoolExecutor(max_workers=self._workers)
+
+    def _submit(self, pool: Executor, window: deque, task: List[SourceJob]) -> None:
+        window.append((task, pool.submit(parse_sources, str(self._indexer.project_root), task)))
+
+    def _parse_stage(
+        self,
+        pool: Executor,
+        window: deque,
+        pending: Iterator[List[SourceJob]],
+        accept: Dict[str, Any],
+        out_q: "queue.Queue[Any]",
+    ) -> None:
+        """Collect parse tasks in order, account for their jobs, forward their chunks"""
+        try:
+            start = time.perf_counter()
+            while window:
+                task, future = window.popleft()
+                results = future.result()
+                next_task = next(pending, None)
+                if next_task is not None:
+                    self._submit(pool, window, next_task)
+                for job, (docs, error) in zip(task, results):
+                    docs = accept[job.source_type](job, docs, error)
+                    self.parse.chunks += len(docs)
+                    if docs:
+                        self._put(out_q, (job, docs))
+            self.parse.seconds = time.perf_counter() - start
+            self._put(out_q, _DONE)
+        except _StageFailed:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def _embed_stage(
+        self,
+        existing: Dict[str, Tuple[str, float, str]],
+        in_q: "queue.Queue[Any]",
+        out_q: "queue.Queue[Any]",
+    ) -> None:
+        """Hash chunks, embed changed ones in batches, forward write operations"""
+        indexer = self._indexer
+        try:
+            batch: List[VectorDocument] = []
+            while True:
+                item = self._get(in_q)
+                if item is _DONE:
+                    break
+                _, docs = item
+                changed, unchanged = indexer.split_changed(existing, docs)
+                if unchanged:
+                    self._put(out_q, ("unchanged", unchanged))
+                self._unembedded.update(_source_key(doc) for doc in changed)
+                batch.extend(changed)
+                while len(batch) >= self._batch_size:
+                    self._embed_batch(batch[: self._batch_size], out_q)
+                    batch = batch[self._batch_size :]
+            if batch:
+                self._embed_batch(batch, out_q)
+            self._put(out_q, _DONE)
+        except _StageFailed:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def _embed_batch(self, docs: List[VectorDocument], out_q: "queue.Queue[Any]") -> None:
+        """Embed one batch; forward the chunks of sources whose every batch is embedded"""
+        todo = [doc for doc in docs if _source_key(doc) not in self._failed_sources]
+        if todo:
+            start = time.perf_counter()
+            try:
+                self._indexer.embed_chunks(todo)
+                self.embed.chunks += len(todo)
+            except Exception as e:
+                # Like the serial path: the sources keep their previous chunks,
+                # including the ones already embedded in earlier batches
+                failed = dict.fromkeys(_source_key(doc) for doc in todo)
+                self._failed_sources.update(failed)
+                for key in failed:
+                    self._held.pop(key, None)
+                self._put(out_q, ("failed", todo, str(e)))
+            finally:
+                self.embed.seconds += time.perf_counter() - start
+        ready: List[VectorDocument] = []
+        for doc in docs:
+            key = _source_key(doc)
+            self._unembedded[key] -= 1
+            if key in self._failed_sources:
+                continue
+            self._held.setdefault(key, []).append(doc)
+            if self._unembedded[key] == 0:
+                ready.extend(self._held.pop(key))
+        if ready:
+            self._put(out_q, ("changed", ready))
+
+    def _write_stage(
+        self,
+        stats: IndexStats,
+        existing: Dict[str, Tuple[str, float, str]],
+        in_q: "queue.Queue[Any]",
+    ) -> List[Tuple[List[VectorDocument], str]]:
+        """Apply write operations on the calling thread; returns failed batches"""
+        indexer = self._indexer
+        failed: List[Tuple[List[VectorDocument], str]] = []
+        done = 0
+        while True:
+            item = self._get(in_q)
+            if item is _DONE:
+                return failed
+            kind = item[0]
+            if kind == "failed":
+                failed.append((item[1], item[2]))
+                continue
+            start = time.perf_counter()
+            if kind == "changed":
+                indexer.write_changed(stats, existing, item[1])
+                self.write.chunks += len(item[1])
+            else:
+                indexer.refresh_unchanged(stats, existing, item[1])
+            self.write.seconds += time.perf_counter() - start
+            done += len(item[1])
+            # Chunk total is only known once parsing finishes
+            indexer.report_progress("index", done, None)
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+
+    def run(self) -> IndexStats:
+        """Index all documents and Insights; stats include per-stage throughput"""
+        indexer = self._indexer
+        wall_start = time.perf_counter()
+
+        doc_stats = IndexStats()
+        doc_existing, doc_kept, doc_jobs = indexer.plan_documents(doc_stats)
+        ins_stats = IndexStats()
+        ins_plan = indexer.plan_insights(ins_stats)
+        ins_existing, ins_kept, ins_jobs = ins_plan if ins_plan else ({}, set(), [])
+
+        parsed_insights = [0]
+        # Chunks accounted per accepted source, undone if its embedding fails
+        accepted_chunks: Dict[SourceKey, int] = {}
+
+        def accept_document(job: SourceJob, docs: List[VectorDocument], error: Optional[str]):
+            docs = indexer.accept_document(doc_stats, doc_kept, job, docs, error)
+            if docs:
+                accepted_chunks[("document", job.path)] = len(docs)
+            return docs
+
+        def accept_insight(job: SourceJob, docs: List[VectorDocument], error: Optional[str]):
+            docs = indexer.accept_insight(ins_stats, ins_kept, job, docs, error)
+            parsed_insights[0] += len(docs)
+            accepted_chunks[("insight", job.path)] = len(docs)
+            return docs
+
+        accept = {"document": accept_document, "insight": accept_insight}
+        # doc_ids are prefixed by source type, so one lookup table serves both
+        existing = {**doc_existing, **ins_existing}
+        write_stats = IndexStats()
+
+        jobs = doc_jobs + ins_jobs
+        tasks = [jobs[i : i + _PARSE_TASK_SIZE] for i in range(0, len(jobs), _PARSE_TASK_SIZE)]
+        pending = iter(tasks)
+        window: deque = deque()
+        parsed_q: "queue.Queue[Any]" = queue.Queue(maxsize=self._queue_size)
+        embedded_q: "queue.Queue[Any]" = queue.Queue(maxsize=self._queue_size)
+        failed: List[Tuple[List[VectorDocument], str]] = []
+
+        pool = self._executor()
+        try:
+            # First submissions start the workers, before any pipeline thread runs
+            for task in itertools.islice(pending, self._workers * _PARSE_WINDOW_PER_WORKER):
+                self._submit(pool, window, task)
+            threads = [
+                threading.Thread(
+                    target=self._parse_stage,
+                    args=(pool, window, pending, accept, parsed_q),
+                    name="vibecollab-index-parse",
+                    daemon=True,
+                ),
+                threading.Thread(
+                    target=self._embed_stage,
+                    args=(existing, parsed_q, embedded_q),
+                    name="vibecollab-index-embed",
+                    daemon=True,
+                ),
+            ]
+            for thread in threads:
+                thread.start()
+            try:
+                failed = self._write_stage(write_stats, existing, embedded_q)
+            except _StageFailed:
+                pass
+            except BaseException as e:
+                self._fail(e)
+            finally:
+                for thread in threads:
+                    thread.join()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if self._errors:
+            raise self._errors[0]
+
+        # Sources of a batch the embedder rejected keep their previous chunks and,
+        # like a failed serial document, are not counted as indexed
+        for docs, error in failed:
+            for source_type, source in dict.fromkeys((d.source_type, d.source) for d in docs):
+                chunks = accepted_chunks.pop((source_type, source), 0)
+                if source_type == "document":
+                    doc_kept.update(indexer.ids_of_source(doc_existing, source))
+                    doc_stats.documents_indexed -= 1
+                    doc_stats.chunks_total -= chunks
+                    doc_stats.errors.append(f"{source}: {error}")
+                    logger.warning("Failed to index document: %s -- %s", source, error)
+                else:
+                    ins_kept.update(indexer.ids_of_source(ins_existing, source))
+                    parsed_insights[0] -= chunks
+                    ins_stats.errors.append(f"{os.path.basename(source)}: {error}")
+
+        indexer.finish_pass(doc_stats, "document", doc_existing, doc_kept)
+        if ins_plan is not None:
+            ins_stats.insights_indexed += parsed_insights[0]
+            indexer.finish_pass(ins_stats, "insight", ins_existing, ins_kept)
+            ins_stats.chunks_total = ins_stats.insights_indexed
+
+        stats = IndexStats()
+        for part in (doc_stats, ins_stats, write_stats):
+            stats.merge(part)
+        stats.throughput = {
+            "parse": self.parse.to_dict(),
+            "embed": self.embed.to_dict(),
+            "write": self.write.to_dict(),
+            "total": StageStats(
+                chunks=self.parse.chunks, seconds=time.perf_counter() - wall_start
+            ).to_dict(),
+        }
+        return stats
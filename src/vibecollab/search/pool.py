@@ -0,0 +1,277 @@
+"""
+IndexerPool - Warm, process-wide Indexer reuse for long-lived processes
+
+Building an Indexer per request re-creates its Embedder, which for the local
+backend reloads the sentence-transformers model (seconds, hundreds of MB).
+The pool keeps one Embedder per (project root, embedder config) and hands out
+Indexers sharing it.
+
+Each thread gets its own Indexer and VectorStore on top of the shared
+Embedder and query result cache, so per-thread state (open store, signature)
+needs no locking; searches on different threads read in parallel under WAL.
+A store is reopened when the index changes underneath it (index.db replaced,
+storage codec or projection changed); the Embedder is only rebuilt for a new
+config. Without an explicit config, the embedder recorded in the index
+manifest is used, so a reindex with another backend transparently switches
+to a new entry; the superseded entry is dropped and its stores closed. The
+manifest is re-read only when index.db (or its WAL) changed on disk.
+
+Usage:
+    pool = get_indexer_pool()
+    pool.preload(project_root)             # optional, background model load
+    results = pool.get(project_root).search("query")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..insight.embedder import Embedder, EmbedderConfig
+from .indexer import Indexer, vectors_dir
+from .manifest import IndexManifest, create_index_embedder, index_embedder_config, read_manifest
+from .query_cache import QueryResultCache
+from .vector_store import CODEC_META_KEY, EXACT_META_KEY, PROJECTION_META_KEY, VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Text embedded once by preload() to initialize lazy backend state
+_WARMUP_TEXT = "warmup"
+
+
+def config_key(config: EmbedderConfig) -> str:
+    """Stable fingerprint of an embedder config (API key hashed, never stored)"""
+    payload = json.dumps(asdict(config), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _file_signature(db_path: Path) -> Tuple[Any, ...]:
+    """Cheap change marker of a SQLite file: stat of the DB and its WAL"""
+    signature = []
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            stat = path.stat()
+            signature.append((stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _index_signature(store: VectorStore) -> Tuple[Any, ...]:
+    """Identity of the index a store reads: DB file plus its storage codec and projection"""
+    file_id: Any = None
+    if store.db_path is not None:
+        try:
+            stat = store.db_path.stat()
+            file_id = (stat.st_dev, stat.st_ino)
+        except OSError:
+            file_id = None
+    return (
+        file_id,
+        store.get_meta(CODEC_META_KEY),
+        store.get_meta(EXACT_META_KEY),
+        store.get_meta(PROJECTION_META_KEY),
+    )
+
+
+class _PoolEntry:
+    """One warm Embedder plus per-thread Indexers for a project root"""
+
+    def __init__(
+        self, project_root: Path, config: EmbedderConfig, manifest: Optional[IndexManifest] = None
+    ):
+        self.project_root = project_root
+        self.config = config
+        # Set when the config was derived from the index manifest
+        self.manifest = manifest
+        self._embedder: Optional[Embedder] = None
+        self.query_cache = QueryResultCache()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stores: List[VectorStore] = []  # Open stores of all threads
+        self.store_opens = 0
+        self.requests = 0
+
+    def embedder(self) -> Embedder:
+        with self._lock:
+            if self._embedder is None:
+                self._embedder = create_index_embedder(self.config, self.manifest)
+                logger.info(
+                    "Embedder ready for %s: %s (%.0f ms)",
+                    self.project_root,
+                    self._embedder.model_name,
+                    self._embedder.latency_stats()["load_ms"],
+                )
+            return self._embedder
+
+    @property
+    def loaded(self) -> bool:
+        return self._embedder is not None
+
+    def indexer(self) -> Indexer:
+        embedder = self.embedder()
+        local = self._local
+        indexer: Optional[Indexer] = getattr(local, "indexer", None)
+        if indexer is not None:
+            try:
+                if _index_signature(indexer.store) == local.signature:
+                    self.requests += 1
+                    return indexer
+            except Exception as e:
+                logger.debug("Index signature check failed, reopening: %s", e)
+            with self._lock:
+                if indexer.store in self._stores:
+                    self._stores.remove(indexer.store)
+            indexer.store.close()
+
+        db_path = vectors_dir(self.project_root) / "index.db"
+        store = VectorStore(db_path=db_path, dimensions=embedder.dimensions)
+        with self._lock:
+            self._stores.append(store)
+        indexer = Indexer(
+            project_root=self.project_root,
+            embedder=embedder,
+            store=store,
+            query_cache=self.query_cache,
+        )
+        local.indexer = indexer
+        local.signature = _index_signature(store)
+        self.store_opens += 1
+        self.requests += 1
+        return indexer
+
+    def close(self) -> None:
+        """Close the stores of every thread and release the embedder"""
+        with self._lock:
+            stores, self._stores = self._stores, []
+            self._embedder = None
+        for store in stores:
+            try:
+                store.close()
+            except Exception as e:
+                logger.debug("Closing pooled store failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "project_root": str(self.project_root),
+            "backend": self.config.backend,
+            "loaded": self.loaded,
+            "requests": self.requests,
+            "store_opens": self.store_opens,
+            "query_cache": self.query_cache.stats(),
+        }
+        if self._embedder is not None:
+            stats["model"] = self._embedder.model_name
+            stats["dimensions"] = self._embedder.dimensions
+            stats["latency"] = self._embedder.latency_stats()
+        return stats
+
+
+class IndexerPool:
+    """Process-wide cache of warm Indexers keyed by (project root, embedder config)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], _PoolEntry] = {}
+        # Per root: entry key derived from the index manifest, and the cached
+        # manifest with the file signature it was read at
+        self._manifest_keys: Dict[str, Tuple[str, str]] = {}
+        self._manifests: Dict[str, Tuple[Tuple[Any, ...], Optional[IndexManifest]]] = {}
+
+    def _manifest(self, root: Path) -> Optional[IndexManifest]:
+        db_path = vectors_dir(root) / "index.db"
+        signature = _file_signature(db_path)
+        with self._lock:
+            cached = self._manifests.get(str(root))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        manifest = read_manifest(db_path)
+        with self._lock:
+            self._manifests[str(root)] = (signature, manifest)
+        return manifest
+
+    def _entry(self, project_root: Path, config: Optional[EmbedderConfig]) -> _PoolEntry:
+        root = Path(project_root).resolve()
+        manifest = None
+        from_manifest = config is None
+        if from_manifest:
+            manifest = self._manifest(root)
+            config = index_embedder_config(root, manifest)
+        key = (str(root), config_key(config))
+        superseded = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(root, config, manifest)
+                self._entries[key] = entry
+            if from_manifest:
+                previous = self._manifest_keys.get(str(root))
+                if previous is not None and previous != key:
+                    superseded = self._entries.pop(previous, None)
+                self._manifest_keys[str(root)] = key
+        if superseded is not None:
+            logger.info("Index embedder changed for %s; releasing the previous one", root)
+            superseded.close()
+        return entry
+
+    def get(self, project_root: Path, config: Optional[EmbedderConfig] = None) -> Indexer:
+        """Warm Indexer for the project (default config: the index manifest's embedder)
+
+        Raises:
+            ReindexNeeded: the manifest's embedder cannot be loaded here
+        """
+        return self._entry(project_root, config).indexer()
+
+    def preload(
+        self, project_root: Path, config: Optional[EmbedderConfig] = None
+    ) -> threading.Thread:
+        """Load the embedder in a background thread; returns the (daemon) thread"""
+        entry = self._entry(project_root, config)
+
+        def _load() -> None:
+            start = time.perf_counter()
+            try:
+                # Bypass the caches so lazy backend state is initialized for real
+                entry.embedder().backend.embed_text(_WARMUP_TEXT)
+            except Exception as e:
+                logger.warning("Embedder preload failed for %s: %s", entry.project_root, e)
+                return
+            logger.info(
+                "Embedder preloaded for %s in %.0f ms",
+                entry.project_root,
+                (time.perf_counter() - start) * 1000,
+            )
+
+        thread = threading.Thread(target=_load, name="vibecollab-embedder-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-entry load state, model load time and embedding latency"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [entry.stats() for entry in entries]
+
+    def clear(self) -> None:
+        """Forget every entry, closing their stores"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._manifest_keys.clear()
+            self._manifests.clear()
+        for entry in entries:
+            entry.close()
+
+
+_default_pool = IndexerPool()
+
+
+def get_indexer_pool() -> IndexerPool:
+    """The process-wide pool"""
+    return _default_pool
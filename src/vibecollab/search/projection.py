@@ -0,0 +1,268 @@
+"""
+Projection - Linear dimensionality reduction for stored vectors
+
+A projection maps embedder vectors (e.g. 1536 or 768 dims) to a few hundred
+dims before they are stored, shrinking index.db and the resident search matrix
+and the bandwidth of every scan. Queries are projected the same way. With
+`keep_exact` the full vectors are kept aside and the top candidates of the
+reduced scan are re-ranked against them (see VectorStore.search).
+
+    pca     top principal directions of the indexed vectors (fitted at index
+            time, uncentered so dot products are preserved best; needs NumPy)
+    random  seeded Gaussian random projection (Johnson-Lindenstrauss); needs
+            no training data and no NumPy
+
+The projection matrix is recorded in the `vector_projection` table of
+index.db, so every process queries with the matrix the vectors were built with.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import sqlite3
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+PROJECTION_PCA = "pca"
+PROJECTION_RANDOM = "random"
+PROJECTION_METHODS = (PROJECTION_PCA, PROJECTION_RANDOM)
+
+PROJECTION_TABLE = "vector_projection"
+
+# Single-row table (id is always 1; no row = vectors stored at full dimensions)
+PROJECTION_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {PROJECTION_TABLE} (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        method TEXT NOT NULL,
+        source_dims INTEGER NOT NULL,
+        target_dims INTEGER NOT NULL,
+        seed INTEGER NOT NULL,
+        matrix BLOB NOT NULL
+    )
+"""
+
+# Rows sampled to fit PCA (the principal directions converge long before)
+_PCA_MAX_TRAIN = 20_000
+
+# Queries sampled by estimate_recall
+DEFAULT_RECALL_SAMPLE = 100
+
+
+def _get_numpy() -> Any:
+    try:
+        import numpy
+
+        return numpy
+    except ImportError:
+        return None
+
+
+def check_method(method: str) -> str:
+    """Validate a projection method name, return it unchanged"""
+    if method not in PROJECTION_METHODS:
+        raise ValueError(
+            f"Unknown projection method: {method!r} "
+            f"(expected one of {', '.join(PROJECTION_METHODS)})"
+        )
+    return method
+
+
+def _check_dims(source_dims: int, target_dims: int) -> None:
+    if not 0 < target_dims < source_dims:
+        raise ValueError(
+            f"Projection target must be between 1 and {source_dims - 1} dims, got {target_dims}"
+        )
+
+
+@dataclass
+class Projection:
+    """Linear map from `source_dims` to `target_dims`
+
+    `matrix` holds the (target_dims, source_dims) matrix row-major as array('f').
+    """
+
+    method: str
+    source_dims: int
+    target_dims: int
+    matrix: array
+    seed: int = 0
+    _np_matrix: Any = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def random(cls, source_dims: int, target_dims: int, seed: int = 0) -> "Projection":
+        """Seeded Gaussian projection, scaled so expected norms are preserved"""
+        _check_dims(source_dims, target_dims)
+        rng = random.Random(seed)
+        scale = 1.0 / math.sqrt(target_dims)
+        matrix = array("f", (rng.gauss(0.0, scale) for _ in range(source_dims * target_dims)))
+        return cls(PROJECTION_RANDOM, source_dims, target_dims, matrix, seed)
+
+    @classmethod
+    def fit_pca(
+        cls, vectors: Sequence[Sequence[float]], target_dims: int, seed: int = 0
+    ) -> "Projection":
+        """Top `target_dims` principal directions of the (row-normalized) vectors
+
+        Raises:
+            ImportError: numpy is not installed
+            ValueError: fewer vectors than target dims, or a target not below the source dims
+        """
+        np = _get_numpy()
+        if np is None:
+            raise ImportError(
+                "PCA projection requires numpy. Install: pip install vibe-collab[embedding] "
+                "(or use the random projection)"
+            )
+        data = np.asarray(vectors, dtype=np.float32)
+        if data.ndim != 2 or not len(data):
+            raise ValueError("PCA projection needs indexed vectors to fit")
+        _check_dims(data.shape[1], target_dims)
+        if len(data) < target_dims:
+            raise ValueError(
+                f"PCA to {target_dims} dims needs at least {target_dims} vectors "
+                f"(index has {len(data)}); use fewer dims or the random projection"
+            )
+        if len(data) > _PCA_MAX_TRAIN:
+            rows = np.random.default_rng(seed).choice(len(data), _PCA_MAX_TRAIN, replace=False)
+            data = data[rows]
+        norms = np.linalg.norm(data, axis=1, keepdims=True)
+        data = data / np.where(norms > 0, norms, 1.0)
+        # Right singular vectors of the uncentered data: best rank-k preservation
+        # of the dot products between the vectors themselves
+        _, _, components = np.linalg.svd(data, full_matrices=False)
+        matrix = np.ascontiguousarray(components[:target_dims], dtype=np.float32)
+        projection = cls(
+            PROJECTION_PCA, data.shape[1], target_dims, array("f", matrix.tobytes()), seed
+        )
+        projection._np_matrix = matrix
+        return projection
+
+    # ------------------------------------------------------------------
+    # Apply
+    # ------------------------------------------------------------------
+
+    def numpy_matrix(self, np: Any) -> Any:
+        """The matrix as a (target_dims, source_dims) float32 array (cached)"""
+        if self._np_matrix is None:
+            self._np_matrix = np.frombuffer(self.matrix.tobytes(), dtype=np.float32).reshape(
+                self.target_dims, self.source_dims
+            )
+        return self._np_matrix
+
+    def apply(self, vector: Sequence[float]) -> List[float]:
+        """Project one vector"""
+        if len(vector) != self.source_dims:
+            raise ValueError(
+                f"Vector dimension mismatch: expected {self.source_dims}, got {len(vector)}"
+            )
+        np = _get_numpy()
+        if np is not None:
+            return (self.numpy_matrix(np) @ np.asarray(vector, dtype=np.float32)).tolist()
+        dims = self.source_dims
+        return [
+            math.fsum(w * x for w, x in zip(self.matrix[r * dims : (r + 1) * dims], vector))
+            for r in range(self.target_dims)
+        ]
+
+    def apply_matrix(self, np: Any, vectors: Any) -> Any:
+        """Project the rows of an (N, source_dims) matrix"""
+        return np.asarray(vectors, dtype=np.float32) @ self.numpy_matrix(np).T
+
+    def restore(self, reduced: Sequence[float]) -> List[float]:
+        """Approximate full vector (transpose map; exact within the PCA subspace)"""
+        np = _get_numpy()
+        if np is not None:
+            return (np.asarray(reduced, dtype=np.float32) @ self.numpy_matrix(np)).tolist()
+        dims = self.source_dims
+        full = [0.0] * dims
+        for r, y in enumerate(reduced):
+            row = self.matrix[r * dims : (r + 1) * dims]
+            for c in range(dims):
+                full[c] += y * row[c]
+        return full
+
+    def describe(self) -> str:
+        return f"{self.method} {self.source_dims} -> {self.target_dims} dims"
+
+    def fingerprint(self) -> str:
+        """Identity of the exact matrix (changes on every refit)"""
+        digest = hashlib.sha256(self.matrix.tobytes()).hexdigest()[:16]
+        return f"{self.method}:{self.source_dims}:{self.target_dims}:{digest}"
+
+
+def read_projection_row(conn: sqlite3.Connection) -> Optional[Projection]:
+    """Projection recorded in an open index connection (None = full dimensions)"""
+    try:
+        row = conn.execute(
+            f"SELECT method, source_dims, target_dims, seed, matrix FROM {PROJECTION_TABLE} "
+            "WHERE id = 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Index created before projections existed
+        return None
+    if row is None:
+        return None
+    method, source_dims, target_dims, seed, blob = row
+    return Projection(method, source_dims, target_dims, array("f", blob), seed)
+
+
+def write_projection_row(conn: sqlite3.Connection, projection: Optional[Projection]) -> None:
+    """Replace (or with None remove) the recorded projection (caller commits)"""
+    conn.execute(f"DELETE FROM {PROJECTION_TABLE}")
+    if projection is not None:
+        conn.execute(
+            f"INSERT INTO {PROJECTION_TABLE} "
+            "(id, method, source_dims, target_dims, seed, matrix) VALUES (1, ?, ?, ?, ?, ?)",
+            (
+                projection.method,
+                projection.source_dims,
+                projection.target_dims,
+                projection.seed,
+                projection.matrix.tobytes(),
+            ),
+        )
+
+
+def estimate_recall(
+    vectors: Sequence[Sequence[float]],
+    projection: Projection,
+    top_k: int = 10,
+    rerank: int = 0,
+    sample: int = DEFAULT_RECALL_SAMPLE,
+    seed: int = 0,
+) -> Optional[float]:
+    """Recall@top_k of the projected scan against exact search over `vectors`
+
+    Queries are `sample` of the vectors themselves. With `rerank` the reduced
+    scan keeps that many candidates, re-scored exactly (as with keep_exact).
+    None when numpy is not installed or there is nothing to measure.
+    """
+    np = _get_numpy()
+    if np is None or not len(vectors) or top_k <= 0:
+        return None
+    full = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(full, axis=1, keepdims=True)
+    full = full / np.where(norms > 0, norms, 1.0)
+    reduced = projection.apply_matrix(np, full)
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    reduced = reduced / np.where(norms > 0, norms, 1.0)
+
+    k = min(top_k, len(full))
+    depth = min(max(k, rerank), len(full))
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(len(full), min(sample, len(full)), replace=False)
+    hits = 0
+    for q in queries:
+        exact = np.argpartition(-(full @ full[q]), k - 1)[:k]
+        scores = reduced @ reduced[q]
+        candidates = np.argpartition(-scores, depth - 1)[:depth]
+        if depth > k:
+            rescored = full[candidates] @ full[q]
+            found = candidates[np.argpartition(-rescored, k - 1)[:k]]
+        else:
+            found = candidates
+        hits += len(set(exact.tolist()) & set(found.tolist()))
+    return hits / (len(queries) * k)
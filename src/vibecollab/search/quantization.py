@@ -0,0 +1,88 @@
+"""
+Vector codecs - On-disk encodings for VectorStore vectors
+
+    float32  4 bytes/dim, lossless (default)
+    float16  2 bytes/dim, ~3 significant digits
+    int8     1 byte/dim + 4-byte per-vector scale (symmetric, max-abs / 127)
+
+Encoding and decoding work without NumPy; `decode_matrix` is the vectorized
+batch decoder used to build the resident search matrix.
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from typing import Any, List, Sequence
+
+CODEC_FLOAT32 = "float32"
+CODEC_FLOAT16 = "float16"
+CODEC_INT8 = "int8"
+
+VECTOR_CODECS = (CODEC_FLOAT32, CODEC_FLOAT16, CODEC_INT8)
+DEFAULT_CODEC = CODEC_FLOAT32
+
+_INT8_SCALE_BYTES = 4
+
+
+def check_codec(codec: str) -> str:
+    """Validate a codec name, return it unchanged"""
+    if codec not in VECTOR_CODECS:
+        raise ValueError(
+            f"Unknown vector codec: {codec!r} (expected one of {', '.join(VECTOR_CODECS)})"
+        )
+    return codec
+
+
+def bytes_per_vector(codec: str, dimensions: int) -> int:
+    """Encoded BLOB size of one vector"""
+    if codec == CODEC_FLOAT16:
+        return dimensions * 2
+    if codec == CODEC_INT8:
+        return dimensions + _INT8_SCALE_BYTES
+    return dimensions * 4
+
+
+def encode_vector(vector: Sequence[float], codec: str) -> bytes:
+    """Encode a float vector to a BLOB"""
+    if codec == CODEC_FLOAT16:
+        return struct.pack(f"{len(vector)}e", *vector)
+    if codec == CODEC_INT8:
+        peak = max((abs(x) for x in vector), default=0.0)
+        scale = peak / 127.0 if peak > 0 else 1.0
+        codes = array("b", [max(-127, min(127, round(x / scale))) for x in vector])
+        return struct.pack("f", scale) + codes.tobytes()
+    return struct.pack(f"{len(vector)}f", *vector)
+
+
+def decode_vector(data: bytes, codec: str) -> array:
+    """Decode a BLOB to an array('f') (dequantized for lossy codecs)"""
+    if codec == CODEC_FLOAT16:
+        return array("f", struct.unpack(f"{len(data) // 2}e", data))
+    if codec == CODEC_INT8:
+        (scale,) = struct.unpack_from("f", data)
+        return array("f", [c * scale for c in array("b", data[_INT8_SCALE_BYTES:])])
+    return array("f", data)
+
+
+def decode_matrix(np: Any, blobs: List[bytes], codec: str, dimensions: int) -> Any:
+    """Decode BLOBs into a compact (N, dims) matrix in the codec's own dtype
+
+    int8 rows are returned as raw codes without their scale: the scale is a
+    positive per-row factor, so it cancels out of a cosine similarity.
+
+    Raises:
+        ValueError: a BLOB does not have the size implied by `dimensions`
+    """
+    width = bytes_per_vector(codec, dimensions)
+    buffer = b"".join(blobs)
+    if len(buffer) != len(blobs) * width:
+        raise ValueError(
+            f"Stored vector dimension mismatch: expected {dimensions} for every row"
+        )
+    if codec == CODEC_FLOAT16:
+        return np.frombuffer(buffer, dtype=np.float16).reshape(len(blobs), dimensions)
+    if codec == CODEC_INT8:
+        raw = np.frombuffer(buffer, dtype=np.uint8).reshape(len(blobs), width)
+        return raw[:, _INT8_SCALE_BYTES:].view(np.int8)
+    return np.frombuffer(buffer, dtype=np.float32).reshape(len(blobs), dimensions)
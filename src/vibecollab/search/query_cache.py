@@ -0,0 +1,301 @@
+"""
+QueryResultCache - LRU of search results keyed by the index generation
+
+Agents repeat near-identical searches within a session; each one re-embeds the
+query and re-scans the index. The Indexer looks results up here first, keyed
+by the whitespace-normalized query plus every parameter that shapes the result
+(mode, filters, top_k, min_score, embedder, ...).
+
+Entries belong to one index generation (VectorStore.index_generation, a token
+rewritten by every index change); a lookup under another generation drops the
+in-memory entries first, so results never outlive the index they came from.
+
+Optionally the cache is also persisted in SQLite so separate CLI invocations
+share it. Rows are looked up by generation too; rows of other generations are
+only deleted at eviction time (before any current row), so processes that see
+different generations during an index run do not wipe each other's entries.
+As for the embedding cache, lookups never write (access times are flushed
+with the next write), the table is only counted when it may be over budget,
+and a locked database is treated as a miss / skipped write, never an error.
+
+Storage path (when persisted): .vibecollab/vectors/query_cache.db
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .vector_store import SearchResult
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_FILENAME = "query_cache.db"
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_DISK_MAX_ENTRIES = 5_000
+
+# Fraction of the disk budget kept after an eviction pass
+_EVICT_TARGET = 0.9
+
+# Buffered access times that force a flush even without a write
+_MAX_PENDING_TOUCHES = 1_000
+
+
+def normalize_query(query: str) -> str:
+    """Query text as cached: surrounding and repeated whitespace collapsed"""
+    return " ".join(query.split())
+
+
+class QueryResultCache:
+    """LRU of search results, optionally persisted to SQLite
+
+    `max_entries` bounds the in-memory LRU (0 = no in-memory caching);
+    `path` enables the persistent cache, bounded by `disk_max_entries`.
+    Thread-safe. Returns fresh SearchResult objects so callers cannot
+    mutate cached results.
+
+    Usage:
+        cache = QueryResultCache(path=vectors_dir(root) / QUERY_CACHE_FILENAME)
+        key = cache.key("retry policy", mode="vector", top_k=10)
+        results = cache.get(key, store.index_generation())
+        cache.put(key, generation, results)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        path: Optional[Path] = None,
+        disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+        timeout: float = 5.0,
+    ):
+        self._max_entries = max_entries
+        self._disk_max_entries = disk_max_entries
+        # Results are held as JSON text: compact, and decoded into fresh objects per hit
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._generation: Optional[str] = None
+        self._lock = threading.Lock()
+        # key -> last disk access time not yet written
+        self._touched: Dict[str, float] = {}
+        # Disk rows at the last count plus rows written since (None = count first)
+        self._disk_estimate: Optional[int] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._path = Path(path) if path is not None else None
+        self._conn: Optional[sqlite3.Connection] = None
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._path), timeout=timeout, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_results (
+                    key TEXT PRIMARY KEY,
+                    generation TEXT NOT NULL,
+                    results TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_last_access ON query_results(last_access)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(query: str, **params: Any) -> str:
+        """Cache key of a normalized query plus the parameters shaping its results
+
+        Dataclass parameters (e.g. SearchFilter) are keyed by their fields.
+        """
+        payload = {
+            name: asdict(value) if hasattr(value, "__dataclass_fields__") else value
+            for name, value in params.items()
+        }
+        payload["query"] = normalize_query(query)
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, generation: str) -> Optional[List[SearchResult]]:
+        """Cached results for `key` under `generation` (None on a miss)"""
+        with self._lock:
+            self._sync_generation(generation)
+            payload = self._data.get(key)
+            if payload is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                payload = self._read(key, generation)
+                if payload is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, payload)
+        return [SearchResult(**row) for row in json.loads(payload)]
+
+    def put(self, key: str, generation: str, results: List[SearchResult]) -> None:
+        """Store the results of `key`, computed against `generation`"""
+        payload = json.dumps([asdict(r) for r in results], ensure_ascii=False)
+        with self._lock:
+            self._sync_generation(generation)
+            self._remember(key, payload)
+            self._write(key, generation, payload)
+
+    def _remember(self, key: str, payload: str) -> None:
+        if self._max_entries <= 0:
+            return
+        self._data[key] = payload
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _sync_generation(self, generation: str) -> None:
+        """Drop in-memory entries of another index generation (disk rows: see _evict_if_needed)"""
+        if generation == self._generation:
+            return
+        if self._generation is not None:
+            self.invalidations += 1
+        self._generation = generation
+        self._data.clear()
+
+    # ------------------------------------------------------------------
+    # Persistent cache
+    # ------------------------------------------------------------------
+
+    def _read(self, key: str, generation: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT results FROM query_results WHERE key = ? AND generation = ?",
+                (key, generation),
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            logger.debug("Query cache read skipped: %s", e)
+            self._rollback()
+            return None
+        if row is None:
+            return None
+        self._touched[key] = time.time()
+        if len(self._touched) >= _MAX_PENDING_TOUCHES:
+            self._write(None, generation, None)
+        return row[0]
+
+    def _write(self, key: Optional[str], generation: str, payload: Optional[str]) -> None:
+        """Insert one row (key None: none) and flush buffered access times in one transaction"""
+        if self._conn is None:
+            return
+        touched = self._touched
+        try:
+            if key is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_results (key, generation, results, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, generation, payload, time.time()),
+                )
+            if touched:
+                self._conn.executemany(
+                    "UPDATE query_results SET last_access = MAX(last_access, ?) WHERE key = ?",
+                    [(at, k) for k, at in touched.items()],
+                )
+            self._conn.commit()
+            self._touched = {}
+            if key is not None:
+                self._evict_if_needed(generation)
+        except sqlite3.OperationalError as e:
+            logger.debug("Query cache write skipped: %s", e)
+            self._rollback()
+
+    def _evict_if_needed(self, generation: str) -> None:
+        """Trim the disk cache to budget: other generations' rows first, then the LRU"""
+        if self._disk_estimate is not None:
+            self._disk_estimate += 1
+            if self._disk_estimate <= self._disk_max_entries:
+                return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM query_results").fetchone()
+        self._disk_estimate = count
+        if count <= self._disk_max_entries:
+            return
+        cursor = self._conn.execute(
+            "DELETE FROM query_results WHERE key IN "
+            "(SELECT key FROM query_results ORDER BY generation = ?, last_access LIMIT ?)",
+            (generation, count - int(self._disk_max_entries * _EVICT_TARGET)),
+        )
+        self._conn.commit()
+        self.evictions += cursor.rowcount
+        self._disk_estimate = count - cursor.rowcount
+
+    def _rollback(self) -> None:
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    # ------------------------------------------------------------------
+    # Management
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats: Dict[str, Any] = {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+            if self._conn is not None:
+                try:
+                    (stats["disk_entries"],) = self._conn.execute(
+                        "SELECT COUNT(*) FROM query_results"
+                    ).fetchone()
+                except sqlite3.OperationalError:
+                    stats["disk_entries"] = -1
+        return stats
+
+    def clear(self) -> None:
+        """Forget every cached result (memory and disk)"""
+        with self._lock:
+            self._data.clear()
+            self._touched = {}
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM query_results")
+                self._conn.commit()
+                self._disk_estimate = 0
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def close(self) -> None:
+        """Flush buffered access times (best effort) and close the connection"""
+        with self._lock:
+            if self._conn is not None:
+                if self._touched:
+                    self._write(None, self._generation or "", None)
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._data)
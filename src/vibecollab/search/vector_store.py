@@ -2,21 +2,70 @@
 VectorStore - Local persistent vector storage
 
 Uses SQLite by default to store vectors and metadata, with pure Python cosine similarity.
-Zero external dependency solution.
+Zero external dependency solution. When NumPy is installed, search switches to a
+vectorized path (one mat-vec product over a pre-normalized float32 matrix).
+
+Vectors can be stored quantized (float16, or int8 with a per-vector scale, see
+quantization.py) to shrink the DB and the resident matrix; the codec is recorded
+in index_meta. Optionally the float32 originals are kept aside to exactly
+re-rank the top candidates of the quantized scan.
+
+An optional projection (PCA or random, see projection.py) stores reduced
+vectors for the scan; with keep_exact the full vectors re-rank the candidates.
+
+Structured filters (tags, category, source glob, heading prefix) are pushed
+down into SQL through indexed side tables, so only matching rows are scored.
+
+An FTS5 table over doc_id/text (synced by triggers) backs lexical BM25 search
+and a hybrid mode fusing BM25 and vector rankings (reciprocal-rank fusion).
+
+Writes go through `bulk_load` (executemany, chunked commits) and connections
+are tuned for it (DEFAULT_PRAGMAS: synchronous=NORMAL under WAL, mmap, a
+larger page cache, in-memory temp tables). `storage_stats` and `vacuum` are
+the maintenance entry points behind `vibecollab index --stats / --vacuum`.
 
 Storage path: .vibecollab/vectors/index.db
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import math
 import sqlite3
 import struct
+import threading
+import time
+import uuid
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .ann_index import ANN_INDEX_FILENAME, IVFIndex, check_nprobe
+from .manifest import (
+    MANIFEST_DDL,
+    IndexManifest,
+    corpus_hash,
+    read_manifest_row,
+    write_manifest_row,
+)
+from .projection import (
+    PROJECTION_DDL,
+    Projection,
+    read_projection_row,
+    write_projection_row,
+)
+from .quantization import (
+    CODEC_FLOAT32,
+    CODEC_INT8,
+    DEFAULT_CODEC,
+    check_codec,
+    decode_matrix,
+    decode_vector,
+    encode_vector,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +80,8 @@ class VectorDocument:
     source: str = ""  # Source file path
     source_type: str = ""  # "insight" | "document" | "code"
     metadata: Dict[str, Any] = field(default_factory=dict)
+    content_hash: str = ""  # Hash of the embedded content (incremental indexing)
+    source_mtime: float = 0.0  # Source file mtime when the chunk was indexed
 
 
 @dataclass
@@ -39,12 +90,130 @@ class SearchResult:
 
     doc_id: str
     text: str
-    score: float  # Cosine similarity, 0~1
+    score: float  # Cosine similarity 0~1 (vector), BM25 (lexical) or RRF (hybrid)
     source: str = ""
     source_type: str = ""
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class SearchFilter:
+    """Structured metadata filter, evaluated in SQL before any vector is scored
+
+    Fields are combined with AND; empty fields do not filter.
+        tags_any: at least one of these tags (case-insensitive)
+        tags_all: every one of these tags (case-insensitive)
+        category: exact category (case-insensitive)
+        source_glob: SQLite GLOB over the source path, e.g. "docs/*.md"
+        heading_prefix: chunk heading starts with this text (case-sensitive)
+    """
+
+    tags_any: List[str] = field(default_factory=list)
+    tags_all: List[str] = field(default_factory=list)
+    category: Optional[str] = None
+    source_glob: Optional[str] = None
+    heading_prefix: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.tags_any
+            or self.tags_all
+            or self.category
+            or self.source_glob
+            or self.heading_prefix
+        )
+
+
+def _normalize_tags(tags: Any) -> List[str]:
+    if isinstance(tags, str):
+        tags = [tags]
+    return sorted({str(t).strip().lower() for t in tags or [] if str(t).strip()})
+
+
+def _doc_facets(metadata: Dict[str, Any]) -> Tuple[List[str], str, str]:
+    """(tags, category, heading) side-table values of a document's metadata"""
+    tags = _normalize_tags(metadata.get("tags"))
+    category = str(metadata.get("category") or "").strip().lower()
+    heading = str(metadata.get("heading") or "")
+    return tags, category, heading
+
+
+def _filter_clause(
+    source_type: Optional[str], filters: SearchFilter
+) -> Tuple[str, List[Any]]:
+    """WHERE clause (over `vectors`) selecting rows matching the filter"""
+    clauses: List[str] = []
+    params: List[Any] = []
+    if source_type:
+        clauses.append("source_type = ?")
+        params.append(source_type)
+    if filters.source_glob:
+        clauses.append("source GLOB ?")
+        params.append(filters.source_glob)
+    if filters.category:
+        clauses.append("doc_id IN (SELECT doc_id FROM vector_facets WHERE category = ?)")
+        params.append(filters.category.strip().lower())
+    if filters.heading_prefix:
+        # Range scan on the heading index instead of an unindexable LIKE
+        clauses.append(
+            "doc_id IN (SELECT doc_id FROM vector_facets WHERE heading >= ? AND heading < ?)"
+        )
+        params.extend([filters.heading_prefix, filters.heading_prefix + "\U0010ffff"])
+    tags_any = _normalize_tags(filters.tags_any)
+    if tags_any:
+        placeholders = ",".join("?" * len(tags_any))
+        clauses.append(f"doc_id IN (SELECT doc_id FROM vector_tags WHERE tag IN ({placeholders}))")
+        params.extend(tags_any)
+    tags_all = _normalize_tags(filters.tags_all)
+    if tags_all:
+        placeholders = ",".join("?" * len(tags_all))
+        clauses.append(
+            f"doc_id IN (SELECT doc_id FROM vector_tags WHERE tag IN ({placeholders}) "
+            "GROUP BY doc_id HAVING COUNT(*) = ?)"
+        )
+        params.extend(tags_all)
+        params.append(len(tags_all))
+    return " AND ".join(clauses) or "1", params
+
+
+# Search modes understood by Indexer.search / `vibecollab search --mode`
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+# Reciprocal-rank fusion constant (the usual k=60 from the RRF paper)
+RRF_K = 60
+
+# Candidates taken from each ranking before fusion (at least top_k)
+DEFAULT_HYBRID_CANDIDATES = 50
+
+# BM25 column weights (doc_id, text): identifier hits outrank body mentions
+_BM25_WEIGHTS = "4.0, 1.0"
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Tuple[str, float]]], k: int = RRF_K
+) -> List[Tuple[str, float]]:
+    """Fuse ranked (doc_id, score) lists: score(d) = sum of 1 / (k + rank)
+
+    Only ranks matter, so BM25 and cosine scores need no normalization.
+    Ties keep first-seen order.
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, (doc_id, _) in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def _fts_query(text: str) -> str:
+    """FTS5 MATCH expression: each whitespace token as a quoted phrase, OR-ed
+
+    Quoting keeps identifiers like INS-042 or foo.bar intact (matched as an
+    adjacent token sequence) and neutralizes FTS5 operators in user input.
+    """
+    terms = [t.replace('"', '""') for t in text.split() if any(ch.isalnum() for ch in t)]
+    return " OR ".join(f'"{t}"' for t in terms)
+
+
 def cosine_similarity(a: List[float], b: List[float]) -> float:
     """Pure Python cosine similarity"""
     if len(a) != len(b):
@@ -71,6 +240,147 @@ def _unpack_vector(data: bytes) -> List[float]:
     return list(struct.unpack(f"{count}f", data))
 
 
+_numpy: Any = None
+_numpy_checked = False
+
+
+def _check_search_depths(nprobe: Optional[int], rerank: Optional[int]) -> None:
+    """Reject negative nprobe / rerank (None = default, 0 = off)"""
+    if nprobe is not None:
+        check_nprobe(nprobe)
+    if rerank is not None and rerank < 0:
+        raise ValueError(f"rerank must be >= 0, got {rerank}")
+
+
+def _get_numpy() -> Any:
+    """Return the numpy module if installed, otherwise None (optional acceleration)"""
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def _top_k_indices(np: Any, scores: Any, top_k: int, min_score: float) -> Any:
+    """Indices of the best `top_k` scores >= min_score, ordered by score desc.
+
+    Ties keep storage order, matching the stable sort of the pure Python path.
+    """
+    candidates = np.flatnonzero(scores >= min_score)
+    if candidates.size > top_k:
+        part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+        candidates = candidates[part]
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+_UPSERT_SQL = """
+    INSERT INTO vectors (
+        doc_id, text, vector, source, source_type, metadata, dimensions,
+        content_hash, source_mtime, vector_exact
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(doc_id) DO UPDATE SET
+        text = excluded.text,
+        vector = excluded.vector,
+        vector_exact = excluded.vector_exact,
+        source = excluded.source,
+        source_type = excluded.source_type,
+        metadata = excluded.metadata,
+        dimensions = excluded.dimensions,
+        content_hash = excluded.content_hash,
+        source_mtime = excluded.source_mtime
+"""
+
+# Columns added after the initial schema: (name, DDL), migrated on open
+_MIGRATED_COLUMNS = [
+    ("content_hash", "content_hash TEXT DEFAULT ''"),
+    ("source_mtime", "source_mtime REAL DEFAULT 0"),
+    ("vector_exact", "vector_exact BLOB DEFAULT NULL"),
+]
+
+# index_meta key marking that the filter side tables were backfilled
+FACETS_META_KEY = "facets"
+
+# index_meta keys recording the storage codec and whether float32 originals are kept
+CODEC_META_KEY = "vector_codec"
+EXACT_META_KEY = "vector_exact"
+
+# index_meta key recording the projection fingerprint (empty = full dimensions)
+PROJECTION_META_KEY = "vector_projection"
+
+# index_meta key holding a token rewritten by every content change (see index_generation)
+GENERATION_META_KEY = "generation"
+
+# Default re-rank depth (multiple of top_k) when float32 originals are kept
+RERANK_FACTOR = 4
+
+# Rows upcast to float32 at a time when scoring an int8 matrix (cache-sized blocks)
+_SCORE_BLOCK_ROWS = 256
+
+# Scans repeated when hits were deleted between the vector scan and the detail fetch
+_STALE_RETRIES = 2
+
+# Queries scored per matrix-matrix product in search_many (bounds the score matrix)
+_QUERY_BLOCK = 64
+
+# Rough per-row bookkeeping cost (doc_id / source_type strings) for the cache cap
+_ROW_OVERHEAD_BYTES = 64
+
+# Default memory cap for the resident vector cache
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Connection pragmas applied on open (override per store with `pragmas=`).
+# synchronous=NORMAL is durable against application crashes in WAL mode; only
+# the last commits can be lost on power failure.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # negative = KiB
+    "temp_store": "MEMORY",
+}
+
+# Rows per transaction in bulk_load
+DEFAULT_COMMIT_ROWS = 5000
+
+# Prepared statements kept per connection (the default of 128 is easily
+# exceeded by the generated filter queries, evicting the hot upsert statement)
+_STATEMENT_CACHE_SIZE = 256
+
+
+@dataclass
+class _VectorSnapshot:
+    """Decoded copy of the vectors table (resident cache entry)
+
+    `matrix` is a row-normalized float32 NumPy matrix, or a list of array('f')
+    rows on the pure Python path. With the int8 codec it holds the compact
+    codes and `row_scale` the factor turning their dot product into a cosine
+    (float16 rows are widened to float32 once: half-precision upcasts are
+    too slow to repeat per query). `source_type` is set when only one source type was loaded
+    (uncached partial snapshot).
+    """
+
+    doc_ids: List[str]
+    source_types: List[str]
+    matrix: Any
+    nbytes: int
+    source_type: Optional[str] = None
+    source_type_array: Any = None
+    is_numpy: bool = False
+    row_scale: Any = None
+    generation: Optional[Tuple[int, int]] = None
+    # ANN cluster -> row arrays, keyed by (id(index), index.version)
+    ann_key: Optional[Tuple[int, int]] = None
+    ann_rows: Any = None
+    # doc_id -> row, built on the first filtered search
+    row_index: Optional[Dict[str, int]] = None
+
+
 class VectorStore:
     """SQLite vector store
 
@@ -82,27 +392,155 @@ class VectorStore:
             source TEXT,
             source_type TEXT,
             metadata TEXT,  -- JSON
-            dimensions INTEGER
+            dimensions INTEGER,
+            content_hash TEXT,  -- incremental indexing
+            source_mtime REAL,
+            vector_exact BLOB  -- float32 original, only with keep_exact
         )
+        index_meta(key TEXT PRIMARY KEY, value TEXT)
+        index_manifest(...)  -- single row: how the index was built (manifest.py)
+        vector_projection(...)  -- single row: projection matrix (projection.py)
+        vector_tags(doc_id TEXT, tag TEXT)  -- filter side tables
+        vector_facets(doc_id TEXT PRIMARY KEY, category TEXT, heading TEXT)
+        vectors_fts USING fts5(doc_id, text)  -- external content, trigger-synced
+
+    Searches reuse a resident decoded copy of the vectors, invalidated when the
+    database changes (own writes bump a generation counter, writes from other
+    connections bump `PRAGMA data_version`). The copy is dropped when it would
+    exceed `cache_max_bytes`; 0 disables caching.
+
+    An optional IVF ANN index (see ann_index.py), persisted next to the DB, limits
+    scoring to the closest clusters. upsert/delete keep it in sync in memory;
+    `flush_ann_index()` saves it (the Indexer after each pass, and `close()`).
+
+    `codec` selects the vector encoding (None = keep what the DB records,
+    float32 for a new DB); `keep_exact` also stores float32 originals so
+    searches re-rank their top candidates exactly. Passing values different
+    from the recorded ones re-encodes the existing rows (see `set_codec`).
+    With a projection (`set_projection`) `vector` holds the reduced vector;
+    `dimensions` stays the embedder's, queries are projected on the way in.
+    `pragmas` overrides entries of DEFAULT_PRAGMAS (None value = leave SQLite's).
+
+    A store may be shared between threads. Writes go through one writer
+    connection serialized by a lock; each thread reads through its own
+    connection, so under WAL concurrent searches run in parallel with each
+    other and with an index update (they see the last committed state).
+    `close()` (or leaving the `with` block) closes every connection; an
+    in-memory store has a single connection shared by all threads.
     """
 
-    def __init__(self, db_path: Optional[Path] = None, dimensions: int = 256):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        dimensions: int = 256,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        codec: Optional[str] = None,
+        keep_exact: Optional[bool] = None,
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
         self._dimensions = dimensions
+        self._cache_max_bytes = cache_max_bytes
+        self._cache: Optional[_VectorSnapshot] = None
+        self._generation = 0
+        self._pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self._closed = False
+        # Serializes the writer connection (and the ANN index it keeps in sync)
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        # Per-thread read connections, closed by close()
+        self._readers: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._readers_lock = threading.Lock()
 
         if db_path is None:
             # In-memory mode (for testing)
             self._db_path = None
-            self._conn = sqlite3.connect(":memory:")
         else:
             self._db_path = Path(db_path)
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
-            self._conn = sqlite3.connect(str(self._db_path))
-
-        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        # Detects commits from any other connection, ours included (PRAGMA data_version)
+        self._probe = self._connect() if self._db_path is not None else self._writer
+        self._probe_lock = threading.Lock()
+        # Guards the ANN index's assignments (mutated by writers, listed by searches)
+        self._ann_lock = threading.Lock()
+        # Orders saves/removals of the ANN file (taken before _ann_lock)
+        self._ann_save_lock = threading.Lock()
+        self._ann_dirty = False
         self._init_schema()
+        self._backfill_facets()
+        self._fts = self._init_fts()
+
+        self._projection: Optional[Projection] = read_projection_row(self._writer)
+        self._projection_key = self.get_meta(PROJECTION_META_KEY, "") or ""
+        self._codec = check_codec(self.get_meta(CODEC_META_KEY, DEFAULT_CODEC))
+        self._keep_exact = self.get_meta(EXACT_META_KEY, "0") == "1"
+        # data_version at which the layout above was last read (see _refresh_layout)
+        self._layout_lock = threading.Lock()
+        self._layout_version = self._current_generation()[1]
+        wanted_codec = check_codec(codec) if codec is not None else self._codec
+        wanted_exact = keep_exact if keep_exact is not None else self._keep_exact
+        wanted_exact = wanted_exact and self._exact_useful(wanted_codec, self._projection)
+        if (wanted_codec, wanted_exact) != (self._codec, self._keep_exact):
+            self.set_codec(wanted_codec, keep_exact=wanted_exact)
+
+        self._ann: Optional[IVFIndex] = None
+        self._ann_path = (
+            self._db_path.parent / ANN_INDEX_FILENAME if self._db_path is not None else None
+        )
+        self._load_ann_index()
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned connection (usable from any thread; callers serialize use)"""
+        conn = sqlite3.connect(
+            str(self._db_path) if self._db_path is not None else ":memory:",
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
+        try:
+            self._apply_pragmas(conn, self._pragmas)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Any]) -> None:
+        for name, value in pragmas.items():
+            if value is None:
+                continue
+            if not name.replace("_", "").isalnum():
+                raise ValueError(f"Invalid pragma name: {name!r}")
+            if isinstance(value, str) and not value.isalnum():
+                raise ValueError(f"Invalid value for pragma {name}: {value!r}")
+            conn.execute(f"PRAGMA {name}={value}")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Read connection of the calling thread (opened on first use)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed VectorStore")
+        if self._db_path is None:
+            return self._writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                # Connections of finished threads are no longer reachable
+                for thread, stale in self._readers:
+                    if not thread.is_alive():
+                        stale.close()
+                self._readers = [(t, c) for t, c in self._readers if t.is_alive()]
+                self._readers.append((threading.current_thread(), conn))
+        return conn
 
     def _init_schema(self):
-        self._conn.execute("""
+        self._writer.execute("""
             CREATE TABLE IF NOT EXISTS vectors (
                 doc_id TEXT PRIMARY KEY,
                 text TEXT NOT NULL,
@@ -110,13 +548,311 @@ class VectorStore:
                 source TEXT DEFAULT '',
                 source_type TEXT DEFAULT '',
                 metadata TEXT DEFAULT '{}',
-                dimensions INTEGER NOT NULL
+                dimensions INTEGER NOT NULL,
+                content_hash TEXT DEFAULT '',
+                source_mtime REAL DEFAULT 0,
+                vector_exact BLOB DEFAULT NULL
             )
         """)
-        self._conn.execute("""
+        existing = {row[1] for row in self._writer.execute("PRAGMA table_info(vectors)")}
+        for name, ddl in _MIGRATED_COLUMNS:
+            if name not in existing:
+                self._writer.execute(f"ALTER TABLE vectors ADD COLUMN {ddl}")
+        self._writer.execute("""
             CREATE INDEX IF NOT EXISTS idx_source_type ON vectors(source_type)
         """)
-        self._conn.commit()
+        self._writer.execute("CREATE INDEX IF NOT EXISTS idx_source ON vectors(source)")
+        self._writer.execute("""
+            CREATE TABLE IF NOT EXISTS vector_tags (
+                doc_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (doc_id, tag)
+            )
+        """)
+        self._writer.execute("CREATE INDEX IF NOT EXISTS idx_tags_tag ON vector_tags(tag)")
+        self._writer.execute("""
+            CREATE TABLE IF NOT EXISTS vector_facets (
+                doc_id TEXT PRIMARY KEY,
+                category TEXT DEFAULT '',
+                heading TEXT DEFAULT ''
+            )
+        """)
+        self._writer.execute(
+            "CREATE INDEX IF NOT EXISTS idx_facets_category ON vector_facets(category)"
+        )
+        self._writer.execute(
+            "CREATE INDEX IF NOT EXISTS idx_facets_heading ON vector_facets(heading)"
+        )
+        self._writer.execute("""
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self._writer.execute(MANIFEST_DDL)
+        self._writer.execute(PROJECTION_DDL)
+        self._writer.commit()
+
+    def _init_fts(self) -> bool:
+        """Create the FTS5 index (kept in sync by triggers); False when unsupported"""
+        existed = self._writer.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'vectors_fts'"
+        ).fetchone()
+        try:
+            self._writer.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS vectors_fts USING fts5("
+                "doc_id, text, content='vectors', content_rowid='rowid')"
+            )
+        except sqlite3.OperationalError as e:
+            logger.info("SQLite FTS5 unavailable, lexical search disabled: %s", e)
+            return False
+        self._writer.executescript("""
+            CREATE TRIGGER IF NOT EXISTS vectors_fts_ai AFTER INSERT ON vectors BEGIN
+                INSERT INTO vectors_fts (rowid, doc_id, text)
+                VALUES (new.rowid, new.doc_id, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS vectors_fts_ad AFTER DELETE ON vectors BEGIN
+                INSERT INTO vectors_fts (vectors_fts, rowid, doc_id, text)
+                VALUES ('delete', old.rowid, old.doc_id, old.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS vectors_fts_au AFTER UPDATE OF doc_id, text ON vectors
+            BEGIN
+                INSERT INTO vectors_fts (vectors_fts, rowid, doc_id, text)
+                VALUES ('delete', old.rowid, old.doc_id, old.text);
+                INSERT INTO vectors_fts (rowid, doc_id, text)
+                VALUES (new.rowid, new.doc_id, new.text);
+            END;
+        """)
+        if not existed:
+            # Index rows written before the FTS table existed
+            self._writer.execute("INSERT INTO vectors_fts (vectors_fts) VALUES ('rebuild')")
+        self._writer.commit()
+        return True
+
+    def _backfill_facets(self) -> None:
+        """Populate the filter side tables for rows written before they existed"""
+        with self._write_lock:
+            if self.get_meta(FACETS_META_KEY) == "1":
+                return
+            rows = self._writer.execute("SELECT doc_id, metadata FROM vectors").fetchall()
+            self._write_facets([(doc_id, json.loads(meta) if meta else {}) for doc_id, meta in rows])
+            self.set_meta(FACETS_META_KEY, "1")
+
+    def _write_facets(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Replace the side-table rows of (doc_id, metadata) pairs (caller commits)"""
+        tag_rows = []
+        facet_rows = []
+        for doc_id, metadata in items:
+            tags, category, heading = _doc_facets(metadata)
+            tag_rows.extend((doc_id, tag) for tag in tags)
+            facet_rows.append((doc_id, category, heading))
+        self._delete_facets([doc_id for doc_id, _ in items])
+        self._writer.executemany("INSERT INTO vector_tags (doc_id, tag) VALUES (?, ?)", tag_rows)
+        self._writer.executemany(
+            "INSERT INTO vector_facets (doc_id, category, heading) VALUES (?, ?, ?)", facet_rows
+        )
+
+    def _delete_facets(self, doc_ids: Sequence[str]) -> None:
+        params = [(doc_id,) for doc_id in doc_ids]
+        self._writer.executemany("DELETE FROM vector_tags WHERE doc_id = ?", params)
+        self._writer.executemany("DELETE FROM vector_facets WHERE doc_id = ?", params)
+
+    def _row_params(self, doc: VectorDocument) -> tuple:
+        return (
+            doc.doc_id,
+            doc.text,
+            encode_vector(self._reduce(doc.vector), self._codec),
+            doc.source,
+            doc.source_type,
+            json.dumps(doc.metadata, ensure_ascii=False),
+            self._dimensions,
+            doc.content_hash,
+            doc.source_mtime,
+            _pack_vector(doc.vector) if self._keep_exact else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Storage codec
+    # ------------------------------------------------------------------
+
+    @property
+    def codec(self) -> str:
+        """Vector storage codec: float32, float16 or int8"""
+        return self._codec
+
+    @property
+    def keep_exact(self) -> bool:
+        """Whether float32 originals are stored for exact re-ranking"""
+        return self._keep_exact
+
+    def set_codec(self, codec: str, keep_exact: bool = False) -> int:
+        """Switch the storage codec, re-encoding existing rows; return rows rewritten
+
+        Rows are re-encoded from their float32 originals when kept, otherwise
+        from the decoded stored vector (converting away from a lossy codec
+        cannot restore the precision it dropped). `keep_exact` is ignored for
+        float32 without a projection, which is already exact; a projected
+        index cannot start keeping originals it already dropped.
+        """
+        with self._write_lock:
+            check_codec(codec)
+            keep_exact = keep_exact and self._exact_useful(codec, self._projection)
+            rows = self._writer.execute("SELECT doc_id, vector, vector_exact FROM vectors").fetchall()
+            updates = []
+            for doc_id, blob, exact in rows:
+                full = _unpack_vector(exact) if exact else None
+                if full is not None:
+                    stored = self._reduce(full)
+                else:
+                    stored = decode_vector(blob, self._codec).tolist()
+                    if self._projection is None:
+                        full = stored
+                updates.append((
+                    encode_vector(stored, codec),
+                    _pack_vector(full) if keep_exact and full is not None else None,
+                    doc_id,
+                ))
+            try:
+                self._writer.executemany(
+                    "UPDATE vectors SET vector = ?, vector_exact = ? WHERE doc_id = ?", updates
+                )
+                # Layout in the same transaction: other stores never see rows and codec disagree
+                self._write_meta(CODEC_META_KEY, codec)
+                self._write_meta(EXACT_META_KEY, "1" if keep_exact else "0")
+                self._stamp_generation()
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._codec = codec
+            self._keep_exact = keep_exact
+            self._bump_generation()
+            return len(updates)
+
+    @staticmethod
+    def _exact_useful(codec: str, projection: Optional[Projection]) -> bool:
+        """Whether float32 originals differ from the scanned vectors"""
+        return codec != CODEC_FLOAT32 or projection is not None
+
+    # ------------------------------------------------------------------
+    # Projection
+    # ------------------------------------------------------------------
+
+    @property
+    def projection(self) -> Optional[Projection]:
+        """Dimensionality reduction applied to stored vectors (None = full dims)"""
+        return self._projection
+
+    @property
+    def stored_dimensions(self) -> int:
+        """Dimensions of the vectors actually scanned"""
+        return self._projection.target_dims if self._projection is not None else self._dimensions
+
+    def _reduce(self, vector: Sequence[float]) -> Sequence[float]:
+        return self._projection.apply(vector) if self._projection is not None else vector
+
+    def full_vectors(self) -> Tuple[List[str], List[List[float]]]:
+        """(doc_ids, full-dimension vectors) of every row, e.g. to fit a projection
+
+        Raises:
+            ValueError: the index is projected and its originals were not kept
+        """
+        rows = self._conn.execute(
+            "SELECT doc_id, vector, vector_exact FROM vectors ORDER BY doc_id"
+        ).fetchall()
+        doc_ids, vectors = [], []
+        for doc_id, blob, exact in rows:
+            if exact:
+                vectors.append(_unpack_vector(exact))
+            elif self._projection is None:
+                vectors.append(decode_vector(blob, self._codec).tolist())
+            else:
+                raise ValueError(
+                    "Full-dimension vectors were not kept (keep_exact); "
+                    "rebuild the index to change its projection"
+                )
+            doc_ids.append(doc_id)
+        return doc_ids, vectors
+
+    def set_projection(
+        self, projection: Optional[Projection], keep_exact: Optional[bool] = None
+    ) -> int:
+        """Store every vector through `projection` (None = back to full dims)
+
+        Rows are re-projected from their full vectors, so those must be
+        available (see `full_vectors`). `keep_exact` (default: current
+        setting) keeps the full vectors for exact re-ranking. The ANN index
+        covers the old vectors and is dropped. Returns rows rewritten.
+
+        Raises:
+            ValueError: dimension mismatch, or the full vectors are gone
+        """
+        if projection is not None and projection.source_dims != self._dimensions:
+            raise ValueError(
+                f"Projection dimension mismatch: expected {self._dimensions} source dims, "
+                f"got {projection.source_dims}"
+            )
+        with self._write_lock:
+            doc_ids, vectors = self.full_vectors()
+            keep_exact = self._keep_exact if keep_exact is None else keep_exact
+            keep_exact = keep_exact and self._exact_useful(self._codec, projection)
+            np = _get_numpy()
+            if projection is None or not vectors:
+                reduced = vectors
+            elif np is not None:
+                reduced = projection.apply_matrix(np, vectors).tolist()
+            else:
+                reduced = [projection.apply(vector) for vector in vectors]
+            try:
+                self._writer.executemany(
+                    "UPDATE vectors SET vector = ?, vector_exact = ? WHERE doc_id = ?",
+                    [
+                        (
+                            encode_vector(stored, self._codec),
+                            _pack_vector(vector) if keep_exact else None,
+                            doc_id,
+                        )
+                        for doc_id, vector, stored in zip(doc_ids, vectors, reduced)
+                    ],
+                )
+                write_projection_row(self._writer, projection)
+                projection_key = projection.fingerprint() if projection else ""
+                self._write_meta(PROJECTION_META_KEY, projection_key)
+                self._write_meta(EXACT_META_KEY, "1" if keep_exact else "0")
+                self._stamp_generation()
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._projection = projection
+            self._projection_key = projection_key
+            self._keep_exact = keep_exact
+            self._cache = None
+            self._bump_generation()
+            self.drop_ann_index()
+            return len(doc_ids)
+
+    def replace_from(self, source_path: Path, dimensions: Optional[int] = None) -> None:
+        """Atomically replace this database with the contents of another one
+
+        Uses SQLite's online backup into the live connection: readers keep
+        seeing the old contents until the copy commits, and no file is swapped
+        under open WAL connections. The ANN index belongs to the old contents
+        and is dropped. `dimensions` updates the expected vector size.
+        """
+        with self._write_lock:
+            source = sqlite3.connect(str(source_path))
+            try:
+                source.backup(self._writer)
+            finally:
+                source.close()
+            if dimensions is not None:
+                self._dimensions = dimensions
+            self._projection_key = None  # Force a projection re-read
+            self._read_layout(self._writer)
+            self._cache = None
+            self._bump_generation()
+            self.drop_ann_index()
 
     def upsert(self, doc: VectorDocument) -> None:
         """Insert or update a vector document"""
@@ -124,34 +860,26 @@ class VectorStore:
             raise ValueError(
                 f"Vector dimension mismatch: expected {self._dimensions}, got {len(doc.vector)}"
             )
-
-        self._conn.execute(
-            """
-            INSERT INTO vectors (doc_id, text, vector, source, source_type, metadata, dimensions)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(doc_id) DO UPDATE SET
-                text = excluded.text,
-                vector = excluded.vector,
-                source = excluded.source,
-                source_type = excluded.source_type,
-                metadata = excluded.metadata,
-                dimensions = excluded.dimensions
-            """,
-            (
-                doc.doc_id,
-                doc.text,
-                _pack_vector(doc.vector),
-                doc.source,
-                doc.source_type,
-                json.dumps(doc.metadata, ensure_ascii=False),
-                self._dimensions,
-            ),
-        )
-        self._conn.commit()
+        self._write_rows([doc])
 
     def upsert_batch(self, docs: Sequence[VectorDocument]) -> int:
-        """Batch insert/update, return affected row count"""
-        count = 0
+        """Batch insert/update in one transaction, return affected row count"""
+        return self.bulk_load(docs, commit_every=None)
+
+    def bulk_load(
+        self,
+        docs: Iterable[VectorDocument],
+        commit_every: Optional[int] = DEFAULT_COMMIT_ROWS,
+    ) -> int:
+        """Insert/update many documents with executemany, committing every N rows
+
+        `docs` may be a generator; at most `commit_every` documents are held
+        at a time (None = a single transaction). Rows committed before a
+        failure stay written; the failing chunk is rolled back. Documents
+        with the wrong dimension are skipped. Returns the rows written.
+        """
+        written = 0
+        chunk: List[VectorDocument] = []
         for doc in docs:
             if len(doc.vector) != self._dimensions:
                 logger.warning(
@@ -161,31 +889,30 @@ class VectorStore:
                     self._dimensions,
                 )
                 continue
-            self._conn.execute(
-                """
-                INSERT INTO vectors (doc_id, text, vector, source, source_type, metadata, dimensions)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(doc_id) DO UPDATE SET
-                    text = excluded.text,
-                    vector = excluded.vector,
-                    source = excluded.source,
-                    source_type = excluded.source_type,
-                    metadata = excluded.metadata,
-                    dimensions = excluded.dimensions
-                """,
-                (
-                    doc.doc_id,
-                    doc.text,
-                    _pack_vector(doc.vector),
-                    doc.source,
-                    doc.source_type,
-                    json.dumps(doc.metadata, ensure_ascii=False),
-                    self._dimensions,
-                ),
-            )
-            count += 1
-        self._conn.commit()
-        return count
+            chunk.append(doc)
+            if commit_every and len(chunk) >= commit_every:
+                written += self._write_rows(chunk)
+                chunk = []
+        if chunk:
+            written += self._write_rows(chunk)
+        return written
+
+    def _write_rows(self, docs: List[VectorDocument]) -> int:
+        """Upsert rows and their facets in one transaction"""
+        with self._write_lock:
+            # Last write wins for a doc_id repeated within the chunk
+            unique = list({doc.doc_id: doc for doc in docs}.values())
+            try:
+                self._writer.executemany(_UPSERT_SQL, [self._row_params(doc) for doc in unique])
+                self._write_facets([(doc.doc_id, doc.metadata) for doc in unique])
+                self._stamp_generation()
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._bump_generation()
+            self._ann_add(unique)
+            return len(unique)
 
     def search(
         self,
@@ -193,6 +920,9 @@ class VectorStore:
         top_k: int = 10,
         source_type: Optional[str] = None,
         min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        filters: Optional[SearchFilter] = None,
     ) -> List[SearchResult]:
         """Vector similarity search
 
@@ -201,77 +931,923 @@ class VectorStore:
             top_k: Maximum number of results
             source_type: Filter by source type
             min_score: Minimum similarity threshold
+            nprobe: ANN clusters to probe (None = index default, 0 = exact scan).
+                Ignored when no ANN index is built.
+            rerank: Candidates of the quantized scan re-scored against the float32
+                originals (None = 4 x top_k, 0 = off). Only applies with keep_exact.
+            filters: Metadata filter pushed down into SQL; only matching rows are
+                scored (exactly: the ANN index is bypassed for filtered searches).
+        """
+        _check_search_depths(nprobe, rerank)
+        if top_k <= 0:
+            self._check_query(query_vector)
+            return []
+        where = None
+        if filters is not None and not filters.is_empty():
+            where = _filter_clause(source_type, filters)
+        for _ in range(_STALE_RETRIES + 1):
+            ranked = self._vector_ranked(
+                query_vector, top_k, source_type, min_score, nprobe, rerank, where
+            )
+            details = self._fetch_details([doc_id for doc_id, _ in ranked])
+            if len(details) == len(ranked):
+                break
+        return self._build_results(ranked, details)
+
+    def search_many(
+        self,
+        query_vectors: Sequence[List[float]],
+        top_k: int = 10,
+        source_type: Optional[str] = None,
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[List[SearchResult]]:
+        """Vector search for several queries in one pass over the stored vectors
+
+        Arguments as in `search`; returns one result list per query, in order.
+        The vectors are loaded (or filtered) once; with NumPy the queries are
+        scored by matrix-matrix products, except when the ANN index picks
+        different candidate rows per query. Text/metadata and float32
+        originals are fetched once for the union of hits.
         """
+        for query_vector in query_vectors:
+            self._check_query(query_vector)
+        _check_search_depths(nprobe, rerank)
+        if top_k <= 0 or not query_vectors:
+            return [[] for _ in query_vectors]
+        where = None
+        if filters is not None and not filters.is_empty():
+            where = _filter_clause(source_type, filters)
+        for _ in range(_STALE_RETRIES + 1):
+            ranked = self._vector_ranked_many(
+                query_vectors, top_k, source_type, min_score, nprobe, rerank, where
+            )
+            hit_ids = list(dict.fromkeys(doc_id for hits in ranked for doc_id, _ in hits))
+            details = self._fetch_details(hit_ids)
+            if len(details) == len(hit_ids):
+                break
+        return [self._build_results(hits, details) for hits in ranked]
+
+    def _check_query(self, query_vector: List[float]) -> None:
         if len(query_vector) != self._dimensions:
             raise ValueError(
                 f"Query vector dimension mismatch: expected {self._dimensions}, got {len(query_vector)}"
             )
 
-        if source_type:
+    def _vector_ranked(
+        self,
+        query_vector: List[float],
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        nprobe: Optional[int],
+        rerank: Optional[int],
+        where: Optional[Tuple[str, List[Any]]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top (doc_id, cosine) pairs, optionally restricted to a WHERE clause"""
+        self._check_query(query_vector)
+        rows = None
+        if where is not None:
+            nprobe = 0
+            snapshot, rows = self._filtered_snapshot(source_type, where)
+        else:
+            snapshot = self._snapshot(source_type)
+        if not snapshot.doc_ids or (rows is not None and not len(rows)):
+            return []
+
+        depth = 0
+        if self._keep_exact:
+            depth = top_k * RERANK_FACTOR if rerank is None else rerank
+        candidates = max(top_k, depth)
+        # min_score applies to the exact scores when candidates are re-ranked
+        scan_min = -math.inf if depth else min_score
+
+        scan_query = self._reduce(query_vector)
+        if snapshot.is_numpy:
+            ranked = self._rank_numpy(
+                snapshot, scan_query, candidates, source_type, scan_min, nprobe, rows
+            )
+        else:
+            ranked = self._rank_python(
+                snapshot, scan_query, candidates, source_type, scan_min, rows
+            )
+        if depth:
+            ranked = self._rerank_exact(query_vector, ranked, min_score)
+        return ranked[:top_k]
+
+    def _vector_ranked_many(
+        self,
+        query_vectors: Sequence[List[float]],
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        nprobe: Optional[int],
+        rerank: Optional[int],
+        where: Optional[Tuple[str, List[Any]]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """`_vector_ranked` for several queries over one snapshot"""
+        rows = None
+        if where is not None:
+            nprobe = 0
+            snapshot, rows = self._filtered_snapshot(source_type, where)
+        else:
+            snapshot = self._snapshot(source_type)
+        if not snapshot.doc_ids or (rows is not None and not len(rows)):
+            return [[] for _ in query_vectors]
+
+        depth = 0
+        if self._keep_exact:
+            depth = top_k * RERANK_FACTOR if rerank is None else rerank
+        candidates = max(top_k, depth)
+        scan_min = -math.inf if depth else min_score
+
+        scan_queries = [self._reduce(q) for q in query_vectors]
+        if snapshot.is_numpy and (rows is not None or nprobe == 0 or self._ann is None):
+            ranked = self._rank_numpy_many(
+                snapshot, scan_queries, candidates, source_type, scan_min, rows
+            )
+        elif snapshot.is_numpy:
+            ranked = [
+                self._rank_numpy(snapshot, q, candidates, source_type, scan_min, nprobe, rows)
+                for q in scan_queries
+            ]
+        else:
+            ranked = [
+                self._rank_python(snapshot, q, candidates, source_type, scan_min, rows)
+                for q in scan_queries
+            ]
+        if depth:
+            exact = self._fetch_exact(
+                list(dict.fromkeys(doc_id for hits in ranked for doc_id, _ in hits))
+            )
+            ranked = [
+                self._rerank_exact(q, hits, min_score, exact)
+                for q, hits in zip(query_vectors, ranked)
+            ]
+        return [hits[:top_k] for hits in ranked]
+
+    # ------------------------------------------------------------------
+    # Lexical (FTS5) and hybrid search
+    # ------------------------------------------------------------------
+
+    @property
+    def fts_available(self) -> bool:
+        """Whether SQLite FTS5 is available (lexical / hybrid search)"""
+        return self._fts
+
+    def _lexical_ranked(
+        self,
+        query_text: str,
+        limit: int,
+        source_type: Optional[str],
+        filters: Optional[SearchFilter],
+    ) -> List[Tuple[str, float]]:
+        """BM25 top (doc_id, relevance) pairs, relevance = -bm25 (higher is better)"""
+        match = _fts_query(query_text)
+        if not match or not self._fts or limit <= 0:
+            return []
+        where, params = _filter_clause(source_type, filters or SearchFilter())
+        sql = (
+            f"SELECT doc_id, -bm25(vectors_fts, {_BM25_WEIGHTS}) FROM vectors_fts "
+            "WHERE vectors_fts MATCH ?"
+        )
+        if where != "1":
+            sql += f" AND rowid IN (SELECT rowid FROM vectors WHERE {where})"
+        sql += f" ORDER BY bm25(vectors_fts, {_BM25_WEIGHTS}) LIMIT ?"
+        return [
+            (doc_id, float(score))
+            for doc_id, score in self._conn.execute(sql, [match, *params, limit])
+        ]
+
+    def search_lexical(
+        self,
+        query_text: str,
+        top_k: int = 10,
+        source_type: Optional[str] = None,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[SearchResult]:
+        """BM25 keyword search over doc_id and text (no vectors involved)
+
+        Query tokens are OR-ed; each is matched as a phrase, so identifiers
+        such as INS-042 or function names hit exactly. Scores are BM25
+        relevance (unbounded, higher is better). Empty when FTS5 is unavailable.
+        """
+        return self._build_results(
+            self._lexical_ranked(query_text, top_k, source_type, filters)
+        )
+
+    def search_hybrid(
+        self,
+        query_text: str,
+        query_vector: List[float],
+        top_k: int = 10,
+        source_type: Optional[str] = None,
+        min_score: float = 0.0,
+        filters: Optional[SearchFilter] = None,
+        candidates: int = DEFAULT_HYBRID_CANDIDATES,
+        lexical_candidates_only: bool = False,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        rrf_k: int = RRF_K,
+    ) -> List[SearchResult]:
+        """Lexical + vector search fused with reciprocal-rank fusion
+
+        Args:
+            query_text: Raw query for BM25
+            query_vector: Embedded query for the vector ranking
+            candidates: Results taken from each ranking before fusion
+            lexical_candidates_only: Score vectors only for the BM25 candidates
+                (falls back to the full vector scan when BM25 finds nothing)
+            min_score: Minimum cosine for vector candidates
+            rrf_k: RRF constant; result scores are the fused RRF scores
+
+        Other arguments as in `search`.
+        """
+        self._check_query(query_vector)
+        _check_search_depths(nprobe, rerank)
+        if top_k <= 0:
+            return []
+        depth = max(top_k, candidates)
+        lexical = self._lexical_ranked(query_text, depth, source_type, filters)
+
+        where = None
+        if lexical_candidates_only and lexical:
+            ids = [doc_id for doc_id, _ in lexical]
+            where = (f"doc_id IN ({','.join('?' * len(ids))})", ids)
+        elif filters is not None and not filters.is_empty():
+            where = _filter_clause(source_type, filters)
+        vector = self._vector_ranked(
+            query_vector, depth, source_type, min_score, nprobe, rerank, where
+        )
+
+        fused = reciprocal_rank_fusion([lexical, vector], k=rrf_k)
+        return self._build_results(fused[:top_k])
+
+    def _rank_python(
+        self,
+        snapshot: _VectorSnapshot,
+        query_vector: List[float],
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        rows: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Pure Python fallback: cosine similarity per row"""
+        scored = []
+        indices = range(len(snapshot.doc_ids)) if rows is None else rows
+        for i in indices:
+            doc_id, stype = snapshot.doc_ids[i], snapshot.source_types[i]
+            if source_type and stype != source_type:
+                continue
+            score = cosine_similarity(query_vector, snapshot.matrix[i])
+            if score >= min_score:
+                scored.append((doc_id, score))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:top_k]
+
+    def _rank_numpy(
+        self,
+        snapshot: _VectorSnapshot,
+        query_vector: List[float],
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        nprobe: Optional[int] = None,
+        rows: Any = None,
+    ) -> List[Tuple[str, float]]:
+        """NumPy path: score rows with one mat-vec product over the normalized matrix
+
+        `rows` restricts scoring to those snapshot rows (ascending); otherwise
+        the ANN index, when built, picks the candidate rows.
+        """
+        np = _get_numpy()
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if query_norm > 0:
+            query = query / query_norm
+
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+        elif self._ann is not None and nprobe != 0 and query_norm > 0:
+            rows = self._ann_candidate_rows(snapshot, query, nprobe, source_type, top_k)
+
+        if query_norm == 0:
+            count = len(snapshot.doc_ids) if rows is None else len(rows)
+            scores = np.zeros(count, dtype=np.float32)
+        else:
+            scores = self._score_rows(np, snapshot, query, rows)
+
+        if source_type and snapshot.source_type is None:
+            # Full snapshot: exclude other source types from selection
+            stypes = snapshot.source_type_array
+            if rows is not None:
+                stypes = stypes[rows]
+            scores = np.where(stypes == source_type, scores, -np.inf)
+
+        top = _top_k_indices(np, scores, top_k, min_score)
+        if rows is not None:
+            return [(snapshot.doc_ids[rows[i]], float(scores[i])) for i in top]
+        return [(snapshot.doc_ids[i], float(scores[i])) for i in top]
+
+    def _rank_numpy_many(
+        self,
+        snapshot: _VectorSnapshot,
+        query_vectors: Sequence[List[float]],
+        top_k: int,
+        source_type: Optional[str],
+        min_score: float,
+        rows: Any = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """NumPy path for several queries: matrix-matrix products, no ANN"""
+        np = _get_numpy()
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+        mask = None
+        if source_type and snapshot.source_type is None:
+            stypes = snapshot.source_type_array
+            mask = (stypes if rows is None else stypes[rows]) == source_type
+
+        ranked: List[List[Tuple[str, float]]] = []
+        for start in range(0, len(query_vectors), _QUERY_BLOCK):
+            queries = np.asarray(query_vectors[start : start + _QUERY_BLOCK], dtype=np.float32)
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            # Zero queries stay zero and score 0 everywhere, as in `_rank_numpy`
+            queries = queries / np.where(norms > 0, norms, 1.0)
+            # One row of scores per query
+            block_scores = np.ascontiguousarray(
+                self._score_rows(np, snapshot, queries.T, rows).T
+            )
+            for scores in block_scores:
+                if mask is not None:
+                    scores = np.where(mask, scores, -np.inf)
+                top = _top_k_indices(np, scores, top_k, min_score)
+                ids = top if rows is None else rows[top]
+                ranked.append(
+                    [(snapshot.doc_ids[i], float(scores[t])) for i, t in zip(ids, top)]
+                )
+        return ranked
+
+    @staticmethod
+    def _score_rows(np: Any, snapshot: _VectorSnapshot, query: Any, rows: Any) -> Any:
+        """Dot products of the (selected) snapshot rows with a normalized query
+
+        `query` may also be a (dims, m) matrix of m queries: scores are then (rows, m).
+        """
+        matrix = snapshot.matrix if rows is None else snapshot.matrix[rows]
+        if snapshot.row_scale is None:
+            return matrix @ query
+        # Quantized rows: upcast block by block to bound the float32 working set
+        scores = np.empty((matrix.shape[0],) + query.shape[1:], dtype=np.float32)
+        for start in range(0, matrix.shape[0], _SCORE_BLOCK_ROWS):
+            block = matrix[start : start + _SCORE_BLOCK_ROWS]
+            scores[start : start + _SCORE_BLOCK_ROWS] = block.astype(np.float32) @ query
+        scale = snapshot.row_scale if rows is None else snapshot.row_scale[rows]
+        return scores * scale.reshape((-1,) + (1,) * (query.ndim - 1))
+
+    def _rerank_exact(
+        self,
+        query_vector: List[float],
+        ranked: List[Tuple[str, float]],
+        min_score: float,
+        exact: Optional[Dict[str, bytes]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Re-score quantized/projected-scan candidates against their float32 originals
+
+        `exact` holds already fetched originals (see `_fetch_exact`).
+        """
+        if not ranked:
+            return ranked
+        if exact is None:
+            exact = self._fetch_exact([doc_id for doc_id, _ in ranked])
+        np = _get_numpy()
+        query = None
+        if np is not None:
+            query = np.asarray(query_vector, dtype=np.float32)
+            query_norm = float(np.linalg.norm(query))
+        rescored = []
+        for doc_id, score in ranked:
+            blob = exact.get(doc_id)
+            if blob and query is None:
+                score = cosine_similarity(query_vector, array("f", blob))
+            elif blob:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                denom = query_norm * float(np.linalg.norm(vector))
+                score = float(vector @ query) / denom if denom else 0.0
+            if score >= min_score:
+                rescored.append((doc_id, score))
+        rescored.sort(key=lambda item: item[1], reverse=True)
+        return rescored
+
+    def _fetch_exact(self, doc_ids: Sequence[str]) -> Dict[str, bytes]:
+        """Fetch the stored float32 originals (doc_id -> BLOB) of the given rows"""
+        found: Dict[str, bytes] = {}
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
             rows = self._conn.execute(
-                "SELECT doc_id, text, vector, source, source_type, metadata "
-                "FROM vectors WHERE source_type = ?",
+                f"SELECT doc_id, vector_exact FROM vectors WHERE doc_id IN ({placeholders})",
+                tuple(chunk),
+            ).fetchall()
+            for doc_id, blob in rows:
+                if blob:
+                    found[doc_id] = blob
+        return found
+
+    def _ann_candidate_rows(
+        self,
+        snapshot: _VectorSnapshot,
+        query: Any,
+        nprobe: Optional[int],
+        source_type: Optional[str] = None,
+        need: int = 0,
+    ) -> Any:
+        """Snapshot rows in the probed clusters plus rows unknown to the index
+
+        Probes the `nprobe` closest clusters, then further ones (closest first)
+        until at least `need` candidate rows of `source_type` are found, so a
+        filtered search is not starved by clusters full of other source types.
+        None (score every row) when the index was dropped concurrently.
+        """
+        np = _get_numpy()
+        with self._ann_lock:
+            ann = self._ann
+            if ann is None:
+                return None
+            key = (id(ann), ann.version)
+            if snapshot.ann_key != key:
+                labels = ann.list_rows(snapshot.doc_ids)
+                order = np.argsort(labels, kind="stable")
+                bounds = np.concatenate(
+                    ([0], np.cumsum(np.bincount(labels + 1, minlength=ann.nlist + 1)))
+                )
+                # Slot 0 holds unassigned rows (label -1), slot c+1 holds cluster c
+                snapshot.ann_rows = [
+                    order[bounds[i] : bounds[i + 1]] for i in range(ann.nlist + 1)
+                ]
+                snapshot.ann_key = key
+            ann_rows = snapshot.ann_rows
+
+        nprobe = ann.nprobe if nprobe is None else nprobe
+        stypes = snapshot.source_type_array if source_type and not snapshot.source_type else None
+
+        def _matching(rows: Any) -> int:
+            if stypes is None:
+                return len(rows)
+            return int(np.count_nonzero(stypes[rows] == source_type))
+
+        parts = [ann_rows[0]]
+        found = _matching(ann_rows[0])
+        for probed, cluster in enumerate(ann.rank_clusters(query)):
+            if probed >= nprobe and found >= need:
+                break
+            parts.append(ann_rows[cluster + 1])
+            found += _matching(ann_rows[cluster + 1])
+        # Sorted rows keep storage order for ties
+        return np.sort(np.concatenate(parts))
+
+    def _build_results(
+        self, ranked: List[Tuple[str, float]], details: Optional[Dict[str, tuple]] = None
+    ) -> List[SearchResult]:
+        """Decode text/metadata only for the ranked rows (`details`: prefetched rows)"""
+        if not ranked:
+            return []
+        if details is None:
+            details = self._fetch_details([doc_id for doc_id, _ in ranked])
+        results = []
+        for doc_id, score in ranked:
+            if doc_id not in details:
+                # Deleted since the snapshot was taken (and still after the retries)
+                continue
+            text, source, stype, meta_json = details[doc_id]
+            results.append(
+                SearchResult(
+                    doc_id=doc_id,
+                    text=text,
+                    score=score,
+                    source=source,
+                    source_type=stype,
+                    metadata=json.loads(meta_json) if meta_json else {},
+                )
+            )
+        return results
+
+    # ------------------------------------------------------------------
+    # Resident vector cache
+    # ------------------------------------------------------------------
+
+    def _current_generation(self) -> Tuple[int, int]:
+        """Own write counter plus SQLite data_version (bumped by other connections)
+
+        data_version is only comparable on one connection, so every thread
+        asks the shared probe connection (which also sees our writer's commits).
+        """
+        with self._probe_lock:
+            data_version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+        return (self._generation, data_version)
+
+    def _bump_generation(self) -> None:
+        self._generation += 1
+
+    def _refresh_layout(self, data_version: int) -> None:
+        """Re-read codec / keep_exact / projection after commits by other connections
+
+        Another store on the same file (another process, or a rebuild swapped
+        in through its own connection) may have re-encoded or re-projected the
+        rows; decoding them with a stale layout would fail or mis-score.
+        """
+        if data_version == self._layout_version:
+            return
+        with self._layout_lock:
+            if data_version != self._layout_version:
+                self._read_layout(self._conn)
+                self._layout_version = data_version
+
+    def _read_layout(self, conn: sqlite3.Connection) -> None:
+        meta = dict(conn.execute(
+            "SELECT key, value FROM index_meta WHERE key IN (?, ?, ?)",
+            (CODEC_META_KEY, EXACT_META_KEY, PROJECTION_META_KEY),
+        ).fetchall())
+        projection_key = meta.get(PROJECTION_META_KEY) or ""
+        if projection_key != self._projection_key:
+            self._projection = read_projection_row(conn)
+            self._projection_key = projection_key
+        self._codec = check_codec(meta.get(CODEC_META_KEY) or DEFAULT_CODEC)
+        self._keep_exact = meta.get(EXACT_META_KEY, "0") == "1"
+
+    def _stamp_generation(self) -> None:
+        """Record a new index generation in the writer's open transaction"""
+        self._writer.execute(
+            "INSERT INTO index_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (GENERATION_META_KEY, uuid.uuid4().hex),
+        )
+
+    def _touch_generation(self) -> None:
+        with self._write_lock:
+            self._stamp_generation()
+            self._writer.commit()
+
+    def index_generation(self) -> str:
+        """Token that changes whenever search results may change
+
+        Rewritten (randomly, so it is never reused) in the same transaction as
+        every upsert/delete and on codec or ANN index changes, and stored in
+        the DB so other processes see it too. Caches of search results key on
+        it. Empty for an index never written by this version.
+        """
+        return self.get_meta(GENERATION_META_KEY, "") or ""
+
+    def invalidate_cache(self) -> None:
+        """Drop the resident vector cache; the next search reloads from SQLite"""
+        self._cache = None
+
+    @property
+    def cache_loaded(self) -> bool:
+        """Whether a resident vector snapshot is currently held in memory"""
+        return self._cache is not None
+
+    def _filtered_snapshot(
+        self, source_type: Optional[str], where_clause: Tuple[str, List[Any]]
+    ) -> Tuple[_VectorSnapshot, Optional[List[int]]]:
+        """Snapshot plus the rows matching a WHERE clause over `vectors`
+
+        A fresh resident cache is reused (rows = matching positions); otherwise
+        only the matching rows are fetched and decoded (rows = None, all match).
+        """
+        where, params = where_clause
+        cache = self._cache
+        if (
+            cache is not None
+            and cache.generation == self._current_generation()
+            and cache.is_numpy == (_get_numpy() is not None)
+        ):
+            if cache.row_index is None:
+                cache.row_index = {doc_id: i for i, doc_id in enumerate(cache.doc_ids)}
+            matched = self._conn.execute(
+                f"SELECT doc_id FROM vectors WHERE {where}", params
+            ).fetchall()
+            rows = sorted(cache.row_index[r[0]] for r in matched if r[0] in cache.row_index)
+            return cache, rows
+
+        self._refresh_layout(self._current_generation()[1])
+        snapshot = self._load_snapshot(source_type, where_clause)
+        snapshot.source_type = source_type or ""
+        return snapshot, None
+
+    def _snapshot(self, source_type: Optional[str]) -> _VectorSnapshot:
+        """Return decoded vectors, reusing the resident cache while the DB is unchanged"""
+        generation = self._current_generation()
+        if self._cache_max_bytes <= 0:
+            # Cache disabled: decode only the rows that can match
+            self._refresh_layout(generation[1])
+            return self._load_snapshot(source_type)
+
+        cache = self._cache
+        if (
+            cache is not None
+            and cache.generation == generation
+            and cache.is_numpy == (_get_numpy() is not None)
+        ):
+            return cache
+
+        self._refresh_layout(generation[1])
+        if source_type and self._snapshot_bytes(self.count()) > self._cache_max_bytes:
+            # Too large to cache: decode only the rows that can match
+            self._cache = None
+            return self._load_snapshot(source_type)
+        snapshot = self._load_snapshot(None)
+        snapshot.generation = generation
+        if snapshot.nbytes <= self._cache_max_bytes:
+            self._cache = snapshot
+        else:
+            logger.debug(
+                "Vector cache dropped: %d bytes exceeds cap of %d",
+                snapshot.nbytes,
+                self._cache_max_bytes,
+            )
+            self._cache = None
+        return snapshot
+
+    def _snapshot_bytes(self, rows: int) -> int:
+        """Estimated `nbytes` of a snapshot of `rows` rows (as computed by _load_snapshot)"""
+        dims = self.stored_dimensions
+        if _get_numpy() is None or self._codec != CODEC_INT8:
+            per_row = dims * 4  # Decoded to float32 (or Python floats, counted alike)
+        else:
+            per_row = dims + 4  # int8 codes plus the row scale
+        return rows * (per_row + _ROW_OVERHEAD_BYTES)
+
+    def _load_snapshot(
+        self,
+        source_type: Optional[str],
+        where: Optional[Tuple[str, List[Any]]] = None,
+    ) -> _VectorSnapshot:
+        """Decode vectors (optionally of one source type or a filter clause) from SQLite"""
+        if where is not None:
+            rows = self._conn.execute(
+                f"SELECT doc_id, source_type, vector FROM vectors WHERE {where[0]}", where[1]
+            ).fetchall()
+        elif source_type:
+            rows = self._conn.execute(
+                "SELECT doc_id, source_type, vector FROM vectors WHERE source_type = ?",
                 (source_type,),
             ).fetchall()
         else:
             rows = self._conn.execute(
-                "SELECT doc_id, text, vector, source, source_type, metadata FROM vectors"
+                "SELECT doc_id, source_type, vector FROM vectors"
             ).fetchall()
 
-        results = []
-        for row in rows:
-            doc_id, text, vec_blob, source, stype, meta_json = row
-            stored_vector = _unpack_vector(vec_blob)
-            score = cosine_similarity(query_vector, stored_vector)
-            if score >= min_score:
-                results.append(
-                    SearchResult(
-                        doc_id=doc_id,
-                        text=text,
-                        score=score,
-                        source=source,
-                        source_type=stype,
-                        metadata=json.loads(meta_json) if meta_json else {},
-                    )
-                )
+        doc_ids = [r[0] for r in rows]
+        source_types = [r[1] for r in rows]
+        np = _get_numpy()
+        if np is None:
+            dims = self.stored_dimensions
+            matrix: Any = [decode_vector(r[2], self._codec) for r in rows]
+            for vector in matrix:
+                if len(vector) != dims:
+                    raise ValueError(f"Vector dimension mismatch: {dims} vs {len(vector)}")
+            return _VectorSnapshot(
+                doc_ids=doc_ids,
+                source_types=source_types,
+                matrix=matrix,
+                nbytes=len(rows) * (dims * 4 + _ROW_OVERHEAD_BYTES),
+                source_type=source_type,
+            )
+
+        matrix = decode_matrix(np, [r[2] for r in rows], self._codec, self.stored_dimensions)
+        row_scale = None
+        if self._codec != CODEC_INT8:
+            # Pre-normalize rows; zero rows keep score 0 like cosine_similarity
+            matrix = matrix.astype(np.float32, copy=False)
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = 1.0
+            matrix = np.ascontiguousarray(matrix / norms[:, None], dtype=np.float32)
+        else:
+            # Keep the compact codes; cosine = (codes . query) / ||codes|| (scales cancel)
+            norms = np.empty(len(rows), dtype=np.float32)
+            for start in range(0, len(rows), _SCORE_BLOCK_ROWS):
+                block = matrix[start : start + _SCORE_BLOCK_ROWS].astype(np.float32)
+                norms[start : start + _SCORE_BLOCK_ROWS] = np.linalg.norm(block, axis=1)
+            norms[norms == 0] = 1.0
+            matrix = np.ascontiguousarray(matrix)
+            row_scale = (1.0 / norms).astype(np.float32)
+
+        nbytes = int(matrix.nbytes) + len(rows) * _ROW_OVERHEAD_BYTES
+        if row_scale is not None:
+            nbytes += int(row_scale.nbytes)
+        return _VectorSnapshot(
+            doc_ids=doc_ids,
+            source_types=source_types,
+            matrix=matrix,
+            nbytes=nbytes,
+            source_type=source_type,
+            source_type_array=np.asarray(source_types, dtype=object),
+            is_numpy=True,
+            row_scale=row_scale,
+        )
+
+    # ------------------------------------------------------------------
+    # ANN index
+    # ------------------------------------------------------------------
+
+    def _load_ann_index(self) -> None:
+        if self._ann_path is None or not self._ann_path.exists():
+            return
+        if _get_numpy() is None:
+            logger.info("ANN index present but numpy is not installed; using exact scan")
+            return
+        try:
+            ann = IVFIndex.load(self._ann_path)
+        except Exception as e:
+            logger.warning("Failed to load ANN index %s: %s", self._ann_path, e)
+            return
+        if ann.dimensions != self.stored_dimensions:
+            logger.warning(
+                "Ignoring ANN index: dimension mismatch (%d vs %d)",
+                ann.dimensions,
+                self.stored_dimensions,
+            )
+            return
+        self._ann = ann
+
+    def _save_ann_index(self) -> None:
+        if self._ann is not None and self._ann_path is not None:
+            self._ann.save(self._ann_path)
+            self._ann_dirty = False
+
+    def _ann_add(self, docs: Sequence[VectorDocument]) -> None:
+        with self._ann_lock:
+            if self._ann is None:
+                return
+            self._ann.add([d.doc_id for d in docs], [self._reduce(d.vector) for d in docs])
+            self._ann_dirty = True
+
+    def _ann_remove(self, doc_ids: Sequence[str]) -> None:
+        with self._ann_lock:
+            if self._ann is not None and self._ann.remove(doc_ids):
+                self._ann_dirty = True
+
+    def flush_ann_index(self) -> bool:
+        """Save the ANN index if upserts/deletes changed it; returns whether it was written
+
+        Writes are batched here instead of rewriting the file on every write;
+        rows missing from a stale saved index are still scored (see IVFIndex).
+        The file is written from a copy, without holding the writer lock.
+        """
+        with self._ann_save_lock:
+            with self._ann_lock:
+                if not self._ann_dirty or self._ann is None or self._ann_path is None:
+                    return False
+                ann = self._ann.copy()
+                self._ann_dirty = False
+            try:
+                ann.save(self._ann_path)
+            except BaseException:
+                with self._ann_lock:
+                    self._ann_dirty = True
+                raise
+            return True
+
+    def build_ann_index(
+        self, nlist: Optional[int] = None, nprobe: Optional[int] = None
+    ) -> IVFIndex:
+        """Train an IVF index over all stored vectors and persist it next to the DB
+
+        Args:
+            nlist: Number of clusters (default ~sqrt(N))
+            nprobe: Default clusters probed per query
 
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:top_k]
+        Raises:
+            ImportError: numpy is not installed
+            ValueError: the store is empty
+        """
+        if _get_numpy() is None:
+            raise ImportError(
+                "ANN index requires numpy. Install: pip install vibe-collab[embedding]"
+            )
+        snapshot = self._load_snapshot(None)
+        matrix = snapshot.matrix
+        if snapshot.row_scale is not None:
+            matrix = matrix.astype("float32") * snapshot.row_scale[:, None]
+        kwargs = {"nprobe": nprobe} if nprobe else {}
+        ann = IVFIndex.build(snapshot.doc_ids, matrix, nlist=nlist, **kwargs)
+        with self._ann_save_lock, self._ann_lock:
+            self._ann = ann
+            self._save_ann_index()
+        self._touch_generation()
+        return ann
+
+    def drop_ann_index(self) -> None:
+        """Remove the ANN index; searches fall back to the exact scan"""
+        with self._ann_save_lock, self._ann_lock:
+            self._ann = None
+            self._ann_dirty = False
+            if self._ann_path is not None and self._ann_path.exists():
+                self._ann_path.unlink()
+        self._touch_generation()
+
+    @property
+    def ann_index(self) -> Optional[IVFIndex]:
+        return self._ann
+
+    def _fetch_details(self, doc_ids: Sequence[str]) -> Dict[str, tuple]:
+        """Fetch (text, source, source_type, metadata JSON) for the given doc_ids"""
+        details: Dict[str, tuple] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                "SELECT doc_id, text, source, source_type, metadata "
+                f"FROM vectors WHERE doc_id IN ({placeholders})",
+                tuple(chunk),
+            ).fetchall()
+            for doc_id, text, source, stype, meta_json in rows:
+                details[doc_id] = (text, source, stype, meta_json)
+        return details
 
     def get(self, doc_id: str) -> Optional[VectorDocument]:
         """Get a single document by doc_id"""
         row = self._conn.execute(
-            "SELECT doc_id, text, vector, source, source_type, metadata "
-            "FROM vectors WHERE doc_id = ?",
+            "SELECT doc_id, text, vector, source, source_type, metadata, "
+            "content_hash, source_mtime, vector_exact FROM vectors WHERE doc_id = ?",
             (doc_id,),
         ).fetchone()
 
         if not row:
             return None
 
-        doc_id, text, vec_blob, source, stype, meta_json = row
+        doc_id, text, vec_blob, source, stype, meta_json, content_hash, mtime, exact = row
+        if exact:
+            vector = _unpack_vector(exact)
+        else:
+            vector = decode_vector(vec_blob, self._codec).tolist()
+            if self._projection is not None:
+                # Originals not kept: best full-dimension approximation
+                vector = self._projection.restore(vector)
         return VectorDocument(
             doc_id=doc_id,
             text=text,
-            vector=_unpack_vector(vec_blob),
+            vector=vector,
             source=source,
             source_type=stype,
             metadata=json.loads(meta_json) if meta_json else {},
+            content_hash=content_hash or "",
+            source_mtime=mtime or 0.0,
         )
 
     def delete(self, doc_id: str) -> bool:
         """Delete a single document"""
-        cursor = self._conn.execute("DELETE FROM vectors WHERE doc_id = ?", (doc_id,))
-        self._conn.commit()
-        return cursor.rowcount > 0
+        with self._write_lock:
+            cursor = self._writer.execute("DELETE FROM vectors WHERE doc_id = ?", (doc_id,))
+            self._delete_facets([doc_id])
+            if cursor.rowcount:
+                self._stamp_generation()
+            self._writer.commit()
+            if cursor.rowcount:
+                self._bump_generation()
+                self._ann_remove([doc_id])
+            return cursor.rowcount > 0
+
+    def delete_many(self, doc_ids: Sequence[str]) -> int:
+        """Delete several documents in one transaction, return deleted count"""
+        with self._write_lock:
+            cursor = self._writer.executemany(
+                "DELETE FROM vectors WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids]
+            )
+            deleted = max(cursor.rowcount, 0)
+            self._delete_facets(doc_ids)
+            if deleted:
+                self._stamp_generation()
+            self._writer.commit()
+            if deleted:
+                self._bump_generation()
+                self._ann_remove(doc_ids)
+            return deleted
 
     def delete_by_source_type(self, source_type: str) -> int:
         """Batch delete by source type"""
-        cursor = self._conn.execute(
-            "DELETE FROM vectors WHERE source_type = ?", (source_type,)
-        )
-        self._conn.commit()
-        return cursor.rowcount
+        with self._write_lock:
+            doc_ids = self.list_doc_ids(source_type) if self._ann is not None else []
+            for table in ("vector_tags", "vector_facets"):
+                self._writer.execute(
+                    f"DELETE FROM {table} WHERE doc_id IN "
+                    "(SELECT doc_id FROM vectors WHERE source_type = ?)",
+                    (source_type,),
+                )
+            cursor = self._writer.execute(
+                "DELETE FROM vectors WHERE source_type = ?", (source_type,)
+            )
+            if cursor.rowcount:
+                self._stamp_generation()
+            self._writer.commit()
+            if cursor.rowcount:
+                self._bump_generation()
+                self._ann_remove(doc_ids)
+            return cursor.rowcount
 
     def count(self, source_type: Optional[str] = None) -> int:
         """Count documents"""
@@ -296,6 +1872,132 @@ class VectorStore:
             ).fetchall()
         return [r[0] for r in rows]
 
+    def chunk_states(self, source_type: Optional[str] = None) -> Dict[str, Tuple[str, float, str]]:
+        """Map doc_id -> (content_hash, source_mtime, source) without decoding vectors"""
+        sql = "SELECT doc_id, content_hash, source_mtime, source FROM vectors"
+        params: tuple = ()
+        if source_type:
+            sql += " WHERE source_type = ?"
+            params = (source_type,)
+        return {
+            doc_id: (content_hash or "", mtime or 0.0, source or "")
+            for doc_id, content_hash, mtime, source in self._conn.execute(sql, params)
+        }
+
+    def set_source_mtimes(self, mtimes: Dict[str, float]) -> None:
+        """Refresh the recorded source mtime of unchanged chunks (vectors untouched)"""
+        with self._write_lock:
+            try:
+                self._writer.executemany(
+                    "UPDATE vectors SET source_mtime = ? WHERE doc_id = ?",
+                    [(mtime, doc_id) for doc_id, mtime in mtimes.items()],
+                )
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Read an index-level metadata value"""
+        row = self._conn.execute(
+            "SELECT value FROM index_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write an index-level metadata value"""
+        with self._write_lock:
+            self._write_meta(key, value)
+            self._writer.commit()
+
+    def _write_meta(self, key: str, value: str) -> None:
+        """Write a metadata value in the writer's open transaction"""
+        self._writer.execute(
+            "INSERT INTO index_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def get_manifest(self) -> Optional[IndexManifest]:
+        """How the index was built (None until an Indexer has written it)"""
+        return read_manifest_row(self._conn)
+
+    def set_manifest(self, manifest: IndexManifest) -> None:
+        """Record how the index was built"""
+        with self._write_lock:
+            write_manifest_row(self._writer, manifest)
+            self._writer.commit()
+
+    def corpus_hash(self) -> str:
+        """Fingerprint of the indexed chunks (doc_ids and content hashes)"""
+        return corpus_hash(
+            self._conn.execute("SELECT doc_id, content_hash FROM vectors ORDER BY doc_id")
+        )
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def storage_stats(self) -> Dict[str, Any]:
+        """Page usage, fragmentation and file sizes of the database
+
+        `fragmentation` is the share of pages on the freelist (reclaimed by
+        `vacuum`); `seconds` is the time taken to collect the numbers.
+        """
+        start = time.perf_counter()
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        stats: Dict[str, Any] = {
+            "rows": self.count(),
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_count": freelist,
+            "fragmentation": round(freelist / page_count, 4) if page_count else 0.0,
+            "db_bytes": page_size * page_count,
+            "wal_bytes": 0,
+        }
+        if self._db_path is not None:
+            wal = self._db_path.with_name(self._db_path.name + "-wal")
+            stats["wal_bytes"] = wal.stat().st_size if wal.exists() else 0
+        stats["seconds"] = round(time.perf_counter() - start, 4)
+        return stats
+
+    def vacuum(self) -> Dict[str, float]:
+        """Compact the database; returns seconds spent per phase
+
+        Phases: checkpoint the WAL, VACUUM (rewrites the file without free
+        pages), ANALYZE for the query planner, then truncate the WAL the
+        rewrite produced. VACUUM may renumber the implicit rowids the FTS index
+        maps to; if it did, an "fts_rebuild" phase re-syncs it.
+        """
+        with self._write_lock:
+            self._writer.commit()
+            timings: Dict[str, float] = {}
+
+            def phase(name: str, *statements: str) -> None:
+                start = time.perf_counter()
+                for sql in statements:
+                    self._writer.execute(sql).fetchall()
+                self._writer.commit()
+                timings[name] = round(time.perf_counter() - start, 4)
+
+            phase("checkpoint", "PRAGMA wal_checkpoint(TRUNCATE)")
+            rowids = self._rowid_digest()
+            phase("vacuum", "VACUUM")
+            if self._fts and self._rowid_digest() != rowids:
+                phase("fts_rebuild", "INSERT INTO vectors_fts (vectors_fts) VALUES ('rebuild')")
+            phase("analyze", "ANALYZE")
+            phase("wal_truncate", "PRAGMA wal_checkpoint(TRUNCATE)")
+            self._bump_generation()
+            return timings
+
+    def _rowid_digest(self) -> str:
+        digest = hashlib.sha256()
+        for rowid, doc_id in self._writer.execute("SELECT rowid, doc_id FROM vectors ORDER BY rowid"):
+            digest.update(f"{rowid}\0{doc_id}\n".encode("utf-8"))
+        return digest.hexdigest()
+
     @property
     def dimensions(self) -> int:
         return self._dimensions
@@ -305,8 +2007,24 @@ class VectorStore:
         return self._db_path
 
     def close(self):
-        """Close database connection"""
-        self._conn.close()
+        """Save a changed ANN index, then close every connection (writer and readers)"""
+        with self._write_lock:
+            if self._closed:
+                return
+            try:
+                self.flush_ann_index()
+            except OSError as e:
+                logger.warning("Failed to save ANN index %s: %s", self._ann_path, e)
+            self._closed = True
+            self._cache = None
+            with self._readers_lock:
+                readers, self._readers = self._readers, []
+            for _, conn in readers:
+                conn.close()
+            with self._probe_lock:
+                if self._probe is not self._writer:
+                    self._probe.close()
+            self._writer.close()
 
     def __enter__(self):
         return self
@@ -0,0 +1,187 @@
+"""
+Tests for IVFIndex — Approximate nearest-neighbour index and VectorStore integration
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vibecollab.search.ann_index import ANN_INDEX_FILENAME, IVFIndex, default_nlist  # noqa: E402
+from vibecollab.search.vector_store import VectorDocument, VectorStore  # noqa: E402
+
+
+def _clustered_docs(n_clusters: int = 8, per_cluster: int = 40, dims: int = 16):
+    rng = random.Random(7)
+    centers = [[rng.gauss(0, 1) for _ in range(dims)] for _ in range(n_clusters)]
+    docs = []
+    for c, center in enumerate(centers):
+        for j in range(per_cluster):
+            vec = [x + rng.gauss(0, 0.1) for x in center]
+            docs.append(VectorDocument(f"c{c}:{j}", f"cluster {c} item {j}", vec,
+                                       source_type="insight" if j % 2 else "document"))
+    return docs, centers
+
+
+# ---------------------------------------------------------------------------
+# IVFIndex Tests
+# ---------------------------------------------------------------------------
+
+class TestIVFIndex:
+    def test_default_nlist(self):
+        assert default_nlist(0) == 1
+        assert default_nlist(100) == 10
+
+    def test_build_assigns_all_rows(self):
+        docs, _ = _clustered_docs()
+        index = IVFIndex.build([d.doc_id for d in docs], [d.vector for d in docs], nlist=8)
+        assert index.nlist == 8
+        assert len(index) == len(docs)
+        assert index.dimensions == 16
+
+    def test_build_deterministic(self):
+        docs, _ = _clustered_docs()
+        ids, vecs = [d.doc_id for d in docs], [d.vector for d in docs]
+        a = IVFIndex.build(ids, vecs, nlist=8)
+        b = IVFIndex.build(ids, vecs, nlist=8)
+        assert a.list_rows(ids).tolist() == b.list_rows(ids).tolist()
+
+    def test_build_empty_raises(self):
+        with pytest.raises(ValueError):
+            IVFIndex.build([], np.zeros((0, 4)))
+
+    def test_add_and_remove(self):
+        docs, _ = _clustered_docs()
+        index = IVFIndex.build([d.doc_id for d in docs], [d.vector for d in docs], nlist=8)
+        version = index.version
+        index.add(["new"], [docs[0].vector])
+        assert index.list_rows(["new"])[0] == index.list_rows([docs[0].doc_id])[0]
+        assert index.version > version
+        assert index.remove(["new", "missing"]) == 1
+        assert index.list_rows(["new"])[0] == -1
+
+    def test_save_and_load(self, tmp_path):
+        docs, _ = _clustered_docs()
+        ids = [d.doc_id for d in docs]
+        index = IVFIndex.build(ids, [d.vector for d in docs], nlist=8, nprobe=3)
+        path = tmp_path / ANN_INDEX_FILENAME
+        index.save(path)
+        loaded = IVFIndex.load(path)
+        assert loaded.nprobe == 3
+        assert loaded.list_rows(ids).tolist() == index.list_rows(ids).tolist()
+        assert list(tmp_path.iterdir()) == [path]  # No temp file left behind
+
+    def test_probe_validates_nprobe(self):
+        docs, centers = _clustered_docs()
+        index = IVFIndex.build([d.doc_id for d in docs], [d.vector for d in docs], nlist=8)
+        assert index.probe(centers[0], 0) == []
+        assert len(index.probe(centers[0], 3)) == 3
+        with pytest.raises(ValueError, match="nprobe"):
+            index.probe(centers[0], -1)
+
+
+# ---------------------------------------------------------------------------
+# VectorStore integration
+# ---------------------------------------------------------------------------
+
+class TestVectorStoreANN:
+    @pytest.fixture
+    def store(self, tmp_path):
+        docs, _ = _clustered_docs()
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=16)
+        store.upsert_batch(docs)
+        yield store
+        store.close()
+
+    def test_build_persists_next_to_db(self, store, tmp_path):
+        store.build_ann_index(nlist=8)
+        assert (tmp_path / ANN_INDEX_FILENAME).exists()
+        reopened = VectorStore(db_path=tmp_path / "index.db", dimensions=16)
+        assert reopened.ann_index is not None
+        assert len(reopened.ann_index) == store.count()
+        reopened.close()
+
+    def test_ann_recall_on_clustered_data(self, store):
+        _, centers = _clustered_docs()
+        exact = [store.search(c, top_k=10, nprobe=0) for c in centers]
+        store.build_ann_index(nlist=8, nprobe=2)
+        approx = [store.search(c, top_k=10) for c in centers]
+        hits = sum(
+            len({r.doc_id for r in e} & {r.doc_id for r in a}) for e, a in zip(exact, approx)
+        )
+        assert hits / (10 * len(centers)) >= 0.9
+
+    def test_full_nprobe_equals_exact(self, store):
+        store.build_ann_index(nlist=8)
+        query = [0.1 * i for i in range(16)]
+        exact = store.search(query, top_k=15, nprobe=0, source_type="insight")
+        full = store.search(query, top_k=15, nprobe=8, source_type="insight")
+        assert [r.doc_id for r in exact] == [r.doc_id for r in full]
+
+    def test_incremental_upsert_and_delete(self, store, tmp_path):
+        store.build_ann_index(nlist=8, nprobe=1)
+        target = [1.0] + [0.0] * 15
+        store.upsert_batch([VectorDocument("fresh", "new doc", target)])
+        assert store.search(target, top_k=1)[0].doc_id == "fresh"
+
+        store.delete("fresh")
+        assert "fresh" not in [r.doc_id for r in store.search(target, top_k=5)]
+        reloaded = IVFIndex.load(tmp_path / ANN_INDEX_FILENAME)
+        assert reloaded.list_rows(["fresh"])[0] == -1
+
+    def test_writes_saved_on_flush(self, store, tmp_path):
+        store.build_ann_index(nlist=8)
+        path = tmp_path / ANN_INDEX_FILENAME
+        store.upsert_batch([VectorDocument("fresh", "new doc", [1.0] + [0.0] * 15)])
+        assert IVFIndex.load(path).list_rows(["fresh"])[0] == -1  # Not rewritten per batch
+        assert store.flush_ann_index() is True
+        assert IVFIndex.load(path).list_rows(["fresh"])[0] >= 0
+        assert store.flush_ann_index() is False
+
+        store.delete("fresh")
+        store.close()
+        assert IVFIndex.load(path).list_rows(["fresh"])[0] == -1
+
+    def test_negative_nprobe_rejected(self, store):
+        store.build_ann_index(nlist=8)
+        query = [0.1] * 16
+        with pytest.raises(ValueError, match="nprobe"):
+            store.search(query, top_k=5, nprobe=-1)
+        with pytest.raises(ValueError, match="nprobe"):
+            store.search_many([query], top_k=5, nprobe=-2)
+
+    def test_filtered_search_probes_until_top_k(self, tmp_path):
+        docs, centers = _clustered_docs()
+        for d in docs:  # Only cluster 3 holds documents
+            d.source_type = "document" if d.doc_id.startswith("c3:") else "insight"
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=16)
+        store.upsert_batch(docs)
+        store.build_ann_index(nlist=8, nprobe=1)
+        results = store.search(centers[0], top_k=10, source_type="document")
+        exact = store.search(centers[0], top_k=10, source_type="document", nprobe=0)
+        assert [r.doc_id for r in results] == [r.doc_id for r in exact]
+        assert len(results) == 10
+        store.close()
+
+    def test_rows_unknown_to_index_still_found(self, store, tmp_path):
+        store.build_ann_index(nlist=8, nprobe=1)
+        # Another connection without the ANN index writes a new row
+        other = VectorStore(db_path=tmp_path / "index.db", dimensions=16)
+        other.drop_ann_index()
+        target = [0.0] * 15 + [1.0]
+        other.upsert(VectorDocument("outsider", "written elsewhere", target))
+        other.close()
+        assert store.search(target, top_k=1)[0].doc_id == "outsider"
+
+    def test_delete_by_source_type_updates_index(self, store):
+        store.build_ann_index(nlist=8)
+        before = len(store.ann_index)
+        removed = store.delete_by_source_type("document")
+        assert len(store.ann_index) == before - removed
+
+    def test_drop_ann_index(self, store, tmp_path):
+        store.build_ann_index(nlist=8)
+        store.drop_ann_index()
+        assert store.ann_index is None
+        assert not (tmp_path / ANN_INDEX_FILENAME).exists()
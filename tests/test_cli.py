@@ -96,6 +96,23 @@ class TestCLI:
             assert result.exit_code == 0
             assert (output_dir / "llm-new.txt").exists()
 
+    def test_upgrade_extends_vibecollab_gitignore(self):
+        """Test upgrade appends runtime patterns missing from an older .vibecollab/.gitignore"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir) / "test-project"
+            self.runner.invoke(main, ["init", "-n", "TestProject", "-d", "generic",
+                                      "-o", str(output_dir)])
+            gitignore = output_dir / ".vibecollab" / ".gitignore"
+            gitignore.write_text("events.jsonl\nvectors/\n*.local.yaml\ncustom/", encoding="utf-8")
+
+            result = self.runner.invoke(main, [
+                "upgrade", "-c", str(output_dir / "project.yaml"), "--force"
+            ])
+            assert result.exit_code == 0
+            lines = gitignore.read_text(encoding="utf-8").splitlines()
+            assert lines == ["events.jsonl", "vectors/", "*.local.yaml", "custom/",
+                             "*.local.json", "*.local.jsonl", "*.lock"]
+
     def test_upgrade_with_role_context(self):
         """Test upgrade command auto-initializes multi-role directory structure"""
         import yaml
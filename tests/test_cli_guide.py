@@ -602,6 +602,7 @@ class TestSearchRelatedInsights:
     def test_returns_related_insights(self, tmp_path):
         """Returns related Insights when vector index exists"""
         from vibecollab.insight.embedder import Embedder, EmbedderConfig
+        from vibecollab.search.manifest import IndexManifest
         from vibecollab.search.vector_store import VectorDocument, VectorStore
 
         db_dir = tmp_path / ".vibecollab" / "vectors"
@@ -633,6 +634,7 @@ class TestSearchRelatedInsights:
             source_type="insight",
             metadata={"title": "CI config", "tags": ["ci", "devops"], "category": "workflow"},
         ))
+        store.set_manifest(IndexManifest.for_embedder(embedder, chunk_count=store.count()))
         store.close()
 
         result = _search_related_insights(tmp_path, "Windows encoding issue")
@@ -648,6 +650,7 @@ class TestSearchRelatedInsights:
     def test_only_returns_insights_not_documents(self, tmp_path):
         """Only returns results with source_type=insight"""
         from vibecollab.insight.embedder import Embedder, EmbedderConfig
+        from vibecollab.search.manifest import IndexManifest
         from vibecollab.search.vector_store import VectorDocument, VectorStore
 
         db_dir = tmp_path / ".vibecollab" / "vectors"
@@ -669,6 +672,7 @@ class TestSearchRelatedInsights:
             source_type="document",
             metadata={"heading": "# Context"},
         ))
+        store.set_manifest(IndexManifest.for_embedder(embedder, chunk_count=store.count()))
         store.close()
 
         result = _search_related_insights(tmp_path, "project document")
@@ -687,6 +691,7 @@ class TestOnboardSemanticEnhancement:
     def project_with_index(self, project_dir):
         """Create a project with vector index"""
         from vibecollab.insight.embedder import Embedder, EmbedderConfig
+        from vibecollab.search.manifest import IndexManifest
         from vibecollab.search.vector_store import VectorDocument, VectorStore
 
         db_dir = project_dir / ".vibecollab" / "vectors"
@@ -712,6 +717,7 @@ class TestOnboardSemanticEnhancement:
                 metadata={"title": text, "tags": tags, "category": category},
             ))
 
+        store.set_manifest(IndexManifest.for_embedder(embedder, chunk_count=store.count()))
         store.close()
         return project_dir
 
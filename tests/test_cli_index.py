@@ -3,7 +3,7 @@ Tests for cli_index.py — Index & Search CLI commands
 
 Covers:
 - index_cmd: basic / rebuild / backend selection / error handling
-- search_cmd: basic / type filter / min-score / no index / empty index / no results
+- search_cmd: basic / type filter / min-score / metadata filters / modes / no index / empty index / no results
 """
 
 import sqlite3
@@ -64,8 +64,19 @@ class TestIndexCmd:
         db_path = tmp_project / ".vibecollab" / "vectors" / "index.db"
         assert db_path.exists()
 
+    def test_index_workers(self, runner, tmp_project):
+        """--workers runs the pipelined indexer and reports stage throughput."""
+        result = runner.invoke(
+            index_cmd,
+            ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python", "-j", "2",
+             "--batch-size", "4"],
+        )
+        assert result.exit_code == 0, result.output
+        assert "Pipeline Throughput" in result.output
+        assert "embed" in result.output
+
     def test_index_rebuild(self, runner, tmp_project):
-        """--rebuild clears old data before re-indexing."""
+        """--rebuild builds a shadow index and swaps it in."""
         config_arg = ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python"]
 
         # First index
@@ -75,7 +86,7 @@ class TestIndexCmd:
         # Rebuild
         result2 = runner.invoke(index_cmd, config_arg + ["--rebuild"])
         assert result2.exit_code == 0
-        assert "Cleared" in result2.output or "cleared" in result2.output
+        assert "Swapped in rebuilt index" in result2.output
 
     def test_index_auto_backend(self, runner, tmp_project):
         """auto backend falls back to pure_python when no ML libs."""
@@ -105,6 +116,50 @@ class TestIndexCmd:
         assert result.exit_code == 0
         assert "Insight" in result.output
 
+    def test_index_with_ann(self, runner, tmp_project):
+        """--ann builds the IVF index next to index.db."""
+        pytest.importorskip("numpy")
+        result = runner.invoke(
+            index_cmd,
+            ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python", "--ann"],
+        )
+        assert result.exit_code == 0
+        assert "ANN index built" in result.output
+        assert (tmp_project / ".vibecollab" / "vectors" / "ann_ivf.npz").exists()
+
+    def test_index_with_codec(self, runner, tmp_project):
+        """--codec is recorded in the index and reported."""
+        result = runner.invoke(
+            index_cmd,
+            ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python", "--codec", "int8"],
+        )
+        assert result.exit_code == 0
+        assert "int8" in result.output
+        db_path = tmp_project / ".vibecollab" / "vectors" / "index.db"
+        conn = sqlite3.connect(str(db_path))
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'vector_codec'").fetchone()
+        conn.close()
+        assert row == ("int8",)
+
+    def test_index_with_projection(self, runner, tmp_project):
+        """--reduce-dims projects the stored vectors and reports recall."""
+        pytest.importorskip("numpy")
+        config_arg = ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python"]
+        result = runner.invoke(
+            index_cmd, config_arg + ["--reduce-dims", "8", "--projection", "random"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Projected" in result.output
+        assert "Estimated recall@" in result.output
+        assert "random 256 -> 8 dims" in result.output
+
+        search = runner.invoke(search_cmd, ["Context", "-c", str(tmp_project / "project.yaml")])
+        assert search.exit_code == 0, search.output
+
+        result = runner.invoke(index_cmd, config_arg + ["--reduce-dims", "0"])
+        assert result.exit_code == 0
+        assert "Projection skipped" in result.output
+
     def test_index_nonexistent_config(self, runner, tmp_path):
         """Index with nonexistent config path handles gracefully."""
         # pure_python backend + config in a directory with no docs
@@ -116,14 +171,43 @@ class TestIndexCmd:
         # The indexer finds docs relative to project root
         assert result.exit_code == 0 or "error" in result.output.lower() or "Error" in result.output
 
+    def test_index_stats(self, runner, tmp_project):
+        """--stats reports storage without indexing."""
+        config_arg = ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python"]
+        runner.invoke(index_cmd, config_arg)
+        result = runner.invoke(index_cmd, config_arg + ["--stats"])
+        assert result.exit_code == 0, result.output
+        assert "Index Storage" in result.output
+        assert "Fragmentation" in result.output
+        assert "Index Results" not in result.output
+
+    def test_index_vacuum(self, runner, tmp_project):
+        """--vacuum compacts index.db and reports phase timings."""
+        config_arg = ["-c", str(tmp_project / "project.yaml"), "-b", "pure_python"]
+        runner.invoke(index_cmd, config_arg)
+        result = runner.invoke(index_cmd, config_arg + ["--vacuum"])
+        assert result.exit_code == 0, result.output
+        assert "Maintenance Phases" in result.output
+        assert "vacuum" in result.output
+        assert "Vacuum complete" in result.output
+        search = runner.invoke(search_cmd, ["Context", "-c", str(tmp_project / "project.yaml")])
+        assert search.exit_code == 0, search.output
+
+    def test_index_stats_without_index(self, runner, tmp_project):
+        result = runner.invoke(
+            index_cmd, ["-c", str(tmp_project / "project.yaml"), "--stats"]
+        )
+        assert result.exit_code == 1
+        assert "does not exist" in result.output
+
 
 # ======================================================================
 # search_cmd tests
 # ======================================================================
 
 
-def _create_index_db(project_root: Path, dims: int = 64):
-    """Helper: create a pre-populated vector index DB."""
+def _create_index_db(project_root: Path, dims: int = 64, manifest: bool = True):
+    """Helper: create a pre-populated vector index DB (pure_python manifest)."""
     db_path = project_root / ".vibecollab" / "vectors" / "index.db"
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -167,6 +251,17 @@ def _create_index_db(project_root: Path, dims: int = 64):
     )
     conn.commit()
     conn.close()
+
+    if manifest:
+        from vibecollab.insight.embedder import PurePythonEmbedder
+        from vibecollab.search.manifest import IndexManifest
+        from vibecollab.search.vector_store import VectorStore
+
+        with VectorStore(db_path=db_path, dimensions=dims) as store:
+            store.set_manifest(IndexManifest(
+                backend="pure_python", model=PurePythonEmbedder(dims).model_name,
+                dimensions=dims, chunk_count=3,
+            ))
     return db_path
 
 
@@ -223,6 +318,149 @@ class TestSearchCmd:
         )
         assert result.exit_code == 0
 
+    def test_search_nprobe(self, runner, tmp_project):
+        """--nprobe is accepted (exact scan without ANN index)."""
+        _create_index_db(tmp_project)
+
+        result = runner.invoke(
+            search_cmd,
+            ["context", "--nprobe", "4", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 0
+
+    def test_search_negative_nprobe_rejected(self, runner, tmp_project):
+        """A negative --nprobe is a usage error."""
+        _create_index_db(tmp_project)
+
+        result = runner.invoke(
+            search_cmd,
+            ["context", "--nprobe", "-1", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 2
+        assert "--nprobe" in result.output
+        assert not isinstance(result.exception, ValueError)
+
+    def test_search_rerank(self, runner, tmp_project):
+        """--rerank is accepted."""
+        _create_index_db(tmp_project)
+
+        result = runner.invoke(
+            search_cmd,
+            ["context", "--rerank", "20", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 0
+
+    def test_search_negative_rerank_rejected(self, runner, tmp_project):
+        """A negative --rerank is a usage error."""
+        _create_index_db(tmp_project)
+
+        result = runner.invoke(
+            search_cmd,
+            ["context", "--rerank", "-5", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 2
+        assert "--rerank" in result.output
+
+    def test_search_metadata_filters(self, runner, tmp_project):
+        """--tag / --source are pushed down (legacy DBs are backfilled)."""
+        _create_index_db(tmp_project)
+        config = str(tmp_project / "project.yaml")
+
+        result = runner.invoke(search_cmd, ["architecture", "--tag", "cache", "-c", config])
+        assert result.exit_code == 0
+        assert "INS-001" in result.output
+        assert "DECISIONS" not in result.output
+
+        result = runner.invoke(
+            search_cmd, ["architecture", "--source", "docs/DEC*", "-c", config]
+        )
+        assert result.exit_code == 0
+        assert "DECISIONS" in result.output
+        assert "INS-001" not in result.output
+
+    @pytest.mark.parametrize("mode", ["lexical", "hybrid"])
+    def test_search_modes(self, runner, tmp_project, mode):
+        """--mode lexical/hybrid find identifier matches."""
+        _create_index_db(tmp_project)
+
+        result = runner.invoke(
+            search_cmd,
+            ["INS-001", "--mode", mode, "--lexical-candidates", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 0
+        assert "INS-001" in result.output
+        assert "Score:" in result.output
+
+    def test_search_queries_file(self, runner, tmp_project):
+        """--queries-file runs one search per non-empty line."""
+        _create_index_db(tmp_project)
+        queries = tmp_project / "queries.txt"
+        queries.write_text("architecture\n\ncontext status\n", encoding="utf-8")
+
+        result = runner.invoke(
+            search_cmd,
+            ["--queries-file", str(queries), "-k", "1", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 0, result.output
+        assert "architecture" in result.output
+        assert "context status" in result.output
+
+    def test_search_queries_from_stdin(self, runner, tmp_project):
+        """--queries-file - reads queries from stdin."""
+        _create_index_db(tmp_project)
+
+        result = runner.invoke(
+            search_cmd,
+            ["-f", "-", "--mode", "lexical", "-c", str(tmp_project / "project.yaml")],
+            input="INS-001\nDECISIONS\n",
+        )
+        assert result.exit_code == 0, result.output
+        assert "INS-001" in result.output
+
+    @pytest.mark.parametrize("args", [[], ["context", "-f", "-"]])
+    def test_search_query_or_file_required(self, runner, tmp_project, args):
+        """Exactly one of QUERY and --queries-file is required."""
+        _create_index_db(tmp_project)
+        result = runner.invoke(search_cmd, args + ["-c", str(tmp_project / "project.yaml")])
+        assert result.exit_code == 2
+
+    def test_search_results_cached_between_invocations(self, runner, tmp_project, monkeypatch):
+        """A repeated search is answered from the persistent query cache."""
+        from vibecollab.search.vector_store import VectorStore
+
+        _create_index_db(tmp_project)
+        config = str(tmp_project / "project.yaml")
+        first = runner.invoke(search_cmd, ["architecture", "-c", config])
+        assert first.exit_code == 0, first.output
+        assert (tmp_project / ".vibecollab" / "vectors" / "query_cache.db").exists()
+
+        monkeypatch.setattr(VectorStore, "search_many", None)
+        again = runner.invoke(search_cmd, ["architecture", "-c", config])
+        assert again.exit_code == 0, again.output
+        assert again.output == first.output
+
+        bypass = runner.invoke(search_cmd, ["architecture", "--no-cache", "-c", config])
+        assert bypass.exit_code == 1
+
+    def test_search_index_without_manifest(self, runner, tmp_project):
+        """An index without manifest is refused instead of guessing the embedder."""
+        _create_index_db(tmp_project, manifest=False)
+        result = runner.invoke(
+            search_cmd,
+            ["context", "-c", str(tmp_project / "project.yaml")],
+        )
+        assert result.exit_code == 1
+        assert "Reindex needed" in result.output
+
+    def test_search_uses_manifest_dimensions(self, runner, tmp_project):
+        """A manifest with other dimensions builds the matching embedder."""
+        _create_index_db(tmp_project, dims=32)
+        result = runner.invoke(
+            search_cmd,
+            ["context", "-c", str(tmp_project / "project.yaml"), "--min-score", "-1"],
+        )
+        assert result.exit_code == 0, result.output
+
     def test_search_empty_index(self, runner, tmp_project):
         """Search with empty index DB."""
         db_path = tmp_project / ".vibecollab" / "vectors" / "index.db"
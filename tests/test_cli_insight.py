@@ -321,6 +321,9 @@ class TestUseInsight:
         assert result.exit_code == 0
         assert "Usage recorded" in result.output
         assert "INS-001" in result.output
+        # Written through to the tracked registry.yaml
+        data = yaml.safe_load(mgr.registry_path.read_text(encoding="utf-8"))
+        assert data["entries"]["INS-001"]["used_count"] == 1
 
     @patch("vibecollab.cli.insight._load_role_manager")
     def test_use_not_found(self, mock_dm_factory, runner, chdir_project, project_dir):
@@ -373,6 +376,32 @@ class TestDecayInsights:
         result = runner.invoke(insight, ["decay"])
         assert result.exit_code == 0
         assert "Weight decay executed" in result.output
+        data = yaml.safe_load(mgr.registry_path.read_text(encoding="utf-8"))
+        assert data["entries"]["INS-001"]["weight"] == 0.95
+
+
+class TestCompactRegistry:
+    def test_compact_folds_journal(self, runner, chdir_project):
+        from vibecollab.cli.insight import _load_insight_manager
+
+        mgr = _load_insight_manager()
+        mgr.create(
+            title="Use Me",
+            tags=["test"],
+            category="technique",
+            body={"scenario": "s", "approach": "a"},
+            created_by="testdev",
+        )
+        mgr.record_use("INS-001", "testdev")
+
+        result = runner.invoke(insight, ["compact"])
+        assert result.exit_code == 0
+        assert "Folded" in result.output
+        data = yaml.safe_load(mgr.registry_path.read_text(encoding="utf-8"))
+        assert data["entries"]["INS-001"]["used_count"] == 1
+
+        result = runner.invoke(insight, ["compact"])
+        assert "up to date" in result.output
 
 
 # ---------------------------------------------------------------------------
@@ -605,6 +605,13 @@ class TestRoleContributed:
         assert dm.add_contributed("INS-001", "alice") is False
         assert dm.get_contributed("alice") == ["INS-001"]
 
+    def test_add_contributed_many(self, dm, project_dir):
+        dm.init_role_context("alice")
+        dm.add_contributed("INS-001", "alice")
+        assert dm.add_contributed_many(["INS-001", "INS-002", "INS-003", "INS-002"], "alice") == 2
+        assert dm.get_contributed("alice") == ["INS-001", "INS-002", "INS-003"]
+        assert dm.add_contributed_many([], "alice") == 0
+
     def test_remove_contributed(self, dm, project_dir):
         dm.init_role_context("alice")
         dm.add_contributed("INS-001", "alice")
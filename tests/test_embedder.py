@@ -2,13 +2,18 @@
 Tests for Embedder — Lightweight embedding abstraction layer
 """
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
 from vibecollab.insight.embedder import (
     Embedder,
     EmbedderConfig,
+    OpenAIEmbedder,
     PurePythonEmbedder,
+    VectorLRUCache,
 )
 
 # ---------------------------------------------------------------------------
@@ -19,7 +24,7 @@ class TestPurePythonEmbedder:
     def test_dimensions(self):
         e = PurePythonEmbedder(dimensions=128)
         assert e.dimensions == 128
-        assert e.model_name == "pure-python-trigram"
+        assert e.model_name == "pure-python-trigram-v2"
 
     def test_default_dimensions(self):
         e = PurePythonEmbedder()
@@ -91,6 +96,31 @@ class TestPurePythonEmbedder:
         assert len(v1) == 64
         assert len(v2) == 64
 
+    def test_batch_matches_single(self):
+        """Batch mode (NumPy bincount when available) equals per-text vectors"""
+        e = PurePythonEmbedder(dimensions=64)
+        texts = ["Hello World", "", "ab", "python programming language", "hello world"]
+        batch = e.embed_texts(texts)
+        for text, vec in zip(texts, batch):
+            assert vec == pytest.approx(e.embed_text(text), abs=1e-9)
+
+    def test_batch_without_numpy(self, monkeypatch):
+        from vibecollab.insight import embedder as embedder_mod
+
+        monkeypatch.setattr(embedder_mod, "_get_numpy", lambda: None)
+        e = PurePythonEmbedder(dimensions=32)
+        vecs = e.embed_texts(["alpha", "beta"])
+        assert vecs == [e.embed_text("alpha"), e.embed_text("beta")]
+
+    def test_stable_hash_values(self):
+        """Trigram buckets are the 32-bit code-point hash, in both embedding paths"""
+        from vibecollab.insight.embedder import _trigram_hash
+
+        e = PurePythonEmbedder(dimensions=16)
+        vec = e.embed_text("abc")
+        assert vec[_trigram_hash(ord("a"), ord("b"), ord("c")) % 16] == pytest.approx(1.0)
+        assert e.embed_texts(["abc", "x"])[0] == pytest.approx(vec)
+
 
 # ---------------------------------------------------------------------------
 # Embedder (unified entry) Tests
@@ -109,7 +139,7 @@ class TestEmbedder:
         config = EmbedderConfig(backend="pure_python", dimensions=128)
         embedder = Embedder(config)
         assert embedder.dimensions == 128
-        assert embedder.model_name == "pure-python-trigram"
+        assert embedder.model_name == "pure-python-trigram-v2"
 
     def test_embed_text(self):
         config = EmbedderConfig(backend="pure_python", dimensions=64)
@@ -166,3 +196,267 @@ class TestEmbedder:
         embedder = Embedder()
         vec = embedder.embed_text("default config test")
         assert len(vec) > 0
+
+
+# ---------------------------------------------------------------------------
+# VectorLRUCache Tests
+# ---------------------------------------------------------------------------
+
+class TestVectorLRUCache:
+    def test_put_get_roundtrip(self):
+        cache = VectorLRUCache()
+        key = VectorLRUCache.key("hello")
+        stored = cache.put(key, [0.5, 0.25])
+        assert stored == [0.5, 0.25]
+        assert cache.get(key) == [0.5, 0.25]
+        assert cache.get(VectorLRUCache.key("other")) is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_returned_list_is_a_copy(self):
+        cache = VectorLRUCache()
+        key = VectorLRUCache.key("x")
+        cache.put(key, [1.0])
+        cache.get(key).append(2.0)
+        assert cache.get(key) == [1.0]
+
+    def test_entry_bound_evicts_lru(self):
+        cache = VectorLRUCache(max_entries=2)
+        a, b, c = (VectorLRUCache.key(t) for t in "abc")
+        cache.put(a, [1.0])
+        cache.put(b, [2.0])
+        cache.get(a)  # a becomes most recent
+        cache.put(c, [3.0])
+        assert a in cache and c in cache
+        assert b not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_bound(self):
+        cache = VectorLRUCache(max_bytes=3 * (64 * 4 + 160))
+        for i in range(10):
+            cache.put(VectorLRUCache.key(str(i)), [0.0] * 64)
+        assert len(cache) == 3
+        assert cache.stats()["bytes"] <= 3 * (64 * 4 + 160)
+
+    def test_stored_as_float32(self):
+        cache = VectorLRUCache()
+        key = VectorLRUCache.key("f")
+        cache.put(key, [0.1] * 256)
+        assert cache.stats()["bytes"] < 256 * 8
+
+
+class TestEmbedderLatency:
+    def test_latency_stats(self):
+        embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=16))
+        stats = embedder.latency_stats()
+        assert stats["calls"] == 0
+        assert stats["load_ms"] >= 0
+        embedder.embed_texts(["a", "b"])
+        embedder.embed_text("a")
+        stats = embedder.latency_stats()
+        assert stats["calls"] == 2
+        assert stats["last_ms"] >= 0
+        assert stats["avg_ms"] >= 0
+
+    def test_config_exposed(self):
+        config = EmbedderConfig(backend="pure_python", dimensions=16)
+        assert Embedder(config).config is config
+
+
+class TestEmbedderBoundedCache:
+    def test_config_bounds_cache(self):
+        embedder = Embedder(
+            EmbedderConfig(backend="pure_python", dimensions=16, cache_max_entries=5)
+        )
+        embedder.embed_texts([f"text {i}" for i in range(20)])
+        assert len(embedder._cache) == 5
+        memory = embedder.cache_stats()["memory"]
+        assert memory["evictions"] == 15
+
+    def test_hit_rate_reported(self):
+        embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=16))
+        embedder.embed_text("q")
+        embedder.embed_text("q")
+        memory = embedder.cache_stats()["memory"]
+        assert memory["hits"] == 1
+        assert memory["misses"] == 1
+
+
+# ---------------------------------------------------------------------------
+# OpenAIEmbedder against a local mock provider
+# ---------------------------------------------------------------------------
+
+class _MockProvider:
+    """Local HTTP server speaking the /embeddings API"""
+
+    def __init__(self, fail_first: int = 0, fail_status: int = 429):
+        self.requests = []
+        self.fail_remaining = fail_first
+        self.fail_status = fail_status
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with provider._lock:
+                    provider._in_flight += 1
+                    provider.max_in_flight = max(provider.max_in_flight, provider._in_flight)
+                    failing = provider.fail_remaining > 0
+                    if failing:
+                        provider.fail_remaining -= 1
+                    else:
+                        provider.requests.append(body)
+                try:
+                    import time
+
+                    time.sleep(0.02)
+                    if failing:
+                        payload = b'{"error": "busy"}'
+                        self.send_response(provider.fail_status)
+                        self.send_header("Retry-After", "0")
+                    else:
+                        data = [
+                            {"index": i, "embedding": [float(len(text)), float(i)]}
+                            for i, text in enumerate(body["input"])
+                        ]
+                        # Deliberately out of order: client must sort by index
+                        payload = json.dumps({"data": data[::-1]}).encode()
+                        self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with provider._lock:
+                        provider._in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def provider():
+    pytest.importorskip("httpx")
+    p = _MockProvider()
+    yield p
+    p.close()
+
+
+class TestOpenAIEmbedder:
+    def _embedder(self, base_url, **kwargs):
+        kwargs.setdefault("backoff_base", 0.01)
+        return OpenAIEmbedder(api_key="test", base_url=base_url, dimensions=2, **kwargs)
+
+    def test_batches_by_size_and_keeps_order(self, provider):
+        embedder = self._embedder(provider.base_url, max_batch_size=3, max_concurrency=4)
+        texts = ["x" * (i + 1) for i in range(10)]
+        vectors = embedder.embed_texts(texts)
+        assert [v[0] for v in vectors] == [float(len(t)) for t in texts]
+        assert sorted(len(r["input"]) for r in provider.requests) == [1, 3, 3, 3]
+        assert all(r["model"] == "text-embedding-3-small" for r in provider.requests)
+        embedder.close()
+
+    def test_token_budget_splits_batches(self, provider):
+        embedder = self._embedder(provider.base_url, max_batch_tokens=30)
+        embedder.embed_texts(["y" * 80] * 4)  # ~21 tokens each
+        assert len(provider.requests) == 4
+        embedder.close()
+
+    def test_concurrency_bounded(self, provider):
+        embedder = self._embedder(provider.base_url, max_batch_size=1, max_concurrency=3)
+        embedder.embed_texts([str(i) for i in range(12)])
+        assert 1 < provider.max_in_flight <= 3
+        embedder.close()
+
+    def test_serial_when_concurrency_one(self, provider):
+        embedder = self._embedder(provider.base_url, max_batch_size=1, max_concurrency=1)
+        embedder.embed_texts(["a", "b", "c"])
+        assert provider.max_in_flight == 1
+        embedder.close()
+
+    def test_retries_on_429(self, provider):
+        provider.fail_remaining = 2
+        embedder = self._embedder(provider.base_url)
+        assert embedder.embed_text("hello") == [5.0, 0.0]
+        assert len(provider.requests) == 1
+        embedder.close()
+
+    def test_retries_on_5xx_then_gives_up(self, provider):
+        import httpx
+
+        provider.fail_status = 503
+        provider.fail_remaining = 10
+        embedder = self._embedder(provider.base_url, max_retries=2)
+        with pytest.raises(httpx.HTTPStatusError):
+            embedder.embed_text("hello")
+        assert provider.fail_remaining == 7  # 1 try + 2 retries
+        embedder.close()
+
+    def test_retry_after_capped(self):
+        pytest.importorskip("httpx")
+        embedder = OpenAIEmbedder(api_key="k", backoff_base=0.5, max_backoff=4.0)
+
+        class _Resp:
+            def __init__(self, value):
+                self.headers = {"Retry-After": value}
+
+        assert embedder._retry_delay(0, _Resp("2")) == 2.0
+        assert embedder._retry_delay(0, _Resp("86400")) == 4.0
+        assert embedder._retry_delay(1, _Resp("-5")) == 1.0
+        assert embedder._retry_delay(1, _Resp("nan")) == 1.0
+        assert embedder._retry_delay(1, _Resp("Wed, 21 Oct 2026 07:28:00 GMT")) == 1.0
+        assert embedder._retry_delay(10) == 4.0
+
+    def test_conflict_not_retried(self, provider):
+        import httpx
+
+        provider.fail_status = 409
+        provider.fail_remaining = 10
+        embedder = self._embedder(provider.base_url)
+        with pytest.raises(httpx.HTTPStatusError):
+            embedder.embed_text("hello")
+        assert provider.fail_remaining == 9
+        embedder.close()
+
+    def test_client_reused(self, provider):
+        embedder = self._embedder(provider.base_url)
+        embedder.embed_text("a")
+        client = embedder._client
+        embedder.embed_text("b")
+        assert embedder._client is client
+        embedder.close()
+        assert embedder._client is None
+
+    def test_empty_input(self, provider):
+        embedder = self._embedder(provider.base_url)
+        assert embedder.embed_texts([]) == []
+        assert provider.requests == []
+
+    def test_config_passthrough(self):
+        pytest.importorskip("httpx")
+        embedder = Embedder(EmbedderConfig(
+            backend="openai", api_key="k", max_batch_size=7, max_concurrency=2,
+        ))
+        assert embedder.backend._max_batch_size == 7
+        assert embedder.backend._max_concurrency == 2
@@ -0,0 +1,168 @@
+"""
+Tests for EmbeddingCache — Persistent embedding cache shared across processes
+"""
+
+import sqlite3
+
+import pytest
+
+from vibecollab.insight.embedder import Embedder, EmbedderConfig
+from vibecollab.insight.embedding_cache import EMBEDDING_CACHE_FILENAME, EmbeddingCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / EMBEDDING_CACHE_FILENAME
+
+
+# ---------------------------------------------------------------------------
+# EmbeddingCache Tests
+# ---------------------------------------------------------------------------
+
+class TestEmbeddingCache:
+    def test_put_and_get(self, cache_path):
+        cache = EmbeddingCache(cache_path, namespace="ns")
+        cache.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+        found = cache.get_many(["b", "missing", "a"])
+        assert found == {0: [3.0, 4.0], 2: [1.0, 2.0]}
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["entries"] == 2
+        cache.close()
+
+    def test_namespaces_isolated(self, cache_path):
+        a = EmbeddingCache(cache_path, namespace="model-a:2")
+        b = EmbeddingCache(cache_path, namespace="model-b:2")
+        a.put_many(["text"], [[1.0, 0.0]])
+        assert b.get_many(["text"]) == {}
+        assert a.get_many(["text"]) == {0: [1.0, 0.0]}
+        a.close()
+        b.close()
+
+    def test_shared_across_instances(self, cache_path):
+        writer = EmbeddingCache(cache_path, namespace="ns")
+        writer.put_many(["persist"], [[0.5]])
+        writer.close()
+        reader = EmbeddingCache(cache_path, namespace="ns")
+        assert reader.get_many(["persist"]) == {0: [0.5]}
+        reader.close()
+
+    def test_entry_budget_evicts_least_recently_used(self, cache_path, monkeypatch):
+        import vibecollab.insight.embedding_cache as mod
+
+        clock = iter(range(1000))
+        monkeypatch.setattr(mod.time, "time", lambda: next(clock))
+        cache = EmbeddingCache(cache_path, namespace="ns", max_entries=10)
+        cache.put_many([f"t{i}" for i in range(10)], [[float(i)] for i in range(10)])
+        cache.get_many(["t0"])  # refresh t0
+        cache.put_many(["new"], [[99.0]])
+        stats = cache.stats()
+        assert stats["entries"] <= 10
+        assert stats["evictions"] >= 1
+        assert 0 in cache.get_many(["t0"])
+        assert cache.get_many(["t1"]) == {}
+        cache.close()
+
+    def test_byte_budget(self, cache_path):
+        cache = EmbeddingCache(cache_path, namespace="ns", max_bytes=4 * 4 * 5)
+        cache.put_many([f"t{i}" for i in range(8)], [[1.0] * 4 for _ in range(8)])
+        assert cache.stats()["bytes"] <= 4 * 4 * 5
+        cache.close()
+
+    def test_lookups_do_not_take_the_write_lock(self, cache_path):
+        import time
+
+        cache = EmbeddingCache(cache_path, namespace="ns", timeout=5.0)
+        cache.put_many(["x"], [[1.0]])
+        writer = sqlite3.connect(str(cache_path))
+        writer.execute("BEGIN IMMEDIATE")  # Another process mid-write
+        try:
+            start = time.perf_counter()
+            assert cache.get_many(["x"]) == {0: [1.0]}
+            assert time.perf_counter() - start < 1.0
+        finally:
+            writer.rollback()
+            writer.close()
+        cache.close()
+
+    def test_access_times_flushed_on_close(self, cache_path, monkeypatch):
+        import vibecollab.insight.embedding_cache as mod
+
+        clock = iter([10.0, 20.0])
+        monkeypatch.setattr(mod.time, "time", lambda: next(clock))
+        cache = EmbeddingCache(cache_path, namespace="ns")
+        cache.put_many(["x"], [[1.0]])  # t=10
+        cache.get_many(["x"])  # t=20, buffered
+        cache.close()
+        conn = sqlite3.connect(str(cache_path))
+        assert conn.execute("SELECT last_access FROM embeddings").fetchone() == (20.0,)
+        conn.close()
+
+    def test_budget_checked_without_counting_every_write(self, cache_path):
+        cache = EmbeddingCache(cache_path, namespace="ns", max_entries=100)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for i in range(20):
+            cache.put_many([f"t{i}"], [[float(i)]])
+        assert sum("COUNT(*)" in sql for sql in statements) == 1
+        cache.close()
+
+    def test_locked_database_is_a_miss(self, cache_path):
+        cache = EmbeddingCache(cache_path, namespace="ns", timeout=0.01)
+        cache.put_many(["x"], [[1.0]])
+        blocker = sqlite3.connect(str(cache_path))
+        blocker.execute("BEGIN EXCLUSIVE")
+        try:
+            cache.put_many(["y"], [[2.0]])  # must not raise
+        finally:
+            blocker.rollback()
+            blocker.close()
+        cache.close()
+
+
+# ---------------------------------------------------------------------------
+# Embedder integration
+# ---------------------------------------------------------------------------
+
+class _CountingBackendEmbedder(Embedder):
+    calls = 0
+
+    def _create_backend(self):
+        backend = super()._create_backend()
+        original = backend.embed_texts
+
+        def counting(texts):
+            type(self).calls += len(texts)
+            return original(texts)
+
+        backend.embed_texts = counting
+        return backend
+
+
+class TestEmbedderDiskCache:
+    def test_disabled_without_cache_dir(self):
+        embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=16))
+        assert embedder.disk_cache is None
+        assert "disk" not in embedder.cache_stats()
+
+    def test_second_process_skips_backend(self, tmp_path):
+        config = EmbedderConfig(backend="pure_python", dimensions=16, cache_dir=str(tmp_path))
+        _CountingBackendEmbedder.calls = 0
+        first = _CountingBackendEmbedder(config)
+        vectors = first.embed_texts(["alpha", "beta"])
+        assert _CountingBackendEmbedder.calls == 2
+
+        second = _CountingBackendEmbedder(config)
+        again = second.embed_texts(["alpha", "beta", "gamma"])
+        assert _CountingBackendEmbedder.calls == 3  # only "gamma" computed
+        for a, b in zip(vectors, again[:2]):
+            assert a == pytest.approx(b, abs=1e-6)
+        assert second.cache_stats()["disk"]["hits"] == 2
+
+    def test_embed_text_uses_disk_cache(self, tmp_path):
+        config = EmbedderConfig(backend="pure_python", dimensions=16, cache_dir=str(tmp_path))
+        Embedder(config).embed_text("query")
+        embedder = Embedder(config)
+        embedder.embed_text("query")
+        assert embedder.disk_cache.stats()["hits"] == 1
@@ -0,0 +1,219 @@
+"""
+Tests for IndexPipeline — pipelined parse / embed / write indexing
+"""
+
+import pytest
+import yaml
+
+from vibecollab.insight.embedder import Embedder, EmbedderConfig
+from vibecollab.search.indexer import Indexer, vectors_dir
+from vibecollab.search.pipeline import IndexPipeline
+from vibecollab.search.vector_store import VectorStore
+
+DIMS = 32
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    insights = tmp_path / ".vibecollab" / "insights"
+    insights.mkdir(parents=True)
+    for i in range(40):
+        data = {
+            "id": f"INS-{i:03d}",
+            "title": f"Insight {i}",
+            "tags": ["cache", f"t{i % 3}"],
+            "category": "technique",
+            "body": {"scenario": f"scenario {i}", "approach": ["step one", "step two"]},
+        }
+        (insights / f"INS-{i:03d}.yaml").write_text(yaml.dump(data), encoding="utf-8")
+    (tmp_path / "CONTRIBUTING_AI.md").write_text(
+        "\n".join(f"# Section {i}\nBody of section {i}" for i in range(12)), encoding="utf-8"
+    )
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "decisions.yaml").write_text(
+        yaml.dump({"decisions": [{"id": "D1", "title": "Use SQLite"}], "notes": "kept local"}),
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def _indexer(root, name, embedder=None):
+    store = VectorStore(db_path=vectors_dir(root) / f"{name}.db", dimensions=DIMS)
+    embedder = embedder or Embedder(EmbedderConfig(backend="pure_python", dimensions=DIMS))
+    return Indexer(project_root=root, embedder=embedder, store=store)
+
+
+def _rows(indexer):
+    return indexer.store._conn.execute(
+        "SELECT doc_id, text, vector, source, source_type, metadata, content_hash, source_mtime "
+        "FROM vectors ORDER BY rowid"
+    ).fetchall()
+
+
+def _counts(stats):
+    fields = dict(vars(stats))
+    fields.pop("throughput")
+    return fields
+
+
+def _run(indexer, **kwargs):
+    kwargs.setdefault("use_processes", False)
+    return IndexPipeline(indexer, **kwargs).run()
+
+
+class TestPipelineParity:
+    def test_identical_to_serial(self, corpus):
+        serial = _indexer(corpus, "serial")
+        piped = _indexer(corpus, "piped")
+        serial_stats = serial.index_all()
+        piped_stats = _run(piped, workers=3, batch_size=7, queue_size=2)
+        assert _rows(piped) == _rows(serial)
+        assert _counts(piped_stats) == _counts(serial_stats)
+        assert piped.manifest().corpus_hash == serial.manifest().corpus_hash
+
+    def test_identical_incremental(self, corpus):
+        serial = _indexer(corpus, "serial")
+        piped = _indexer(corpus, "piped")
+        serial.index_all()
+        _run(piped, workers=2)
+
+        insights = corpus / ".vibecollab" / "insights"
+        (insights / "INS-003.yaml").write_text(
+            yaml.dump({"id": "INS-003", "title": "Rewritten", "tags": ["new"]}), encoding="utf-8"
+        )
+        (insights / "INS-007.yaml").unlink()
+        (insights / "INS-100.yaml").write_text(
+            yaml.dump({"id": "INS-100", "title": "Added later"}), encoding="utf-8"
+        )
+
+        serial_stats = serial.index_all()
+        piped_stats = _run(piped, workers=2, batch_size=1)
+        assert _rows(piped) == _rows(serial)
+        assert _counts(piped_stats) == _counts(serial_stats)
+        assert (piped_stats.added, piped_stats.updated, piped_stats.removed) == (1, 1, 1)
+
+    def test_process_pool(self, corpus):
+        serial = _indexer(corpus, "serial")
+        piped = _indexer(corpus, "piped")
+        serial_stats = serial.index_all()
+        piped_stats = piped.index_all(workers=2)
+        assert _rows(piped) == _rows(serial)
+        assert _counts(piped_stats) == _counts(serial_stats)
+
+    def test_parse_errors_match_serial(self, corpus):
+        (corpus / ".vibecollab" / "insights" / "INS-999.yaml").write_text(
+            "title: [unclosed", encoding="utf-8"
+        )
+        serial_stats = _indexer(corpus, "serial").index_all()
+        piped_stats = _run(_indexer(corpus, "piped"), workers=2)
+        assert piped_stats.errors == serial_stats.errors
+        assert piped_stats.errors[0].startswith("INS-999.yaml:")
+
+
+class TestPipelineStats:
+    def test_throughput_per_stage(self, corpus):
+        stats = _run(_indexer(corpus, "piped"), workers=2, batch_size=10)
+        assert set(stats.throughput) == {"parse", "embed", "write", "total"}
+        assert stats.throughput["parse"]["chunks"] == stats.added
+        assert stats.throughput["embed"]["chunks"] == stats.added
+        assert stats.throughput["write"]["chunks"] == stats.added
+        assert stats.throughput["total"]["chunks_per_sec"] > 0
+
+    def test_unchanged_rerun_embeds_nothing(self, corpus):
+        indexer = _indexer(corpus, "piped")
+        _run(indexer, workers=2)
+        stats = _run(indexer, workers=2)
+        assert stats.added == stats.updated == 0
+        assert stats.throughput["embed"]["chunks"] == 0
+
+
+class _FailingEmbedder:
+    """Embedder stand-in whose batches fail once `fail` is set (or from call `fail_at` on,
+    or when a text contains `fail_on`)"""
+
+    def __init__(self):
+        self._inner = Embedder(EmbedderConfig(backend="pure_python", dimensions=DIMS))
+        self.fail = False
+        self.fail_at = None
+        self.fail_on = None
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        if (
+            self.fail
+            or (self.fail_at is not None and self.calls >= self.fail_at)
+            or (self.fail_on is not None and any(self.fail_on in t for t in texts))
+        ):
+            raise RuntimeError("embedding service down")
+        return self._inner.embed_texts(texts)
+
+
+class TestPipelineFailures:
+    def test_failed_batch_keeps_previous_chunks(self, corpus):
+        embedder = _FailingEmbedder()
+        indexer = _indexer(corpus, "piped", embedder=embedder)
+        _run(indexer, workers=2)
+        before = indexer.store.count()
+
+        (corpus / ".vibecollab" / "insights" / "INS-001.yaml").write_text(
+            yaml.dump({"id": "INS-001", "title": "Changed"}), encoding="utf-8"
+        )
+        embedder.fail = True
+        stats = _run(indexer, workers=2)
+        assert any("embedding service down" in e for e in stats.errors)
+        assert indexer.store.count() == before
+        assert indexer.store.get("insight:INS-001").metadata["title"] == "Insight 1"
+
+    def test_source_failing_in_later_batch_is_not_half_written(self, corpus):
+        embedder = _FailingEmbedder()
+        indexer = _indexer(corpus, "piped", embedder=embedder)
+        _run(indexer, workers=2)
+        before = _rows(indexer)
+
+        (corpus / "CONTRIBUTING_AI.md").write_text(
+            "\n".join(f"# Section {i}\nRewritten section {i}" for i in range(12)),
+            encoding="utf-8",
+        )
+        # 12 changed chunks in batches of 5: the first batch embeds, the second fails
+        embedder.calls, embedder.fail_at = 0, 2
+        stats = _run(indexer, workers=2, batch_size=5)
+        assert [e for e in stats.errors if "embedding service down" in e] == [
+            "CONTRIBUTING_AI.md: embedding service down"
+        ]
+        assert stats.updated == 0 and stats.added == 0 and stats.removed == 0
+        assert _rows(indexer) == before
+
+    def test_failed_document_stats_match_serial(self, corpus):
+        serial_embedder, piped_embedder = _FailingEmbedder(), _FailingEmbedder()
+        serial = _indexer(corpus, "serial", embedder=serial_embedder)
+        piped = _indexer(corpus, "piped", embedder=piped_embedder)
+        serial.index_all()
+        _run(piped, workers=2)
+
+        (corpus / "CONTRIBUTING_AI.md").write_text(
+            "# Section 0\nBody of section 0\n# Section 1\nRewritten section 1", encoding="utf-8"
+        )
+        (corpus / "docs" / "decisions.yaml").write_text(
+            yaml.dump({"decisions": [{"id": "D1", "title": "Use Postgres"}]}), encoding="utf-8"
+        )
+        serial_embedder.fail_on = piped_embedder.fail_on = "Rewritten"
+        serial_stats = serial.index_all()
+        piped_stats = _run(piped, workers=2, batch_size=1)
+        assert _counts(piped_stats) == _counts(serial_stats)
+        assert serial_stats.documents_indexed == 1
+        assert _rows(piped) == _rows(serial)
+
+    def test_writer_failure_propagates(self, corpus, monkeypatch):
+        indexer = _indexer(corpus, "piped")
+
+        def broken(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(indexer.store, "upsert_batch", broken)
+        with pytest.raises(OSError, match="disk full"):
+            _run(indexer, workers=2, batch_size=2, queue_size=1)
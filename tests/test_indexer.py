@@ -6,12 +6,16 @@ import pytest
 import yaml
 
 from vibecollab.insight.embedder import Embedder, EmbedderConfig
+from vibecollab.search import indexer as indexer_module
 from vibecollab.search.indexer import (
     Indexer,
+    _chunk_doc_id,
     _insight_to_text,
+    rebuild_dir,
+    vectors_dir,
     _split_markdown_by_heading,
 )
-from vibecollab.search.vector_store import VectorStore
+from vibecollab.search.vector_store import SearchFilter, VectorStore
 
 # ---------------------------------------------------------------------------
 # _split_markdown_by_heading Tests
@@ -195,6 +199,99 @@ class TestIndexer:
         results = indexer.search("template", top_k=5, source_type="insight")
         assert all(r.source_type == "insight" for r in results)
 
+    def test_search_with_metadata_filter(self, indexer):
+        indexer.index_all()
+        results = indexer.search("template", top_k=5, filters=SearchFilter(category="debug"))
+        assert [r.doc_id for r in results] == ["insight:INS-001"]
+
+    def test_lexical_mode_skips_embedder(self, indexer, monkeypatch):
+        indexer.index_all()
+        monkeypatch.setattr(indexer.embedder, "embed_text", None)
+        results = indexer.search("INS-002", mode="lexical")
+        assert [r.doc_id for r in results] == ["insight:INS-002"]
+
+    def test_hybrid_mode(self, indexer):
+        indexer.index_all()
+        results = indexer.search("Jinja2 manifest", top_k=3, mode="hybrid")
+        assert results[0].doc_id == "insight:INS-002"
+
+    @pytest.mark.parametrize("mode", ["vector", "hybrid", "lexical"])
+    def test_search_many_matches_search(self, indexer, mode):
+        indexer.index_all()
+        queries = ["encoding compatibility", "Jinja2 manifest", "INS-001"]
+        batched = indexer.search_many(queries, top_k=3, min_score=-1.0, mode=mode)
+        expected = [indexer.search(q, top_k=3, min_score=-1.0, mode=mode) for q in queries]
+        assert [[r.doc_id for r in rs] for rs in batched] == [
+            [r.doc_id for r in rs] for rs in expected
+        ]
+
+    def test_repeated_search_served_from_cache(self, indexer, monkeypatch):
+        indexer.index_all()
+        first = indexer.search("template  engine", top_k=3, min_score=-1.0)
+        monkeypatch.setattr(indexer.embedder, "embed_text", None)
+        monkeypatch.setattr(indexer.store, "search", None)
+        again = indexer.search(" template engine", top_k=3, min_score=-1.0)
+        assert [r.doc_id for r in again] == [r.doc_id for r in first]
+        stats = indexer.query_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_index_change_invalidates_cached_results(self, indexer):
+        indexer.index_all()
+        before = indexer.search("template", top_k=10, source_type="insight")
+        assert "insight:INS-001" in [r.doc_id for r in before]
+        indexer.store.delete("insight:INS-001")
+        after = indexer.search("template", top_k=10, source_type="insight")
+        assert "insight:INS-001" not in [r.doc_id for r in after]
+        assert indexer.query_cache_stats()["invalidations"] == 1
+
+    def test_search_many_embeds_only_uncached(self, indexer, monkeypatch):
+        indexer.index_all()
+        indexer.search_many(["template"], top_k=2)
+        calls = []
+        original = indexer.embedder.embed_texts
+        monkeypatch.setattr(
+            indexer.embedder, "embed_texts", lambda texts: calls.append(texts) or original(texts)
+        )
+        results = indexer.search_many(["template", "encoding"], top_k=2)
+        assert calls == [["encoding"]]
+        assert len(results) == 2
+
+    def test_search_many_embeds_once(self, indexer, monkeypatch):
+        indexer.index_all()
+        calls = []
+        original = indexer.embedder.embed_texts
+        monkeypatch.setattr(
+            indexer.embedder, "embed_texts", lambda texts: calls.append(texts) or original(texts)
+        )
+        monkeypatch.setattr(indexer.embedder, "embed_text", None)
+        results = indexer.search_many(["template", "encoding"], top_k=2, source_type="insight")
+        assert calls == [["template", "encoding"]]
+        assert all(r.source_type == "insight" for rs in results for r in rs)
+
+    def test_last_embed_ms_is_per_thread(self, indexer, monkeypatch):
+        import threading
+        import time
+
+        indexer.index_all()
+        original = indexer.embedder.embed_text
+
+        def slow_embed(text):
+            time.sleep(0.05 if text == "slow" else 0)
+            return original(text)
+
+        monkeypatch.setattr(indexer.embedder, "embed_text", slow_embed)
+        indexer.search("fast", top_k=1)
+        worker = threading.Thread(target=indexer.search, args=("slow",), kwargs={"top_k": 1})
+        worker.start()
+        worker.join()
+        assert indexer.last_embed_ms < 50
+        indexer.search("fast", top_k=1)  # Query cache hit: nothing embedded
+        assert indexer.last_embed_ms == 0.0
+
+    def test_unknown_mode_raises(self, indexer):
+        with pytest.raises(ValueError, match="Unknown search mode"):
+            indexer.search("x", mode="fuzzy")
+
     def test_index_missing_files_skipped(self, project_dir):
         embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=64))
         store = VectorStore(db_path=None, dimensions=64)
@@ -247,3 +344,338 @@ class TestIndexer:
         store2 = VectorStore(db_path=db_path, dimensions=64)
         assert store2.count() == count
         store2.close()
+
+
+# ---------------------------------------------------------------------------
+# Incremental indexing Tests
+# ---------------------------------------------------------------------------
+
+class _CountingEmbedder(Embedder):
+    """Embedder that records every text sent to the backend"""
+
+    def __init__(self):
+        super().__init__(EmbedderConfig(backend="pure_python", dimensions=64))
+        self.embedded = []
+
+    def embed_texts(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_texts(texts)
+
+
+def _ctx_id(heading_path, occurrence=0):
+    return _chunk_doc_id("docs/CONTEXT.md", heading_path, occurrence)
+
+
+class TestIncrementalIndexing:
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "CONTEXT.md").write_text(
+            "# A\nalpha\n# B\nbeta\n# C\ngamma", encoding="utf-8"
+        )
+        ins_dir = tmp_path / ".vibecollab" / "insights"
+        ins_dir.mkdir(parents=True)
+        for i in (1, 2):
+            (ins_dir / f"INS-00{i}.yaml").write_text(
+                yaml.dump({"id": f"INS-00{i}", "title": f"Insight {i}", "tags": ["t"]}),
+                encoding="utf-8",
+            )
+        return tmp_path
+
+    def _indexer(self, project_dir, store, embedder=None):
+        return Indexer(
+            project_root=project_dir,
+            embedder=embedder or _CountingEmbedder(),
+            store=store,
+            doc_files=["docs/CONTEXT.md"],
+        )
+
+    def test_first_run_adds_everything(self, project_dir):
+        store = VectorStore(db_path=None, dimensions=64)
+        stats = self._indexer(project_dir, store).index_all()
+        assert stats.added == 5
+        assert stats.updated == stats.unchanged == stats.removed == 0
+        doc = store.get("insight:INS-001")
+        assert doc.content_hash
+        assert doc.source_mtime > 0
+
+    def test_rerun_skips_embedder(self, project_dir):
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert embedder.embedded == []
+        assert stats.unchanged == 5
+        assert stats.added == stats.updated == stats.removed == 0
+        assert stats.insights_indexed == 2
+        assert stats.documents_indexed == 1
+
+    def test_touched_file_without_changes_not_reembedded(self, project_dir):
+        import os
+
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        ctx = project_dir / "docs" / "CONTEXT.md"
+        stat = ctx.stat()
+        os.utime(ctx, (stat.st_atime, stat.st_mtime + 10))
+
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert embedder.embedded == []
+        assert stats.unchanged == 5
+        assert store.get(_ctx_id("# A")).source_mtime == stat.st_mtime + 10
+
+    def test_edit_reembeds_only_changed_chunk(self, project_dir):
+        import os
+
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        ctx = project_dir / "docs" / "CONTEXT.md"
+        ctx.write_text("# A\nalpha\n# B\nBETA changed\n# C\ngamma", encoding="utf-8")
+        os.utime(ctx, (1, ctx.stat().st_mtime + 5))
+
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert len(embedder.embedded) == 1
+        assert "BETA changed" in embedder.embedded[0]
+        assert stats.updated == 1
+        assert stats.unchanged == 4
+
+    def test_inserted_section_keeps_other_chunk_ids(self, project_dir):
+        import os
+
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        ctx = project_dir / "docs" / "CONTEXT.md"
+        ctx.write_text("# New\nfirst\n# A\nalpha\n# B\nbeta\n# C\ngamma", encoding="utf-8")
+        os.utime(ctx, (1, ctx.stat().st_mtime + 5))
+
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert embedder.embedded == ["# New\nfirst"]
+        assert stats.added == 1 and stats.updated == 0 and stats.removed == 0
+
+        ctx.write_text("# A\nalpha\n# C\ngamma", encoding="utf-8")
+        os.utime(ctx, (1, ctx.stat().st_mtime + 5))
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert stats.removed == 2 and stats.updated == 0 and stats.added == 0
+
+    def test_repeated_and_nested_headings_get_distinct_ids(self, project_dir):
+        ctx = project_dir / "docs" / "CONTEXT.md"
+        ctx.write_text("# A\n## Notes\nx\n# B\n## Notes\ny\n## Notes\nz", encoding="utf-8")
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        assert store.get(_ctx_id("# A > ## Notes")).text == "## Notes\nx"
+        assert store.get(_ctx_id("# B > ## Notes")).text == "## Notes\ny"
+        assert store.get(_ctx_id("# B > ## Notes", 1)).text == "## Notes\nz"
+
+    def test_shrinking_document_removes_stale_chunks(self, project_dir):
+        import os
+
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        ctx = project_dir / "docs" / "CONTEXT.md"
+        ctx.write_text("# A\nalpha", encoding="utf-8")
+        os.utime(ctx, (1, ctx.stat().st_mtime + 5))
+
+        stats = self._indexer(project_dir, store).index_all()
+        assert stats.removed == 2
+        assert store.list_doc_ids(source_type="document") == [_ctx_id("# A")]
+
+    def test_deleted_insight_removed(self, project_dir):
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        (project_dir / ".vibecollab" / "insights" / "INS-002.yaml").unlink()
+
+        stats = self._indexer(project_dir, store).index_all()
+        assert stats.removed == 1
+        assert store.list_doc_ids(source_type="insight") == ["insight:INS-001"]
+
+    def test_embedder_change_reembeds_everything(self, project_dir, monkeypatch):
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+
+        embedder = _CountingEmbedder()
+        monkeypatch.setattr(type(embedder), "model_name", property(lambda self: "other-model"))
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert len(embedder.embedded) == 5
+        assert stats.updated == 5
+        assert store.get_meta("embedder:insight") == "other-model:64"
+
+
+# ---------------------------------------------------------------------------
+# Checkpointed / shadow rebuild Tests
+# ---------------------------------------------------------------------------
+
+class _FailingEmbedder(_CountingEmbedder):
+    """Counting embedder that raises once `fail_after` calls have succeeded"""
+
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        if self.calls >= self.fail_after:
+            raise KeyboardInterrupt
+        self.calls += 1
+        return super().embed_texts(texts)
+
+
+class TestRebuild:
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "CONTEXT.md").write_text("# A\nalpha\n# B\nbeta", encoding="utf-8")
+        ins_dir = tmp_path / ".vibecollab" / "insights"
+        ins_dir.mkdir(parents=True)
+        for i in range(6):
+            (ins_dir / f"INS-00{i}.yaml").write_text(
+                yaml.dump({"id": f"INS-00{i}", "title": f"Insight {i}", "tags": ["t"]}),
+                encoding="utf-8",
+            )
+        return tmp_path
+
+    @pytest.fixture
+    def small_batches(self, monkeypatch):
+        monkeypatch.setattr(indexer_module, "CHECKPOINT_BATCH_SIZE", 2)
+
+    def _store(self, project_dir):
+        return VectorStore(db_path=vectors_dir(project_dir) / "index.db", dimensions=64)
+
+    def _indexer(self, project_dir, store, embedder=None, progress=None):
+        return Indexer(
+            project_root=project_dir,
+            embedder=embedder or _CountingEmbedder(),
+            store=store,
+            doc_files=["docs/CONTEXT.md"],
+            progress=progress,
+        )
+
+    def test_rebuild_swaps_in_fresh_index(self, project_dir):
+        store = self._store(project_dir)
+        self._indexer(project_dir, store).index_all()
+        reader = self._store(project_dir)
+        assert reader.count() == 8
+
+        (project_dir / ".vibecollab" / "insights" / "INS-005.yaml").unlink()
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).rebuild()
+
+        assert len(embedder.embedded) == 7
+        assert stats.added == 7 and stats.resumed == 0
+        assert store.count() == reader.count() == 7
+        assert store.get("insight:INS-005") is None
+        assert store.get_manifest().chunk_count == 7
+        assert not rebuild_dir(project_dir).exists()
+
+    def test_searches_use_old_index_during_rebuild(self, project_dir):
+        store = self._store(project_dir)
+        self._indexer(project_dir, store).index_all()
+        (project_dir / "docs" / "CONTEXT.md").write_text("# A\nrewritten", encoding="utf-8")
+        reader = self._store(project_dir)
+        seen = []
+
+        class _ObservingEmbedder(_CountingEmbedder):
+            def embed_texts(self, texts):
+                seen.append((reader.count(), reader.get(_ctx_id("# A")).text))
+                return super().embed_texts(texts)
+
+        self._indexer(project_dir, store, _ObservingEmbedder()).rebuild()
+        assert seen and all(state == (8, "# A\nalpha") for state in seen)
+        assert reader.get(_ctx_id("# A")).text == "# A\nrewritten"
+        assert reader.count() == 7
+
+    def test_interrupted_rebuild_resumes(self, project_dir, small_batches):
+        store = self._store(project_dir)
+        self._indexer(project_dir, store).index_all()
+        before = store.list_doc_ids()
+
+        with pytest.raises(KeyboardInterrupt):
+            self._indexer(project_dir, store, _FailingEmbedder(fail_after=2)).rebuild()
+        # Live index untouched, two committed batches kept in the shadow
+        assert store.list_doc_ids() == before
+        assert rebuild_dir(project_dir).exists()
+
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).rebuild()
+        assert stats.resumed == 4
+        assert len(embedder.embedded) == 4
+        assert stats.unchanged == 4 and stats.added == 4
+        assert store.list_doc_ids() == before
+        assert not rebuild_dir(project_dir).exists()
+
+    def test_interrupted_incremental_pass_rehashes_sources(self, project_dir, small_batches):
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store).index_all()
+        ctx = project_dir / "docs" / "CONTEXT.md"
+        ctx.write_text("# A\nalpha 2\n# B\nbeta 2\n# C\ngamma", encoding="utf-8")
+
+        with pytest.raises(KeyboardInterrupt):
+            self._indexer(project_dir, store, _FailingEmbedder(fail_after=1)).index_all()
+
+        # Chunks 0-1 were committed with the new mtime; chunk 2 must not be skipped
+        embedder = _CountingEmbedder()
+        stats = self._indexer(project_dir, store, embedder).index_all()
+        assert embedder.embedded == ["# C\ngamma"]
+        assert store.get(_ctx_id("# C")) is not None
+        assert stats.unchanged == 8
+
+    def test_rebuild_applies_codec(self, project_dir):
+        store = self._store(project_dir)
+        self._indexer(project_dir, store).index_all()
+        other = self._store(project_dir)
+        query = store.get("insight:INS-002").vector
+        assert other.search(query, top_k=1)[0].doc_id == "insight:INS-002"
+        self._indexer(project_dir, store).rebuild(codec="int8")
+        assert store.codec == "int8"
+        assert self._store(project_dir).codec == "int8"
+        # A store opened before the swap decodes the new rows with the new codec
+        assert other.search(query, top_k=1)[0].doc_id == "insight:INS-002"
+        assert other.codec == "int8"
+        assert store.search(store.get("insight:INS-001").vector, top_k=1)[0].doc_id == (
+            "insight:INS-001"
+        )
+
+    def test_reduce_dimensions_reports_recall(self, project_dir):
+        store = self._store(project_dir)
+        indexer = self._indexer(project_dir, store)
+        indexer.index_all()
+        report = indexer.reduce_dimensions(16, "random", keep_exact=True, top_k=3)
+        assert report["method"] == "random"
+        assert (report["source_dims"], report["target_dims"], report["rows"]) == (64, 16, 8)
+        assert store.stored_dimensions == 16
+        if report["recall"] is not None:
+            assert 0.0 <= report["recall"] <= report["rerank_recall"] <= 1.0
+        assert store.search(store.get("insight:INS-003").vector, top_k=1)[0].doc_id == (
+            "insight:INS-003"
+        )
+
+        report = indexer.reduce_dimensions(0)
+        assert report["method"] == "" and report["recall"] is None
+        assert store.projection is None
+
+    def test_rebuild_refits_projection(self, project_dir):
+        store = self._store(project_dir)
+        indexer = self._indexer(project_dir, store)
+        indexer.index_all()
+        indexer.reduce_dimensions(8, "random")
+
+        stats = self._indexer(project_dir, store).rebuild()
+        assert store.projection.describe() == "random 64 -> 8 dims"
+        assert stats.projection["target_dims"] == 8
+        assert self._store(project_dir).stored_dimensions == 8
+
+        stats = self._indexer(project_dir, store).rebuild(reduce_dims=0)
+        assert store.projection is None
+
+    def test_progress_reports_chunks(self, project_dir, small_batches):
+        calls = []
+        store = VectorStore(db_path=None, dimensions=64)
+        self._indexer(project_dir, store, progress=lambda *a: calls.append(a)).index_all()
+        assert calls[0] == ("document", 0, 2)
+        assert calls[-1] == ("insight", 6, 6)
+        assert [c for c in calls if c[0] == "insight"] == [
+            ("insight", n, 6) for n in (0, 2, 4, 6)
+        ]
@@ -0,0 +1,156 @@
+"""
+Tests for IndexerPool — warm, process-wide Indexer/Embedder reuse
+"""
+
+import shutil
+import threading
+
+import pytest
+
+from vibecollab.insight.embedder import Embedder, EmbedderConfig
+from vibecollab.search import pool as pool_module
+from vibecollab.search.indexer import Indexer, vectors_dir
+from vibecollab.search.pool import IndexerPool, config_key, get_indexer_pool
+from vibecollab.search.vector_store import VectorDocument, VectorStore
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    (tmp_path / "CONTRIBUTING_AI.md").write_text("# Guide\nRules here", encoding="utf-8")
+    return tmp_path
+
+
+def _reindex(project_dir, dims):
+    """Index from scratch with a pure_python embedder of `dims` (records the manifest)"""
+    shutil.rmtree(vectors_dir(project_dir), ignore_errors=True)
+    embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=dims))
+    store = VectorStore(db_path=vectors_dir(project_dir) / "index.db", dimensions=dims)
+    Indexer(project_root=project_dir, embedder=embedder, store=store).index_all()
+    store.close()
+
+
+@pytest.fixture
+def config():
+    return EmbedderConfig(backend="pure_python", dimensions=32)
+
+
+class TestIndexerPool:
+    def test_reuses_indexer_and_embedder(self, project_dir, config):
+        pool = IndexerPool()
+        first = pool.get(project_dir, config)
+        second = pool.get(project_dir, config)
+        assert first is second
+        [stats] = pool.stats()
+        assert stats["store_opens"] == 1
+        assert stats["requests"] == 2
+
+    def test_config_change_builds_new_embedder(self, project_dir, config):
+        pool = IndexerPool()
+        a = pool.get(project_dir, config)
+        b = pool.get(project_dir, EmbedderConfig(backend="pure_python", dimensions=64))
+        assert a.embedder is not b.embedder
+        assert b.embedder.dimensions == 64
+        assert len(pool.stats()) == 2
+
+    def test_config_key_stable(self, config):
+        assert config_key(config) == config_key(EmbedderConfig(backend="pure_python", dimensions=32))
+        assert config_key(config) != config_key(EmbedderConfig(backend="pure_python", dimensions=16))
+
+    def test_index_change_reopens_store_only(self, project_dir, config):
+        pool = IndexerPool()
+        indexer = pool.get(project_dir, config)
+        indexer.index_all()
+        assert pool.get(project_dir, config) is indexer
+
+        # Another process switches the codec of the same index
+        with VectorStore(db_path=indexer.store.db_path, dimensions=32) as other:
+            other.set_codec("int8")
+        reopened = pool.get(project_dir, config)
+        assert reopened is not indexer
+        assert reopened.embedder is indexer.embedder
+        assert reopened.store.codec == "int8"
+        assert pool.stats()[0]["store_opens"] == 2
+
+    def test_threads_get_own_store_shared_embedder(self, project_dir, config):
+        pool = IndexerPool()
+        main = pool.get(project_dir, config)
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(pool.get(project_dir, config)))
+        thread.start()
+        thread.join()
+        assert seen[0] is not main
+        assert seen[0].store is not main.store
+        assert seen[0].embedder is main.embedder
+
+    def test_threads_share_query_cache(self, project_dir, config):
+        pool = IndexerPool()
+        main = pool.get(project_dir, config)
+        main.index_all()
+        main.search("rules")
+        seen = []
+        thread = threading.Thread(
+            target=lambda: seen.append(pool.get(project_dir, config).search("rules"))
+        )
+        thread.start()
+        thread.join()
+        assert seen[0]
+        assert pool.stats()[0]["query_cache"]["hits"] == 1
+
+    def test_preload_loads_in_background(self, project_dir, config):
+        pool = IndexerPool()
+        thread = pool.preload(project_dir, config)
+        thread.join(timeout=10)
+        [stats] = pool.stats()
+        assert stats["loaded"]
+        assert stats["latency"]["load_ms"] >= 0
+        assert stats["store_opens"] == 0
+
+    def test_stats_report_embedding_latency(self, project_dir, config):
+        pool = IndexerPool()
+        pool.get(project_dir, config).search("rules")
+        latency = pool.stats()[0]["latency"]
+        assert latency["calls"] == 1
+        assert latency["last_ms"] >= 0
+
+    def test_manifest_change_releases_superseded_entry(self, project_dir):
+        pool = IndexerPool()
+        _reindex(project_dir, 32)
+        old = pool.get(project_dir)
+        assert old.embedder.dimensions == 32
+
+        _reindex(project_dir, 64)
+        new = pool.get(project_dir)
+        assert new.embedder.dimensions == 64
+        assert old.store._closed
+        [stats] = pool.stats()
+        assert stats["dimensions"] == 64
+
+    def test_manifest_read_only_when_index_changes(self, project_dir, monkeypatch):
+        _reindex(project_dir, 32)
+        reads = []
+        original = pool_module.read_manifest
+        monkeypatch.setattr(
+            pool_module, "read_manifest", lambda path: reads.append(path) or original(path)
+        )
+        pool = IndexerPool()
+        indexer = pool.get(project_dir)  # Opening the store may create the WAL
+        reads.clear()
+        for _ in range(3):
+            assert pool.get(project_dir) is indexer
+        assert len(reads) <= 1
+
+        with VectorStore(db_path=vectors_dir(project_dir) / "index.db", dimensions=32) as other:
+            other.upsert(VectorDocument("extra", "written elsewhere", [1.0] * 32))
+        count = len(reads)
+        pool.get(project_dir)
+        assert len(reads) == count + 1
+
+    def test_clear_closes_stores(self, project_dir, config):
+        pool = IndexerPool()
+        indexer = pool.get(project_dir, config)
+        pool.clear()
+        assert indexer.store._closed
+        assert pool.stats() == []
+
+    def test_default_pool_is_process_wide(self):
+        assert get_indexer_pool() is get_indexer_pool()
@@ -0,0 +1,247 @@
+"""
+Tests for BulkImporter — Single-pass ingestion of Insight export bundles
+"""
+
+import copy
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from vibecollab.domain.event_log import EventLog
+from vibecollab.insight.bulk_import import (
+    PHASES,
+    InvalidBundleError,
+    bundle_records,
+    stream_bundle,
+)
+from vibecollab.insight.manager import InsightManager
+
+
+@pytest.fixture
+def tmp_project(tmp_path):
+    (tmp_path / "project.yaml").write_text("project_name: TestProject\n", encoding="utf-8")
+    (tmp_path / ".vibecollab").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def mgr(tmp_project):
+    mgr = InsightManager(project_root=tmp_project, event_log=EventLog(tmp_project))
+    mgr.create("Existing A", ["a"], "technique", {"scenario": "a"}, created_by="dev")
+    mgr.create("Existing B", ["b"], "technique", {"scenario": "b"}, created_by="dev")
+    return mgr
+
+
+def _item(ins_id, title, tags=("x",)):
+    return {
+        "id": ins_id,
+        "title": title,
+        "tags": list(tags),
+        "category": "technique",
+        "body": {"scenario": title},
+        "origin": {"created_by": "remote"},
+    }
+
+
+def _bundle(*items, registry=None):
+    bundle = {
+        "format": "vibecollab-insight-export",
+        "version": "1.0",
+        "source_project": "Remote",
+        "count": len(items),
+        "insights": list(items),
+    }
+    if registry is not None:
+        bundle["registry"] = registry
+    return bundle
+
+
+def _write_bundle(path, bundle):
+    path.write_text(yaml.dump(bundle, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    return path
+
+
+class TestStreamBundle:
+    def test_matches_in_memory_records(self, tmp_path):
+        bundle = _bundle(_item("INS-001", "One"), _item("INS-002", "Two"),
+                         registry={"INS-001": {"used_count": 3}})
+        path = _write_bundle(tmp_path / "bundle.yaml", bundle)
+        assert list(stream_bundle(path)) == list(bundle_records(bundle))
+
+    def test_non_mapping_document(self, tmp_path):
+        path = tmp_path / "bundle.yaml"
+        path.write_text("- a\n- b\n", encoding="utf-8")
+        assert list(stream_bundle(path)) == [("", ["a", "b"])]
+
+
+class TestBulkImport:
+    def test_same_results_as_sequential(self, mgr, tmp_project):
+        bundle = _bundle(_item("INS-002", "Remote two"), _item("INS-010", "Remote ten"))
+        other = InsightManager(project_root=tmp_project / "other")
+        (tmp_project / "other" / ".vibecollab").mkdir(parents=True)
+        other.create("Existing A", ["a"], "technique", {"scenario": "a"}, created_by="dev")
+        other.create("Existing B", ["b"], "technique", {"scenario": "b"}, created_by="dev")
+        # import_insights rewrites IDs in its input, so give it a copy
+        expected = other.import_insights(copy.deepcopy(bundle), "dev", strategy="rename")
+
+        results = mgr.bulk_import(bundle, imported_by="dev", strategy="rename")
+        for key in ("imported", "skipped", "renamed", "errors"):
+            assert results[key] == expected[key]
+        assert mgr.get("INS-003").title == "Remote two"
+        assert mgr.get("INS-003").origin.source_project == "Remote"
+        assert bundle["insights"][0]["id"] == "INS-002"  # Input not mutated
+
+    def test_renamed_ids_never_collide(self, mgr):
+        # INS-003 is reserved for the renamed INS-001, so the bundle's INS-003 is renamed too
+        bundle = _bundle(_item("INS-001", "R1"), _item("INS-003", "R3"), _item("INS-003", "R3b"))
+        results = mgr.bulk_import(bundle, imported_by="dev", strategy="rename")
+        assert results["imported"] == ["INS-003", "INS-004", "INS-005"]
+        assert results["renamed"]["INS-001"] == "INS-003"
+        titles = {i.id: i.title for i in mgr.list_all()}
+        assert [titles[f"INS-00{n}"] for n in (3, 4, 5)] == ["R1", "R3", "R3b"]
+
+    def test_skip_and_overwrite(self, mgr):
+        bundle = _bundle(_item("INS-001", "Replaced"), _item("INS-009", "New"))
+        results = mgr.bulk_import(bundle, imported_by="dev")
+        assert results["skipped"] == ["INS-001"] and results["imported"] == ["INS-009"]
+        assert mgr.get("INS-001").title == "Existing A"
+
+        results = mgr.bulk_import(_bundle(_item("INS-001", "Replaced")), imported_by="dev",
+                                  strategy="overwrite")
+        assert results["imported"] == ["INS-001"]
+        assert mgr.get("INS-001").title == "Replaced"
+
+    def test_dedupe_by_content(self, mgr):
+        existing = mgr.get("INS-001")
+        same = _item("INS-007", existing.title, existing.tags)
+        same["body"] = existing.body
+        bundle = _bundle(same, _item("INS-008", "Twin"), _item("INS-009", "Twin"))
+        results = mgr.bulk_import(bundle, imported_by="dev")
+        assert results["duplicates"] == {"INS-007": "INS-001", "INS-009": "INS-008"}
+        assert results["imported"] == ["INS-008"]
+
+        results = mgr.bulk_import(_bundle(same), imported_by="dev", dedupe=False)
+        assert results["imported"] == ["INS-007"] and results["duplicates"] == {}
+
+    def test_single_registry_write_and_event(self, mgr, monkeypatch):
+        writes = []
+        save = mgr._save_registry
+        monkeypatch.setattr(mgr, "_save_registry", lambda *a: writes.append(1) or save(*a))
+        events_before = len(mgr.event_log.read_all())
+
+        items = [_item(f"INS-{n:03d}", f"Remote {n}") for n in range(10, 40)]
+        bundle = _bundle(*items, registry={"INS-010": {"used_count": 4}})
+        results = mgr.bulk_import(bundle, imported_by="dev", workers=4)
+        assert len(results["imported"]) == 30
+        assert writes == [1]
+        entries, _ = mgr.get_registry()
+        assert all(f"INS-{n:03d}" in entries for n in range(10, 40))
+        assert entries["INS-010"].used_count == 4
+
+        events = mgr.event_log.read_all()[events_before:]
+        assert len(events) == 1
+        assert events[0].payload["action"] == "insights_imported"
+        assert len(events[0].payload["insight_ids"]) == 30
+        assert set(results["timings"]) == set(PHASES) | {"total"}
+
+    def test_small_batches(self, mgr):
+        from vibecollab.insight.bulk_import import BulkImporter
+
+        items = [_item(f"INS-{n:03d}", f"Remote {n}") for n in range(10, 17)]
+        results = BulkImporter(mgr, "dev", batch_size=2, workers=2).run(
+            bundle_records(_bundle(*items))
+        )
+        assert results["imported"] == [f"INS-{n:03d}" for n in range(10, 17)]
+        assert len(mgr.list_all()) == 9
+
+    def test_invalid_items_reported(self, mgr):
+        bundle = _bundle("oops", {"title": "No id"}, {"id": "INS-020", "artifacts": [1]})
+        results = mgr.bulk_import(bundle, imported_by="dev")
+        assert results["imported"] == [] and len(results["errors"]) == 3
+
+    def test_invalid_bundle_imports_nothing(self, mgr):
+        bundle = _bundle(_item("INS-010", "Remote"))
+        bundle["format"] = "other"
+        with pytest.raises(InvalidBundleError):
+            mgr.bulk_import(bundle, imported_by="dev")
+        assert mgr.get("INS-010") is None
+
+    def test_damaged_stream_keeps_earlier_items(self, mgr, tmp_path):
+        path = _write_bundle(tmp_path / "bundle.yaml",
+                             _bundle(_item("INS-010", "Good"), _item("INS-011", "Lost")))
+        text = path.read_text(encoding="utf-8")
+        cut = text.index("- id: INS-011")
+        path.write_text(text[:cut] + "- id: [unclosed\n", encoding="utf-8")
+        results = mgr.bulk_import(stream_bundle(path), imported_by="dev")
+        assert results["imported"] == ["INS-010"]
+        assert results["errors"][0].startswith("bundle:")
+
+    def test_header_after_insights(self, mgr, tmp_path):
+        path = tmp_path / "bundle.yaml"
+        bundle = _bundle(_item("INS-010", "Late header"))
+        reordered = {"insights": bundle["insights"], "format": bundle["format"],
+                     "source_project": bundle["source_project"]}
+        _write_bundle(path, reordered)
+        results = mgr.bulk_import(stream_bundle(path), imported_by="dev")
+        assert results["imported"] == ["INS-010"]
+        assert mgr.get("INS-010").origin.source_project == "Remote"
+
+        reordered["format"] = "other"
+        _write_bundle(path, reordered)
+        with pytest.raises(InvalidBundleError):
+            mgr.bulk_import(stream_bundle(path), imported_by="dev", strategy="overwrite")
+
+
+class TestCLIImport:
+    def test_default_bulk_path(self, mgr, tmp_project, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_project)
+        from vibecollab.cli.insight import insight
+
+        existing = mgr.get("INS-002")
+        same = _item("INS-030", existing.title, existing.tags)
+        same["body"] = existing.body
+        path = _write_bundle(tmp_path / "bundle.yaml",
+                             _bundle(_item("INS-001", "Remote one"), same))
+        result = CliRunner().invoke(insight, ["import", str(path), "--strategy", "rename"])
+        assert result.exit_code == 0, result.output
+        assert "Renamed" in result.output and "INS-001 -> INS-003" in result.output
+        assert "Duplicates" in result.output and "Timings" in result.output
+
+    def test_sequential_path(self, mgr, tmp_project, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_project)
+        from vibecollab.cli.insight import insight
+
+        path = _write_bundle(tmp_path / "bundle.yaml", _bundle(_item("INS-001", "Remote")))
+        result = CliRunner().invoke(insight, ["import", str(path), "--sequential"])
+        assert result.exit_code == 0
+        assert "Skipped" in result.output and "Timings" not in result.output
+
+    def test_invalid_bundle(self, tmp_project, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_project)
+        from vibecollab.cli.insight import insight
+
+        path = tmp_path / "bundle.yaml"
+        path.write_text("format: other\ninsights: []\n", encoding="utf-8")
+        result = CliRunner().invoke(insight, ["import", str(path)])
+        assert result.exit_code == 1 and "Invalid bundle format" in result.output
+
+        path.write_text("format: [unclosed\n", encoding="utf-8")
+        result = CliRunner().invoke(insight, ["import", str(path)])
+        assert result.exit_code == 1 and "Failed to parse YAML" in result.output
+
+    def test_other_value_errors_not_reported_as_invalid_bundle(
+        self, mgr, tmp_project, tmp_path, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_project)
+        from vibecollab.cli.insight import insight
+
+        def broken(*args, **kwargs):
+            raise ValueError("disk says no")
+
+        monkeypatch.setattr(InsightManager, "bulk_import", broken)
+        path = _write_bundle(tmp_path / "bundle.yaml", _bundle(_item("INS-010", "Remote")))
+        result = CliRunner().invoke(insight, ["import", str(path)])
+        assert result.exit_code != 0
+        assert "Invalid bundle format" not in result.output
+        assert isinstance(result.exception, ValueError)
@@ -0,0 +1,255 @@
+"""
+Tests for InsightCatalog — In-process index of the insights directory
+"""
+
+import json
+import os
+import time
+
+import pytest
+import yaml
+
+from vibecollab.insight.catalog import COMPILED_CATALOG_FILE, InsightCatalog, get_insight_catalog
+from vibecollab.insight.manager import InsightManager
+
+
+def _age(*paths, seconds: float = 60.0):
+    """Backdate mtimes out of the racy window so cached parses are trusted"""
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def _write(insights_dir, insight_id, tags, category="technique", created_by="dev",
+           derived_from=None, title=None):
+    path = insights_dir / f"{insight_id}.yaml"
+    data = {
+        "id": insight_id,
+        "title": title or f"Insight {insight_id}",
+        "tags": tags,
+        "category": category,
+        "body": {"scenario": "s"},
+        "origin": {"created_by": created_by, "derived_from": derived_from or []},
+    }
+    path.write_text(yaml.dump(data), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def insights_dir(tmp_path):
+    d = tmp_path / ".vibecollab" / "insights"
+    d.mkdir(parents=True)
+    paths = [
+        _write(d, "INS-001", ["Cache", "sqlite"]),
+        _write(d, "INS-002", ["cache"], category="debug", created_by="qa",
+               derived_from=["INS-001"]),
+        _write(d, "INS-003", ["yaml"], category="debug", derived_from=["INS-001"]),
+    ]
+    _age(*paths)
+    return d
+
+
+@pytest.fixture
+def catalog(insights_dir):
+    return InsightCatalog(insights_dir)
+
+
+class TestIndexes:
+    def test_queries(self, catalog):
+        assert [i.id for i in catalog.all()] == ["INS-001", "INS-002", "INS-003"]
+        assert [i.id for i in catalog.with_tags(["CACHE"])] == ["INS-001", "INS-002"]
+        assert [i.id for i in catalog.in_category("debug")] == ["INS-002", "INS-003"]
+        assert [i.id for i in catalog.created_by("qa")] == ["INS-002"]
+        assert [i.id for i in catalog.derived_by("INS-001")] == ["INS-002", "INS-003"]
+        assert catalog.with_tags(["missing"]) == []
+
+    def test_tag_counts_exclude(self, catalog):
+        assert catalog.tag_counts() == {"cache": 2, "sqlite": 1, "yaml": 1}
+        assert catalog.tag_counts(exclude_ids=["INS-001", "INS-404"]) == {"cache": 1, "yaml": 1}
+
+    def test_stats(self, catalog):
+        catalog.all()
+        stats = catalog.stats()
+        assert stats["files"] == stats["insights"] == 3
+        assert stats["tags"] == 3 and stats["categories"] == 2
+        assert stats["derivation_edges"] == 2
+        assert stats["parses"] == 3 and stats["hits"] == 0
+
+
+class TestFreshness:
+    def test_parses_each_file_once(self, catalog):
+        catalog.all()
+        catalog.with_tags(["cache"])
+        catalog.get("INS-002")
+        stats = catalog.stats()
+        assert stats["parses"] == 3
+        assert stats["hits"] == 4
+        assert stats["refreshes"] == 2
+
+    def test_reparses_changed_file_and_reindexes(self, catalog, insights_dir):
+        catalog.all()
+        _age(_write(insights_dir, "INS-003", ["cache", "new-tag"], category="workflow"))
+        assert [i.id for i in catalog.with_tags(["cache"])] == ["INS-001", "INS-002", "INS-003"]
+        assert catalog.in_category("debug")[0].id == "INS-002"
+        assert "yaml" not in catalog.tag_counts()
+        assert catalog.stats()["parses"] == 4
+
+    def test_added_and_removed_files(self, catalog, insights_dir):
+        catalog.all()
+        (insights_dir / "INS-001.yaml").unlink()
+        _age(_write(insights_dir, "INS-004", ["sqlite"]))
+        assert [i.id for i in catalog.all()] == ["INS-002", "INS-003", "INS-004"]
+        assert catalog.derived_by("INS-001")[0].id == "INS-002"
+        assert catalog.stats()["removals"] == 1
+
+    def test_recent_same_size_rewrite_is_seen(self, catalog, insights_dir):
+        path = _write(insights_dir, "INS-009", ["aaaa"])
+        catalog.all()
+        stat = path.stat()
+        _write(insights_dir, "INS-009", ["bbbb"])
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert [i.id for i in catalog.with_tags(["bbbb"])] == ["INS-009"]
+
+    def test_unparseable_file_skipped_until_fixed(self, catalog, insights_dir):
+        bad = insights_dir / "INS-005.yaml"
+        bad.write_text("id: INS-005\ntags: []\n", encoding="utf-8")
+        _age(bad)
+        assert len(catalog.all()) == 3
+        catalog.all()
+        assert catalog.stats()["errors"] == 1
+        assert catalog.get("INS-005") is None
+
+    def test_missing_directory(self, tmp_path):
+        catalog = InsightCatalog(tmp_path / "nope")
+        assert catalog.all() == []
+        assert catalog.registry_data() == {}
+
+
+class TestRegistryCache:
+    def test_cached_until_changed(self, catalog, insights_dir):
+        registry = insights_dir / "registry.yaml"
+        registry.write_text(yaml.dump({"entries": {"INS-001": {"weight": 2.0}}}), "utf-8")
+        _age(registry)
+        assert catalog.registry_data()["entries"]["INS-001"]["weight"] == 2.0
+        catalog.registry_data()
+        assert catalog.stats()["registry_parses"] == 1
+        assert catalog.stats()["registry_hits"] == 1
+        catalog.invalidate(registry)
+        catalog.registry_data()
+        assert catalog.stats()["registry_parses"] == 2
+
+
+class TestCompiledCatalog:
+    def _cold(self, insights_dir):
+        """A fresh catalog, as in a new process"""
+        return InsightCatalog(insights_dir)
+
+    def test_cold_start_parses_nothing(self, catalog, insights_dir):
+        catalog.all()
+        assert (insights_dir / COMPILED_CATALOG_FILE).exists()
+        cold = self._cold(insights_dir)
+        assert [i.id for i in cold.derived_by("INS-001")] == ["INS-002", "INS-003"]
+        stats = cold.stats()
+        assert stats["compiled_records"] == 3
+        assert stats["parses"] == 0 and stats["hits"] == 3
+        assert stats["compiled_saves"] == 0
+
+    def test_touched_file_is_hashed_not_parsed(self, catalog, insights_dir):
+        catalog.all()
+        _age(insights_dir / "INS-002.yaml", seconds=30)
+        cold = self._cold(insights_dir)
+        assert len(cold.all()) == 3
+        assert cold.stats()["verified"] == 1 and cold.stats()["parses"] == 0
+        # The refreshed stat is persisted: the next process trusts it outright
+        assert cold.stats()["compiled_saves"] == 1
+        again = self._cold(insights_dir)
+        again.all()
+        assert again.stats()["verified"] == 0 and again.stats()["hits"] == 3
+
+    def test_stale_record_falls_back_to_yaml(self, catalog, insights_dir):
+        catalog.all()
+        _age(_write(insights_dir, "INS-001", ["rewritten"], title="Changed"))
+        cold = self._cold(insights_dir)
+        assert cold.get("INS-001").title == "Changed"
+        assert [i.id for i in cold.with_tags(["rewritten"])] == ["INS-001"]
+        assert cold.with_tags(["sqlite"]) == []
+        assert cold.stats()["parses"] == 1
+
+    def test_contents(self, catalog, insights_dir):
+        registry = insights_dir / "registry.yaml"
+        registry.write_text(yaml.dump({"entries": {"INS-001": {"weight": 1.5}}}), "utf-8")
+        catalog.all()
+        catalog.registry_data()
+        payload = json.loads((insights_dir / COMPILED_CATALOG_FILE).read_text("utf-8"))
+        assert payload["format"] == "vibecollab-insight-catalog"
+        assert payload["tags"]["cache"] == ["INS-001", "INS-002"]
+        assert payload["files"]["INS-003"]["data"]["tags"] == ["yaml"]
+        assert payload["registry"]["data"]["entries"]["INS-001"]["weight"] == 1.5
+        assert self._cold(insights_dir).registry_data()["entries"]["INS-001"]["weight"] == 1.5
+
+    def test_corrupt_compiled_file_ignored(self, catalog, insights_dir):
+        (insights_dir / COMPILED_CATALOG_FILE).write_text("{not json", encoding="utf-8")
+        assert len(catalog.all()) == 3
+        assert catalog.stats()["parses"] == 3
+        assert json.loads((insights_dir / COMPILED_CATALOG_FILE).read_text("utf-8"))["files"]
+
+    def test_records_include_invalid_insights(self, catalog, insights_dir):
+        extra = insights_dir / "INS-TEST.yaml"
+        extra.write_text(yaml.dump({"id": "INS-TEST", "tags": ["git"]}), encoding="utf-8")
+        assert [stem for stem, _ in catalog.records()][-1] == "INS-TEST"
+        assert len(catalog.all()) == 3
+
+    def test_non_json_data_not_compiled(self, catalog, insights_dir):
+        dated = insights_dir / "INS-007.yaml"
+        dated.write_text("id: INS-007\ntags: [x]\ncreated: 2024-01-01\n", encoding="utf-8")
+        _age(dated)
+        catalog.all()
+        cold = self._cold(insights_dir)
+        cold.all()
+        assert cold.stats()["compiled_records"] == 3
+        assert cold.stats()["parses"] == 1
+
+    def test_memory_only(self, insights_dir):
+        InsightCatalog(insights_dir, compiled_file=None).all()
+        assert not (insights_dir / COMPILED_CATALOG_FILE).exists()
+
+    def test_empty_directory_writes_nothing(self, tmp_path):
+        InsightCatalog(tmp_path).all()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestManagerIntegration:
+    def test_managers_share_catalog(self, insights_dir):
+        root = insights_dir.parent.parent
+        assert get_insight_catalog(insights_dir) is get_insight_catalog(insights_dir / ".")
+        first = InsightManager(root)
+        first.search_by_tags(["cache"])
+        parses = first.catalog_stats()["parses"]
+        InsightManager(root).build_graph()
+        assert InsightManager(root).catalog_stats()["parses"] == parses
+
+    def test_shared_catalog_compiles_only_project_insights(self, insights_dir, tmp_path):
+        assert get_insight_catalog(insights_dir).compiled_path is not None
+        other = tmp_path / "elsewhere"
+        other.mkdir()
+        assert get_insight_catalog(other).compiled_path is None
+
+    def test_returned_insights_are_copies(self, insights_dir):
+        mgr = InsightManager(insights_dir.parent.parent, catalog=InsightCatalog(insights_dir))
+        mgr.list_all()[0].tags.append("mutated")
+        mgr.get("INS-001").title = "mutated"
+        ins = mgr.get("INS-001")
+        assert ins.title == "Insight INS-001"
+        assert "mutated" not in ins.tags
+
+    def test_writes_are_visible(self, insights_dir):
+        mgr = InsightManager(insights_dir.parent.parent, catalog=InsightCatalog(insights_dir))
+        mgr.list_all()
+        mgr.update("INS-001", "dev", tags=["renamed"])
+        assert [i.id for i in mgr.search_by_tags(["renamed"])] == ["INS-001"]
+        created = mgr.create("New", ["cache"], "tool", {"s": 1}, created_by="pm")
+        assert [i.id for i in mgr.search_by_role("pm")] == [created.id]
+        mgr.delete("INS-002", "dev")
+        assert mgr.get_derived_tree("INS-001")["derived_by"] == ["INS-003"]
+        mgr.record_use(created.id, "qa")
+        assert mgr.get_registry()[0][created.id].used_count == 1
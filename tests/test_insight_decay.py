@@ -0,0 +1,135 @@
+"""
+Tests for DecaySchedule — Lazy, read-time weight decay for the insight registry
+"""
+
+import random
+
+import pytest
+import yaml
+
+from vibecollab.insight.catalog import InsightCatalog
+from vibecollab.insight.decay import DecaySchedule
+from vibecollab.insight.journal import RegistryJournal
+from vibecollab.insight.manager import InsightManager, RegistryEntry
+
+
+def _eager_decay(entry, rate, threshold):
+    """The pre-lazy apply_decay step for one entry, including the save rounding"""
+    if entry.active:
+        entry.weight *= rate
+        if entry.weight < threshold:
+            entry.active = False
+    return RegistryEntry.from_dict(entry.to_dict())
+
+
+@pytest.fixture
+def mgr(tmp_path):
+    insights_dir = tmp_path / ".vibecollab" / "insights"
+    insights_dir.mkdir(parents=True)
+    journal = RegistryJournal(InsightCatalog(insights_dir, compiled_file=None))
+    mgr = InsightManager(tmp_path, journal=journal)
+    for title in ("A", "B", "C"):
+        mgr.create(title, ["t"], "technique", {"scenario": "s"}, created_by="dev")
+    return mgr
+
+
+class TestDecaySchedule:
+    def test_matches_eager_steps(self):
+        schedule = DecaySchedule()
+        eager = RegistryEntry(weight=1.3)
+        for rate, threshold in [(0.95, 0.1)] * 5 + [(0.5, 0.2)] * 2 + [(0.9, 0.1)] * 3:
+            schedule.advance(rate, threshold)
+            eager = _eager_decay(eager, rate, threshold)
+        assert len(schedule.segments) == 3 and schedule.epoch == 10
+        assert schedule.decay(1.3, True, 0) == (eager.weight, eager.active)
+
+    def test_partial_and_current(self):
+        schedule = DecaySchedule()
+        for _ in range(3):
+            schedule.advance(0.5, 0.0)
+        assert schedule.decay(1.0, True, 2) == (0.5, True)
+        assert schedule.decay(1.0, True, 3) == (1.0, True)
+        assert schedule.decay(1.0, True, None) == (1.0, True)
+        assert schedule.decay(1.0, False, 0) == (1.0, False)
+
+    def test_deactivation_stops_decay(self):
+        schedule = DecaySchedule()
+        for _ in range(10):
+            schedule.advance(0.5, 0.1)
+        # 0.4 -> 0.2 -> 0.1 -> 0.05 (< 0.1: deactivated, then frozen)
+        assert schedule.decay(0.4, True, 0) == (0.05, False)
+
+    def test_fixed_point_skips_long_runs(self):
+        schedule = DecaySchedule()
+        for _ in range(100_000):
+            schedule.advance(0.95, 0.0)
+        assert schedule.decay(0.0001, True, 0) == (0.0001, True)
+
+    def test_roundtrip(self):
+        schedule = DecaySchedule()
+        schedule.advance(0.95, 0.1)
+        assert DecaySchedule.from_dict(schedule.to_dict()) == schedule
+        assert DecaySchedule.from_dict(None) == DecaySchedule()
+
+
+class TestLazyRegistry:
+    def test_decay_touches_no_entries(self, mgr):
+        mgr.apply_decay()
+        mgr.apply_decay()
+        view = mgr._journal.view()
+        assert view["decay"].epoch == 2
+        assert view["entries"]["INS-001"]["weight"] == 1.0
+        assert mgr.get_registry()[0]["INS-001"].weight == pytest.approx(0.9025)
+
+    def test_matches_eager_registry(self, mgr):
+        rng = random.Random(5)
+        eager = {i: RegistryEntry() for i in ("INS-001", "INS-002", "INS-003")}
+        rate, threshold = 0.95, 0.1
+        for step in range(60):
+            if step % 20 == 10:
+                # Settings change (a full rewrite, which also compacts)
+                rate, threshold = rng.choice([0.95, 0.8]), rng.choice([0.1, 0.5])
+                entries, settings = mgr.get_registry()
+                settings.update(decay_rate=rate, deactivate_threshold=threshold)
+                mgr._save_registry(entries, settings)
+            if rng.random() < 0.5:
+                deactivated = mgr.apply_decay()
+                expected = []
+                for k, e in eager.items():
+                    was_active = e.active
+                    eager[k] = _eager_decay(e, rate, threshold)
+                    if was_active and not eager[k].active:
+                        expected.append(k)
+                assert deactivated == expected
+            else:
+                ins_id = rng.choice(sorted(eager))
+                used = mgr.record_use(ins_id, "qa")
+                e = eager[ins_id]
+                e.weight += 0.1
+                e.used_count += 1
+                e.active = True
+                e.last_used_by, e.last_used_at = "qa", used.last_used_at
+                if "qa" not in e.used_by:
+                    e.used_by.append("qa")
+                eager[ins_id] = RegistryEntry.from_dict(e.to_dict())
+                assert used.to_dict() == eager[ins_id].to_dict()
+            lazy = {k: e.to_dict() for k, e in mgr.get_registry()[0].items()}
+            assert lazy == {k: e.to_dict() for k, e in eager.items()}
+        expected_active = sorted(
+            ((k, e.weight) for k, e in eager.items() if e.active), key=lambda x: -x[1]
+        )
+        assert mgr.get_active_insights() == expected_active
+
+    def test_compaction_materializes(self, mgr):
+        mgr.record_use("INS-002", "qa")
+        mgr.apply_decay()
+        mgr.record_use("INS-003", "qa")
+        assert mgr._journal.view()["entries"]["INS-003"]["last_decay_epoch"] == 1
+        before = {k: e.to_dict() for k, e in mgr.get_registry()[0].items()}
+        mgr.compact_registry()
+        data = yaml.safe_load(mgr.registry_path.read_text(encoding="utf-8"))
+        assert "decay" not in data
+        assert all("last_decay_epoch" not in e for e in data["entries"].values())
+        assert data["entries"]["INS-002"]["weight"] == pytest.approx(1.045)
+        assert {k: e.to_dict() for k, e in mgr.get_registry()[0].items()} == before
+        assert mgr._journal.view()["decay"].epoch == 0
@@ -0,0 +1,214 @@
+"""
+Tests for RegistryJournal — Append-only usage journal in front of registry.yaml
+"""
+
+import json
+import threading
+
+import pytest
+import yaml
+
+from vibecollab.insight.catalog import InsightCatalog
+from vibecollab.insight.journal import JOURNAL_FILE, RegistryJournal
+from vibecollab.insight.manager import InsightManager, RegistryEntry
+
+
+def _manager(project_dir, **journal_kwargs):
+    """A manager with private catalog/journal, as a separate process would have"""
+    insights_dir = project_dir / ".vibecollab" / "insights"
+    journal = RegistryJournal(InsightCatalog(insights_dir, compiled_file=None), **journal_kwargs)
+    return InsightManager(project_dir, journal=journal)
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    (tmp_path / ".vibecollab" / "insights").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def mgr(project_dir):
+    mgr = _manager(project_dir)
+    for title in ("A", "B", "C"):
+        mgr.create(title, ["t"], "technique", {"scenario": "s"}, created_by="dev")
+    return mgr
+
+
+def _registry(mgr):
+    return {k: e.to_dict() for k, e in mgr.get_registry()[0].items()}
+
+
+class TestFold:
+    def test_matches_eager_rewrites(self, mgr):
+        mgr.record_use("INS-001", "qa")
+        mgr.record_use("INS-001", "dev")
+        mgr.apply_decay()
+        mgr.record_use("INS-002", "qa")
+        mgr.delete("INS-003", "dev")
+        journaled = _registry(mgr)
+        assert not mgr.registry_path.exists()
+
+        # The pre-journal code path: mutate RegistryEntry objects, save (round) after each op
+        eager = {i: RegistryEntry() for i in ("INS-001", "INS-002", "INS-003")}
+
+        def _save():
+            for k, e in eager.items():
+                eager[k] = RegistryEntry.from_dict(e.to_dict())
+
+        for ins_id, by in (("INS-001", "qa"), ("INS-001", "dev"), (None, None), ("INS-002", "qa")):
+            if ins_id is None:
+                for e in eager.values():
+                    e.weight *= 0.95
+            else:
+                e = eager[ins_id]
+                e.used_count += 1
+                e.weight += 0.1
+                e.last_used_by = by
+                e.last_used_at = journaled[ins_id]["last_used_at"]
+                if by not in e.used_by:
+                    e.used_by.append(by)
+            _save()
+        del eager["INS-003"]
+        assert journaled == {k: e.to_dict() for k, e in eager.items()}
+        assert journaled["INS-001"]["weight"] == pytest.approx(1.14)
+        assert journaled["INS-001"]["used_by"] == ["qa", "dev"]
+
+        assert mgr.compact_registry() == 8
+        assert _registry(mgr) == journaled
+        assert not (mgr.insights_dir / JOURNAL_FILE).exists()
+        assert mgr.compact_registry() == 0
+
+    def test_decay_deactivates(self, mgr):
+        entries, settings = mgr.get_registry()
+        entries["INS-002"].weight = 0.1
+        mgr._save_registry(entries, settings)
+        assert mgr.apply_decay() == ["INS-002"]
+        assert [k for k, _ in mgr.get_active_insights()] == ["INS-001", "INS-003"]
+
+    def test_decay_reads_registry_once(self, mgr, monkeypatch):
+        entries, settings = mgr.get_registry()
+        entries["INS-003"].weight = 0.11
+        mgr._save_registry(entries, settings)
+        mgr.apply_decay()  # 0.11 -> 0.1045, still active
+
+        def _no_materialize():
+            raise AssertionError("apply_decay materialized the registry")
+
+        monkeypatch.setattr(mgr, "get_registry", _no_materialize)
+        assert mgr.apply_decay() == ["INS-003"]
+        assert mgr.apply_decay() == []
+
+    def test_reads_are_incremental(self, mgr):
+        mgr.get_registry()
+        replays = mgr.registry_journal_stats()["replays"]
+        for _ in range(5):
+            mgr.record_use("INS-001", "qa")
+        stats = mgr.registry_journal_stats()
+        assert stats["replays"] == replays
+        assert stats["pending"] == 8 and stats["appends"] == 8
+
+    def test_other_process_sees_journal(self, mgr, project_dir):
+        mgr.record_use("INS-002", "qa")
+        assert _registry(_manager(project_dir)) == _registry(mgr)
+
+    def test_automatic_compaction(self, project_dir):
+        mgr = _manager(project_dir, compact_every=4)
+        for title in ("A", "B"):
+            mgr.create(title, ["t"], "technique", {"scenario": "s"}, created_by="dev")
+        mgr.record_use("INS-001", "qa")
+        mgr.record_use("INS-001", "qa")
+        stats = mgr.registry_journal_stats()
+        assert stats["compactions"] == 1 and stats["pending"] == 0
+        data = yaml.safe_load(mgr.registry_path.read_text(encoding="utf-8"))
+        assert data["entries"]["INS-001"]["used_count"] == 2
+        assert data["settings"]["use_reward"] == 0.1
+
+    def test_compaction_threshold_from_settings(self, mgr, project_dir):
+        entries, settings = mgr.get_registry()
+        assert settings["journal_compact_every"] == 20
+        settings["journal_compact_every"] = 2
+        mgr._save_registry(entries, settings)
+        mgr.record_use("INS-001", "qa")
+        assert mgr.registry_journal_stats()["pending"] == 1
+        mgr.record_use("INS-001", "qa")
+        stats = mgr.registry_journal_stats()
+        assert stats["pending"] == 0 and stats["compact_every"] == 2
+        # An explicit journal threshold wins over the setting
+        assert _manager(project_dir, compact_every=5).registry_journal_stats()["compact_every"] == 5
+
+    def test_full_rewrite_absorbs_journal(self, mgr):
+        mgr.record_use("INS-001", "qa")
+        entries, settings = mgr.get_registry()
+        settings["use_reward"] = 0.5
+        mgr._save_registry(entries, settings)
+        assert mgr.registry_journal_stats()["pending"] == 0
+        assert mgr.record_use("INS-001", "qa").weight == pytest.approx(1.6)
+
+
+class TestCrashRecovery:
+    def test_torn_last_line_ignored(self, mgr):
+        mgr.record_use("INS-001", "qa")
+        path = mgr.insights_dir / JOURNAL_FILE
+        with open(path, "ab") as f:
+            f.write(b'{"op":"use","id":"INS-0')
+        cold = _manager(mgr.project_root)
+        assert cold.get_registry()[0]["INS-001"].used_count == 1
+        # The next append starts on a fresh line; the torn fragment stays ignored
+        assert cold.record_use("INS-001", "dev").used_count == 2
+        fresh = _manager(mgr.project_root)
+        assert fresh.get_registry()[0]["INS-001"].used_count == 2
+        assert fresh.registry_journal_stats()["torn_lines"] == 1
+
+    def test_crash_before_journal_removed(self, mgr):
+        mgr.record_use("INS-001", "qa")
+        path = mgr.insights_dir / JOURNAL_FILE
+        leftover = path.read_bytes()
+        mgr.compact_registry()
+        # As if the process died between writing registry.yaml and unlinking
+        path.write_bytes(leftover)
+        marker = yaml.safe_load(mgr.registry_path.read_text(encoding="utf-8"))["journal"]
+        assert marker["applied"] == 4
+        cold = _manager(mgr.project_root)
+        assert cold.get_registry()[0]["INS-001"].used_count == 1
+        # Ops appended after the crash still apply, once
+        cold.record_use("INS-001", "qa")
+        cold.compact_registry()
+        assert _manager(mgr.project_root).get_registry()[0]["INS-001"].used_count == 2
+
+    def test_journal_applies_over_replaced_snapshot(self, mgr):
+        mgr.record_use("INS-001", "qa")
+        # registry.yaml replaced externally (e.g. git checkout): pending ops replay on top
+        mgr.registry_path.write_text(
+            yaml.dump({"entries": {"INS-001": {"weight": 2.0, "used_count": 5}}}), "utf-8"
+        )
+        mgr._catalog.invalidate(mgr.registry_path)
+        entry = mgr.get_registry()[0]["INS-001"]
+        assert entry.used_count == 6 and entry.weight == pytest.approx(2.1)
+
+
+class TestConcurrentWriters:
+    def test_no_lost_or_doubled_uses(self, mgr, project_dir):
+        workers, uses = 4, 25
+
+        def _work(n):
+            writer = _manager(project_dir, compact_every=7)
+            for _ in range(uses):
+                writer.record_use("INS-001", f"role-{n}")
+                writer.get_registry()
+
+        threads = [threading.Thread(target=_work, args=(n,)) for n in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        entry = _manager(project_dir).get_registry()[0]["INS-001"]
+        assert entry.used_count == workers * uses
+        assert entry.weight == pytest.approx(1.0 + 0.1 * workers * uses)
+        assert sorted(entry.used_by) == [f"role-{n}" for n in range(workers)]
+
+    def test_journal_lines_are_complete(self, mgr):
+        mgr.record_use("INS-001", "qa")
+        lines = (mgr.insights_dir / JOURNAL_FILE).read_text(encoding="utf-8").splitlines()
+        header, *ops = [json.loads(line) for line in lines]
+        assert header["format"] == "vibecollab-registry-journal"
+        assert [op["op"] for op in ops] == ["add", "add", "add", "use"]
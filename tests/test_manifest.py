@@ -0,0 +1,179 @@
+"""
+Tests for IndexManifest — record of the embedder that built index.db
+"""
+
+import sys
+
+import pytest
+
+from vibecollab.insight.embedder import Embedder, EmbedderConfig
+from vibecollab.search.indexer import Indexer, vectors_dir
+from vibecollab.search.manifest import (
+    IndexManifest,
+    ReindexNeeded,
+    index_embedder_config,
+    load_index_embedder,
+    read_manifest,
+)
+from vibecollab.search.vector_store import VectorDocument, VectorStore
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    (tmp_path / "CONTRIBUTING_AI.md").write_text(
+        "# Guide\nRules here\n## Testing\nRun pytest", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def _indexer(project_dir, dims=32):
+    embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=dims))
+    store = VectorStore(db_path=vectors_dir(project_dir) / "index.db", dimensions=dims)
+    return Indexer(project_root=project_dir, embedder=embedder, store=store)
+
+
+class TestManifestWritten:
+    def test_index_all_records_manifest(self, project_dir):
+        indexer = _indexer(project_dir)
+        indexer.index_all()
+        manifest = indexer.manifest()
+        assert manifest.backend == "pure_python"
+        assert manifest.model == indexer.embedder.model_name
+        assert manifest.dimensions == 32
+        assert manifest.codec == "float32"
+        assert manifest.chunk_count == indexer.store.count() == 2
+        assert manifest.built_at
+        assert len(manifest.corpus_hash) == 64
+
+    def test_corpus_hash_tracks_content(self, project_dir):
+        indexer = _indexer(project_dir)
+        indexer.index_all()
+        first = indexer.manifest().corpus_hash
+        indexer.index_all()
+        assert indexer.manifest().corpus_hash == first
+
+        (project_dir / "CONTRIBUTING_AI.md").write_text("# Guide\nNew rules", encoding="utf-8")
+        indexer.index_all()
+        assert indexer.manifest().corpus_hash != first
+        assert indexer.manifest().chunk_count == 1
+
+    def test_read_manifest_without_store(self, project_dir):
+        indexer = _indexer(project_dir)
+        indexer.index_all()
+        indexer.store.close()
+        manifest = read_manifest(vectors_dir(project_dir) / "index.db")
+        assert manifest.dimensions == 32
+
+    def test_read_manifest_missing(self, tmp_path):
+        assert read_manifest(tmp_path / "index.db") is None
+        assert not (tmp_path / "index.db").exists()
+
+    def test_read_manifest_legacy_db(self, tmp_path):
+        import sqlite3
+
+        db_path = tmp_path / "index.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TABLE vectors (doc_id TEXT PRIMARY KEY)")
+        conn.close()
+        assert read_manifest(db_path) is None
+
+
+class TestManifestChecks:
+    def test_search_with_other_embedder_refused(self, project_dir):
+        indexer = _indexer(project_dir)
+        indexer.index_all()
+        other = Indexer(
+            project_root=project_dir,
+            embedder=Embedder(EmbedderConfig(backend="pure_python", dimensions=64)),
+            store=indexer.store,
+        )
+        with pytest.raises(ReindexNeeded, match="Reindex needed"):
+            other.search("rules")
+        with pytest.raises(ReindexNeeded):
+            other.search("rules", mode="hybrid")
+
+    def test_lexical_search_needs_no_matching_embedder(self, project_dir):
+        indexer = _indexer(project_dir)
+        indexer.index_all()
+        if not indexer.store.fts_available:
+            pytest.skip("SQLite FTS5 not available")
+        other = Indexer(
+            project_root=project_dir,
+            embedder=Embedder(EmbedderConfig(backend="pure_python", dimensions=64)),
+            store=indexer.store,
+        )
+        assert other.search("pytest", mode="lexical")
+
+    def test_populated_store_without_manifest_refused(self, project_dir):
+        store = VectorStore(dimensions=32)
+        store.upsert(VectorDocument("a", "text", [1.0] + [0.0] * 31))
+        indexer = Indexer(
+            project_root=project_dir,
+            embedder=Embedder(EmbedderConfig(backend="pure_python", dimensions=32)),
+            store=store,
+        )
+        with pytest.raises(ReindexNeeded, match="no manifest"):
+            indexer.search("text")
+
+    def test_empty_store_without_manifest_searchable(self, project_dir):
+        indexer = Indexer(
+            project_root=project_dir,
+            embedder=Embedder(EmbedderConfig(backend="pure_python", dimensions=32)),
+            store=VectorStore(dimensions=32),
+        )
+        assert indexer.search("text") == []
+
+    def test_mismatch_reasons(self):
+        embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=16))
+        manifest = IndexManifest.for_embedder(embedder)
+        assert manifest.mismatch(embedder) is None
+        manifest.model = "pure-python-trigram-v1"
+        assert "pure-python-trigram-v1" in manifest.mismatch(embedder)
+
+    def test_embedder_config_pins_manifest(self):
+        manifest = IndexManifest(backend="local", model="all-mpnet-base-v2", dimensions=768)
+        config = manifest.embedder_config(EmbedderConfig(cache_dir="/tmp/x"))
+        assert (config.backend, config.model, config.dimensions) == ("local", "all-mpnet-base-v2", 768)
+        assert config.cache_dir == "/tmp/x"
+        pure = IndexManifest(backend="pure_python", model="pure-python-trigram-v2", dimensions=64)
+        assert pure.embedder_config(EmbedderConfig()).model == ""
+
+
+class TestLoadIndexEmbedder:
+    def test_builds_matching_embedder(self, project_dir):
+        indexer = _indexer(project_dir, dims=48)
+        indexer.index_all()
+        indexer.store.close()
+        embedder, manifest = load_index_embedder(project_dir)
+        assert embedder.backend_name == "pure_python"
+        assert embedder.dimensions == 48
+        assert manifest.chunk_count == 2
+
+    def test_default_config_when_unindexed(self, tmp_path):
+        assert index_embedder_config(tmp_path).backend == "auto"
+
+    def test_no_index(self, tmp_path):
+        with pytest.raises(ReindexNeeded, match="does not exist"):
+            load_index_embedder(tmp_path)
+
+    def test_index_without_manifest(self, project_dir):
+        db_path = vectors_dir(project_dir) / "index.db"
+        with VectorStore(db_path=db_path, dimensions=4) as store:
+            store.upsert(VectorDocument("a", "text", [1.0, 0.0, 0.0, 0.0]))
+        with pytest.raises(ReindexNeeded, match="no manifest"):
+            load_index_embedder(project_dir)
+
+    def test_empty_index_without_manifest(self, project_dir):
+        VectorStore(db_path=vectors_dir(project_dir) / "index.db", dimensions=4).close()
+        with pytest.raises(ReindexNeeded, match="empty"):
+            load_index_embedder(project_dir)
+
+    def test_unavailable_backend(self, project_dir, monkeypatch):
+        db_path = vectors_dir(project_dir) / "index.db"
+        with VectorStore(db_path=db_path, dimensions=384) as store:
+            store.set_manifest(
+                IndexManifest(backend="local", model="all-MiniLM-L6-v2", dimensions=384, chunk_count=1)
+            )
+        monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+        with pytest.raises(ReindexNeeded, match="cannot load local/all-MiniLM-L6-v2"):
+            load_index_embedder(project_dir)
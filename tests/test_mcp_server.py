@@ -181,6 +181,14 @@ class TestHelpers:
 
         assert _get_insight_files(tmp_path) == []
 
+    def test_get_insight_records(self, project_dir):
+        from vibecollab.agent.mcp_server import _get_insight_records
+
+        records = _get_insight_records(project_dir)
+        assert [stem for stem, _ in records] == ["INS-002", "INS-001"]  # Reverse order
+        assert records[0][1]["id"] == "INS-002"
+        assert _get_insight_records(project_dir / "missing") == []
+
 
 # ============================================================
 # MCP Server creation tests
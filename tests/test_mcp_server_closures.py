@@ -311,6 +311,61 @@ class TestApiTools:
         ))
         assert "results" in result or "error" in result
 
+    def test_search_docs_tag_filter(self, mcp, project_dir, monkeypatch):
+        from vibecollab.search.indexer import Indexer
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        Indexer(project_root=project_dir).index_all()
+        result = json.loads(mcp.tools["search_docs"](query="context", tags="TEST"))
+        assert [r["doc_id"] for r in result["results"]] == ["insight:INS-001"]
+        assert result["results"][0]["title"] == "Test Insight"
+
+        result = json.loads(mcp.tools["search_docs"](query="context", source="docs/*"))
+        assert result["results"]
+        assert all(r["source"].startswith("docs/") for r in result["results"])
+
+    def test_search_docs_reuses_warm_indexer(self, mcp, monkeypatch):
+        from vibecollab.search.pool import get_indexer_pool
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        get_indexer_pool().clear()
+        mcp.tools["search_docs"](query="context")
+        result = json.loads(mcp.tools["search_docs"](query="rules"))
+        assert "embed_ms" in result
+        status = json.loads(mcp.tools["search_status"]())
+        [entry] = status["indexers"]
+        assert entry["store_opens"] == 1
+        assert entry["requests"] == 2
+        assert entry["latency"]["calls"] == 2
+        get_indexer_pool().clear()
+
+    def test_search_docs_follows_manifest(self, mcp, project_dir):
+        from vibecollab.insight.embedder import Embedder, EmbedderConfig
+        from vibecollab.search.indexer import Indexer
+        from vibecollab.search.pool import get_indexer_pool
+
+        get_indexer_pool().clear()
+        embedder = Embedder(EmbedderConfig(backend="pure_python", dimensions=48))
+        Indexer(project_root=project_dir, embedder=embedder).index_all()
+        result = json.loads(mcp.tools["search_docs"](query="context"))
+        assert result["results"]
+        status = json.loads(mcp.tools["search_status"]())
+        assert status["manifest"]["dimensions"] == 48
+        assert status["indexers"][0]["dimensions"] == 48
+        get_indexer_pool().clear()
+
+    def test_search_docs_reindex_needed(self, mcp, project_dir):
+        from vibecollab.search.indexer import vectors_dir
+        from vibecollab.search.pool import get_indexer_pool
+        from vibecollab.search.vector_store import VectorDocument, VectorStore
+
+        get_indexer_pool().clear()
+        with VectorStore(db_path=vectors_dir(project_dir) / "index.db", dimensions=4) as store:
+            store.upsert(VectorDocument("doc:x", "context", [1.0, 0.0, 0.0, 0.0]))
+        result = json.loads(mcp.tools["search_docs"](query="context"))
+        assert result["status"] == "reindex_needed"
+        get_indexer_pool().clear()
+
     def test_insight_suggest(self, mcp):
         result = json.loads(mcp.tools["insight_suggest"]())
         assert "candidates" in result or "error" in result
@@ -0,0 +1,130 @@
+"""
+Tests for Projection — Linear dimensionality reduction for stored vectors
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from vibecollab.search import projection as projection_module
+from vibecollab.search.projection import (
+    PROJECTION_DDL,
+    Projection,
+    check_method,
+    estimate_recall,
+    read_projection_row,
+    write_projection_row,
+)
+
+
+def _vectors(n: int = 80, dims: int = 16, seed: int = 7):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1, 1) for _ in range(dims)] for _ in range(n)]
+
+
+class TestRandomProjection:
+    def test_shape_and_determinism(self):
+        a = Projection.random(16, 4, seed=3)
+        b = Projection.random(16, 4, seed=3)
+        assert len(a.matrix) == 64
+        assert a.matrix == b.matrix
+        assert Projection.random(16, 4, seed=4).matrix != a.matrix
+        assert a.describe() == "random 16 -> 4 dims"
+        assert a.fingerprint() == b.fingerprint()
+
+    @pytest.mark.parametrize("target", [0, 16, 20])
+    def test_target_out_of_range(self, target):
+        with pytest.raises(ValueError, match="between 1 and 15"):
+            Projection.random(16, target)
+
+    def test_apply_pure_python_matches_numpy(self, monkeypatch):
+        pytest.importorskip("numpy")
+        proj = Projection.random(16, 4, seed=1)
+        vector = _vectors(1)[0]
+        fast = proj.apply(vector)
+        monkeypatch.setattr(projection_module, "_get_numpy", lambda: None)
+        slow = proj.apply(vector)
+        assert len(slow) == 4
+        for a, b in zip(fast, slow):
+            assert abs(a - b) < 1e-4
+
+    def test_apply_dimension_mismatch(self):
+        with pytest.raises(ValueError, match="[Dd]imension"):
+            Projection.random(16, 4).apply([1.0] * 8)
+
+    def test_unknown_method(self):
+        assert check_method("pca") == "pca"
+        with pytest.raises(ValueError, match="Unknown projection method"):
+            check_method("umap")
+
+
+class TestPcaProjection:
+    def test_fit_preserves_low_rank_data(self):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(0)
+        # Rank-3 data embedded in 12 dims: 3 components reproduce it exactly
+        data = rng.normal(size=(50, 3)) @ rng.normal(size=(3, 12))
+        proj = Projection.fit_pca(data.tolist(), 3)
+        assert (proj.method, proj.source_dims, proj.target_dims) == ("pca", 12, 3)
+        row = data[0] / np.linalg.norm(data[0])
+        restored = proj.restore(proj.apply(row.tolist()))
+        assert np.allclose(restored, row, atol=1e-4)
+
+    def test_apply_matrix_matches_apply(self):
+        np = pytest.importorskip("numpy")
+        vectors = _vectors()
+        proj = Projection.fit_pca(vectors, 4)
+        batch = proj.apply_matrix(np, vectors[:5])
+        assert batch.shape == (5, 4)
+        assert np.allclose(batch[2], proj.apply(vectors[2]), atol=1e-5)
+
+    def test_needs_enough_vectors(self):
+        pytest.importorskip("numpy")
+        with pytest.raises(ValueError, match="at least 8 vectors"):
+            Projection.fit_pca(_vectors(5), 8)
+
+    def test_requires_numpy(self, monkeypatch):
+        monkeypatch.setattr(projection_module, "_get_numpy", lambda: None)
+        with pytest.raises(ImportError, match="numpy"):
+            Projection.fit_pca(_vectors(), 4)
+
+
+class TestProjectionRow:
+    def test_roundtrip_and_remove(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute(PROJECTION_DDL)
+        assert read_projection_row(conn) is None
+        proj = Projection.random(16, 4, seed=9)
+        write_projection_row(conn, proj)
+        loaded = read_projection_row(conn)
+        assert loaded == proj
+        write_projection_row(conn, None)
+        assert read_projection_row(conn) is None
+
+    def test_missing_table(self):
+        assert read_projection_row(sqlite3.connect(":memory:")) is None
+
+
+class TestEstimateRecall:
+    def test_rerank_improves_recall(self):
+        pytest.importorskip("numpy")
+        vectors = _vectors(200, 32)
+        proj = Projection.random(32, 6, seed=2)
+        plain = estimate_recall(vectors, proj, top_k=5, sample=50)
+        reranked = estimate_recall(vectors, proj, top_k=5, rerank=40, sample=50)
+        assert 0.0 <= plain <= 1.0
+        assert plain <= reranked <= 1.0
+
+    def test_lossless_projection_is_exact(self):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(1)
+        data = (rng.normal(size=(60, 4)) @ rng.normal(size=(4, 10))).tolist()
+        proj = Projection.fit_pca(data, 4)
+        assert estimate_recall(data, proj, top_k=5) == pytest.approx(1.0)
+
+    def test_nothing_to_measure(self, monkeypatch):
+        proj = Projection.random(4, 2)
+        assert estimate_recall([], proj) is None
+        monkeypatch.setattr(projection_module, "_get_numpy", lambda: None)
+        assert estimate_recall([[1.0, 0.0, 0.0, 0.0]], proj) is None
@@ -0,0 +1,55 @@
+"""
+Tests for vector codecs (float32 / float16 / int8)
+"""
+
+import pytest
+
+from vibecollab.search.quantization import (
+    VECTOR_CODECS,
+    bytes_per_vector,
+    check_codec,
+    decode_matrix,
+    decode_vector,
+    encode_vector,
+)
+
+VECTOR = [0.5, -0.25, 1.0, 0.0, -0.875, 0.1]
+
+
+class TestCodecs:
+    @pytest.mark.parametrize("codec", VECTOR_CODECS)
+    def test_roundtrip(self, codec):
+        blob = encode_vector(VECTOR, codec)
+        assert len(blob) == bytes_per_vector(codec, len(VECTOR))
+        assert list(decode_vector(blob, codec)) == pytest.approx(VECTOR, abs=0.01)
+
+    def test_sizes(self):
+        assert bytes_per_vector("float32", 1536) == 6144
+        assert bytes_per_vector("float16", 1536) == 3072
+        assert bytes_per_vector("int8", 1536) == 1540
+
+    def test_int8_zero_vector(self):
+        blob = encode_vector([0.0] * 4, "int8")
+        assert list(decode_vector(blob, "int8")) == [0.0] * 4
+
+    def test_check_codec(self):
+        assert check_codec("int8") == "int8"
+        with pytest.raises(ValueError):
+            check_codec("bfloat16")
+
+
+class TestDecodeMatrix:
+    @pytest.mark.parametrize("codec", VECTOR_CODECS)
+    def test_matches_decode_vector_direction(self, codec):
+        np = pytest.importorskip("numpy")
+        blobs = [encode_vector(VECTOR, codec), encode_vector([1.0] * 6, codec)]
+        matrix = decode_matrix(np, blobs, codec, 6).astype(np.float32)
+        assert matrix.shape == (2, 6)
+        row = np.asarray(decode_vector(blobs[0], codec))
+        cos = float(matrix[0] @ row / (np.linalg.norm(matrix[0]) * np.linalg.norm(row)))
+        assert cos == pytest.approx(1.0, abs=1e-6)
+
+    def test_size_mismatch_raises(self):
+        np = pytest.importorskip("numpy")
+        with pytest.raises(ValueError, match="dimension mismatch"):
+            decode_matrix(np, [encode_vector(VECTOR, "int8")], "int8", 8)
@@ -0,0 +1,161 @@
+"""
+Tests for QueryResultCache — search results cached per index generation
+"""
+
+import pytest
+
+from vibecollab.search.query_cache import (
+    QUERY_CACHE_FILENAME,
+    QueryResultCache,
+    normalize_query,
+)
+from vibecollab.search.vector_store import SearchFilter, SearchResult
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / QUERY_CACHE_FILENAME
+
+
+def _results(*doc_ids):
+    return [
+        SearchResult(doc_id, f"text of {doc_id}", 0.5, metadata={"tags": ["a"]})
+        for doc_id in doc_ids
+    ]
+
+
+class TestQueryResultCache:
+    def test_key_normalizes_query_whitespace(self):
+        assert normalize_query("  retry \n policy ") == "retry policy"
+        assert QueryResultCache.key(" retry  policy", top_k=5) == QueryResultCache.key(
+            "retry policy", top_k=5
+        )
+        assert QueryResultCache.key("retry policy", top_k=5) != QueryResultCache.key(
+            "Retry policy", top_k=5
+        )
+
+    def test_key_covers_parameters(self):
+        base = QueryResultCache.key("q", top_k=5, filters=SearchFilter(category="debug"))
+        assert base == QueryResultCache.key("q", top_k=5, filters=SearchFilter(category="debug"))
+        assert base != QueryResultCache.key("q", top_k=6, filters=SearchFilter(category="debug"))
+        assert base != QueryResultCache.key("q", top_k=5, filters=SearchFilter(category="tool"))
+
+    def test_put_and_get_return_fresh_copies(self):
+        cache = QueryResultCache()
+        cache.put("k", "gen-1", _results("a", "b"))
+        first = cache.get("k", "gen-1")
+        assert [r.doc_id for r in first] == ["a", "b"]
+        first[0].metadata["tags"].append("mutated")
+        assert cache.get("k", "gen-1")[0].metadata == {"tags": ["a"]}
+        assert cache.get("missing", "gen-1") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.6667)
+
+    def test_generation_change_invalidates(self):
+        cache = QueryResultCache()
+        cache.put("k", "gen-1", _results("a"))
+        assert cache.get("k", "gen-2") is None
+        assert cache.get("k", "gen-1") is None  # Dropped, not kept aside
+        assert cache.stats()["invalidations"] == 2
+
+    def test_lru_eviction(self):
+        cache = QueryResultCache(max_entries=2)
+        cache.put("a", "g", _results("a"))
+        cache.put("b", "g", _results("b"))
+        cache.get("a", "g")  # refresh a
+        cache.put("c", "g", _results("c"))
+        assert cache.get("b", "g") is None
+        assert cache.get("a", "g") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_zero_entries_disables_memory_cache(self):
+        cache = QueryResultCache(max_entries=0)
+        cache.put("k", "g", _results("a"))
+        assert cache.get("k", "g") is None
+        assert len(cache) == 0
+
+
+class TestPersistentQueryCache:
+    def test_shared_across_instances(self, cache_path):
+        writer = QueryResultCache(path=cache_path)
+        writer.put("k", "gen-1", _results("a", "b"))
+        writer.close()
+
+        reader = QueryResultCache(path=cache_path)
+        assert [r.doc_id for r in reader.get("k", "gen-1")] == ["a", "b"]
+        assert reader.get("k", "gen-1") is not None  # Now from memory
+        stats = reader.stats()
+        assert (stats["hits"], stats["disk_hits"], stats["disk_entries"]) == (2, 1, 1)
+        reader.close()
+
+    def test_other_generations_kept_until_eviction(self, cache_path):
+        # Two processes seeing different generations during an index run
+        old = QueryResultCache(path=cache_path)
+        new = QueryResultCache(path=cache_path)
+        old.put("k", "gen-1", _results("a"))
+        assert new.get("k", "gen-2") is None
+        new.put("k2", "gen-2", _results("b"))
+        assert old.get("k", "gen-1") is not None
+        assert new.stats()["disk_entries"] == 2
+        old.close()
+        new.close()
+
+    def test_eviction_drops_other_generations_first(self, cache_path):
+        cache = QueryResultCache(max_entries=0, path=cache_path, disk_max_entries=4)
+        for i in range(3):
+            cache.put(f"old{i}", "gen-1", _results(str(i)))
+        for i in range(2):
+            cache.put(f"new{i}", "gen-2", _results(str(i)))
+        assert cache.stats()["disk_entries"] == 3
+        assert cache.get("new0", "gen-2") is not None
+        assert cache.get("new1", "gen-2") is not None
+        cache.close()
+
+    def test_lookups_do_not_take_the_write_lock(self, cache_path):
+        import sqlite3
+        import time
+
+        cache = QueryResultCache(max_entries=0, path=cache_path)
+        cache.put("k", "g", _results("a"))
+        writer = sqlite3.connect(str(cache_path))
+        writer.execute("BEGIN IMMEDIATE")  # Another process mid-write
+        try:
+            start = time.perf_counter()
+            assert cache.get("k", "g") is not None
+            assert time.perf_counter() - start < 1.0
+        finally:
+            writer.rollback()
+            writer.close()
+        cache.close()
+
+    def test_budget_checked_without_counting_every_write(self, cache_path):
+        cache = QueryResultCache(path=cache_path, disk_max_entries=100)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for i in range(20):
+            cache.put(f"k{i}", "g", _results(str(i)))
+        assert sum("COUNT(*)" in sql for sql in statements) == 1
+        cache.close()
+
+    def test_disk_budget_evicts_least_recently_used(self, cache_path, monkeypatch):
+        import vibecollab.search.query_cache as mod
+
+        clock = iter(range(1000))
+        monkeypatch.setattr(mod.time, "time", lambda: next(clock))
+        cache = QueryResultCache(max_entries=0, path=cache_path, disk_max_entries=10)
+        for i in range(10):
+            cache.put(f"k{i}", "g", _results(str(i)))
+        assert cache.get("k0", "g") is not None  # refresh k0
+        cache.put("new", "g", _results("new"))
+        assert cache.stats()["disk_entries"] == 9
+        assert cache.get("k0", "g") is not None
+        assert cache.get("k1", "g") is None
+        cache.close()
+
+    def test_clear(self, cache_path):
+        cache = QueryResultCache(path=cache_path)
+        cache.put("k", "g", _results("a"))
+        cache.clear()
+        assert cache.get("k", "g") is None
+        assert cache.stats()["disk_entries"] == 0
+        cache.close()
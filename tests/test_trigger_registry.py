@@ -206,3 +206,20 @@ class TestTriggerRegistry:
             trigger_words = [t.word for t in triggers]
 
             assert "new-tag" in trigger_words
+
+    def test_new_registry_reuses_parsed_insights(self):
+        """Recreated registries read the shared insight catalog, not the YAML again"""
+        from vibecollab.insight.catalog import get_insight_catalog
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            insights_dir = Path(tmpdir)
+            with open(insights_dir / "INS-001.yaml", "w") as f:
+                yaml.dump({"id": "INS-001", "title": "Git", "tags": ["git"]}, f)
+
+            assert TriggerRegistry(insights_dir).get_trigger("git").count == 1
+            catalog = get_insight_catalog(insights_dir)
+            parses = catalog.stats()["parses"]
+            assert TriggerRegistry(insights_dir).get_trigger("git").count == 1
+            assert catalog.stats()["parses"] == parses
+            # Read-only: nothing is written next to the insights it was pointed at
+            assert [p.name for p in insights_dir.iterdir()] == ["INS-001.yaml"]
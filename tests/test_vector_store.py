@@ -5,7 +5,11 @@ Tests for VectorStore — Local persistent vector storage
 
 import pytest
 
+from vibecollab.search import vector_store
+from vibecollab.search.projection import Projection
 from vibecollab.search.vector_store import (
+    SearchFilter,
+    reciprocal_rank_fusion,
     VectorDocument,
     VectorStore,
     _pack_vector,
@@ -237,6 +241,508 @@ class TestVectorStoreSearch:
         assert results[0].metadata == {"key": "value"}
 
 
+# ---------------------------------------------------------------------------
+# NumPy / pure Python search path parity
+# ---------------------------------------------------------------------------
+
+def _random_store(n: int = 60, dims: int = 8, **kwargs) -> VectorStore:
+    import random
+
+    rng = random.Random(42)
+    store = VectorStore(db_path=None, dimensions=dims, **kwargs)
+    docs = [
+        VectorDocument(
+            f"doc:{i}",
+            f"text {i}",
+            [rng.uniform(-1, 1) for _ in range(dims)],
+            source_type="insight" if i % 3 == 0 else "document",
+            metadata={"i": i},
+        )
+        for i in range(n)
+    ]
+    docs.append(VectorDocument("zero", "zero vector", [0.0] * dims))
+    store.upsert_batch(docs)
+    return store
+
+
+class TestSearchPaths:
+    def test_pure_python_fallback(self, monkeypatch):
+        monkeypatch.setattr(vector_store, "_get_numpy", lambda: None)
+        store = _random_store()
+        results = store.search([1.0] * 8, top_k=5)
+        assert len(results) == 5
+        scores = [r.score for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_numpy_matches_pure_python(self, monkeypatch):
+        pytest.importorskip("numpy")
+        store = _random_store()
+        query = [0.3, -0.2, 0.9, 0.0, 0.1, -0.7, 0.4, 0.2]
+        fast = store.search(query, top_k=7, min_score=-1.0)
+        fast_filtered = store.search(query, top_k=50, source_type="insight", min_score=0.1)
+
+        monkeypatch.setattr(vector_store, "_get_numpy", lambda: None)
+        slow = store.search(query, top_k=7, min_score=-1.0)
+        slow_filtered = store.search(query, top_k=50, source_type="insight", min_score=0.1)
+
+        assert [r.doc_id for r in fast] == [r.doc_id for r in slow]
+        assert [r.doc_id for r in fast_filtered] == [r.doc_id for r in slow_filtered]
+        for a, b in zip(fast, slow):
+            assert abs(a.score - b.score) < 1e-5
+            assert a.metadata == b.metadata
+            assert a.text == b.text
+
+    def test_numpy_zero_query_scores_zero(self):
+        pytest.importorskip("numpy")
+        store = _random_store()
+        results = store.search([0.0] * 8, top_k=3)
+        assert len(results) == 3
+        assert all(r.score == 0.0 for r in results)
+
+    def test_top_k_zero(self):
+        store = _random_store()
+        assert store.search([1.0] * 8, top_k=0) == []
+
+
+class TestSearchMany:
+    QUERIES = [
+        [0.3, -0.2, 0.9, 0.0, 0.1, -0.7, 0.4, 0.2],
+        [1.0] * 8,
+        [0.0] * 8,
+        [-0.5, 0.5, -0.5, 0.5, 0.1, 0.2, 0.3, 0.4],
+    ]
+
+    def _assert_matches_search(self, store, **kwargs):
+        batched = store.search_many(self.QUERIES, **kwargs)
+        assert len(batched) == len(self.QUERIES)
+        for query, results in zip(self.QUERIES, batched):
+            single = store.search(query, **kwargs)
+            assert [r.doc_id for r in results] == [r.doc_id for r in single]
+            for a, b in zip(results, single):
+                assert abs(a.score - b.score) < 1e-5
+                assert (a.text, a.metadata) == (b.text, b.metadata)
+
+    @pytest.mark.parametrize("numpy", [True, False])
+    def test_matches_single_queries(self, monkeypatch, numpy):
+        if numpy:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(vector_store, "_get_numpy", lambda: None)
+        store = _random_store()
+        self._assert_matches_search(store, top_k=7, min_score=-1.0)
+        self._assert_matches_search(store, top_k=50, source_type="insight", min_score=0.1)
+
+    def test_filters_and_quantized_rerank(self):
+        pytest.importorskip("numpy")
+        store = _random_store(codec="int8", keep_exact=True)
+        for doc_id in store.list_doc_ids()[:20]:
+            doc = store.get(doc_id)
+            doc.metadata = {"tags": ["picked"]}
+            store.upsert(doc)
+        self._assert_matches_search(store, top_k=5, min_score=-1.0)
+        self._assert_matches_search(
+            store, top_k=5, min_score=-1.0, filters=SearchFilter(tags_any=["picked"])
+        )
+
+    def test_with_ann_index(self):
+        pytest.importorskip("numpy")
+        store = _random_store(n=200)
+        store.build_ann_index(nlist=4, nprobe=2)
+        self._assert_matches_search(store, top_k=5, min_score=-1.0)
+        self._assert_matches_search(store, top_k=5, min_score=-1.0, nprobe=0)
+
+    def test_one_snapshot_and_detail_fetch(self, monkeypatch):
+        store = _random_store()
+        store.search([1.0] * 8, top_k=1)
+        fetches = []
+        original = store._fetch_details
+        monkeypatch.setattr(store, "_fetch_details", lambda ids: fetches.append(ids) or original(ids))
+        monkeypatch.setattr(store, "_load_snapshot", lambda *a: pytest.fail("snapshot reloaded"))
+        batched = store.search_many(self.QUERIES, top_k=3, min_score=-1.0)
+        assert len(fetches) == 1
+        assert all(len(results) == 3 for results in batched)
+
+    def test_edge_cases(self):
+        store = _random_store()
+        assert store.search_many([]) == []
+        assert store.search_many(self.QUERIES, top_k=0) == [[], [], [], []]
+        with pytest.raises(ValueError):
+            store.search_many([[1.0] * 8, [1.0] * 3])
+
+
+# ---------------------------------------------------------------------------
+# Resident vector cache
+# ---------------------------------------------------------------------------
+
+class TestVectorCache:
+    def test_cache_reused_between_searches(self, monkeypatch):
+        store = _random_store()
+        store.search([1.0] * 8, top_k=3)
+        assert store.cache_loaded
+
+        loads = []
+        original = store._load_snapshot
+        monkeypatch.setattr(store, "_load_snapshot", lambda st: loads.append(st) or original(st))
+        store.search([0.5] * 8, top_k=3)
+        store.search([0.5] * 8, top_k=3, source_type="insight")
+        assert loads == []
+
+    def test_upsert_invalidates_cache(self):
+        store = _random_store()
+        store.search([1.0] * 8, top_k=1)
+        store.upsert(VectorDocument("best", "exact", [1.0] * 8))
+        results = store.search([1.0] * 8, top_k=1)
+        assert results[0].doc_id == "best"
+
+    def test_delete_invalidates_cache(self):
+        store = _random_store()
+        top = store.search([1.0] * 8, top_k=1)[0].doc_id
+        assert store.delete(top)
+        assert top not in [r.doc_id for r in store.search([1.0] * 8, top_k=100, min_score=-1)]
+
+    def test_other_connection_write_invalidates_cache(self, tmp_path):
+        db_file = tmp_path / "index.db"
+        reader = VectorStore(db_path=db_file, dimensions=4)
+        writer = VectorStore(db_path=db_file, dimensions=4)
+        writer.upsert(VectorDocument("a", "t", [1, 0, 0, 0]))
+        assert [r.doc_id for r in reader.search([0, 1, 0, 0], top_k=1)] == ["a"]
+
+        writer.upsert(VectorDocument("b", "t", [0, 1, 0, 0]))
+        assert reader.search([0, 1, 0, 0], top_k=1)[0].doc_id == "b"
+        reader.close()
+        writer.close()
+
+    def test_memory_cap_drops_cache(self):
+        store = VectorStore(db_path=None, dimensions=4, cache_max_bytes=10)
+        store.upsert(VectorDocument("a", "t", [1, 0, 0, 0]))
+        assert store.search([1, 0, 0, 0], top_k=1)[0].doc_id == "a"
+        assert not store.cache_loaded
+
+    def test_memory_cap_loads_only_searched_source_type(self, monkeypatch):
+        store = _random_store(cache_max_bytes=1000)
+        loads = []
+        original = store._load_snapshot
+        monkeypatch.setattr(store, "_load_snapshot", lambda st: loads.append(st) or original(st))
+        results = store.search([1.0] * 8, top_k=5, source_type="insight", min_score=-1)
+        assert loads == ["insight"]
+        assert len(results) == 5 and all(r.source_type == "insight" for r in results)
+        assert not store.cache_loaded
+
+    def test_cache_disabled(self):
+        store = VectorStore(db_path=None, dimensions=4, cache_max_bytes=0)
+        store.upsert(VectorDocument("a", "t", [1, 0, 0, 0], source_type="doc"))
+        store.upsert(VectorDocument("b", "t", [0, 1, 0, 0], source_type="insight"))
+        results = store.search([1, 1, 0, 0], top_k=5, source_type="insight")
+        assert [r.doc_id for r in results] == ["b"]
+        assert not store.cache_loaded
+
+    def test_invalidate_cache(self):
+        store = _random_store()
+        store.search([1.0] * 8, top_k=1)
+        store.invalidate_cache()
+        assert not store.cache_loaded
+
+
+# ---------------------------------------------------------------------------
+# Quantized storage
+# ---------------------------------------------------------------------------
+
+class TestQuantizedStorage:
+    QUERY = [0.3, -0.2, 0.9, 0.0, 0.1, -0.7, 0.4, 0.2]
+
+    @pytest.mark.parametrize("codec", ["float16", "int8"])
+    def test_search_close_to_float32(self, codec):
+        exact = _random_store().search(self.QUERY, top_k=5, min_score=-1.0)
+        quant = _random_store(codec=codec).search(self.QUERY, top_k=5, min_score=-1.0)
+        assert quant[0].doc_id == exact[0].doc_id
+        for a, b in zip(exact, quant):
+            assert abs(a.score - b.score) < 0.02
+
+    @pytest.mark.parametrize("codec", ["float16", "int8"])
+    def test_numpy_matches_pure_python(self, monkeypatch, codec):
+        pytest.importorskip("numpy")
+        store = _random_store(codec=codec)
+        fast = store.search(self.QUERY, top_k=10, min_score=-1.0)
+        monkeypatch.setattr(vector_store, "_get_numpy", lambda: None)
+        slow = store.search(self.QUERY, top_k=10, min_score=-1.0)
+        assert [r.doc_id for r in fast] == [r.doc_id for r in slow]
+        for a, b in zip(fast, slow):
+            assert abs(a.score - b.score) < 1e-4
+
+    def test_codec_recorded_and_reloaded(self, tmp_path):
+        db_file = tmp_path / "index.db"
+        with VectorStore(db_path=db_file, dimensions=4, codec="int8") as store:
+            store.upsert(VectorDocument("a", "a", [0.5, -1.0, 0.25, 0.0]))
+        with VectorStore(db_path=db_file, dimensions=4) as store:
+            assert store.codec == "int8"
+            assert store.get("a").vector == pytest.approx([0.5, -1.0, 0.25, 0.0], abs=0.01)
+
+    def test_set_codec_reencodes_rows(self):
+        store = _random_store()
+        before = store.search(self.QUERY, top_k=3)
+        assert store.set_codec("float16") == 61
+        assert store.codec == "float16"
+        after = store.search(self.QUERY, top_k=3)
+        assert [r.doc_id for r in after] == [r.doc_id for r in before]
+
+    def test_keep_exact_reranks_to_float32_scores(self):
+        exact = _random_store().search(self.QUERY, top_k=5, min_score=-1.0)
+        store = _random_store(codec="int8", keep_exact=True)
+        assert store.keep_exact
+        reranked = store.search(self.QUERY, top_k=5, min_score=-1.0)
+        assert [r.doc_id for r in reranked] == [r.doc_id for r in exact]
+        for a, b in zip(exact, reranked):
+            assert a.score == pytest.approx(b.score, abs=1e-6)
+        # rerank=0 keeps the quantized scores
+        approx = store.search(self.QUERY, top_k=5, min_score=-1.0, rerank=0)
+        assert any(abs(a.score - b.score) > 1e-6 for a, b in zip(exact, approx))
+
+    def test_min_score_applies_to_exact_scores(self):
+        store = _random_store(codec="int8", keep_exact=True)
+        exact = store.search(self.QUERY, top_k=10, min_score=-1.0)
+        for hit in exact:
+            # The threshold is the exact score, so the quantized scan must not drop it
+            found = store.search(self.QUERY, top_k=10, min_score=hit.score)
+            assert hit.doc_id in [r.doc_id for r in found]
+            assert all(r.score >= hit.score for r in found)
+            many = store.search_many([self.QUERY], top_k=10, min_score=hit.score)[0]
+            assert [r.doc_id for r in many] == [r.doc_id for r in found]
+
+    def test_negative_rerank_rejected(self):
+        store = _random_store(codec="int8", keep_exact=True)
+        with pytest.raises(ValueError, match="rerank"):
+            store.search(self.QUERY, top_k=5, rerank=-5)
+        with pytest.raises(ValueError, match="rerank"):
+            store.search_many([self.QUERY], top_k=5, rerank=-1)
+        with pytest.raises(ValueError, match="rerank"):
+            store.search_hybrid("text", self.QUERY, top_k=5, rerank=-1)
+        assert store.search(self.QUERY, top_k=5, rerank=0)
+
+    def test_keep_exact_ignored_for_float32(self):
+        store = VectorStore(db_path=None, dimensions=4, keep_exact=True)
+        assert not store.keep_exact
+
+    def test_get_returns_exact_original(self):
+        store = VectorStore(db_path=None, dimensions=4, codec="int8", keep_exact=True)
+        store.upsert(VectorDocument("a", "a", [0.123, -1.0, 0.25, 0.0]))
+        assert store.get("a").vector == pytest.approx([0.123, -1.0, 0.25, 0.0])
+
+    def test_unknown_codec_raises(self):
+        with pytest.raises(ValueError, match="Unknown vector codec"):
+            VectorStore(db_path=None, dimensions=4, codec="int4")
+
+    def test_ann_over_quantized_store(self):
+        pytest.importorskip("numpy")
+        store = _random_store(n=200, codec="int8")
+        store.build_ann_index(nlist=4)
+        exact = store.search(self.QUERY, top_k=5, nprobe=0)
+        probed = store.search(self.QUERY, top_k=5, nprobe=4)
+        assert [r.doc_id for r in probed] == [r.doc_id for r in exact]
+
+
+# ---------------------------------------------------------------------------
+# Metadata filter pushdown
+# ---------------------------------------------------------------------------
+
+def _faceted_store(**kwargs) -> VectorStore:
+    store = VectorStore(db_path=None, dimensions=4, **kwargs)
+    store.upsert_batch([
+        VectorDocument("ins:1", "a", [1, 0, 0, 0], source=".vibecollab/insights/INS-1.yaml",
+                       source_type="insight",
+                       metadata={"tags": ["MCP", "cache"], "category": "Technique"}),
+        VectorDocument("ins:2", "b", [0.9, 0.1, 0, 0], source=".vibecollab/insights/INS-2.yaml",
+                       source_type="insight", metadata={"tags": ["cache"], "category": "pitfall"}),
+        VectorDocument("doc:1", "c", [0.8, 0.2, 0, 0], source="docs/CONTEXT.md",
+                       source_type="document", metadata={"heading": "## Architecture"}),
+        VectorDocument("doc:2", "d", [0.7, 0.3, 0, 0], source="CONTRIBUTING_AI.md",
+                       source_type="document", metadata={"heading": "## Rules"}),
+    ])
+    return store
+
+
+DEFAULT_CACHE = vector_store.DEFAULT_CACHE_MAX_BYTES
+
+
+class TestSearchFilters:
+    QUERY = [1.0, 0.0, 0.0, 0.0]
+
+    def _ids(self, store, **filter_kwargs):
+        results = store.search(self.QUERY, top_k=10, filters=SearchFilter(**filter_kwargs))
+        return [r.doc_id for r in results]
+
+    @pytest.mark.parametrize("cached", [True, False])
+    def test_filters(self, cached):
+        store = _faceted_store(cache_max_bytes=DEFAULT_CACHE if cached else 0)
+        if cached:
+            store.search(self.QUERY)
+            assert store.cache_loaded
+        assert self._ids(store, tags_any=["mcp"]) == ["ins:1"]
+        assert self._ids(store, tags_any=["cache", "mcp"]) == ["ins:1", "ins:2"]
+        assert self._ids(store, tags_all=["cache", "MCP"]) == ["ins:1"]
+        assert self._ids(store, category="PITFALL") == ["ins:2"]
+        assert self._ids(store, source_glob="docs/*") == ["doc:1"]
+        assert self._ids(store, heading_prefix="## Arch") == ["doc:1"]
+        assert self._ids(store, tags_any=["nope"]) == []
+
+    def test_filter_combined_with_source_type(self):
+        store = _faceted_store()
+        results = store.search(
+            self.QUERY, top_k=10, source_type="document",
+            filters=SearchFilter(source_glob="*.md"),
+        )
+        assert [r.doc_id for r in results] == ["doc:1", "doc:2"]
+
+    def test_top_k_counts_only_matches(self):
+        store = _faceted_store()
+        results = store.search(self.QUERY, top_k=1, filters=SearchFilter(source_glob="CONTRIB*"))
+        assert [r.doc_id for r in results] == ["doc:2"]
+
+    def test_empty_filter_is_unfiltered(self):
+        store = _faceted_store()
+        assert len(store.search(self.QUERY, top_k=10, filters=SearchFilter())) == 4
+
+    def test_pure_python_filters(self, monkeypatch):
+        monkeypatch.setattr(vector_store, "_get_numpy", lambda: None)
+        store = _faceted_store()
+        assert self._ids(store, tags_any=["cache"]) == ["ins:1", "ins:2"]
+
+    def test_side_tables_follow_updates_and_deletes(self):
+        store = _faceted_store()
+        store.upsert(VectorDocument("ins:1", "a", [1, 0, 0, 0], source_type="insight",
+                                    metadata={"tags": ["other"]}))
+        assert self._ids(store, tags_any=["mcp"]) == []
+        assert self._ids(store, tags_any=["other"]) == ["ins:1"]
+        store.delete("ins:2")
+        store.delete_by_source_type("document")
+        assert self._ids(store, tags_any=["cache"]) == []
+        assert self._ids(store, heading_prefix="##") == []
+
+    def test_backfill_existing_rows(self, tmp_path):
+        import sqlite3
+
+        db_file = tmp_path / "index.db"
+        with _faceted_store_at(db_file):
+            pass
+        conn = sqlite3.connect(str(db_file))
+        conn.execute("DELETE FROM vector_tags")
+        conn.execute("DELETE FROM index_meta WHERE key = 'facets'")
+        conn.commit()
+        conn.close()
+        with VectorStore(db_path=db_file, dimensions=4) as store:
+            assert self._ids(store, tags_any=["mcp"]) == ["ins:1"]
+
+
+def _faceted_store_at(db_file) -> VectorStore:
+    store = VectorStore(db_path=db_file, dimensions=4)
+    store.upsert(VectorDocument("ins:1", "a", [1, 0, 0, 0], source_type="insight",
+                                metadata={"tags": ["mcp"]}))
+    return store
+
+
+# ---------------------------------------------------------------------------
+# Lexical (FTS5) and hybrid search
+# ---------------------------------------------------------------------------
+
+def _text_store(**kwargs) -> VectorStore:
+    store = VectorStore(db_path=None, dimensions=4, **kwargs)
+    store.upsert_batch([
+        VectorDocument("insight:INS-042", "Retry with exponential backoff", [0, 1, 0, 0],
+                       source_type="insight", metadata={"tags": ["http"]}),
+        VectorDocument("doc:a", "The embedding cache evicts least recently used rows",
+                       [1, 0, 0, 0], source="docs/CONTEXT.md", source_type="document"),
+        VectorDocument("doc:b", "Vector search uses cosine similarity", [0.9, 0.1, 0, 0],
+                       source="docs/DECISIONS.md", source_type="document"),
+    ])
+    return store
+
+
+class TestReciprocalRankFusion:
+    def test_fuses_by_rank(self):
+        fused = reciprocal_rank_fusion([[("a", 9.0), ("b", 1.0)], [("b", 0.9), ("c", 0.5)]], k=1)
+        assert [doc_id for doc_id, _ in fused] == ["b", "a", "c"]
+        assert fused[0][1] == pytest.approx(1 / 3 + 1 / 2)
+
+
+class TestLexicalSearch:
+    def test_identifier_lookup(self):
+        store = _text_store()
+        assert store.fts_available
+        results = store.search_lexical("INS-042")
+        assert [r.doc_id for r in results] == ["insight:INS-042"]
+        assert results[0].score > 0
+
+    def test_keywords_and_operators_are_literal(self):
+        store = _text_store()
+        assert [r.doc_id for r in store.search_lexical("cosine OR")] == ["doc:b"]
+        assert store.search_lexical('" * ( -') == []
+
+    def test_filters_apply(self):
+        store = _text_store()
+        assert store.search_lexical("cache cosine", source_type="insight") == []
+        results = store.search_lexical(
+            "cache cosine", filters=SearchFilter(source_glob="docs/DEC*")
+        )
+        assert [r.doc_id for r in results] == ["doc:b"]
+
+    def test_index_follows_writes(self):
+        store = _text_store()
+        store.upsert(VectorDocument("doc:a", "Rewritten paragraph", [1, 0, 0, 0]))
+        assert store.search_lexical("evicts") == []
+        assert [r.doc_id for r in store.search_lexical("rewritten")] == ["doc:a"]
+        store.delete("doc:a")
+        store.delete_many(["doc:b"])
+        assert store.search_lexical("rewritten cosine") == []
+
+    def test_backfill_existing_db(self, tmp_path):
+        import sqlite3
+
+        db_file = tmp_path / "index.db"
+        VectorStore(db_path=db_file, dimensions=4).close()
+        conn = sqlite3.connect(str(db_file))
+        conn.execute("DROP TABLE vectors_fts")
+        for trigger in ("ai", "ad", "au"):
+            conn.execute(f"DROP TRIGGER vectors_fts_{trigger}")
+        conn.execute(
+            "INSERT INTO vectors (doc_id, text, vector, dimensions) VALUES (?, ?, ?, 4)",
+            ("legacy", "legacy row", _pack_vector([1, 0, 0, 0])),
+        )
+        conn.commit()
+        conn.close()
+        with VectorStore(db_path=db_file, dimensions=4) as store:
+            assert [r.doc_id for r in store.search_lexical("legacy")] == ["legacy"]
+
+
+class TestHybridSearch:
+    QUERY = [1.0, 0.0, 0.0, 0.0]
+
+    def test_fuses_lexical_and_vector(self):
+        store = _text_store()
+        results = store.search_hybrid("INS-042", self.QUERY, top_k=3)
+        # INS-042: lexical rank 1 + vector rank 3; doc:a: vector rank 1 only
+        assert [r.doc_id for r in results] == ["insight:INS-042", "doc:a", "doc:b"]
+        assert results[0].score == pytest.approx(1 / 61 + 1 / 63)
+
+    def test_lexical_candidates_only(self):
+        store = _text_store()
+        results = store.search_hybrid(
+            "cosine", self.QUERY, top_k=3, lexical_candidates_only=True
+        )
+        assert [r.doc_id for r in results] == ["doc:b"]
+        assert results[0].score == pytest.approx(2 / 61)
+
+    def test_lexical_candidates_only_falls_back_without_hits(self):
+        store = _text_store()
+        results = store.search_hybrid("zzz", self.QUERY, top_k=1, lexical_candidates_only=True)
+        assert [r.doc_id for r in results] == ["doc:a"]
+
+    def test_filters_apply_to_both_rankings(self):
+        store = _text_store()
+        results = store.search_hybrid(
+            "INS-042", self.QUERY, top_k=5, filters=SearchFilter(tags_any=["http"])
+        )
+        assert [r.doc_id for r in results] == ["insight:INS-042"]
+
+
 # ---------------------------------------------------------------------------
 # VectorStore Persistence Tests
 # ---------------------------------------------------------------------------
@@ -272,3 +778,361 @@ class TestVectorStorePersistence:
         store = VectorStore(db_path=None, dimensions=4)
         assert store.db_path is None
         store.close()
+
+    def test_replace_from_swaps_contents(self, tmp_path):
+        live = VectorStore(db_path=tmp_path / "index.db", dimensions=4)
+        live.upsert(VectorDocument("old", "old text", [1, 0, 0, 0]))
+        reader = VectorStore(db_path=tmp_path / "index.db", dimensions=4)
+        assert [r.doc_id for r in reader.search([1, 0, 0, 0], top_k=5)] == ["old"]
+
+        with VectorStore(db_path=tmp_path / "new" / "index.db", dimensions=2, codec="int8") as new:
+            new.upsert(VectorDocument("new", "new text", [0, 1]))
+        live.replace_from(tmp_path / "new" / "index.db", dimensions=2)
+
+        assert live.codec == "int8"
+        assert live.list_doc_ids() == ["new"]
+        assert [r.doc_id for r in live.search([0, 1], top_k=5)] == ["new"]
+        # Other connections see the new contents on their next read
+        assert reader.list_doc_ids() == ["new"]
+
+    @pytest.mark.parametrize("cache_max_bytes", [DEFAULT_CACHE, 0])
+    def test_other_store_follows_layout_changes(self, tmp_path, cache_max_bytes):
+        db_file = tmp_path / "index.db"
+        writer = VectorStore(db_path=db_file, dimensions=8)
+        writer.bulk_load(
+            VectorDocument(f"doc:{i}", f"t{i}", [float((i * 7 + j * j) % 5) - 2 for j in range(8)])
+            for i in range(20)
+        )
+        reader = VectorStore(db_path=db_file, dimensions=8, cache_max_bytes=cache_max_bytes)
+        query = writer.get("doc:3").vector
+        assert reader.search(query, top_k=1)[0].doc_id == "doc:3"
+
+        writer.set_codec("int8", keep_exact=True)
+        assert reader.search(query, top_k=1)[0].doc_id == "doc:3"
+        assert (reader.codec, reader.keep_exact) == ("int8", True)
+
+        writer.set_projection(Projection.random(8, 4, seed=1))
+        assert reader.search(query, top_k=1)[0].doc_id == "doc:3"
+        assert reader.stored_dimensions == 4
+        writer.close()
+        reader.close()
+
+
+# ---------------------------------------------------------------------------
+# Bulk load / SQLite tuning / maintenance Tests
+# ---------------------------------------------------------------------------
+
+def _docs(n: int, start: int = 0):
+    for i in range(start, start + n):
+        yield VectorDocument(f"doc:{i}", f"chunk number {i}", [1.0, float(i), 0.0, 0.0],
+                             metadata={"tags": ["bulk"]})
+
+
+class TestIndexGeneration:
+    def test_changes_on_writes_only(self):
+        store = _random_store()
+        generation = store.index_generation()
+        assert generation
+        store.search([1.0] * 8)
+        store.set_source_mtimes({"doc:0": 1.0})
+        assert store.index_generation() == generation
+
+        for write in (
+            lambda: store.upsert(VectorDocument("new", "new", [1.0] * 8)),
+            lambda: store.delete("new"),
+            lambda: store.delete_many(["doc:1", "doc:2"]),
+            lambda: store.set_codec("float16"),
+        ):
+            write()
+            assert store.index_generation() != generation
+            generation = store.index_generation()
+
+        assert not store.delete("missing")
+        assert store.index_generation() == generation
+
+    def test_visible_to_other_connections(self, tmp_path):
+        db = tmp_path / "index.db"
+        writer = VectorStore(db_path=db, dimensions=4)
+        reader = VectorStore(db_path=db, dimensions=4)
+        assert reader.index_generation() == ""
+        writer.upsert_batch(_docs(3))
+        assert reader.index_generation() == writer.index_generation() != ""
+        writer.close()
+        reader.close()
+
+
+class TestProjection:
+    QUERY = [0.3, -0.2, 0.9, 0.0, 0.1, -0.7, 0.4, 0.2]
+
+    def test_reduces_stored_vectors(self):
+        store = _random_store()
+        assert store.set_projection(Projection.random(8, 4, seed=1)) == 61
+        assert store.stored_dimensions == 4
+        assert store.projection.describe() == "random 8 -> 4 dims"
+        blob = store._conn.execute("SELECT vector FROM vectors WHERE doc_id = 'doc:1'").fetchone()
+        assert len(blob[0]) == 4 * 4
+        # A stored vector is its own nearest neighbour in the reduced space
+        results = store.search(store.get("doc:5").vector, top_k=1, min_score=-1.0)
+        assert results[0].doc_id == "doc:5"
+
+    def test_keep_exact_reranks_to_exact_scores(self):
+        exact = _random_store().search(self.QUERY, top_k=5, min_score=-1.0)
+        store = _random_store()
+        store.set_projection(Projection.random(8, 6, seed=1), keep_exact=True)
+        assert store.keep_exact
+        projected = store.search(self.QUERY, top_k=5, min_score=-1.0)
+        by_id = {r.doc_id: r.score for r in exact}
+        for result in projected:
+            if result.doc_id in by_id:
+                assert result.score == pytest.approx(by_id[result.doc_id], abs=1e-5)
+        assert store.get("doc:3").vector == pytest.approx(_random_store().get("doc:3").vector)
+
+    def test_upsert_after_projection(self):
+        store = _random_store()
+        store.set_projection(Projection.random(8, 4, seed=1))
+        store.upsert(VectorDocument("new", "new", self.QUERY))
+        assert store.search(self.QUERY, top_k=1)[0].doc_id == "new"
+        with pytest.raises(ValueError, match="[Dd]imension"):
+            store.upsert(VectorDocument("short", "short", [1.0] * 4))
+
+    def test_pure_python_path(self, monkeypatch):
+        store = _random_store()
+        store.set_projection(Projection.random(8, 4, seed=1))
+        monkeypatch.setattr(vector_store, "_get_numpy", lambda: None)
+        results = store.search(self.QUERY, top_k=5, min_score=-1.0)
+        assert len(results) == 5
+
+    def test_remove_projection_from_exact(self):
+        store = _random_store()
+        full = store.get("doc:7").vector
+        store.set_projection(Projection.random(8, 4, seed=1), keep_exact=True)
+        store.set_projection(None)
+        assert store.projection is None
+        assert store.stored_dimensions == 8
+        assert store.get("doc:7").vector == pytest.approx(full)
+
+    def test_full_vectors_need_exact(self):
+        store = _random_store()
+        store.set_projection(Projection.random(8, 4, seed=1))
+        with pytest.raises(ValueError, match="keep_exact"):
+            store.full_vectors()
+        with pytest.raises(ValueError, match="keep_exact"):
+            store.set_projection(None)
+        assert store.stored_dimensions == 4
+
+    def test_source_dims_must_match(self):
+        store = _random_store()
+        with pytest.raises(ValueError, match="8 source dims"):
+            store.set_projection(Projection.random(16, 4))
+
+    def test_persisted_across_reopen(self, tmp_path):
+        db_file = tmp_path / "index.db"
+        proj = Projection.random(4, 2, seed=5)
+        with VectorStore(db_path=db_file, dimensions=4) as store:
+            store.upsert_batch(_docs(5))
+            generation = store.index_generation()
+            store.set_projection(proj, keep_exact=True)
+            assert store.index_generation() != generation
+        with VectorStore(db_path=db_file, dimensions=4) as store:
+            assert store.projection == proj
+            assert store.keep_exact
+            assert store.get_meta(vector_store.PROJECTION_META_KEY) == proj.fingerprint()
+            assert len(store.search([1.0, 0.0, 0.0, 0.0], top_k=3, min_score=-1.0)) == 3
+
+
+class TestBulkLoad:
+    def test_generator_with_chunked_commits(self, monkeypatch):
+        store = VectorStore(db_path=None, dimensions=4)
+        commits = []
+        write_rows = store._write_rows
+
+        def counting_write_rows(docs):
+            commits.append(len(docs))
+            return write_rows(docs)
+
+        monkeypatch.setattr(store, "_write_rows", counting_write_rows)
+        assert store.bulk_load(_docs(25), commit_every=10) == 25
+        assert commits == [10, 10, 5]
+        assert store.count() == 25
+        results = store.search([1.0, 3.0, 0, 0], top_k=1, filters=SearchFilter(tags_any=["bulk"]))
+        assert results[0].doc_id == "doc:3"
+
+    def test_failed_chunk_rolled_back(self):
+        store = VectorStore(db_path=None, dimensions=4)
+
+        def docs():
+            yield from _docs(4)
+            yield VectorDocument("bad", "bad", [1.0, object(), 0.0, 0.0])
+
+        with pytest.raises(Exception):
+            store.bulk_load(docs(), commit_every=3)
+        # First chunk committed, the failing one rolled back
+        assert store.list_doc_ids() == ["doc:0", "doc:1", "doc:2"]
+        store.upsert(VectorDocument("ok", "ok", [1, 0, 0, 0]))
+        assert store.count() == 4
+
+    def test_skips_wrong_dimensions_and_dedupes(self):
+        store = VectorStore(db_path=None, dimensions=4)
+        written = store.upsert_batch([
+            VectorDocument("a", "first", [1, 0, 0, 0], metadata={"tags": ["x"]}),
+            VectorDocument("short", "short", [1, 0]),
+            VectorDocument("a", "second", [0, 1, 0, 0], metadata={"tags": ["x"]}),
+        ])
+        assert written == 1
+        assert store.get("a").text == "second"
+        assert store.count() == 1
+
+    def test_failed_mtime_refresh_rolled_back(self):
+        store = VectorStore(db_path=None, dimensions=4)
+        store.bulk_load(_docs(2))
+        with pytest.raises(Exception):
+            store.set_source_mtimes({"doc:0": 5.0, "doc:1": object()})
+        store.set_meta("probe", "1")  # Next commit must not carry the partial update
+        assert store.chunk_states()["doc:0"][1] == 0.0
+
+    def test_pragmas_applied(self, tmp_path):
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=4,
+                            pragmas={"cache_size": -1024})
+        conn = store._conn
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -1024
+        store.close()
+
+    def test_invalid_pragma_rejected(self):
+        with pytest.raises(ValueError):
+            VectorStore(db_path=None, dimensions=4, pragmas={"synchronous": "OFF; DROP"})
+
+
+class TestMaintenance:
+    def test_vacuum_reclaims_free_pages(self, tmp_path):
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=4)
+        store.bulk_load(
+            VectorDocument(d.doc_id, d.text * 50, d.vector) for d in _docs(400)
+        )
+        store.delete_many([f"doc:{i}" for i in range(0, 400, 2)])
+        before = store.storage_stats()
+        assert before["rows"] == 200
+        assert before["freelist_count"] > 0 and before["fragmentation"] > 0
+
+        timings = store.vacuum()
+        assert set(timings) >= {"checkpoint", "vacuum", "analyze"}
+        after = store.storage_stats()
+        assert after["freelist_count"] == 0
+        assert after["page_count"] < before["page_count"]
+        assert after["wal_bytes"] == 0
+        # Row data, vectors and the FTS mapping survive the rewrite
+        assert store.get("doc:7").text.startswith("chunk number 7")
+        assert store.search([1.0, 7.0, 0, 0], top_k=1)[0].doc_id == "doc:7"
+        if store.fts_available:
+            assert store.search_lexical("7")[0].doc_id == "doc:7"
+        store.close()
+
+
+class TestConcurrency:
+    DIMS = 8
+
+    def _doc(self, i: int) -> VectorDocument:
+        vector = [1.0] + [float((i * (k + 3)) % 7) for k in range(self.DIMS - 1)]
+        return VectorDocument(f"doc:{i}", f"stress chunk {i}", vector, source_type="document",
+                              metadata={"tags": [f"t{i % 4}"]})
+
+    @pytest.mark.parametrize("many", [False, True])
+    def test_hit_deleted_before_detail_fetch_is_replaced(self, tmp_path, monkeypatch, many):
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=self.DIMS)
+        store.bulk_load(self._doc(i) for i in range(20))
+        query = self._doc(3).vector
+        original = store._fetch_details
+        deleted = []
+
+        def fetch_after_delete(doc_ids):
+            if not deleted:
+                # Another writer commits between the scan and the detail fetch
+                deleted.append(doc_ids[0])
+                store.delete(doc_ids[0])
+            return original(doc_ids)
+
+        monkeypatch.setattr(store, "_fetch_details", fetch_after_delete)
+        if many:
+            [results] = store.search_many([query], top_k=5, min_score=-1.0)
+        else:
+            results = store.search(query, top_k=5, min_score=-1.0)
+        assert len(results) == 5
+        assert deleted[0] not in [r.doc_id for r in results]
+        store.close()
+
+    def test_concurrent_searchers_with_one_writer(self, tmp_path):
+        import threading
+
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=self.DIMS)
+        store.bulk_load(self._doc(i) for i in range(200))
+        stop = threading.Event()
+        errors = []
+        counts = {}
+
+        def writer():
+            try:
+                for start in range(200, 1200, 50):
+                    store.upsert_batch([self._doc(i) for i in range(start, start + 50)])
+                    store.delete_many([f"doc:{start - 150}"])
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                stop.set()
+
+        def searcher(n):
+            seen = []
+            try:
+                while not stop.is_set() or len(seen) < 5:
+                    query = self._doc(n).vector
+                    results = store.search(query, top_k=5, min_score=-1.0)
+                    assert len(results) == 5
+                    assert all(r.doc_id.startswith("doc:") for r in results)
+                    filtered = store.search(query, top_k=3, min_score=-1.0,
+                                            filters=SearchFilter(tags_any=[f"t{n % 4}"]))
+                    assert all(f"t{n % 4}" in r.metadata["tags"] for r in filtered)
+                    assert store.get("doc:199") is not None
+                    seen.append(store.count())
+            except Exception as e:
+                errors.append(e)
+            counts[n] = seen
+
+        threads = [threading.Thread(target=searcher, args=(n,)) for n in range(8)]
+        threads.append(threading.Thread(target=writer))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+
+        assert not errors, errors
+        # Readers only ever see committed states: after each upsert or delete
+        committed = {200}
+        for k in range(1, 21):
+            committed |= {200 + 50 * k - (k - 1), 200 + 50 * k - k}
+        for seen in counts.values():
+            assert seen and set(seen) <= committed
+        assert store.count() == 1200 - 20
+        store.close()
+
+    def test_close_closes_every_thread_connection(self, tmp_path):
+        import sqlite3
+        import threading
+
+        store = VectorStore(db_path=tmp_path / "index.db", dimensions=4)
+        store.upsert(VectorDocument("a", "text", [1, 0, 0, 0]))
+        reader = {}
+
+        def read():
+            assert store.count() == 1
+            reader["conn"] = store._conn
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        with store:
+            assert store.count() == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            reader["conn"].execute("SELECT 1")
+        with pytest.raises(sqlite3.ProgrammingError):
+            store.count()
+        store.close()  # idempotent